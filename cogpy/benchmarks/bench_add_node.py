@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Benchmark for AtomSpace.add_node per-insert cost
+
+Inserts nodes into a fresh AtomSpace at increasing sizes and reports the
+average cost of one insert. With the (type, name) node table the cost
+should stay flat as the AtomSpace grows.
+
+Usage:
+    python bench_add_node.py [max_exponent]
+"""
+
+import sys
+import os
+import time
+
+# Add the repository root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from cogpy.core import AtomSpace, AtomType
+
+
+NODE_TYPES = [
+    AtomType.CONCEPT_NODE,
+    AtomType.PREDICATE_NODE,
+    AtomType.SCHEMA_NODE,
+]
+
+
+def bench_inserts(count: int) -> float:
+    """Insert `count` nodes and return the average seconds per insert"""
+    atomspace = AtomSpace()
+    # Names are shared across node types to exercise the (type, name) key
+    names = [f"concept-{i // len(NODE_TYPES)}" for i in range(count)]
+    
+    start = time.perf_counter()
+    for i, name in enumerate(names):
+        atomspace.add_node(NODE_TYPES[i % len(NODE_TYPES)], name)
+    elapsed = time.perf_counter() - start
+    
+    assert len(atomspace) == count
+    return elapsed / count
+
+
+def bench_lookups(count: int) -> float:
+    """Look up `count` existing nodes and return seconds per lookup"""
+    atomspace = AtomSpace()
+    for i in range(count):
+        atomspace.add_node(AtomType.CONCEPT_NODE, f"concept-{i}")
+    
+    start = time.perf_counter()
+    for i in range(count):
+        atomspace.get_node_by_name(f"concept-{i}", AtomType.CONCEPT_NODE)
+    elapsed = time.perf_counter() - start
+    
+    return elapsed / count
+
+
+def main():
+    """Run the benchmark"""
+    max_exponent = int(sys.argv[1]) if len(sys.argv) > 1 else 6
+    
+    print(f"{'nodes':>12}  {'insert (us)':>12}  {'lookup (us)':>12}")
+    for exponent in range(3, max_exponent + 1):
+        count = 10 ** exponent
+        insert_cost = bench_inserts(count) * 1e6
+        lookup_cost = bench_lookups(count) * 1e6
+        print(f"{count:>12}  {insert_cost:>12.3f}  {lookup_cost:>12.3f}")
+
+
+if __name__ == '__main__':
+    main()
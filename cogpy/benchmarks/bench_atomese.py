@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the streaming Atomese reader and writer
+
+Generates a corpus of random InheritanceLinks, EvaluationLinks and
+truth-valued concepts, then reads it: once into a sink that only counts
+atoms (the cost of tokenizing and parsing alone), then into a
+ColumnarAtomSpace and an AtomSpace. Finally writes the AtomSpace back out.
+
+Usage:
+    python bench_atomese.py [expression_count]
+"""
+
+import sys
+import os
+import random
+import tempfile
+import time
+from contextlib import contextmanager
+
+# Add the repository root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from cogpy.core import AtomSpace, ColumnarAtomSpace
+from cogpy.io import read_atomese, write_atomese
+
+
+class CountingSink:
+    """Stands in for an AtomSpace, counting the atoms it is given"""
+    
+    def __init__(self):
+        self.count = 0
+    
+    @contextmanager
+    def bulk_load(self):
+        yield self
+    
+    def add_node(self, atom_type, name, truth_value=None):
+        self.count += 1
+    
+    def add_link(self, atom_type, outgoing, truth_value=None):
+        self.count += 1
+    
+    def __len__(self) -> int:
+        return self.count
+
+
+def generate(path: str, expression_count: int, seed: int = 0):
+    """Write a random Atomese corpus"""
+    rng = random.Random(seed)
+    concepts = max(2, expression_count // 4)
+    with open(path, "w", encoding="utf-8") as file:
+        for i in range(expression_count):
+            first, second = rng.sample(range(concepts), 2)
+            kind = i % 10
+            if kind < 7:
+                line = (f'(InheritanceLink (stv 0.9 0.8)\n'
+                        f'  (ConceptNode "concept-{first}")\n  (ConceptNode "concept-{second}"))\n')
+            elif kind < 9:
+                line = (f'(EvaluationLink (PredicateNode "relation-{first % 100}")\n'
+                        f'  (ListLink (ConceptNode "concept-{first}") (ConceptNode "concept-{second}")))\n')
+            else:
+                line = f'(ConceptNode "concept-{first}" (stv {rng.random():.3f} 0.5))\n'
+            file.write(line)
+
+
+def main():
+    """Run the benchmark"""
+    expression_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "corpus.scm")
+        generate(path, expression_count)
+        print(f"expressions: {expression_count}, {os.path.getsize(path) / 2 ** 20:.1f} MiB")
+        
+        sink = CountingSink()
+        start = time.perf_counter()
+        read_atomese(sink, path)
+        elapsed = time.perf_counter() - start
+        # Atoms as they occur in the file, repeats included
+        occurrences = sink.count
+        print(f"{'parse only':>12}: {elapsed:>7.3f} s, {occurrences / elapsed:>10.0f} atom occurrences/s")
+        
+        for name, make in [("Columnar", ColumnarAtomSpace), ("AtomSpace", AtomSpace)]:
+            atomspace = make()
+            start = time.perf_counter()
+            read_atomese(atomspace, path)
+            elapsed = time.perf_counter() - start
+            print(f"{name:>12}: {elapsed:>7.3f} s, {occurrences / elapsed:>10.0f} atom occurrences/s, "
+                  f"{len(atomspace)} atoms")
+        
+        start = time.perf_counter()
+        written = write_atomese(atomspace, os.path.join(directory, "written.scm"))
+        elapsed = time.perf_counter() - start
+        print(f"{'write':>12}: {elapsed:>7.3f} s, {len(atomspace) / elapsed:>10.0f} atoms/s, {written} expressions")
+
+
+if __name__ == '__main__':
+    main()
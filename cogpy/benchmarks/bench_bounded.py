@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark for BoundedAtomSpace, memory and lookup cost against AtomSpace
+
+Loads the same random InheritanceLinks into an AtomSpace and into a
+BoundedAtomSpace capped at a tenth of the atoms, then looks atoms up by
+handle: first the most recently added ones (mostly resident), then random
+ones (mostly faulted in from disk).
+
+Usage:
+    python bench_bounded.py [link_count]
+"""
+
+import sys
+import os
+import gc
+import random
+import time
+import tracemalloc
+
+# Add the repository root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from cogpy.core import AtomSpace, AtomType, BoundedAtomSpace
+
+
+LOOKUPS = 10000
+
+
+def load(atomspace, link_count: int, seed: int = 0):
+    """Add random InheritanceLinks over link_count / 4 concepts"""
+    rng = random.Random(seed)
+    concept_count = max(2, link_count // 4)
+    for _ in range(link_count):
+        first, second = rng.sample(range(concept_count), 2)
+        atomspace.add_link(AtomType.INHERITANCE_LINK, [
+            atomspace.add_node(AtomType.CONCEPT_NODE, f"concept-{first}"),
+            atomspace.add_node(AtomType.CONCEPT_NODE, f"concept-{second}")])
+
+
+def main():
+    """Run the benchmark"""
+    link_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    atom_count = link_count + link_count // 4
+    print(f"links: {link_count}, cap: {atom_count // 10}")
+    for name, make in [("AtomSpace", AtomSpace), ("Bounded", lambda: BoundedAtomSpace(atom_count // 10))]:
+        gc.collect()
+        tracemalloc.start()
+        start = time.perf_counter()
+        atomspace = make()
+        load(atomspace, link_count)
+        load_time = time.perf_counter() - start
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        handles = sorted(atom.id for atom in atomspace.get_all_atoms())
+        rng = random.Random(1)
+        recent = [handles[-1 - i % len(handles)] for i in range(LOOKUPS)]
+        start = time.perf_counter()
+        for handle in recent:
+            atomspace.get_atom_by_id(handle)
+        recent_time = time.perf_counter() - start
+
+        low, high = handles[0], handles[-1]
+        spread = [rng.randint(low, high) for _ in range(LOOKUPS)]
+        start = time.perf_counter()
+        for handle in spread:
+            atomspace.get_atom_by_id(handle)
+        random_time = time.perf_counter() - start
+
+        print(f"{name:>10}: load {load_time:>7.3f} s, {memory / 2 ** 20:>7.1f} MiB, "
+              f"{LOOKUPS} recent lookups {recent_time:>6.3f} s, {LOOKUPS} random lookups {random_time:>6.3f} s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Benchmark for bulk loading an AtomSpace
+
+Loads the same synthetic knowledge base (ConceptNodes plus InheritanceLinks
+between them) one atom at a time with add_node/add_link, and in batches
+with add_nodes/add_links, and reports the throughput of each.
+
+Usage:
+    python bench_bulk_load.py [atom_count]
+"""
+
+import sys
+import os
+import random
+import time
+
+# Add the repository root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from cogpy.core import AtomSpace
+
+
+def make_dataset(count: int):
+    """Build node and link specs for `count` atoms, with string types"""
+    node_count = count // 2
+    rng = random.Random(42)
+    node_specs = [("ConceptNode", f"concept-{i}") for i in range(node_count)]
+    link_pairs = [(rng.randrange(node_count), rng.randrange(node_count))
+                  for _ in range(count - node_count)]
+    return node_specs, link_pairs
+
+
+def load_one_by_one(node_specs, link_pairs) -> AtomSpace:
+    """Load with one add_node/add_link call per atom"""
+    atomspace = AtomSpace()
+    nodes = [atomspace.add_node(atom_type, name) for atom_type, name in node_specs]
+    for source, target in link_pairs:
+        atomspace.add_link("InheritanceLink", [nodes[source], nodes[target]])
+    return atomspace
+
+
+def load_batched(node_specs, link_pairs) -> AtomSpace:
+    """Load with add_nodes/add_links"""
+    atomspace = AtomSpace()
+    nodes = atomspace.add_nodes(node_specs)
+    atomspace.add_links(("InheritanceLink", (nodes[source], nodes[target]))
+                        for source, target in link_pairs)
+    return atomspace
+
+
+def main():
+    """Run the benchmark"""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    node_specs, link_pairs = make_dataset(count)
+    
+    print(f"atoms: {count}")
+    for label, load in (("one by one", load_one_by_one), ("batched", load_batched)):
+        start = time.perf_counter()
+        atomspace = load(node_specs, link_pairs)
+        elapsed = time.perf_counter() - start
+        print(f"{label:>12}: {elapsed:8.2f} s  {len(atomspace) / elapsed:>12,.0f} atoms/s")
+        del atomspace
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Benchmark for AtomSpace.is_a with and without the ancestor index
+
+Builds a taxonomy tree of InheritanceLinks and times random is_a queries
+by walking the links and with the ancestor index, plus the cost of
+maintaining the index while the links are added.
+
+Usage:
+    python bench_closure.py [concept_count]
+"""
+
+import sys
+import os
+import random
+import time
+
+# Add the repository root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from cogpy.core import AtomSpace, AtomType
+
+
+BRANCHING = 4
+QUERIES = 10000
+
+
+def build(count: int, ancestor_index: bool):
+    """Build a tree of `count` concepts and return it with the build time"""
+    atomspace = AtomSpace(ancestor_index=ancestor_index)
+    start = time.perf_counter()
+    concepts = atomspace.add_nodes(
+        (AtomType.CONCEPT_NODE, f"concept-{i}") for i in range(count))
+    atomspace.add_links(
+        (AtomType.INHERITANCE_LINK, [concepts[i], concepts[(i - 1) // BRANCHING]])
+        for i in range(1, count))
+    return atomspace, concepts, time.perf_counter() - start
+
+
+def main():
+    """Run the benchmark"""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    rng = random.Random(0)
+    pairs = [(rng.randrange(count), rng.randrange(count // 100)) for _ in range(QUERIES)]
+    
+    print(f"concepts: {count}")
+    print(f"{'':>10}  {'build (s)':>10}  {'is_a (us)':>10}  {'hits':>6}")
+    for name, ancestor_index in [("walk", False), ("index", True)]:
+        atomspace, concepts, build_time = build(count, ancestor_index)
+        queries = [(concepts[child], concepts[parent]) for child, parent in pairs]
+        start = time.perf_counter()
+        hits = sum(atomspace.is_a(child, parent) for child, parent in queries)
+        elapsed = time.perf_counter() - start
+        print(f"{name:>10}  {build_time:>10.2f}  {elapsed / QUERIES * 1e6:>10.2f}  {hits:>6}")
+
+
+if __name__ == '__main__':
+    main()
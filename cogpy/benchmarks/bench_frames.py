@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark for copy-on-write AtomSpace frames against deep copies
+
+Builds random InheritanceLinks (and their concepts) in a base AtomSpace,
+then runs a number of hypothetical scenarios two ways: on a deep copy of
+the base, and on a frame over it. Each scenario adds a few links, revises
+a few truth values, removes a concept and runs a few queries. Reports the
+time per scenario and the memory each scenario holds, from tracemalloc.
+
+Usage:
+    python bench_frames.py [link_count] [scenario_count]
+"""
+
+import sys
+import os
+import copy
+import random
+import time
+import tracemalloc
+
+# Add the repository root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from cogpy.core import AtomSpace, AtomType, TruthValue
+
+
+def build(link_count: int, seed: int = 0) -> AtomSpace:
+    """Build random InheritanceLinks over link_count / 4 concepts"""
+    rng = random.Random(seed)
+    atomspace = AtomSpace()
+    concepts = atomspace.add_nodes((AtomType.CONCEPT_NODE, f"concept-{i}") for i in range(max(2, link_count // 4)))
+    atomspace.add_links((AtomType.INHERITANCE_LINK, rng.sample(concepts, 2)) for _ in range(link_count))
+    return atomspace
+
+
+def scenario(atomspace, seed: int) -> int:
+    """Change an AtomSpace a little and query it"""
+    rng = random.Random(seed)
+    names = [f"concept-{rng.randrange(1000)}" for _ in range(20)]
+    nodes = [atomspace.get_node_by_name(name) for name in names]
+    for first, second in zip(nodes[:10], nodes[10:]):
+        atomspace.add_link(AtomType.INHERITANCE_LINK, [first, second], TruthValue(0.8, 0.5))
+    for node in nodes[:5]:
+        for link in atomspace.get_incoming(node)[:2]:
+            atomspace.add_link(link.type, link.outgoing, TruthValue(0.1, 0.9))
+    atomspace.remove_atom(nodes[-1])
+    return sum(atomspace.count_incoming(node) for node in nodes[:-1])
+
+
+def main():
+    """Run the benchmark"""
+    link_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    scenario_count = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    base = build(link_count)
+    print(f"base: {len(base)} atoms, {scenario_count} scenarios")
+    
+    for name, fork in [("deep copy", copy.deepcopy), ("frame", lambda base: AtomSpace(parent=base))]:
+        tracemalloc.start()
+        start = time.perf_counter()
+        kept = []
+        for seed in range(scenario_count):
+            atomspace = fork(base)
+            scenario(atomspace, seed)
+            # Scenarios are kept, as when comparing their outcomes
+            kept.append(atomspace)
+        elapsed = time.perf_counter() - start
+        held = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        print(f"{name:>10}: {elapsed / scenario_count * 1000:>9.2f} ms/scenario, "
+              f"{held / scenario_count / 2 ** 20:>8.2f} MiB/scenario")
+        del kept
+    
+    frame = AtomSpace(parent=base)
+    scenario(frame, 0)
+    start = time.perf_counter()
+    frame.collapse()
+    print(f"{'collapse':>10}: {(time.perf_counter() - start) * 1000:>9.2f} ms, base now {len(base)} atoms")
+
+
+if __name__ == '__main__':
+    main()
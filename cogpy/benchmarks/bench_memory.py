@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Benchmark for memory used per atom
+
+Reports the bytes allocated per node and per link, both for bare atom
+objects and for atoms stored in an AtomSpace (which includes the cost of
+the AtomSpace indexes). Each is measured against a baseline: reference
+atom classes laid out as before __slots__ (a __dict__ per atom and per
+truth value, outgoing sets as lists), and an AtomSpace whose atoms read
+their truth value from their own object instead of the shared store.
+
+Usage:
+    python bench_memory.py [atom_count]
+"""
+
+import sys
+import os
+import gc
+import tracemalloc
+from itertools import count as counter
+
+# Add the repository root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from cogpy.core import AtomSpace, AtomType, Node, Link
+from cogpy.core.columnar import ColumnarAtomSpace
+
+
+_next_handle = counter().__next__
+
+
+class BaselineTruthValue:
+    """A truth value without __slots__"""
+    
+    def __init__(self, strength: float = 1.0, confidence: float = 1.0):
+        self.strength = strength
+        self.confidence = confidence
+
+
+class BaselineNode:
+    """A node without __slots__ or a cached hash"""
+    
+    def __init__(self, atom_type: AtomType, name: str):
+        self.id = _next_handle()
+        self.type = atom_type
+        self.truth_value = BaselineTruthValue()
+        self.name = name
+    
+    def __hash__(self) -> int:
+        return hash((self.type, self.name))
+
+
+class BaselineLink:
+    """A link without __slots__ or a cached hash, with a list outgoing set"""
+    
+    def __init__(self, atom_type: AtomType, outgoing: list):
+        self.id = _next_handle()
+        self.type = atom_type
+        self.truth_value = BaselineTruthValue()
+        self.outgoing = list(outgoing)
+    
+    def __hash__(self) -> int:
+        return hash((self.type, tuple(self.outgoing)))
+
+
+class BaselineAtomSpace(AtomSpace):
+    """An AtomSpace whose atoms each keep a truth value object of their own"""
+    
+    def _index_atoms(self, atoms, restored=False, copied=False):
+        atoms = list(atoms)
+        super()._index_atoms(atoms, restored, copied)
+        for atom in atoms:
+            atom._tv = BaselineTruthValue()
+
+
+def measure(build) -> int:
+    """Return the bytes still allocated after calling `build`"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return after - before
+
+
+def measure_bare(node_class, link_class, names, link_count):
+    """Return the bytes allocated for bare nodes and for bare links"""
+    node_count = len(names)
+    nodes = []
+    node_bytes = measure(lambda: nodes.extend(
+        node_class(AtomType.CONCEPT_NODE, name) for name in names))
+    link_bytes = measure(lambda: [
+        link_class(AtomType.INHERITANCE_LINK, [nodes[i], nodes[(i + 1) % node_count]])
+        for i in range(link_count)])
+    return node_bytes, link_bytes
+
+
+def measure_space(atomspace, names, link_count):
+    """Return the bytes allocated for nodes and for links added to an AtomSpace"""
+    node_count = len(names)
+    nodes = []
+    node_bytes = measure(lambda: nodes.extend(
+        atomspace.add_node(AtomType.CONCEPT_NODE, name) for name in names))
+    link_bytes = measure(lambda: [
+        atomspace.add_link(AtomType.INHERITANCE_LINK, [nodes[i], nodes[(i + 1) % node_count]])
+        for i in range(link_count)])
+    return node_bytes, link_bytes
+
+
+def main():
+    """Run the benchmark"""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    node_count = count // 2
+    link_count = count - node_count
+    # Names are built up front so they are not charged to the atoms
+    names = [f"concept-{i}" for i in range(node_count)]
+    
+    rows = [
+        ("bare, baseline", measure_bare(BaselineNode, BaselineLink, names, link_count)),
+        ("bare objects", measure_bare(Node, Link, names, link_count)),
+        ("in AtomSpace, baseline", measure_space(BaselineAtomSpace(), names, link_count)),
+        ("in AtomSpace", measure_space(AtomSpace(), names, link_count)),
+    ]
+    
+    columnar = ColumnarAtomSpace()
+    columnar_node_bytes = measure(lambda: [
+        columnar.add_node(AtomType.CONCEPT_NODE, name) and None for name in names])
+    columnar_link_bytes = measure(lambda: [
+        columnar.add_link(AtomType.INHERITANCE_LINK,
+                          [columnar.get_atom_by_id(i), columnar.get_atom_by_id((i + 1) % node_count)]) and None
+        for i in range(link_count)])
+    
+    rows.append(("columnar", (columnar_node_bytes, columnar_link_bytes)))
+    
+    print(f"atoms: {count} ({node_count} nodes, {link_count} links)")
+    print(f"{'':>22}  {'node (B)':>10}  {'link (B)':>10}")
+    for label, (node_bytes, link_bytes) in rows:
+        print(f"{label:>22}  {node_bytes / node_count:>10.1f}  {link_bytes / link_count:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
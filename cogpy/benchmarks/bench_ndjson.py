@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark for streaming NDJSON import and export
+
+Builds random InheritanceLinks (and their concepts) in a
+ColumnarAtomSpace, exports them to a file and imports the file into a
+ColumnarAtomSpace and an AtomSpace, then imports it again with the lines
+reversed so every link comes before its outgoing atoms. Peak memory is
+measured with tracemalloc for export, to show it does not grow with the
+AtomSpace.
+
+Usage:
+    python bench_ndjson.py [link_count]
+"""
+
+import sys
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+# Add the repository root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from cogpy.core import AtomSpace, AtomType, ColumnarAtomSpace
+from cogpy.io import read_ndjson, write_ndjson
+
+
+def build(link_count: int, seed: int = 0) -> ColumnarAtomSpace:
+    """Build random InheritanceLinks over link_count / 4 concepts"""
+    rng = random.Random(seed)
+    atomspace = ColumnarAtomSpace()
+    concepts = atomspace.add_nodes((AtomType.CONCEPT_NODE, f"concept-{i}") for i in range(max(2, link_count // 4)))
+    atomspace.add_links((AtomType.INHERITANCE_LINK, rng.sample(concepts, 2)) for _ in range(link_count))
+    return atomspace
+
+
+def main():
+    """Run the benchmark"""
+    link_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "atoms.ndjson")
+        for count in (link_count // 10, link_count):
+            atomspace = build(count)
+            start = time.perf_counter()
+            write_ndjson(atomspace, path)
+            elapsed = time.perf_counter() - start
+            # Measured apart, as tracing slows allocation down
+            tracemalloc.start()
+            write_ndjson(atomspace, path)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(f"{'export':>12}: {len(atomspace):>8} atoms, {elapsed:>7.3f} s, "
+                  f"{len(atomspace) / elapsed:>8.0f} atoms/s, peak {peak / 2 ** 20:.1f} MiB")
+        print(f"file: {os.path.getsize(path) / 2 ** 20:.1f} MiB")
+        
+        for name, make in [("Columnar", ColumnarAtomSpace), ("AtomSpace", AtomSpace)]:
+            imported = make()
+            start = time.perf_counter()
+            read_ndjson(imported, path)
+            elapsed = time.perf_counter() - start
+            print(f"{name:>12}: {elapsed:>7.3f} s, {len(imported) / elapsed:>8.0f} atoms/s")
+        
+        with open(path, encoding="utf-8") as file:
+            lines = file.readlines()
+        lines.reverse()
+        imported = ColumnarAtomSpace()
+        start = time.perf_counter()
+        read_ndjson(imported, lines, max_pending=len(lines))
+        elapsed = time.perf_counter() - start
+        print(f"{'reversed':>12}: {elapsed:>7.3f} s, {len(imported) / elapsed:>8.0f} atoms/s")
+
+
+if __name__ == '__main__':
+    main()
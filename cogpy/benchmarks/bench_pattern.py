@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Benchmark for PatternMatcher against a naive scan
+
+Builds a taxonomy of concepts under a number of categories and runs a
+single-clause query, InheritanceLink($X, category), and a two-clause
+conjunction, InheritanceLink($Y, root) and InheritanceLink($X, $Y), both
+with the PatternMatcher and with hand-written loops over every
+InheritanceLink. The conjunction is also run with its clauses written in
+the expensive order, which the matcher reorders from live counts. Finally,
+a stream of small queries of one shape measures the per-query overhead with
+and without the plan cache.
+
+Usage:
+    python bench_pattern.py [concept_count]
+"""
+
+import sys
+import os
+import time
+
+# Add the repository root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from cogpy.core import AtomSpace, AtomType, Node, Link, PatternMatcher
+
+
+CATEGORY_COUNT = 1000
+REPEATS = 20000
+
+
+def build(count: int) -> AtomSpace:
+    """Build `count` concepts spread evenly over the categories"""
+    atomspace = AtomSpace()
+    root = atomspace.add_node(AtomType.CONCEPT_NODE, "root")
+    categories = atomspace.add_nodes(
+        (AtomType.CONCEPT_NODE, f"category-{i}") for i in range(CATEGORY_COUNT))
+    concepts = atomspace.add_nodes(
+        (AtomType.CONCEPT_NODE, f"concept-{i}") for i in range(count))
+    atomspace.add_links(
+        (AtomType.INHERITANCE_LINK, [concept, categories[i % CATEGORY_COUNT]])
+        for i, concept in enumerate(concepts))
+    # Only a few categories are under the root
+    atomspace.add_links(
+        (AtomType.INHERITANCE_LINK, [category, root]) for category in categories[:3])
+    return atomspace
+
+
+def naive_single(atomspace: AtomSpace, category) -> list:
+    """InheritanceLink($X, category) by scanning every InheritanceLink"""
+    return [{"$X": link.outgoing[0]} for link in atomspace.iter_by_type(AtomType.INHERITANCE_LINK)
+            if link.outgoing[1] == category]
+
+
+def naive_conjunction(atomspace: AtomSpace, root) -> list:
+    """InheritanceLink($Y, root), InheritanceLink($X, $Y) by nested scans"""
+    groundings = []
+    for upper in atomspace.iter_by_type(AtomType.INHERITANCE_LINK):
+        if upper.outgoing[1] != root:
+            continue
+        for lower in atomspace.iter_by_type(AtomType.INHERITANCE_LINK):
+            if lower.outgoing[1] == upper.outgoing[0]:
+                groundings.append({"$X": lower.outgoing[0], "$Y": upper.outgoing[0]})
+    return groundings
+
+
+def timed(function, *args):
+    """Return the result of a call and the seconds it took"""
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def bench_repeated(matcher: PatternMatcher) -> float:
+    """Return the seconds per query for a stream of same-shape queries"""
+    X = Node(AtomType.VARIABLE_NODE, "$X")
+    queries = [
+        Link(AtomType.INHERITANCE_LINK, [Node(AtomType.CONCEPT_NODE, f"concept-{i}"), X])
+        for i in range(REPEATS)]
+    start = time.perf_counter()
+    for query in queries:
+        for _ in matcher.match(query):
+            pass
+    return (time.perf_counter() - start) / REPEATS
+
+
+def main():
+    """Run the benchmark"""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    atomspace = build(count)
+    matcher = PatternMatcher(atomspace)
+    X = Node(AtomType.VARIABLE_NODE, "$X")
+    Y = Node(AtomType.VARIABLE_NODE, "$Y")
+    category = Node(AtomType.CONCEPT_NODE, "category-0")
+    root = Node(AtomType.CONCEPT_NODE, "root")
+    
+    single = Link(AtomType.INHERITANCE_LINK, [X, category])
+    conjunction = [Link(AtomType.INHERITANCE_LINK, [Y, root]), Link(AtomType.INHERITANCE_LINK, [X, Y])]
+    reversed_conjunction = conjunction[::-1]
+    
+    print(f"concepts: {count}")
+    print(f"{'query':>20}  {'matches':>8}  {'naive (ms)':>11}  {'matcher (ms)':>12}")
+    for name, naive, template, constant in [
+        ("single", naive_single, single, category),
+        ("conjunction", naive_conjunction, conjunction, root),
+        ("conjunction reversed", naive_conjunction, reversed_conjunction, root),
+    ]:
+        expected, naive_time = timed(naive, atomspace, constant)
+        result, matcher_time = timed(matcher.match_all, template)
+        assert len(result) == len(expected)
+        print(f"{name:>20}  {len(result):>8}  {naive_time * 1e3:>11.2f}  {matcher_time * 1e3:>12.2f}")
+    
+    cached = bench_repeated(PatternMatcher(atomspace))
+    uncached = bench_repeated(PatternMatcher(atomspace, plan_cache_size=0))
+    print(f"repeated query: {cached * 1e6:.1f} us cached, {uncached * 1e6:.1f} us uncached")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Benchmark for AtomSpace snapshots, mapped against read and rebuilt
+
+Builds random InheritanceLinks (and their concepts) in a
+ColumnarAtomSpace and saves a snapshot. Then starts a "worker" three
+ways, each answering the same first queries: rebuilding the graph with
+add_nodes/add_links, reading the snapshot into memory, and mapping it.
+
+Usage:
+    python bench_snapshot.py [link_count]
+"""
+
+import sys
+import os
+import random
+import tempfile
+import time
+
+# Add the repository root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from cogpy.core import AtomSpace, AtomType, ColumnarAtomSpace
+
+
+def build(link_count: int, seed: int = 0) -> ColumnarAtomSpace:
+    """Build random InheritanceLinks over link_count / 4 concepts"""
+    rng = random.Random(seed)
+    atomspace = ColumnarAtomSpace()
+    concepts = atomspace.add_nodes((AtomType.CONCEPT_NODE, f"concept-{i}") for i in range(max(2, link_count // 4)))
+    atomspace.add_links((AtomType.INHERITANCE_LINK, rng.sample(concepts, 2)) for _ in range(link_count))
+    return atomspace
+
+
+def first_queries(atomspace) -> int:
+    """Answer a few queries, as a freshly started worker would"""
+    names = [f"concept-{i}" for i in range(0, len(atomspace) // 5, max(1, len(atomspace) // 500))]
+    found = 0
+    for name in names:
+        node = atomspace.get_node_by_name(name)
+        found += len(atomspace.get_incoming(node))
+    return found
+
+
+def main():
+    """Run the benchmark"""
+    link_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    start = time.perf_counter()
+    atomspace = build(link_count)
+    expected = first_queries(atomspace)
+    print(f"atoms: {len(atomspace)}")
+    print(f"{'rebuild':>8}: {time.perf_counter() - start:>8.3f} s")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "atoms.snapshot")
+        start = time.perf_counter()
+        atomspace.save_snapshot(path)
+        print(f"{'save':>8}: {time.perf_counter() - start:>8.3f} s, {os.path.getsize(path) / 2 ** 20:.0f} MiB")
+        del atomspace
+        
+        for name, mmap in [("read", False), ("mmap", True)]:
+            start = time.perf_counter()
+            opened = AtomSpace.open_snapshot(path, mmap=mmap)
+            assert first_queries(opened) == expected
+            print(f"{name:>8}: {time.perf_counter() - start:>8.3f} s")
+            del opened
+
+
+if __name__ == '__main__':
+    main()
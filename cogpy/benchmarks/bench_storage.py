@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark for SQLiteStorage, write-behind batching vs one commit per atom
+
+Stores random InheritanceLinks (and their concepts) with SQLiteStorage:
+once flushing after every atom, as a synchronous store would, and once
+with the default write-behind queue. Then reopens the database and loads
+every atom into a new AtomSpace.
+
+Usage:
+    python bench_storage.py [link_count]
+"""
+
+import sys
+import os
+import random
+import tempfile
+import time
+
+# Add the repository root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from cogpy.core import AtomSpace, AtomType
+from cogpy.storage import SQLiteStorage
+
+
+def build(link_count: int, seed: int = 0) -> AtomSpace:
+    """Build random InheritanceLinks over link_count / 4 concepts"""
+    rng = random.Random(seed)
+    atomspace = AtomSpace()
+    concepts = atomspace.add_nodes((AtomType.CONCEPT_NODE, f"concept-{i}") for i in range(max(2, link_count // 4)))
+    atomspace.add_links((AtomType.INHERITANCE_LINK, rng.sample(concepts, 2)) for _ in range(link_count))
+    return atomspace
+
+
+def store_synchronously(atomspace: AtomSpace, path: str):
+    """Store one atom per transaction"""
+    storage = SQLiteStorage(atomspace, path, flush_interval=None)
+    for atom in atomspace.iter_atoms():
+        storage.store_atom(atom)
+        storage.flush()
+    storage.close()
+
+
+def store_write_behind(atomspace: AtomSpace, path: str):
+    """Store through the write-behind queue"""
+    storage = SQLiteStorage(atomspace, path)
+    storage.store_atomspace()
+    storage.close()
+
+
+def main():
+    """Run the benchmark"""
+    link_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    atomspace = build(link_count)
+    # One commit per atom is slow, so it is timed on a sample
+    sample = build(min(link_count, 10000))
+    print(f"atoms: {len(atomspace)}")
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        store_synchronously(sample, os.path.join(directory, "synchronous.db"))
+        elapsed = time.perf_counter() - start
+        print(f"{'per-atom':>12}: {len(sample) / elapsed:>10.0f} atoms/s ({len(sample)} atoms)")
+
+        path = os.path.join(directory, "write-behind.db")
+        start = time.perf_counter()
+        store_write_behind(atomspace, path)
+        elapsed = time.perf_counter() - start
+        print(f"{'write-behind':>12}: {len(atomspace) / elapsed:>10.0f} atoms/s")
+
+        loaded = AtomSpace()
+        start = time.perf_counter()
+        storage = SQLiteStorage(loaded, path)
+        storage.load_atomspace()
+        storage.close()
+        elapsed = time.perf_counter() - start
+        print(f"{'load':>12}: {len(loaded) / elapsed:>10.0f} atoms/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Benchmark for whole-graph truth value updates
+
+Halves the strength of every link, once with a Python loop over the atoms
+and once with get_truth_values/set_truth_values on NumPy arrays. The
+vectorized update is also timed with the handles already known, as in a
+loop that recomputes the same atoms repeatedly.
+
+Usage:
+    python bench_truth_values.py [link_count]
+"""
+
+import sys
+import os
+import time
+
+# Add the repository root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from cogpy.core import AtomSpace, AtomType, TruthValue
+
+
+def build(count: int) -> AtomSpace:
+    """Build `count` InheritanceLinks over a chain of concepts"""
+    atomspace = AtomSpace()
+    concepts = atomspace.add_nodes(
+        (AtomType.CONCEPT_NODE, f"concept-{i}") for i in range(count + 1))
+    atomspace.add_links(
+        (AtomType.INHERITANCE_LINK, [concepts[i], concepts[i + 1]]) for i in range(count))
+    return atomspace
+
+
+def update_loop(atomspace: AtomSpace):
+    """Halve every link strength one atom at a time"""
+    for link in atomspace.iter_by_type(AtomType.INHERITANCE_LINK):
+        tv = link.truth_value
+        link.truth_value = TruthValue(tv.strength * 0.5, tv.confidence)
+
+
+def update_vectorized(atomspace: AtomSpace):
+    """Halve every link strength with array math"""
+    handles, strengths, confidences = atomspace.get_truth_values(AtomType.INHERITANCE_LINK)
+    atomspace.set_truth_values(handles, strengths * 0.5, confidences)
+
+
+def update_known_handles(atomspace: AtomSpace, handles):
+    """Halve the strength of known handles with array math"""
+    _, strengths, confidences = atomspace.get_truth_values(handles=handles)
+    atomspace.set_truth_values(handles, strengths * 0.5, confidences)
+
+
+def main():
+    """Run the benchmark"""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    atomspace = build(count)
+    
+    print(f"links: {count}")
+    for name, update in [("loop", update_loop), ("vectorized", update_vectorized)]:
+        start = time.perf_counter()
+        update(atomspace)
+        elapsed = time.perf_counter() - start
+        print(f"{name:>14}: {elapsed * 1e3:>10.1f} ms")
+    
+    handles = atomspace.get_truth_values(AtomType.INHERITANCE_LINK)[0]
+    start = time.perf_counter()
+    update_known_handles(atomspace, handles)
+    elapsed = time.perf_counter() - start
+    print(f"{'known handles':>14}: {elapsed * 1e3:>10.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Benchmark for WriteAheadLog, logging overhead and recovery time
+
+Adds random InheritanceLinks (and their concepts) to an AtomSpace with
+and without a WriteAheadLog attached, then recovers the log into a new
+AtomSpace twice: once by replaying the whole log, and once from a
+snapshot.
+
+Usage:
+    python bench_wal.py [link_count]
+"""
+
+import sys
+import os
+import random
+import tempfile
+import time
+
+# Add the repository root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from cogpy.core import AtomSpace, AtomType
+from cogpy.storage import WriteAheadLog
+
+
+def load(atomspace: AtomSpace, link_count: int, seed: int = 0):
+    """Add random InheritanceLinks over link_count / 4 concepts, one at a time"""
+    rng = random.Random(seed)
+    concepts = [atomspace.add_node(AtomType.CONCEPT_NODE, f"concept-{i}") for i in range(max(2, link_count // 4))]
+    for _ in range(link_count):
+        atomspace.add_link(AtomType.INHERITANCE_LINK, rng.sample(concepts, 2))
+
+
+def timed_recovery(directory: str) -> float:
+    """Recover a log into a new AtomSpace, returning the seconds taken"""
+    start = time.perf_counter()
+    log = WriteAheadLog(AtomSpace(), directory, snapshot_interval=None)
+    elapsed = time.perf_counter() - start
+    log.close()
+    return elapsed
+
+
+def main():
+    """Run the benchmark"""
+    link_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    atom_count = link_count + max(2, link_count // 4)
+    print(f"atoms: {atom_count}")
+    
+    start = time.perf_counter()
+    load(AtomSpace(), link_count)
+    baseline = time.perf_counter() - start
+    print(f"{'no log':>16}: {atom_count / baseline:>10.0f} atoms/s")
+    
+    with tempfile.TemporaryDirectory() as directory:
+        atomspace = AtomSpace()
+        log = WriteAheadLog(atomspace, directory, snapshot_interval=None)
+        start = time.perf_counter()
+        load(atomspace, link_count)
+        log.commit()
+        elapsed = time.perf_counter() - start
+        size = sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+        print(f"{'logged':>16}: {atom_count / elapsed:>10.0f} atoms/s "
+              f"({elapsed / baseline - 1:+.0%}, {size / atom_count:.0f} bytes/atom)")
+        
+        print(f"{'replay':>16}: {atom_count / timed_recovery(directory):>10.0f} atoms/s")
+        
+        start = time.perf_counter()
+        log.checkpoint(wait=True)
+        elapsed = time.perf_counter() - start
+        log.close()
+        print(f"{'snapshot write':>16}: {atom_count / elapsed:>10.0f} atoms/s")
+        print(f"{'snapshot load':>16}: {atom_count / timed_recovery(directory):>10.0f} atoms/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -4,6 +4,11 @@ Core module for cogpy hypergraph implementation
 
 from cogpy.core.atom import Atom, Node, Link
 from cogpy.core.atomspace import AtomSpace
+from cogpy.core.attention import AttentionValue, ImportanceSpreader
+from cogpy.core.bounded import BoundedAtomSpace
+from cogpy.core.columnar import ColumnarAtomSpace
+from cogpy.core.pattern import PatternMatcher
+from cogpy.core.inference import BackwardChainer, ForwardChainer
 from cogpy.core.types import AtomType
 from cogpy.core.truthvalue import TruthValue
 
@@ -12,6 +17,13 @@ __all__ = [
     "Node",
     "Link",
     "AtomSpace",
+    "ColumnarAtomSpace",
+    "BoundedAtomSpace",
+    "PatternMatcher",
+    "ForwardChainer",
+    "BackwardChainer",
+    "AttentionValue",
+    "ImportanceSpreader",
     "AtomType",
     "TruthValue",
 ]
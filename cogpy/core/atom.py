@@ -2,19 +2,37 @@
 Atom classes for the hypergraph
 """
 
-from typing import List, Optional, Union
-from uuid import uuid4
+from itertools import count
+from operator import attrgetter
+from typing import Optional, Sequence, Tuple, Union
 
 from cogpy.core.types import AtomType
-from cogpy.core.truthvalue import TruthValue
+from cogpy.core.truthvalue import TruthValue, TruthValueStore
+
+
+# Process-wide allocator for atom handles. Handles are small integers that
+# increase monotonically and are never reused, so they are unique across
+# every AtomSpace in the process.
+_next_handle = count().__next__
+
+_handle_of = attrgetter("id")
 
 
 class Atom:
     """
     Base class for all atoms in the hypergraph.
     An atom represents a node or link in the knowledge graph.
+    
+    Atoms use __slots__ and compute their hash once at construction, so
+    the identifying attributes (type, name, outgoing) must not be changed
+    after the atom is created.
+    
+    An atom that belongs to an AtomSpace keeps its truth value in the
+    AtomSpace's TruthValueStore, and truth_value returns a view of it.
     """
     
+    __slots__ = ("id", "type", "_tv", "_hash")
+    
     def __init__(
         self,
         atom_type: Union[AtomType, str],
@@ -30,9 +48,29 @@ class Atom:
         if isinstance(atom_type, str):
             atom_type = AtomType.from_string(atom_type)
         
-        self.id = str(uuid4())
+        self.id = _next_handle()
         self.type = atom_type
-        self.truth_value = truth_value or TruthValue()
+        # The truth value, None until first read if not given, or the
+        # TruthValueStore holding it
+        self._tv = truth_value
+        self._hash = hash(self.id)
+    
+    @property
+    def truth_value(self) -> TruthValue:
+        tv = self._tv
+        if tv is None:
+            self._tv = tv = TruthValue()
+        elif tv.__class__ is TruthValueStore:
+            return tv.view(self.id, self)
+        return tv
+    
+    @truth_value.setter
+    def truth_value(self, truth_value: TruthValue):
+        tv = self._tv
+        if tv.__class__ is TruthValueStore:
+            tv.set(self.id, truth_value)
+        else:
+            self._tv = truth_value
     
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}(id={self.id}, type={self.type.value})"
@@ -43,7 +81,7 @@ class Atom:
         return self.id == other.id
     
     def __hash__(self) -> int:
-        return hash(self.id)
+        return self._hash
 
 
 class Node(Atom):
@@ -52,6 +90,8 @@ class Node(Atom):
     Nodes represent concepts, predicates, or values.
     """
     
+    __slots__ = ("name",)
+    
     def __init__(
         self,
         atom_type: Union[AtomType, str],
@@ -68,6 +108,7 @@ class Node(Atom):
         """
         super().__init__(atom_type, truth_value)
         self.name = name
+        self._hash = hash((self.type, name))
     
     def __repr__(self) -> str:
         return f"Node(type={self.type.value}, name='{self.name}')"
@@ -75,22 +116,29 @@ class Node(Atom):
     def __eq__(self, other) -> bool:
         if not isinstance(other, Node):
             return False
-        return self.type == other.type and self.name == other.name
+        return (self._hash == other._hash and
+                self.type == other.type and
+                self.name == other.name)
     
-    def __hash__(self) -> int:
-        return hash((self.type, self.name))
+    __hash__ = Atom.__hash__
 
 
 class Link(Atom):
     """
     A link in the hypergraph connecting multiple atoms.
     Links represent relationships between atoms.
+    
+    Links of unordered types (subtypes of UnorderedLink, such as SetLink
+    and SimilarityLink) sort their outgoing set by handle, so links with
+    the same atoms in a different order are equal.
     """
     
+    __slots__ = ("outgoing",)
+    
     def __init__(
         self,
         atom_type: Union[AtomType, str],
-        outgoing: List[Atom],
+        outgoing: Sequence[Atom],
         truth_value: Optional[TruthValue] = None,
     ):
         """
@@ -98,11 +146,16 @@ class Link(Atom):
         
         Args:
             atom_type: Type of the link
-            outgoing: List of atoms this link connects
+            outgoing: Atoms this link connects, stored as a tuple
             truth_value: Optional truth value
         """
         super().__init__(atom_type, truth_value)
-        self.outgoing = outgoing if outgoing else []
+        if not outgoing:
+            outgoing = ()
+        elif AtomType.is_unordered(self.type):
+            outgoing = sorted(outgoing, key=_handle_of)
+        self.outgoing: Tuple[Atom, ...] = tuple(outgoing)
+        self._hash = hash((self.type, self.outgoing))
     
     def __repr__(self) -> str:
         outgoing_str = ", ".join([str(atom) for atom in self.outgoing])
@@ -111,12 +164,11 @@ class Link(Atom):
     def __eq__(self, other) -> bool:
         if not isinstance(other, Link):
             return False
-        return (self.type == other.type and
-                len(self.outgoing) == len(other.outgoing) and
-                all(a == b for a, b in zip(self.outgoing, other.outgoing)))
+        return (self._hash == other._hash and
+                self.type == other.type and
+                self.outgoing == other.outgoing)
     
-    def __hash__(self) -> int:
-        return hash((self.type, tuple(self.outgoing)))
+    __hash__ = Atom.__hash__
     
     def get_arity(self) -> int:
         """Get the number of outgoing atoms"""
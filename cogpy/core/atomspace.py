@@ -2,12 +2,18 @@
 AtomSpace - the hypergraph database
 """
 
-from typing import List, Optional, Set, Union, Dict
-from collections import defaultdict
+from typing import Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Union, Dict
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+import gc
+from itertools import chain
+from uuid import uuid4
 
-from cogpy.core.atom import Atom, Node, Link
+from cogpy.core.atom import Atom, Node, Link, _handle_of
+from cogpy.core.attention import AttentionValue, AttentionValueStore
+from cogpy.core.closure import AncestorIndex, CLOSURE_LINK_TYPES, walk_inheritance
 from cogpy.core.types import AtomType
-from cogpy.core.truthvalue import TruthValue
+from cogpy.core.truthvalue import HandleRows, TruthValue, TruthValueStore, require_numpy
 
 
 class AtomSpace:
@@ -15,15 +21,99 @@ class AtomSpace:
     The AtomSpace is the central hypergraph database.
     It stores and manages atoms (nodes and links) and provides
     methods for adding, removing, and querying atoms.
+    
+    An AtomSpace created with a parent is a copy-on-write frame over it.
+    Reads fall through to the parent; atoms added to the frame, and atoms
+    removed from it, only change the frame. Writing a truth or attention
+    value of a parent atom through the frame (add_node, add_link,
+    set_truth_values, the attention methods) first copies the atom into
+    the frame under the same handle, and lookups return the copy from
+    then on. Many frames can share one parent at the cost of their
+    changes only; collapse() applies a frame's changes to its parent.
     """
     
-    def __init__(self):
-        """Initialize an empty AtomSpace"""
-        self._atoms: Dict[str, Atom] = {}  # id -> atom
+    def __init__(
+        self,
+        external_ids: bool = False,
+        ancestor_index: bool = False,
+        parent: Optional["AtomSpace"] = None,
+    ):
+        """
+        Initialize an empty AtomSpace.
+        
+        Args:
+            external_ids: If True, assign every atom a stable string ID
+                (a UUID) in addition to its integer handle, for clients
+                such as the GraphQL layer that need opaque external IDs
+            ancestor_index: If True, maintain the transitive closure of
+                InheritanceLinks and MemberLinks as atoms are added and
+                removed, so is_a and ancestors are set lookups
+            parent: AtomSpace to create a frame over. A frame uses the
+                parent's external ID setting and keeps no ancestor index.
+                The parent must not lose atoms while it has frames.
+        """
+        if parent is not None:
+            if not isinstance(parent, AtomSpace):
+                raise TypeError("The parent of a frame must be an AtomSpace")
+            if ancestor_index:
+                raise ValueError("A frame cannot keep an ancestor index")
+            external_ids = parent._external_ids is not None
+        
+        self._nodes: Dict[int, Node] = {}  # handle -> node
+        self._links: Dict[int, Link] = {}  # handle -> link
         self._nodes_by_type: Dict[AtomType, Set[Node]] = defaultdict(set)
-        self._nodes_by_name: Dict[str, Set[Node]] = defaultdict(set)
+        self._node_table: Dict[Tuple[AtomType, str], Node] = {}  # (type, name) -> node
         self._links_by_type: Dict[AtomType, Set[Link]] = defaultdict(set)
-        self._incoming: Dict[str, Set[Link]] = defaultdict(set)  # atom_id -> links pointing to it
+        self._link_table: Dict[Tuple[AtomType, Tuple[int, ...]], Link] = {}  # (type, outgoing handles) -> link
+        # handle -> (link type, position in outgoing) -> links pointing to it
+        self._incoming: Dict[int, Dict[Tuple[AtomType, int], Set[Link]]] = defaultdict(dict)
+        # handle -> link type -> extra incoming entries from links that hold
+        # the atom at more than one position
+        self._incoming_repeats: Dict[int, Dict[AtomType, int]] = {}
+        
+        # Optional external ID mapping
+        self._external_ids: Optional[Dict[str, int]] = {} if external_ids else None  # external id -> handle
+        self._handle_to_external: Dict[int, str] = {}  # handle -> external id
+        
+        # Dense rows for the indexed atoms, reused once they are removed
+        self._handle_rows = HandleRows()
+        
+        # Strength and confidence of every indexed atom, by row
+        self._truth_values = TruthValueStore(self._handle_rows)
+        
+        # Short- and long-term importance of every indexed atom, in the
+        # same rows
+        self._attention = AttentionValueStore(self._handle_rows)
+        
+        # Incremented whenever atoms are indexed or unindexed, so derived
+        # structures (e.g. the spreading matrix) know when to rebuild
+        self._version = 0
+        
+        # Optional transitive closure of inheritance links
+        self._ancestor_index: Optional[AncestorIndex] = AncestorIndex() if ancestor_index else None
+        
+        # Atoms added inside bulk_load() whose secondary indexes are not
+        # built yet; None when not bulk loading
+        self._pending: Optional[List[Atom]] = None
+        
+        # Write-ahead log told of every change, if one is attached (see
+        # cogpy.storage.WriteAheadLog)
+        self._journal = None
+        
+        # AtomSpace this frame reads through to, and its atoms hidden here
+        # (handle -> parent atom) because they were removed from the frame
+        # or copied into it
+        self._parent = parent
+        self._masked: Dict[int, Atom] = {}
+        # handle -> attention value of every atom the frame copied on
+        # write. Copies keep their truth value themselves: their handles
+        # are scattered over the parent's, which would spread the stores.
+        self._copied_attention: Dict[int, AttentionValue] = {}
+    
+    @property
+    def parent(self) -> Optional["AtomSpace"]:
+        """The AtomSpace this frame reads through to, or None"""
+        return self._parent
     
     def add_node(
         self,
@@ -46,18 +136,24 @@ class AtomSpace:
             atom_type = AtomType.from_string(atom_type)
         
         # Check if node already exists
-        for node in self._nodes_by_name.get(name, set()):
-            if node.type == atom_type:
-                # Update truth value if provided
-                if truth_value:
-                    node.truth_value = truth_value
-                return node
+        key = (atom_type, name)
+        node = self._node_table.get(key)
+        if node is None and self._parent is not None:
+            node = self._inherited(self._parent.get_node_by_name(name, atom_type))
+        if node is not None:
+            # Update truth value if provided
+            if truth_value:
+                node = self._writable(node)
+                node.truth_value = truth_value
+            return node
         
         # Create new node
         node = Node(atom_type, name, truth_value)
-        self._atoms[node.id] = node
-        self._nodes_by_type[atom_type].add(node)
-        self._nodes_by_name[name].add(node)
+        self._node_table[key] = node
+        if self._pending is not None:
+            self._pending.append(node)
+        else:
+            self._index_atoms((node,))
         
         return node
     
@@ -82,84 +178,403 @@ class AtomSpace:
             atom_type = AtomType.from_string(atom_type)
         
         # Check if link already exists
-        for link in self._links_by_type.get(atom_type, set()):
-            if link.outgoing == outgoing:
-                # Update truth value if provided
-                if truth_value:
-                    link.truth_value = truth_value
-                return link
+        handles = tuple([atom.id for atom in outgoing])
+        if AtomType.is_unordered(atom_type):
+            handles = tuple(sorted(handles))
+        key = (atom_type, handles)
+        link = self._link_table.get(key)
+        if link is None and self._parent is not None:
+            link = self._inherited(self._parent.get_link(atom_type, outgoing))
+        if link is not None:
+            # Update truth value if provided
+            if truth_value:
+                link = self._writable(link)
+                link.truth_value = truth_value
+            return link
         
         # Create new link
         link = Link(atom_type, outgoing, truth_value)
-        self._atoms[link.id] = link
-        self._links_by_type[atom_type].add(link)
-        
-        # Update incoming sets
-        for atom in outgoing:
-            self._incoming[atom.id].add(link)
+        self._link_table[key] = link
+        if self._pending is not None:
+            self._pending.append(link)
+        else:
+            self._index_atoms((link,))
         
         return link
     
-    def remove_atom(self, atom: Atom) -> bool:
+    def add_nodes(self, nodes: Iterable[Sequence]) -> List[Node]:
+        """
+        Add many nodes at once.
+        
+        Types are resolved once per distinct type name and duplicates are
+        detected within the batch as well as against the AtomSpace. The
+        secondary indexes are built in a single pass after the batch.
+        
+        Args:
+            nodes: (atom_type, name) or (atom_type, name, truth_value)
+                tuples
+            
+        Returns:
+            The created or existing nodes, in input order
+        """
+        if self._parent is not None:
+            with self.bulk_load():
+                return [self.add_node(*spec) for spec in nodes]
+        
+        types: Dict[str, AtomType] = {}
+        table = self._node_table
+        result = []
+        with self.bulk_load():
+            created = self._pending
+            for spec in nodes:
+                atom_type, name = spec[0], spec[1]
+                truth_value = spec[2] if len(spec) > 2 else None
+                if isinstance(atom_type, str):
+                    resolved = types.get(atom_type)
+                    if resolved is None:
+                        resolved = types[atom_type] = AtomType.from_string(atom_type)
+                    atom_type = resolved
+                
+                key = (atom_type, name)
+                node = table.get(key)
+                if node is None:
+                    node = table[key] = Node(atom_type, name, truth_value)
+                    created.append(node)
+                elif truth_value:
+                    node.truth_value = truth_value
+                result.append(node)
+        return result
+    
+    def add_links(self, links: Iterable[Sequence]) -> List[Link]:
+        """
+        Add many links at once.
+        
+        Works like add_nodes. Outgoing atoms must already have been
+        added to the AtomSpace.
+        
+        Args:
+            links: (atom_type, outgoing) or (atom_type, outgoing,
+                truth_value) tuples
+            
+        Returns:
+            The created or existing links, in input order
+        """
+        if self._parent is not None:
+            with self.bulk_load():
+                return [self.add_link(*spec) for spec in links]
+        
+        types: Dict[str, AtomType] = {}
+        table = self._link_table
+        result = []
+        with self.bulk_load():
+            created = self._pending
+            for spec in links:
+                atom_type, outgoing = spec[0], spec[1]
+                truth_value = spec[2] if len(spec) > 2 else None
+                if isinstance(atom_type, str):
+                    resolved = types.get(atom_type)
+                    if resolved is None:
+                        resolved = types[atom_type] = AtomType.from_string(atom_type)
+                    atom_type = resolved
+                
+                handles = tuple([atom.id for atom in outgoing])
+                if AtomType.is_unordered(atom_type):
+                    handles = tuple(sorted(handles))
+                key = (atom_type, handles)
+                link = table.get(key)
+                if link is None:
+                    link = table[key] = Link(atom_type, outgoing, truth_value)
+                    created.append(link)
+                elif truth_value:
+                    link.truth_value = truth_value
+                result.append(link)
+        return result
+    
+    @contextmanager
+    def bulk_load(self):
+        """
+        Defer secondary index maintenance while loading many atoms.
+        
+        Inside the block, add_node, add_link, add_nodes and add_links only
+        update the deduplication tables; the other indexes are built in one
+        pass when the block exits. Until then, only the add methods and
+        get_node_by_name see the new atoms. remove_atom and clear may be
+        used and first build the pending indexes.
+        
+        The cyclic garbage collector is paused for the duration of the
+        block. Atoms never form reference cycles, and collections
+        triggered by millions of new objects would otherwise dominate the
+        load time.
+        
+        Example:
+            with atomspace.bulk_load():
+                for name in names:
+                    atomspace.add_node("ConceptNode", name)
+        """
+        if self._pending is not None:
+            # Nested bulk_load: the outermost block builds the indexes
+            yield self
+            return
+        
+        self._pending = []
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            yield self
+        finally:
+            pending, self._pending = self._pending, None
+            try:
+                self._index_atoms(pending)
+            finally:
+                if gc_enabled:
+                    gc.enable()
+    
+    def _flush_pending(self):
+        """Build the indexes of atoms added so far inside bulk_load()"""
+        if self._pending:
+            self._index_atoms(self._pending)
+            self._pending.clear()
+    
+    def _index_atoms(self, atoms: Iterable[Atom], restored: bool = False, copied: bool = False):
+        """
+        Add new atoms to every index except the deduplication tables.
+        
+        Restored atoms were indexed before and spilled out of memory (see
+        BoundedAtomSpace), which puts back their external IDs and attention
+        values itself; they are not journaled again. Copied atoms are
+        parent atoms a frame copied on write, and are kept out of the truth
+        and attention value stores.
+        """
+        nodes = self._nodes
+        links = self._links
+        nodes_by_type = self._nodes_by_type
+        links_by_type = self._links_by_type
+        incoming = self._incoming
+        assign_external_ids = self._external_ids is not None and not restored
+        ancestor_index = self._ancestor_index
+        journal = None if restored else self._journal
+        truth_values = self._truth_values
+        attention = self._attention
+        self._version += 1
+        
+        for atom in atoms:
+            atom_type = atom.type
+            if not copied:
+                truth_values.set(atom.id, atom._tv)
+                atom._tv = truth_values
+                attention.set(atom.id)
+            if isinstance(atom, Node):
+                nodes[atom.id] = atom
+                nodes_by_type[atom_type].add(atom)
+            else:
+                links[atom.id] = atom
+                links_by_type[atom_type].add(atom)
+                
+                # Update incoming sets
+                outgoing = atom.outgoing
+                for position, target in enumerate(outgoing):
+                    buckets = incoming[target.id]
+                    bucket = buckets.get((atom_type, position))
+                    if bucket is None:
+                        buckets[(atom_type, position)] = bucket = set()
+                    bucket.add(atom)
+                if len(outgoing) > 1 and len(set(outgoing)) < len(outgoing):
+                    self._update_repeats(atom, 1)
+                if ancestor_index is not None and atom_type in CLOSURE_LINK_TYPES and len(outgoing) == 2:
+                    ancestor_index.add_edge(outgoing[0].id, outgoing[1].id)
+            
+            if assign_external_ids:
+                self._assign_external_id(atom)
+            if journal is not None:
+                journal.atom_added(atom)
+    
+    def remove_atom(self, atom: Atom, recursive: bool = True) -> bool:
         """
         Remove an atom from the AtomSpace.
         
         Args:
             atom: The atom to remove
+            recursive: Also remove every link that contains the atom,
+                directly or through other links. If False, an atom that
+                still has incoming links is not removed.
             
         Returns:
-            True if removed, False if not found
+            True if removed, False if not found or not removable
+        """
+        return self.remove_atoms((atom,), recursive) > 0
+    
+    def remove_atoms(self, atoms: Iterable[Atom], recursive: bool = True) -> int:
         """
-        if atom.id not in self._atoms:
-            return False
+        Remove many atoms at once.
         
-        # Remove from main storage
-        del self._atoms[atom.id]
+        The full set of atoms to remove is computed first, iteratively, so
+        arbitrarily deep link-of-link chains are handled without recursion.
+        Every index is then updated in a single pass over that set.
         
-        if isinstance(atom, Node):
-            # Remove from node indices
-            self._nodes_by_type[atom.type].discard(atom)
-            self._nodes_by_name[atom.name].discard(atom)
+        Args:
+            atoms: The atoms to remove
+            recursive: Also remove every link that contains one of the
+                atoms. If False, atoms with incoming links from outside
+                the batch are left in place.
             
-            # Remove all incoming links
-            for link in list(self._incoming.get(atom.id, set())):
-                self.remove_atom(link)
+        Returns:
+            The number of atoms removed, including dependent links
+        """
+        self._flush_pending()
+        doomed: Dict[int, Atom] = {}
+        for atom in atoms:
+            found = self.get_atom_by_id(atom.id)
+            if found is not None:
+                doomed[atom.id] = found
+        
+        if recursive:
+            pending = list(doomed.values())
+            while pending:
+                for link in self.iter_incoming(pending.pop()):
+                    if link.id not in doomed:
+                        doomed[link.id] = link
+                        pending.append(link)
+        else:
+            # Keep atoms whose incoming links are not all being removed;
+            # keeping one can make its outgoing atoms unremovable in turn
+            changed = True
+            while changed:
+                changed = False
+                for handle, atom in list(doomed.items()):
+                    if any(link.id not in doomed for link in self.iter_incoming(atom)):
+                        del doomed[handle]
+                        changed = True
+        
+        self._unindex_atoms(doomed)
+        return len(doomed)
+    
+    def _unindex_atoms(self, doomed: Dict[int, Atom], evicted: bool = False):
+        """
+        Remove a closed set of atoms (handle -> atom) from every index.
         
-        elif isinstance(atom, Link):
-            # Remove from link indices
-            self._links_by_type[atom.type].discard(atom)
+        Evicted atoms are only spilled out of memory (see BoundedAtomSpace),
+        so the journal is not told.
+        """
+        nodes = self._nodes
+        links = self._links
+        incoming = self._incoming
+        ancestor_index = self._ancestor_index
+        rows = self._handle_rows
+        self._version += 1
+        if self._journal is not None and not evicted:
+            self._journal.atoms_removed(doomed)
+        
+        if self._parent is not None:
+            # Atoms of the parent are only hidden from the frame
+            own = {}
+            for handle, atom in doomed.items():
+                if handle in nodes or handle in links:
+                    own[handle] = atom
+                else:
+                    self._masked[handle] = atom
+                    incoming.pop(handle, None)
+                    self._incoming_repeats.pop(handle, None)
+            doomed = own
+        
+        copies = self._copied_attention
+        for handle, atom in doomed.items():
+            if handle in copies:
+                # A frame's copy of a parent atom holds its truth value
+                del copies[handle]
+            else:
+                # Removed atoms keep a copy of their truth value
+                atom._tv = self._truth_values.get(handle)
+                rows.remove(handle)
+            external_id = self._handle_to_external.pop(handle, None)
+            if external_id is not None:
+                del self._external_ids[external_id]
             
-            # Remove from incoming sets
-            for out_atom in atom.outgoing:
-                self._incoming[out_atom.id].discard(atom)
+            if isinstance(atom, Node):
+                del nodes[handle]
+                self._node_table.pop((atom.type, atom.name), None)
+                self._nodes_by_type[atom.type].discard(atom)
+            else:
+                del links[handle]
+                self._link_table.pop((atom.type, tuple([a.id for a in atom.outgoing])), None)
+                self._links_by_type[atom.type].discard(atom)
+                
+                # Remove from the incoming sets of surviving atoms
+                for position, target in enumerate(atom.outgoing):
+                    if target.id in doomed:
+                        continue
+                    buckets = incoming.get(target.id)
+                    if buckets is None:
+                        continue
+                    key = (atom.type, position)
+                    bucket = buckets.get(key)
+                    if bucket is not None:
+                        bucket.discard(atom)
+                        if not bucket:
+                            del buckets[key]
+                if len(set(atom.outgoing)) < len(atom.outgoing):
+                    self._update_repeats(atom, -1)
+                if ancestor_index is not None and atom.type in CLOSURE_LINK_TYPES and len(atom.outgoing) == 2:
+                    ancestor_index.remove_edge(atom.outgoing[0].id, atom.outgoing[1].id)
         
-        # Clean up incoming
-        if atom.id in self._incoming:
-            del self._incoming[atom.id]
+        # Removed atoms have no incoming links left
+        for handle in doomed:
+            incoming.pop(handle, None)
+            self._incoming_repeats.pop(handle, None)
+    
+    def get_atom_by_id(self, atom_id: int) -> Optional[Atom]:
+        """Get an atom by its handle"""
+        atom = self._nodes.get(atom_id)
+        if atom is None:
+            atom = self._links.get(atom_id)
+            if atom is None and self._parent is not None and atom_id not in self._masked:
+                return self._parent.get_atom_by_id(atom_id)
+        return atom
+    
+    def get_external_id(self, atom: Atom) -> Optional[str]:
+        """
+        Get the stable external ID of an atom.
         
-        return True
+        Args:
+            atom: The atom to look up
+            
+        Returns:
+            The external ID, or None if external IDs are disabled or the
+            atom is not in this AtomSpace
+        """
+        external_id = self._handle_to_external.get(atom.id)
+        if external_id is None and self._parent is not None and self.get_atom_by_id(atom.id) is not None:
+            return self._parent.get_external_id(atom)
+        return external_id
+    
+    def get_atom_by_external_id(self, external_id: str) -> Optional[Atom]:
+        """Get an atom by its stable external ID"""
+        if self._external_ids is None:
+            return None
+        handle = self._external_ids.get(external_id)
+        if handle is None and self._parent is not None:
+            atom = self._parent.get_atom_by_external_id(external_id)
+            handle = atom.id if atom is not None else None
+        return self.get_atom_by_id(handle) if handle is not None else None
     
-    def get_atom_by_id(self, atom_id: str) -> Optional[Atom]:
-        """Get an atom by its ID"""
-        return self._atoms.get(atom_id)
+    def _assign_external_id(self, atom: Atom):
+        """Allocate a new external ID for an atom"""
+        external_id = str(uuid4())
+        self._external_ids[external_id] = atom.id
+        self._handle_to_external[atom.id] = external_id
     
-    def get_atoms_by_type(self, atom_type: Union[AtomType, str]) -> List[Atom]:
+    def get_atoms_by_type(self, atom_type: Union[AtomType, str], subtypes: bool = False) -> List[Atom]:
         """
         Get all atoms of a specific type.
         
         Args:
             atom_type: Type to filter by
+            subtypes: Also include atoms of every subtype, e.g. all node
+                types for AtomType.NODE
             
         Returns:
             List of atoms of the specified type
         """
-        if isinstance(atom_type, str):
-            atom_type = AtomType.from_string(atom_type)
-        
-        if AtomType.is_node(atom_type):
-            return list(self._nodes_by_type.get(atom_type, set()))
-        else:
-            return list(self._links_by_type.get(atom_type, set()))
+        return list(self.iter_by_type(atom_type, subtypes))
     
     def get_node_by_name(self, name: str, atom_type: Optional[Union[AtomType, str]] = None) -> Optional[Node]:
         """
@@ -172,54 +587,730 @@ class AtomSpace:
         Returns:
             The node if found, None otherwise
         """
-        nodes = self._nodes_by_name.get(name, set())
-        
         if atom_type:
             if isinstance(atom_type, str):
                 atom_type = AtomType.from_string(atom_type)
-            
-            for node in nodes:
-                if node.type == atom_type:
+            node = self._node_table.get((atom_type, name))
+            if node is None and self._parent is not None:
+                node = self._inherited(self._parent.get_node_by_name(name, atom_type))
+            return node
+        
+        if self._parent is not None:
+            for node_type in AtomType.get_subtypes(AtomType.NODE):
+                node = self.get_node_by_name(name, node_type)
+                if node is not None:
                     return node
             return None
         
-        return next(iter(nodes), None) if nodes else None
+        table = self._node_table
+        for node_type in AtomType.get_subtypes(AtomType.NODE):
+            node = table.get((node_type, name))
+            if node is not None:
+                return node
+        return None
     
-    def get_incoming(self, atom: Atom) -> List[Link]:
+    def get_link(self, atom_type: Union[AtomType, str], outgoing: Sequence[Atom]) -> Optional[Link]:
         """
-        Get all links that point to this atom.
+        Get a link by type and outgoing set.
+        
+        Args:
+            atom_type: Type of the link
+            outgoing: Atoms the link connects
+            
+        Returns:
+            The link if found, None otherwise
+        """
+        if isinstance(atom_type, str):
+            atom_type = AtomType.from_string(atom_type)
+        handles = tuple([atom.id for atom in outgoing])
+        if AtomType.is_unordered(atom_type):
+            handles = tuple(sorted(handles))
+        link = self._link_table.get((atom_type, handles))
+        if link is None and self._parent is not None:
+            link = self._inherited(self._parent.get_link(atom_type, outgoing))
+        return link
+    
+    def _inherited(self, atom: Optional[Atom]) -> Optional[Atom]:
+        """Hide an atom found in the parent if the frame removed it"""
+        if atom is not None and atom.id in self._masked:
+            return None
+        return atom
+    
+    def _writable(self, atom: Atom) -> Atom:
+        """
+        Get the atom to write a truth or attention value of an atom to.
+        
+        That is the atom itself, except that a frame first copies an atom
+        of its parent, under the same handle, so the parent's values stay
+        as they are.
+        """
+        if self._parent is None:
+            return atom
+        self._flush_pending()
+        handle = atom.id
+        own = self._nodes.get(handle)
+        if own is None:
+            own = self._links.get(handle)
+        if own is not None:
+            return own
+        
+        original = self.get_atom_by_id(handle)
+        copy = original.__class__.__new__(original.__class__)
+        copy.id = handle
+        copy.type = original.type
+        copy._hash = original._hash
+        truth_value = original.truth_value
+        copy._tv = TruthValue(truth_value.strength, truth_value.confidence)
+        if isinstance(original, Node):
+            copy.name = original.name
+            self._node_table[(copy.type, copy.name)] = copy
+        else:
+            copy.outgoing = original.outgoing
+            self._link_table[(copy.type, tuple([target.id for target in copy.outgoing]))] = copy
+        self._masked[handle] = original
+        self._copied_attention[handle] = self._parent.get_attention_value(original)
+        self._index_atoms((copy,), restored=True, copied=True)
+        return copy
+    
+    def is_a(self, atom: Atom, ancestor: Atom) -> bool:
+        """
+        Check whether an atom inherits from another.
+        
+        An atom inherits from the parents it points to with InheritanceLinks
+        and MemberLinks, and transitively from their ancestors. Every atom
+        inherits from itself. With the ancestor index enabled this is a
+        set lookup; otherwise the links are walked.
+        
+        Args:
+            atom: The child atom
+            ancestor: The candidate ancestor
+            
+        Returns:
+            True if atom is ancestor or inherits from it
+        """
+        if atom.id == ancestor.id:
+            return True
+        if self._ancestor_index is not None:
+            return self._ancestor_index.is_a(atom.id, ancestor.id)
+        return any(found.id == ancestor.id for found in walk_inheritance(self, atom, 0))
+    
+    def ancestors(self, atom: Atom) -> Set[Atom]:
+        """Get every atom an atom transitively inherits from"""
+        if self._ancestor_index is not None:
+            return {self.get_atom_by_id(handle) for handle in self._ancestor_index.ancestors(atom.id)}
+        return set(walk_inheritance(self, atom, 0))
+    
+    def descendants(self, atom: Atom) -> Set[Atom]:
+        """Get every atom that transitively inherits from an atom"""
+        if self._ancestor_index is not None:
+            return {self.get_atom_by_id(handle) for handle in self._ancestor_index.descendants(atom.id)}
+        return set(walk_inheritance(self, atom, 1))
+    
+    def get_incoming(
+        self,
+        atom: Atom,
+        link_type: Optional[Union[AtomType, str]] = None,
+        position: Optional[int] = None,
+    ) -> List[Link]:
+        """
+        Get the links that point to this atom.
+        
+        Incoming links are bucketed by link type and by the position of
+        the atom in the link's outgoing set, so filtering by either reads
+        only the matching buckets.
         
         Args:
             atom: The target atom
+            link_type: Only return links of this type
+            position: Only return links that have the atom at this
+                position of their outgoing set
             
         Returns:
             List of incoming links
         """
-        return list(self._incoming.get(atom.id, set()))
+        return list(self.iter_incoming(atom, link_type, position))
+    
+    def iter_incoming(
+        self,
+        atom: Atom,
+        link_type: Optional[Union[AtomType, str]] = None,
+        position: Optional[int] = None,
+    ) -> Iterator[Link]:
+        """
+        Iterate over the links that point to this atom without copying.
+        
+        Takes the same filters as get_incoming. The AtomSpace must not be
+        modified while the iterator is in use.
+        """
+        if isinstance(link_type, str):
+            link_type = AtomType.from_string(link_type)
+        if self._parent is not None:
+            return chain(self._iter_own_incoming(atom, link_type, position),
+                         self._unmasked(self._parent.iter_incoming(atom, link_type, position)))
+        return self._iter_own_incoming(atom, link_type, position)
+    
+    def _iter_own_incoming(self, atom: Atom, link_type: Optional[AtomType], position: Optional[int]) -> Iterator[Link]:
+        """Iterate over the incoming links held by this AtomSpace itself"""
+        buckets = self._incoming.get(atom.id)
+        if not buckets:
+            return
+        
+        if link_type is not None and position is not None:
+            yield from buckets.get((link_type, position), ())
+            return
+        
+        matching = [
+            (bucket_position, bucket) for (bucket_type, bucket_position), bucket in buckets.items()
+            if (link_type is None or bucket_type == link_type) and
+            (position is None or bucket_position == position)
+        ]
+        if position is not None or atom.id not in self._incoming_repeats:
+            # Buckets are disjoint, so every link is seen exactly once
+            for _, bucket in matching:
+                yield from bucket
+            return
+        
+        # A link holding the atom at several positions is in several
+        # buckets; report it only from the bucket of its first position
+        for bucket_position, bucket in matching:
+            for link in bucket:
+                if bucket_position == 0 or atom not in link.outgoing[:bucket_position]:
+                    yield link
+    
+    def count_incoming(
+        self,
+        atom: Atom,
+        link_type: Optional[Union[AtomType, str]] = None,
+        position: Optional[int] = None,
+    ) -> int:
+        """
+        Count the links that point to this atom, without iterating them.
+        
+        Takes the same filters as get_incoming.
+        """
+        if isinstance(link_type, str):
+            link_type = AtomType.from_string(link_type)
+        count = self._count_own_incoming(atom, link_type, position)
+        if self._parent is not None:
+            if self._masked:
+                count += sum(1 for _ in self._unmasked(self._parent.iter_incoming(atom, link_type, position)))
+            else:
+                count += self._parent.count_incoming(atom, link_type, position)
+        return count
+    
+    def _count_own_incoming(self, atom: Atom, link_type: Optional[AtomType], position: Optional[int]) -> int:
+        """Count the incoming links held by this AtomSpace itself"""
+        buckets = self._incoming.get(atom.id)
+        if not buckets:
+            return 0
+        
+        if link_type is not None and position is not None:
+            return len(buckets.get((link_type, position), ()))
+        
+        total = sum(
+            len(bucket) for (bucket_type, bucket_position), bucket in buckets.items()
+            if (link_type is None or bucket_type == link_type) and
+            (position is None or bucket_position == position)
+        )
+        repeats = self._incoming_repeats.get(atom.id)
+        if position is None and repeats:
+            total -= repeats.get(link_type, 0) if link_type else sum(repeats.values())
+        return total
+    
+    def _update_repeats(self, link: Link, delta: int):
+        """Track incoming entries of a link that holds an atom repeatedly"""
+        for handle, occurrences in Counter(atom.id for atom in link.outgoing).items():
+            if occurrences > 1:
+                repeats = self._incoming_repeats.setdefault(handle, {})
+                repeats[link.type] = repeats.get(link.type, 0) + delta * (occurrences - 1)
+                if not repeats[link.type]:
+                    del repeats[link.type]
+                    if not repeats:
+                        del self._incoming_repeats[handle]
     
     def get_all_atoms(self) -> List[Atom]:
         """Get all atoms in the AtomSpace"""
-        return list(self._atoms.values())
+        return list(self.iter_atoms())
     
     def get_all_nodes(self) -> List[Node]:
         """Get all nodes in the AtomSpace"""
-        return [atom for atom in self._atoms.values() if isinstance(atom, Node)]
+        return list(self.iter_nodes())
     
     def get_all_links(self) -> List[Link]:
         """Get all links in the AtomSpace"""
-        return [atom for atom in self._atoms.values() if isinstance(atom, Link)]
+        return list(self.iter_links())
+    
+    def iter_atoms(self) -> Iterator[Atom]:
+        """
+        Iterate over all atoms without copying.
+        
+        The AtomSpace must not be modified while the iterator is in use.
+        """
+        if self._parent is not None:
+            return chain(self.iter_nodes(), self.iter_links())
+        return chain(self._nodes.values(), self._links.values())
+    
+    def iter_nodes(self) -> Iterator[Node]:
+        """Iterate over all nodes without copying"""
+        if self._parent is not None:
+            return chain(self._unmasked(self._parent.iter_nodes()), self._nodes.values())
+        return iter(self._nodes.values())
+    
+    def iter_links(self) -> Iterator[Link]:
+        """Iterate over all links without copying"""
+        if self._parent is not None:
+            return chain(self._unmasked(self._parent.iter_links()), self._links.values())
+        return iter(self._links.values())
+    
+    def iter_by_type(self, atom_type: Union[AtomType, str], subtypes: bool = False) -> Iterator[Atom]:
+        """Iterate over the atoms of a specific type without copying"""
+        if isinstance(atom_type, str):
+            atom_type = AtomType.from_string(atom_type)
+        
+        if not subtypes:
+            atoms = iter(self._type_index(atom_type))
+        else:
+            atoms = chain.from_iterable(self._type_index(t) for t in AtomType.get_subtypes(atom_type))
+        if self._parent is not None:
+            return chain(self._unmasked(self._parent.iter_by_type(atom_type, subtypes)), atoms)
+        return atoms
+    
+    def _unmasked(self, atoms: Iterable[Atom]) -> Iterator[Atom]:
+        """Skip the parent atoms a frame removed or holds copies of"""
+        masked = self._masked
+        if not masked:
+            return iter(atoms)
+        return (atom for atom in atoms if atom.id not in masked)
+    
+    def count_atoms(self) -> int:
+        """Count all atoms"""
+        return len(self)
+    
+    def count_nodes(self) -> int:
+        """Count all nodes"""
+        count = len(self._nodes)
+        if self._parent is not None:
+            count += self._parent.count_nodes() - sum(
+                1 for atom in self._masked.values() if isinstance(atom, Node))
+        return count
+    
+    def count_links(self) -> int:
+        """Count all links"""
+        count = len(self._links)
+        if self._parent is not None:
+            count += self._parent.count_links() - sum(
+                1 for atom in self._masked.values() if isinstance(atom, Link))
+        return count
+    
+    def count_by_type(self, atom_type: Union[AtomType, str], subtypes: bool = False) -> int:
+        """Count the atoms of a specific type"""
+        if isinstance(atom_type, str):
+            atom_type = AtomType.from_string(atom_type)
+        
+        if not subtypes:
+            count = len(self._type_index(atom_type))
+        else:
+            count = sum(len(self._type_index(t)) for t in AtomType.get_subtypes(atom_type))
+        if self._parent is not None:
+            types = set(AtomType.get_subtypes(atom_type)) if subtypes else {atom_type}
+            count += self._parent.count_by_type(atom_type, subtypes) - sum(
+                1 for atom in self._masked.values() if atom.type in types)
+        return count
+    
+    def _type_index(self, atom_type: AtomType) -> Set[Atom]:
+        """Get the per-type index holding atoms of exactly this type"""
+        if AtomType.is_node(atom_type):
+            return self._nodes_by_type.get(atom_type, ())
+        else:
+            return self._links_by_type.get(atom_type, ())
+    
+    def get_truth_values(
+        self,
+        atom_type: Optional[Union[AtomType, str]] = None,
+        subtypes: bool = False,
+        handles=None,
+    ):
+        """
+        Get the truth values of many atoms as NumPy arrays.
+        
+        Requires NumPy.
+        
+        Args:
+            atom_type: Only include atoms of this type; all atoms if None
+            subtypes: Also include atoms of every subtype of atom_type
+            handles: Get exactly these handles instead, in this order
+            
+        Returns:
+            A (handles, strengths, confidences) tuple of NumPy arrays
+        """
+        np = require_numpy()
+        self._flush_pending()
+        if handles is None:
+            if atom_type is None:
+                atoms, count = self.iter_atoms(), self.count_atoms()
+            else:
+                atoms, count = self.iter_by_type(atom_type, subtypes), self.count_by_type(atom_type, subtypes)
+            handles = np.fromiter(map(_handle_of, atoms), dtype=np.int64, count=count)
+        else:
+            handles = np.asarray(handles, dtype=np.int64)
+        if self._parent is not None:
+            strengths, confidences = self._gather(
+                handles, self._truth_values.get_many,
+                lambda copied: [self.get_atom_by_id(handle).truth_value.to_tuple() for handle in copied],
+                lambda inherited: self._parent.get_truth_values(handles=inherited)[1:])
+        else:
+            strengths, confidences = self._truth_values.get_many(handles)
+        return handles, strengths, confidences
+    
+    def set_truth_values(self, handles, strengths, confidences):
+        """
+        Set the truth values of many atoms at once.
+        
+        The arrays are written in place, without a TruthValue per atom.
+        Values are clamped to [0, 1]. Requires NumPy.
+        
+        Args:
+            handles: Array-like of atom handles, e.g. from get_truth_values
+            strengths: Array-like of strengths, or one strength for all
+            confidences: Array-like of confidences, or one confidence for all
+        """
+        self._flush_pending()
+        if self._parent is not None:
+            (copied, copied_strengths, copied_confidences), (handles, strengths, confidences) = (
+                self._split_copies(handles, strengths, confidences))
+            for handle, strength, confidence in zip(
+                    copied.tolist(), copied_strengths.tolist(), copied_confidences.tolist()):
+                self.get_atom_by_id(handle).truth_value = TruthValue(strength, confidence)
+        self._truth_values.set_many(handles, strengths, confidences)
+    
+    def _split_copies(self, handles, *columns):
+        """
+        Copy the parent atoms among many handles into a frame, then split
+        the handles, and their columns of values, into those of the
+        frame's copies and the others. A column may be an array, a scalar
+        or None.
+        
+        Returns:
+            ([copied handles, *columns], [other handles, *columns])
+        """
+        np = require_numpy()
+        handles = np.asarray(handles, dtype=np.int64)
+        nodes, links = self._nodes, self._links
+        for handle in set(handles.ravel().tolist()):
+            if handle not in nodes and handle not in links:
+                atom = self.get_atom_by_id(handle)
+                if atom is not None:
+                    self._writable(atom)
+        
+        copies = self._copied_attention
+        copied = np.isin(handles, np.fromiter(copies, dtype=np.int64, count=len(copies)))
+        columns = [None if column is None else np.broadcast_to(np.asarray(column, dtype=np.float64), handles.shape)
+                   for column in columns]
+        return ([handles[copied]] + [None if column is None else column[copied] for column in columns],
+                [handles[~copied]] + [None if column is None else column[~copied] for column in columns])
+    
+    def _gather(self, handles, own_values, copied_values, inherited_values):
+        """
+        Get per-atom arrays in a frame, from its own store, its copies and
+        its parent.
+        
+        Args:
+            handles: Array of handles
+            own_values: Gets the arrays for atoms added to the frame
+            copied_values: Gets a list of value tuples for its copies
+            inherited_values: Gets the arrays for the parent's atoms
+        """
+        np = require_numpy()
+        copies = self._copied_attention
+        added = np.fromiter((handle for handle in chain(self._nodes, self._links) if handle not in copies),
+                            dtype=np.int64)
+        sources = [(np.isin(handles, added), own_values)]
+        if copies:
+            sources.append((np.isin(handles, np.fromiter(copies, dtype=np.int64, count=len(copies))),
+                            lambda copied: np.array(copied_values(copied.tolist()), dtype=np.float64).reshape(-1, 2).T))
+        sources.append((~np.logical_or.reduce([mask for mask, _ in sources]), inherited_values))
+        
+        result = None
+        for mask, values in sources:
+            if mask.any():
+                columns = values(handles[mask])
+                if result is None:
+                    result = [np.empty(len(handles), dtype=column.dtype) for column in columns]
+                for out, column in zip(result, columns):
+                    out[mask] = column
+        if result is None:
+            return inherited_values(handles)
+        return tuple(result)
+    
+    def get_attention_value(self, atom: Atom) -> AttentionValue:
+        """Get a copy of the attention value of an atom"""
+        self._flush_pending()
+        atom = self._member(atom)
+        if self._parent is not None and atom.id not in self._nodes and atom.id not in self._links:
+            return self._parent.get_attention_value(atom)
+        copied = self._copied_attention.get(atom.id)
+        if copied is not None:
+            return AttentionValue(copied.sti, copied.lti)
+        return self._attention.get(atom.id)
+    
+    def set_attention_value(self, atom: Atom, attention_value: AttentionValue):
+        """Set the attention value of an atom"""
+        self._flush_pending()
+        handle = self._writable(self._member(atom)).id
+        if handle in self._copied_attention:
+            self._copied_attention[handle] = AttentionValue(attention_value.sti, attention_value.lti)
+        else:
+            self._attention.set(handle, attention_value)
+    
+    def stimulate(self, atom: Atom, amount: float):
+        """Add to the short-term importance of an atom"""
+        self._flush_pending()
+        handle = self._writable(self._member(atom)).id
+        copied = self._copied_attention.get(handle)
+        if copied is not None:
+            self._copied_attention[handle] = AttentionValue(copied.sti + amount, copied.lti)
+        else:
+            self._attention.stimulate(handle, amount)
+    
+    def _member(self, atom: Atom) -> Atom:
+        """
+        Get this AtomSpace's atom with the handle of an atom.
+        
+        A frame's copy of a parent atom stands for it.
+        
+        Raises:
+            ValueError: If the atom is not in this AtomSpace
+        """
+        found = self.get_atom_by_id(atom.id)
+        if found is None or (found is not atom and self._parent is None):
+            raise ValueError(f"{atom!r} is not in this AtomSpace")
+        return found
+    
+    def get_attention_values(self, handles=None):
+        """
+        Get the attention values of many atoms as NumPy arrays.
+        
+        Requires NumPy.
+        
+        Args:
+            handles: Get exactly these handles, in this order; every atom
+                if None
+            
+        Returns:
+            A (handles, stis, ltis) tuple of NumPy arrays
+        """
+        np = require_numpy()
+        self._flush_pending()
+        if handles is None:
+            handles = np.fromiter(map(_handle_of, self.iter_atoms()), dtype=np.int64, count=self.count_atoms())
+        else:
+            handles = np.asarray(handles, dtype=np.int64)
+        if self._parent is not None:
+            stis, ltis = self._gather(
+                handles, self._attention.get_many,
+                lambda copied: [self._copied_attention[handle].to_tuple() for handle in copied],
+                lambda inherited: self._parent.get_attention_values(handles=inherited)[1:])
+        else:
+            stis, ltis = self._attention.get_many(handles)
+        return handles, stis, ltis
+    
+    def set_attention_values(self, handles, stis=None, ltis=None):
+        """
+        Set the attention values of many atoms at once. Requires NumPy.
+        
+        Args:
+            handles: Array-like of atom handles
+            stis: Array-like of STIs, one STI for all, or None to keep them
+            ltis: Array-like of LTIs, one LTI for all, or None to keep them
+        """
+        self._flush_pending()
+        if self._parent is not None:
+            (copied, copied_stis, copied_ltis), (handles, stis, ltis) = self._split_copies(handles, stis, ltis)
+            attention = self._copied_attention
+            for i, handle in enumerate(copied.tolist()):
+                old = attention[handle]
+                attention[handle] = AttentionValue(old.sti if copied_stis is None else float(copied_stis[i]),
+                                                   old.lti if copied_ltis is None else float(copied_ltis[i]))
+        self._attention.set_many(handles, stis, ltis)
+    
+    def get_attentional_focus(self, count: int) -> List[Atom]:
+        """
+        Get the atoms with the highest short-term importance.
+        
+        Requires NumPy.
+        
+        Args:
+            count: Maximum number of atoms
+            
+        Returns:
+            Up to count atoms, highest STI first
+        """
+        np = require_numpy()
+        handles, stis, _ = self.get_attention_values()
+        if count < len(handles):
+            top = np.argpartition(-stis, count)[:count]
+            handles, stis = handles[top], stis[top]
+        order = np.argsort(-stis, kind="stable")
+        return [self.get_atom_by_id(handle) for handle in handles[order].tolist()]
+    
+    def get_adjacency(self):
+        """
+        Get every link-to-outgoing-atom edge as NumPy arrays.
+        
+        Requires NumPy.
+        
+        Returns:
+            A (links, targets) tuple of handle arrays, one entry per
+            position in each link's outgoing set
+        """
+        np = require_numpy()
+        self._flush_pending()
+        links = list(self.iter_links())
+        sizes = np.fromiter((len(link.outgoing) for link in links), dtype=np.int64, count=len(links))
+        sources = np.repeat(np.fromiter(map(_handle_of, links), dtype=np.int64, count=len(links)), sizes)
+        targets = np.fromiter(
+            (target.id for link in links for target in link.outgoing), dtype=np.int64, count=int(sizes.sum()))
+        return sources, targets
+    
+    def save_snapshot(self, path: str):
+        """
+        Write the AtomSpace to a memory-mappable snapshot file.
+        
+        The atoms are copied into the columnar layout first, so they get
+        new handles, in the order of their current ones.
+        
+        Args:
+            path: File to write, replaced atomically
+        """
+        from cogpy.core.snapshot import save_snapshot
+        save_snapshot(self, path)
+    
+    @staticmethod
+    def open_snapshot(path: str, mmap: bool = True) -> "ColumnarAtomSpace":
+        """
+        Open a snapshot file written by save_snapshot.
+        
+        Snapshots are served by a ColumnarAtomSpace, which with mmap
+        answers queries straight from the mapped file; see
+        ColumnarAtomSpace.open_snapshot.
+        
+        Args:
+            path: Snapshot file
+            mmap: Map the file rather than read it into memory
+        
+        Returns:
+            A ColumnarAtomSpace with the atoms of the snapshot
+        """
+        from cogpy.core.snapshot import open_snapshot
+        return open_snapshot(path, mmap)
+    
+    def collapse(self) -> "AtomSpace":
+        """
+        Apply the changes of a frame to its parent and empty the frame.
+        
+        Atoms removed from the frame are removed from the parent. Atoms
+        added to the frame move to the parent with their handles and
+        external IDs, so references to them stay valid. Truth and
+        attention values written in the frame replace the parent's. Other
+        frames over the same parent should be discarded first, as they
+        cannot see atoms the parent loses.
+        
+        Returns:
+            The parent
+        
+        Raises:
+            ValueError: If the AtomSpace is not a frame
+        """
+        parent = self._parent
+        if parent is None:
+            raise ValueError("Only a frame can be collapsed into its parent")
+        self._flush_pending()
+        masked = self._masked
+        own = list(chain(self._nodes.values(), self._links.values()))
+        copies = self._copied_attention
+        truth_values = {atom.id: atom.truth_value if atom.id in copies else self._truth_values.get(atom.id)
+                        for atom in own}
+        attention = {atom.id: copies.get(atom.id) or self._attention.get(atom.id) for atom in own}
+        external_ids = self._handle_to_external
+        for atom in own:
+            atom._tv = truth_values[atom.id]
+        
+        parent.remove_atoms([atom for handle, atom in masked.items() if handle not in truth_values])
+        added = []
+        with parent.bulk_load():
+            for atom in own:
+                original = masked.get(atom.id)
+                if original is not None:
+                    # Copied on write: only its values changed
+                    parent._writable(original).truth_value = atom._tv
+                    continue
+                if isinstance(atom, Node):
+                    parent._node_table[(atom.type, atom.name)] = atom
+                else:
+                    if any(target.id in masked for target in atom.outgoing):
+                        # Hold the parent's atoms rather than the frame's copies
+                        atom.outgoing = tuple([masked.get(target.id, target) for target in atom.outgoing])
+                    parent._link_table[(atom.type, tuple([target.id for target in atom.outgoing]))] = atom
+                parent._pending.append(atom)
+                added.append(atom)
+        for atom in own:
+            parent.set_attention_value(masked.get(atom.id, atom), attention[atom.id])
+        if parent._external_ids is not None:
+            for atom in added:
+                external_id = external_ids.get(atom.id)
+                if external_id is not None:
+                    del parent._external_ids[parent._handle_to_external[atom.id]]
+                    parent._external_ids[external_id] = atom.id
+                    parent._handle_to_external[atom.id] = external_id
+        
+        self._forget()
+        self._masked = {}
+        return parent
     
     def clear(self):
         """Remove all atoms from the AtomSpace"""
-        self._atoms.clear()
+        if self._pending:
+            self._pending.clear()
+        if self._journal is not None:
+            self._journal.cleared()
+        truth_values = self._truth_values
+        copies = self._copied_attention
+        for atom in chain(self._nodes.values(), self._links.values()):
+            if atom.id not in copies:
+                atom._tv = truth_values.get(atom.id)
+        self._forget()
+        if self._parent is not None:
+            # A frame hides every atom of its parent instead
+            self._masked = {atom.id: atom for atom in self._parent.iter_atoms()}
+    
+    def _forget(self):
+        """Empty every index, leaving the atoms as they are"""
+        self._truth_values.clear()
+        self._attention.clear()
+        self._copied_attention.clear()
+        self._version += 1
+        self._nodes.clear()
+        self._links.clear()
         self._nodes_by_type.clear()
-        self._nodes_by_name.clear()
+        self._node_table.clear()
         self._links_by_type.clear()
+        self._link_table.clear()
         self._incoming.clear()
+        self._incoming_repeats.clear()
+        if self._external_ids is not None:
+            self._external_ids.clear()
+        self._handle_to_external.clear()
+        if self._ancestor_index is not None:
+            self._ancestor_index.clear()
     
     def __len__(self) -> int:
         """Return the number of atoms in the AtomSpace"""
-        return len(self._atoms)
+        count = len(self._nodes) + len(self._links)
+        if self._parent is not None:
+            count += len(self._parent) - len(self._masked)
+        return count
     
     def __repr__(self) -> str:
-        return f"AtomSpace(atoms={len(self._atoms)})"
+        if self._parent is not None:
+            return f"AtomSpace(atoms={len(self)}, parent={self._parent!r})"
+        return f"AtomSpace(atoms={len(self)})"
@@ -0,0 +1,251 @@
+"""
+Attention values and importance spreading
+"""
+
+from array import array
+from typing import Optional, Tuple
+
+from cogpy.core.truthvalue import HandleRows, np, require_numpy
+
+
+class AttentionValue:
+    """
+    Represents the importance of an atom.
+    
+    Short-term importance (STI) measures how relevant an atom is right now
+    and moves quickly; long-term importance (LTI) follows STI slowly and
+    measures how useful the atom is to keep around.
+    """
+    
+    __slots__ = ("sti", "lti")
+    
+    def __init__(self, sti: float = 0.0, lti: float = 0.0):
+        """
+        Initialize an attention value.
+        
+        Args:
+            sti: Short-term importance
+            lti: Long-term importance
+        """
+        self.sti = float(sti)
+        self.lti = float(lti)
+    
+    def to_tuple(self) -> Tuple[float, float]:
+        """Convert to tuple representation"""
+        return (self.sti, self.lti)
+    
+    @classmethod
+    def from_tuple(cls, values: Tuple[float, float]) -> "AttentionValue":
+        """Create from tuple representation"""
+        return cls(values[0], values[1])
+    
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, AttentionValue):
+            return False
+        return self.sti == other.sti and self.lti == other.lti
+    
+    def __repr__(self) -> str:
+        return f"AttentionValue(sti={self.sti:.3f}, lti={self.lti:.3f})"
+
+
+class AttentionValueStore:
+    """
+    STI and LTI of many atoms in two contiguous float arrays.
+    
+    Laid out like TruthValueStore: rows come from a HandleRows, usually
+    the one the AtomSpace's TruthValueStore uses, or are the handles
+    themselves without one. New rows hold zero importance.
+    """
+    
+    __slots__ = ("_sti", "_lti", "_map", "_rows")
+    
+    def __init__(self, rows: Optional[HandleRows] = None):
+        """
+        Initialize an empty store.
+        
+        Args:
+            rows: Map from handles to rows, possibly shared with another
+                store; if None, handles are rows
+        """
+        self._map = rows
+        self._rows = rows._rows if rows is not None else None
+        self.clear()
+    
+    def clear(self):
+        """Drop every row"""
+        self._sti = array("d")
+        self._lti = array("d")
+        if self._map is not None:
+            self._map.clear()
+    
+    def set(self, handle: int, attention_value: Optional[AttentionValue] = None):
+        """
+        Store the attention value of one atom, adding its row if needed.
+        
+        Args:
+            handle: Handle of the atom
+            attention_value: The attention value, or None for zero
+        """
+        rows = self._rows
+        if rows is None:
+            row = handle
+        else:
+            row = rows.get(handle)
+            if row is None:
+                row = self._map.add(handle)
+        sti, lti = attention_value.to_tuple() if attention_value is not None else (0.0, 0.0)
+        size = len(self._sti)
+        if row == size:
+            # New rows usually come last
+            self._sti.append(sti)
+            self._lti.append(lti)
+            return
+        if row > size:
+            self._grow(row + 1)
+        self._sti[row] = sti
+        self._lti[row] = lti
+    
+    def get(self, handle: int) -> AttentionValue:
+        """Get a copy of the attention value of one atom"""
+        rows = self._rows
+        row = handle if rows is None else rows[handle]
+        return AttentionValue(self._sti[row], self._lti[row])
+    
+    def stimulate(self, handle: int, amount: float):
+        """Add to the STI of one atom"""
+        rows = self._rows
+        self._sti[handle if rows is None else rows[handle]] += amount
+    
+    def get_many(self, handles) -> Tuple["np.ndarray", "np.ndarray"]:
+        """
+        Get the attention values of many atoms.
+        
+        Args:
+            handles: Array-like of handles
+        
+        Returns:
+            NumPy arrays of the STIs and the LTIs, in the order of handles
+        """
+        rows = self._find_many(handles)
+        return (np.frombuffer(self._sti, dtype=np.float64)[rows],
+                np.frombuffer(self._lti, dtype=np.float64)[rows])
+    
+    def set_many(self, handles, sti=None, lti=None):
+        """
+        Set the attention values of many atoms at once.
+        
+        Args:
+            handles: Array-like of handles
+            sti: Array-like of STIs, a scalar, or None to leave STI as is
+            lti: Array-like of LTIs, a scalar, or None to leave LTI as is
+        """
+        rows = self._find_many(handles)
+        if sti is not None:
+            np.frombuffer(self._sti, dtype=np.float64)[rows] = sti
+        if lti is not None:
+            np.frombuffer(self._lti, dtype=np.float64)[rows] = lti
+    
+    def _find_many(self, handles) -> "np.ndarray":
+        """Convert handles to row numbers, checking they are stored"""
+        require_numpy()
+        if self._map is not None:
+            rows = self._map.find_many(handles)
+        else:
+            rows = np.asarray(handles, dtype=np.int64)
+        if rows.size and (rows.min() < 0 or rows.max() >= len(self._sti)):
+            raise ValueError("Handle not in this store")
+        return rows
+    
+    def _grow(self, size: int):
+        """Pad the arrays with zero rows up to size"""
+        padding = array("d", bytes(8 * (size - len(self._sti))))
+        self._sti.extend(padding)
+        self._lti.extend(padding)
+    
+    def __len__(self) -> int:
+        """Return the number of rows"""
+        return len(self._sti)
+
+
+class ImportanceSpreader:
+    """
+    Diffuses short-term importance through an AtomSpace, ECAN style.
+    
+    Every atom is connected to the links that contain it and to the atoms
+    it contains. Each step, every atom with positive STI gives a fraction
+    of it away, split evenly among its neighbours, so total STI is
+    conserved (before decay). LTI then moves a little towards STI.
+    
+    The neighbourhood is held as a sparse matrix in coordinate form, and a
+    step is one sparse matrix-vector product over the STI array, computed
+    with np.bincount. The matrix is rebuilt only when atoms have been added
+    or removed since the last step. Requires NumPy.
+    """
+    
+    def __init__(self, atomspace, fraction: float = 0.2, decay: float = 0.0, lti_rate: float = 0.1):
+        """
+        Initialize a spreader.
+        
+        Args:
+            atomspace: The AtomSpace (or ColumnarAtomSpace) to spread over
+            fraction: Fraction of its STI an atom gives away per step
+            decay: Fraction of every STI lost per step
+            lti_rate: How far LTI moves towards STI per step, from 0 to 1
+        """
+        require_numpy()
+        self.atomspace = atomspace
+        self.fraction = fraction
+        self.decay = decay
+        self.lti_rate = lti_rate
+        # The spreading matrix and the AtomSpace version it was built at
+        self._graph = None
+        self._version = None
+    
+    def spread(self, steps: int = 1):
+        """
+        Run spreading steps and write the results back to the AtomSpace.
+        
+        Args:
+            steps: Number of steps
+        """
+        # Fetching every attention value also brings the AtomSpace's
+        # indexes (and so its version) up to date
+        handles, sti, lti = self.atomspace.get_attention_values()
+        if not len(handles):
+            return
+        sources, targets, shares = self._neighbourhood(handles)
+        connected = shares > 0
+        size = len(handles)
+        for _ in range(steps):
+            given = np.where(connected, self.fraction * np.maximum(sti, 0.0), 0.0)
+            sti = sti - given + np.bincount(targets, weights=(given * shares)[sources], minlength=size)
+            if self.decay:
+                sti *= 1.0 - self.decay
+            lti = lti + self.lti_rate * (sti - lti)
+        self.atomspace.set_attention_values(handles, sti, lti)
+    
+    def _neighbourhood(self, handles):
+        """
+        Get the (cached) spreading matrix over the live handles.
+        
+        Returns:
+            The source and target row of every edge, and the share of its
+            outflow each row sends down each edge
+        """
+        atomspace = self.atomspace
+        version = atomspace._version
+        if self._graph is not None and self._version == version:
+            return self._graph
+        
+        order = np.argsort(handles, kind="stable")
+        links, members = atomspace.get_adjacency()
+        link_rows = order[np.searchsorted(handles, links, sorter=order)]
+        member_rows = order[np.searchsorted(handles, members, sorter=order)]
+        sources = np.concatenate([link_rows, member_rows])
+        targets = np.concatenate([member_rows, link_rows])
+        degrees = np.bincount(sources, minlength=len(handles))
+        shares = np.zeros(len(handles))
+        np.divide(1.0, degrees, out=shares, where=degrees > 0)
+        self._graph = (sources, targets, shares)
+        self._version = version
+        return self._graph
@@ -0,0 +1,679 @@
+"""
+Memory-bounded AtomSpace that spills cold atoms to disk
+"""
+
+import sqlite3
+from array import array
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Union
+
+from cogpy.core.atom import Atom, Node, Link
+from cogpy.core.atomspace import AtomSpace
+from cogpy.core.attention import AttentionValue
+from cogpy.core.closure import CLOSURE_LINK_TYPES, walk_inheritance
+from cogpy.core.types import AtomType
+from cogpy.core.truthvalue import TruthValue, require_numpy
+
+
+# A spilled atom: (handle, type, name or None, outgoing handles, strength,
+# confidence, STI, LTI, external ID or None)
+Record = Tuple[int, AtomType, Optional[str], Tuple[int, ...], float, float, float, float, Optional[str]]
+
+EVICTION_POLICIES = ("lru", "importance")
+
+# Fewest eviction candidates examined per evict() call
+_MIN_SCAN = 64
+
+# SQLite limits the number of parameters in one statement
+_SQL_BATCH = 500
+
+
+def _pack(handles: Sequence[int]) -> bytes:
+    """Encode outgoing handles as a blob"""
+    return array("q", handles).tobytes()
+
+
+def _unpack(blob: bytes) -> Tuple[int, ...]:
+    """Decode outgoing handles from a blob"""
+    handles = array("q")
+    handles.frombytes(blob)
+    return tuple(handles)
+
+
+class SpillStore:
+    """
+    On-disk store for the atoms evicted from a BoundedAtomSpace.
+    
+    A SQLite database with one row per atom, indexed by handle, by node
+    name and type and by link type and outgoing set, and a table of
+    (target, link) pairs for finding the spilled links that point at an
+    atom. Handles are only meaningful to the process that spilled them, so
+    opening a store discards whatever the file held before.
+    """
+    
+    def __init__(self, path: str = ""):
+        """
+        Open a store.
+        
+        Args:
+            path: Database file; the default "" is a private temporary
+                file that SQLite deletes when the store is closed
+        """
+        self._db = sqlite3.connect(path)
+        # Spilled atoms are scratch data, so nothing needs to survive a crash
+        self._db.executescript("""
+            PRAGMA journal_mode = OFF;
+            PRAGMA synchronous = OFF;
+            DROP TABLE IF EXISTS atoms;
+            DROP TABLE IF EXISTS incoming;
+            CREATE TABLE atoms (
+                handle INTEGER PRIMARY KEY,
+                type TEXT NOT NULL,
+                name TEXT,
+                outgoing BLOB,
+                strength REAL NOT NULL,
+                confidence REAL NOT NULL,
+                sti REAL NOT NULL,
+                lti REAL NOT NULL,
+                external_id TEXT
+            );
+            CREATE INDEX atoms_by_name ON atoms (name, type) WHERE name IS NOT NULL;
+            CREATE INDEX atoms_by_outgoing ON atoms (type, outgoing) WHERE outgoing IS NOT NULL;
+            CREATE INDEX atoms_by_external_id ON atoms (external_id) WHERE external_id IS NOT NULL;
+            CREATE TABLE incoming (
+                target INTEGER NOT NULL,
+                link INTEGER NOT NULL
+            );
+            CREATE INDEX incoming_by_target ON incoming (target);
+            CREATE INDEX incoming_by_link ON incoming (link);
+        """)
+        self._count = 0
+    
+    def put(self, records: Sequence[Record]):
+        """Store spilled atoms"""
+        with self._db:
+            self._db.executemany(
+                "INSERT INTO atoms VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(handle, atom_type.value, name, None if name is not None else _pack(outgoing)) + tuple(values)
+                 for handle, atom_type, name, outgoing, *values in records])
+            self._db.executemany(
+                "INSERT INTO incoming VALUES (?, ?)",
+                [(target, record[0]) for record in records if record[2] is None for target in set(record[3])])
+        self._count += len(records)
+    
+    def get(self, handles: Iterable[int]) -> Dict[int, Record]:
+        """Get the stored atoms among handles, by handle"""
+        handles = list(handles)
+        records = {}
+        for start in range(0, len(handles), _SQL_BATCH):
+            batch = handles[start:start + _SQL_BATCH]
+            rows = self._db.execute(
+                f"SELECT * FROM atoms WHERE handle IN ({','.join('?' * len(batch))})", batch)
+            for handle, type_name, name, outgoing, *values in rows:
+                records[handle] = (handle, AtomType.from_string(type_name), name,
+                                   () if outgoing is None else _unpack(outgoing)) + tuple(values)
+        return records
+    
+    def find_node(self, name: str, atom_type: Optional[AtomType] = None) -> Optional[int]:
+        """Get the handle of a stored node, of any node type if atom_type is None"""
+        if atom_type is not None:
+            row = self._db.execute(
+                "SELECT handle FROM atoms WHERE name = ? AND type = ?", (name, atom_type.value)).fetchone()
+            return row[0] if row else None
+        found = dict(self._db.execute("SELECT type, handle FROM atoms WHERE name = ?", (name,)))
+        for node_type in AtomType.get_subtypes(AtomType.NODE):
+            if node_type.value in found:
+                return found[node_type.value]
+        return None
+    
+    def find_link(self, atom_type: AtomType, handles: Sequence[int]) -> Optional[int]:
+        """Get the handle of a stored link by type and outgoing handles"""
+        row = self._db.execute(
+            "SELECT handle FROM atoms WHERE type = ? AND outgoing = ?", (atom_type.value, _pack(handles))).fetchone()
+        return row[0] if row else None
+    
+    def find_external_id(self, external_id: str) -> Optional[int]:
+        """Get the handle of a stored atom by external ID"""
+        row = self._db.execute("SELECT handle FROM atoms WHERE external_id = ?", (external_id,)).fetchone()
+        return row[0] if row else None
+    
+    def incoming(self, handle: int) -> List[int]:
+        """Get the handles of the stored links that point at an atom"""
+        return [row[0] for row in self._db.execute("SELECT link FROM incoming WHERE target = ?", (handle,))]
+    
+    def delete(self, handles: Sequence[int]):
+        """Drop atoms from the store"""
+        rows = [(handle,) for handle in handles]
+        with self._db:
+            deleted = self._db.executemany("DELETE FROM atoms WHERE handle = ?", rows).rowcount
+            self._db.executemany("DELETE FROM incoming WHERE link = ?", rows)
+        self._count -= deleted
+    
+    def clear(self):
+        """Drop every atom"""
+        with self._db:
+            self._db.execute("DELETE FROM atoms")
+            self._db.execute("DELETE FROM incoming")
+        self._count = 0
+    
+    def close(self):
+        """Close the database"""
+        self._db.close()
+    
+    def __len__(self) -> int:
+        """Return the number of stored atoms"""
+        return self._count
+
+
+class BoundedAtomSpace(AtomSpace):
+    """
+    An AtomSpace that keeps at most max_atoms atoms in memory.
+    
+    When an add would exceed the cap, cold atoms are evicted to a
+    SpillStore on disk: the least recently used ones ("lru"), or those
+    with the lowest short-term then long-term importance ("importance").
+    An atom is only evicted once no resident link contains it, so every
+    resident link's outgoing atoms stay resident and the indexes of
+    resident atoms stay exact.
+    
+    Evicted atoms keep their handle and are faulted back in whenever they
+    are asked for: by get_atom_by_id, get_node_by_name, get_incoming and
+    the other incoming-set methods, get_link, and by adds and removals
+    that name them, and by get_atom_by_external_id and the batch truth and
+    attention value methods given their handles. Scans (get_all_atoms,
+    get_atoms_by_type, the iter_ and count_ methods, len) only see resident
+    atoms. Evicted atoms take their truth and attention values and external
+    IDs to disk and release their rows; the ancestor index only holds the
+    edges of resident links, so while any inheritance link is spilled,
+    is_a, ancestors and descendants walk the links instead.
+    
+    Atom objects obtained before an eviction are detached copies; fetch
+    the atom again (e.g. by handle) to read or change it. Reads can evict
+    atoms too, so the iter_ methods return snapshots.
+    """
+    
+    def __init__(
+        self,
+        max_atoms: int,
+        policy: str = "lru",
+        path: str = "",
+        external_ids: bool = False,
+        ancestor_index: bool = False,
+    ):
+        """
+        Initialize an empty BoundedAtomSpace.
+        
+        Args:
+            max_atoms: Maximum number of resident atoms
+            policy: "lru" or "importance" (requires NumPy)
+            path: File for the SpillStore; a temporary file by default
+            external_ids: See AtomSpace
+            ancestor_index: See AtomSpace
+        """
+        if max_atoms < 1:
+            raise ValueError("max_atoms must be at least 1")
+        if policy not in EVICTION_POLICIES:
+            raise ValueError(f"Unknown eviction policy: {policy}")
+        if policy == "importance":
+            require_numpy()
+        super().__init__(external_ids=external_ids, ancestor_index=ancestor_index)
+        self.max_atoms = max_atoms
+        self.policy = policy
+        self._store = SpillStore(path)
+        # Resident handles, least recently used first
+        self._recent: "OrderedDict[int, None]" = OrderedDict()
+        # handle -> number of spilled links that point at it
+        self._spilled_incoming: Dict[int, int] = {}
+        # Number of spilled links whose edges left the ancestor index
+        self._spilled_edges = 0
+        # Eviction is held off while an operation is in progress, and after
+        # falling short until this many atoms are resident
+        self._busy = 0
+        self._retry_at = 0
+    
+    def add_node(
+        self,
+        atom_type: Union[AtomType, str],
+        name: str,
+        truth_value: Optional[TruthValue] = None,
+    ) -> Node:
+        if isinstance(atom_type, str):
+            atom_type = AtomType.from_string(atom_type)
+        if (atom_type, name) not in self._node_table and len(self._store):
+            handle = self._store.find_node(name, atom_type)
+            if handle is not None:
+                self._fault([handle])
+        node = super().add_node(atom_type, name, truth_value)
+        self._touch(node.id)
+        self._enforce_cap((node.id,))
+        return node
+    
+    def add_link(
+        self,
+        atom_type: Union[AtomType, str],
+        outgoing: List[Atom],
+        truth_value: Optional[TruthValue] = None,
+    ) -> Link:
+        if isinstance(atom_type, str):
+            atom_type = AtomType.from_string(atom_type)
+        outgoing = [self._resident(atom) for atom in outgoing]
+        self._fault_link(atom_type, outgoing)
+        link = super().add_link(atom_type, outgoing, truth_value)
+        self._touch(link.id)
+        self._enforce_cap([link.id] + [atom.id for atom in outgoing])
+        return link
+    
+    def add_nodes(self, nodes: Iterable[Sequence]) -> List[Node]:
+        nodes = list(nodes)
+        with self._hold():
+            if len(self._store):
+                for spec in nodes:
+                    atom_type = spec[0]
+                    if isinstance(atom_type, str):
+                        atom_type = AtomType.from_string(atom_type)
+                    if (atom_type, spec[1]) not in self._node_table:
+                        handle = self._store.find_node(spec[1], atom_type)
+                        if handle is not None:
+                            self._fault([handle])
+            result = super().add_nodes(nodes)
+        self._enforce_cap()
+        return result
+    
+    def add_links(self, links: Iterable[Sequence]) -> List[Link]:
+        with self._hold():
+            resolved = []
+            for spec in links:
+                atom_type = spec[0]
+                if isinstance(atom_type, str):
+                    atom_type = AtomType.from_string(atom_type)
+                outgoing = [self._resident(atom) for atom in spec[1]]
+                self._fault_link(atom_type, outgoing)
+                resolved.append((atom_type, outgoing) + tuple(spec[2:]))
+            result = super().add_links(resolved)
+        self._enforce_cap()
+        return result
+    
+    @contextmanager
+    def bulk_load(self):
+        with super().bulk_load():
+            yield self
+        self._enforce_cap()
+    
+    def remove_atoms(self, atoms: Iterable[Atom], recursive: bool = True) -> int:
+        with self._hold():
+            removed = super().remove_atoms([self._resident(atom) for atom in atoms], recursive)
+        self._enforce_cap()
+        return removed
+    
+    def get_atom_by_id(self, atom_id: int) -> Optional[Atom]:
+        atom = self._nodes.get(atom_id)
+        if atom is None:
+            atom = self._links.get(atom_id)
+            if atom is None:
+                if not len(self._store):
+                    return None
+                self._fault([atom_id])
+                atom = self._nodes.get(atom_id) or self._links.get(atom_id)
+                if atom is not None:
+                    self._enforce_cap((atom_id,))
+                return atom
+        self._touch(atom_id)
+        return atom
+    
+    def get_node_by_name(self, name: str, atom_type: Optional[Union[AtomType, str]] = None) -> Optional[Node]:
+        if isinstance(atom_type, str):
+            atom_type = AtomType.from_string(atom_type)
+        node = super().get_node_by_name(name, atom_type)
+        if node is None and len(self._store):
+            handle = self._store.find_node(name, atom_type)
+            if handle is not None:
+                self._fault([handle])
+                node = self._nodes.get(handle)
+                self._enforce_cap((handle,))
+        elif node is not None and node.id in self._recent:
+            self._touch(node.id)
+        return node
+    
+    def get_link(self, atom_type: Union[AtomType, str], outgoing: Sequence[Atom]) -> Optional[Link]:
+        if isinstance(atom_type, str):
+            atom_type = AtomType.from_string(atom_type)
+        outgoing = [self._resident(atom) for atom in outgoing]
+        self._fault_link(atom_type, outgoing)
+        link = super().get_link(atom_type, outgoing)
+        if link is not None:
+            self._touch(link.id)
+            self._enforce_cap([link.id] + [atom.id for atom in outgoing])
+        return link
+    
+    def iter_incoming(
+        self,
+        atom: Atom,
+        link_type: Optional[Union[AtomType, str]] = None,
+        position: Optional[int] = None,
+    ) -> Iterator[Link]:
+        self._fault_incoming(atom)
+        links = list(super().iter_incoming(atom, link_type, position))
+        for link in links:
+            self._touch(link.id)
+        self._enforce_cap([atom.id] + [link.id for link in links])
+        return iter(links)
+    
+    def count_incoming(
+        self,
+        atom: Atom,
+        link_type: Optional[Union[AtomType, str]] = None,
+        position: Optional[int] = None,
+    ) -> int:
+        self._fault_incoming(atom)
+        count = super().count_incoming(atom, link_type, position)
+        self._enforce_cap((atom.id,))
+        return count
+    
+    def iter_atoms(self) -> Iterator[Atom]:
+        return iter(list(super().iter_atoms()))
+    
+    def iter_nodes(self) -> Iterator[Node]:
+        return iter(list(super().iter_nodes()))
+    
+    def iter_links(self) -> Iterator[Link]:
+        return iter(list(super().iter_links()))
+    
+    def iter_by_type(self, atom_type: Union[AtomType, str], subtypes: bool = False) -> Iterator[Atom]:
+        return iter(list(super().iter_by_type(atom_type, subtypes)))
+    
+    def get_external_id(self, atom: Atom) -> Optional[str]:
+        atom = self._resident(atom)
+        external_id = super().get_external_id(atom)
+        self._enforce_cap((atom.id,))
+        return external_id
+    
+    def get_atom_by_external_id(self, external_id: str) -> Optional[Atom]:
+        if self._external_ids is not None and external_id not in self._external_ids and len(self._store):
+            handle = self._store.find_external_id(external_id)
+            if handle is not None:
+                return self.get_atom_by_id(handle)
+        return super().get_atom_by_external_id(external_id)
+    
+    def is_a(self, atom: Atom, ancestor: Atom) -> bool:
+        if self._spilled_edges and atom.id != ancestor.id:
+            return any(found.id == ancestor.id for found in self._walk(atom, 0))
+        return super().is_a(atom, ancestor)
+    
+    def ancestors(self, atom: Atom) -> Set[Atom]:
+        if self._spilled_edges:
+            return set(self._walk(atom, 0))
+        return super().ancestors(atom)
+    
+    def descendants(self, atom: Atom) -> Set[Atom]:
+        if self._spilled_edges:
+            return set(self._walk(atom, 1))
+        return super().descendants(atom)
+    
+    def get_truth_values(self, atom_type: Optional[Union[AtomType, str]] = None, subtypes: bool = False, handles=None):
+        with self._hold():
+            self._fault_handles(handles)
+            result = super().get_truth_values(atom_type, subtypes, handles)
+        self._enforce_cap()
+        return result
+    
+    def set_truth_values(self, handles, strengths, confidences):
+        with self._hold():
+            self._fault_handles(handles)
+            super().set_truth_values(handles, strengths, confidences)
+        self._enforce_cap()
+    
+    def get_attention_values(self, handles=None):
+        with self._hold():
+            self._fault_handles(handles)
+            result = super().get_attention_values(handles)
+        self._enforce_cap()
+        return result
+    
+    def set_attention_values(self, handles, stis=None, ltis=None):
+        with self._hold():
+            self._fault_handles(handles)
+            super().set_attention_values(handles, stis, ltis)
+        self._enforce_cap()
+    
+    def count_evicted(self) -> int:
+        """Count the atoms spilled to disk"""
+        return len(self._store)
+    
+    def evict(self, count: int, protect: Iterable[int] = ()) -> int:
+        """
+        Spill up to count cold atoms to disk now.
+        
+        Args:
+            count: Number of atoms to evict
+            protect: Handles that must stay resident
+        
+        Returns:
+            The number of atoms evicted
+        """
+        self._flush_pending()
+        protect = set(protect)
+        nodes = self._nodes
+        links = self._links
+        incoming = self._incoming
+        victims: Dict[int, Atom] = {}
+        
+        # Atoms still held by resident links are skipped; evicting those
+        # links can free them for a later pass. The number of candidates
+        # examined is bounded, so that adds stay cheap when most resident
+        # atoms are held (e.g. by long link chains).
+        order = self._eviction_order()
+        budget = 2 * count + _MIN_SCAN
+        progress = True
+        while progress and budget > 0 and len(victims) < count:
+            progress = False
+            blocked = []
+            for handle in order:
+                if len(victims) >= count or budget <= 0:
+                    break
+                if handle in victims or handle in protect:
+                    continue
+                budget -= 1
+                buckets = incoming.get(handle)
+                if buckets and any(link.id not in victims for bucket in buckets.values() for link in bucket):
+                    blocked.append(handle)
+                    continue
+                atom = nodes.get(handle)
+                victims[handle] = atom if atom is not None else links[handle]
+                progress = True
+            order = blocked
+        
+        if self.policy == "lru":
+            # Atoms in use by resident links count as recently used
+            for handle in order:
+                self._recent.move_to_end(handle)
+        if victims:
+            self._spill(victims)
+        return len(victims)
+    
+    def clear(self):
+        super().clear()
+        self._store.clear()
+        self._recent.clear()
+        self._spilled_incoming.clear()
+        self._spilled_edges = 0
+        self._retry_at = 0
+    
+    def close(self):
+        """Close the SpillStore; the AtomSpace must not be used afterwards"""
+        self._store.close()
+    
+    def _index_atoms(self, atoms: Iterable[Atom], restored: bool = False, copied: bool = False):
+        atoms = list(atoms)
+        super()._index_atoms(atoms, restored, copied)
+        self._recent.update(dict.fromkeys([atom.id for atom in atoms]))
+    
+    def _unindex_atoms(self, doomed: Dict[int, Atom], evicted: bool = False):
+        super()._unindex_atoms(doomed, evicted)
+        recent = self._recent
+        for handle in doomed:
+            recent.pop(handle, None)
+        if not evicted:
+            for handle in doomed:
+                self._spilled_incoming.pop(handle, None)
+    
+    @contextmanager
+    def _hold(self):
+        """Hold off eviction until the block exits"""
+        self._busy += 1
+        try:
+            yield
+        finally:
+            self._busy -= 1
+    
+    def _touch(self, handle: int):
+        """Mark a resident atom as just used"""
+        if self.policy == "lru" and handle in self._recent:
+            self._recent.move_to_end(handle)
+    
+    def _enforce_cap(self, protect: Iterable[int] = ()):
+        """Evict atoms if over the cap, unless an operation is in progress"""
+        if self._busy or self._pending is not None:
+            return
+        size = len(self)
+        excess = size - self.max_atoms
+        if excess <= 0 or size < self._retry_at:
+            return
+        # Evict a little extra so that a run of adds does not evict one
+        # atom at a time
+        slack = self.max_atoms // 16
+        if self.evict(excess + slack, protect) < excess:
+            # Most resident atoms are held by resident links; try again
+            # once more atoms have been added
+            self._retry_at = size + max(_MIN_SCAN, slack)
+    
+    def _eviction_order(self) -> List[int]:
+        """Get the resident handles, coldest first"""
+        if self.policy == "lru":
+            return list(self._recent)
+        np = require_numpy()
+        handles, stis, ltis = super().get_attention_values()
+        return handles[np.lexsort((ltis, stis))].tolist()
+    
+    def _resident(self, atom: Atom) -> Atom:
+        """Get the resident object for an atom, faulting it in if needed"""
+        resident = self._nodes.get(atom.id)
+        if resident is None:
+            resident = self._links.get(atom.id)
+            if resident is None and len(self._store):
+                self._fault([atom.id])
+                resident = self._nodes.get(atom.id) or self._links.get(atom.id)
+        return resident if resident is not None else atom
+    
+    def _fault_link(self, atom_type: AtomType, outgoing: Sequence[Atom]):
+        """Fault in the spilled link with this type and outgoing set, if any"""
+        if not len(self._store):
+            return
+        handles = tuple([atom.id for atom in outgoing])
+        if AtomType.is_unordered(atom_type):
+            handles = tuple(sorted(handles))
+        if (atom_type, handles) not in self._link_table:
+            handle = self._store.find_link(atom_type, handles)
+            if handle is not None:
+                self._fault([handle])
+    
+    def _fault_handles(self, handles):
+        """Fault in the spilled atoms among an array-like of handles, if given"""
+        if handles is not None and len(self._store):
+            np = require_numpy()
+            self._fault(np.asarray(handles, dtype=np.int64).ravel().tolist())
+    
+    def _walk(self, atom: Atom, position: int) -> List[Atom]:
+        """Walk inheritance links as walk_inheritance does, faulting them in"""
+        with self._hold():
+            found = list(walk_inheritance(self, atom, position))
+        self._enforce_cap()
+        return found
+    
+    def _fault_incoming(self, atom: Atom):
+        """Fault in every spilled link that points at an atom"""
+        if self._spilled_incoming.get(atom.id):
+            self._fault(self._store.incoming(atom.id))
+    
+    def _spill(self, victims: Dict[int, Atom]):
+        """Write atoms to the SpillStore and drop them from memory"""
+        truth_values = self._truth_values
+        attention = self._attention
+        external_ids = self._handle_to_external
+        records = []
+        spilled_incoming = self._spilled_incoming
+        for handle, atom in victims.items():
+            truth_value = truth_values.get(handle)
+            attention_value = attention.get(handle)
+            values = (truth_value.strength, truth_value.confidence, attention_value.sti, attention_value.lti,
+                      external_ids.get(handle))
+            if isinstance(atom, Node):
+                records.append((handle, atom.type, atom.name, ()) + values)
+            else:
+                outgoing = tuple([target.id for target in atom.outgoing])
+                records.append((handle, atom.type, None, outgoing) + values)
+                for target in set(outgoing):
+                    spilled_incoming[target] = spilled_incoming.get(target, 0) + 1
+                if atom.type in CLOSURE_LINK_TYPES and len(outgoing) == 2:
+                    self._spilled_edges += 1
+        self._store.put(records)
+        self._unindex_atoms(victims, evicted=True)
+    
+    def _fault(self, handles: Iterable[int]):
+        """Load spilled atoms, and the spilled atoms they contain, back into memory"""
+        nodes = self._nodes
+        links = self._links
+        records: Dict[int, Record] = {}
+        wanted: Set[int] = {handle for handle in handles if handle not in nodes and handle not in links}
+        while wanted:
+            fetched = self._store.get(wanted)
+            records.update(fetched)
+            wanted = {
+                target for record in fetched.values() for target in record[3]
+                if target not in nodes and target not in links and target not in records}
+        if not records:
+            return
+        
+        # Outgoing atoms always have lower handles than their links
+        spilled_incoming = self._spilled_incoming
+        restored: Dict[int, Atom] = {}
+        for handle in sorted(records):
+            _, atom_type, name, outgoing, strength, confidence = records[handle][:6]
+            if name is not None:
+                atom = Node.__new__(Node)
+                atom.name = name
+                atom._hash = hash((atom_type, name))
+                self._node_table[(atom_type, name)] = atom
+            else:
+                atom = Link.__new__(Link)
+                atom.outgoing = tuple([
+                    restored[target] if target in restored else nodes.get(target) or links[target]
+                    for target in outgoing])
+                atom._hash = hash((atom_type, atom.outgoing))
+                self._link_table[(atom_type, outgoing)] = atom
+                for target in set(outgoing):
+                    remaining = spilled_incoming[target] - 1
+                    if remaining:
+                        spilled_incoming[target] = remaining
+                    else:
+                        del spilled_incoming[target]
+                if atom_type in CLOSURE_LINK_TYPES and len(outgoing) == 2:
+                    self._spilled_edges -= 1
+            atom.id = handle
+            atom.type = atom_type
+            atom._tv = TruthValue(strength, confidence)
+            restored[handle] = atom
+        
+        self._index_atoms(restored.values(), restored=True)
+        attention = self._attention
+        for handle in restored:
+            sti, lti, external_id = records[handle][6:]
+            if sti or lti:
+                attention.set(handle, AttentionValue(sti, lti))
+            if external_id is not None and self._external_ids is not None:
+                self._external_ids[external_id] = handle
+                self._handle_to_external[handle] = external_id
+        self._store.delete(list(restored))
+    
+    def __repr__(self) -> str:
+        return f"BoundedAtomSpace(atoms={len(self)}, evicted={len(self._store)})"
@@ -0,0 +1,155 @@
+"""
+Transitive closure of inheritance links
+"""
+
+from typing import Dict, Iterable, Iterator, Set
+
+from cogpy.core.atom import Atom
+from cogpy.core.types import AtomType
+
+
+# Binary link types whose transitive closure is indexed, as (child, parent)
+CLOSURE_LINK_TYPES = frozenset([AtomType.INHERITANCE_LINK, AtomType.MEMBER_LINK])
+
+
+def walk_inheritance(atomspace, atom: Atom, position: int) -> Iterator[Atom]:
+    """
+    Walk inheritance links transitively through the incoming index.
+    
+    Args:
+        atomspace: The AtomSpace holding the links
+        atom: The atom to start from
+        position: 0 to walk up to ancestors, 1 to walk down to descendants
+        
+    Returns:
+        An iterator over the atoms reached, each once
+    """
+    other = 1 - position
+    seen = set()
+    stack = [atom]
+    while stack:
+        current = stack.pop()
+        for link_type in CLOSURE_LINK_TYPES:
+            for link in atomspace.iter_incoming(current, link_type, position):
+                if len(link.outgoing) != 2:
+                    continue
+                found = link.outgoing[other]
+                if found.id not in seen:
+                    seen.add(found.id)
+                    stack.append(found)
+                    yield found
+
+
+class AncestorIndex:
+    """
+    A reachability index over child -> parent edges, by atom handle.
+    
+    Every handle maps to the full set of its ancestors and of its
+    descendants, so reachability is a set lookup. Adding an edge extends
+    the sets of the child, its descendants and the parent's ancestors.
+    Removing an edge recomputes the ancestors of the child and its
+    descendants only, reusing the sets of every other atom, which cannot
+    have changed.
+    """
+    
+    def __init__(self):
+        """Initialize an empty index"""
+        self._parents: Dict[int, Dict[int, int]] = {}  # child -> parent -> edge count
+        self._ancestors: Dict[int, Set[int]] = {}
+        self._descendants: Dict[int, Set[int]] = {}
+    
+    def add_edge(self, child: int, parent: int):
+        """Add a child -> parent edge"""
+        parents = self._parents.setdefault(child, {})
+        if parent in parents:
+            # Parallel edges (e.g. an InheritanceLink and a MemberLink)
+            # do not change reachability
+            parents[parent] += 1
+            return
+        parents[parent] = 1
+        
+        ancestors = self._ancestors
+        descendants = self._descendants
+        sources = [child]
+        sources.extend(descendants.get(child, ()))
+        targets = [parent]
+        targets.extend(ancestors.get(parent, ()))
+        for source in sources:
+            source_ancestors = ancestors.get(source)
+            if source_ancestors is None:
+                ancestors[source] = source_ancestors = set()
+            for target in targets:
+                if target not in source_ancestors:
+                    source_ancestors.add(target)
+                    target_descendants = descendants.get(target)
+                    if target_descendants is None:
+                        descendants[target] = target_descendants = set()
+                    target_descendants.add(source)
+    
+    def remove_edge(self, child: int, parent: int):
+        """Remove a child -> parent edge"""
+        parents = self._parents.get(child)
+        count = parents.get(parent) if parents else None
+        if not count:
+            return
+        if count > 1:
+            parents[parent] = count - 1
+            return
+        del parents[parent]
+        if not parents:
+            del self._parents[child]
+        
+        # Only atoms that reached the parent through the child can lose
+        # ancestors
+        ancestors = self._ancestors
+        descendants = self._descendants
+        affected = {child}
+        affected.update(descendants.get(child, ()))
+        for handle in affected:
+            reached = self._reach(handle, affected)
+            for lost in ancestors.get(handle, set()) - reached:
+                lost_descendants = descendants[lost]
+                lost_descendants.discard(handle)
+                if not lost_descendants:
+                    del descendants[lost]
+            if reached:
+                ancestors[handle] = reached
+            else:
+                ancestors.pop(handle, None)
+    
+    def _reach(self, handle: int, affected: Set[int]) -> Set[int]:
+        """Recompute the ancestors of an affected handle"""
+        parents = self._parents
+        ancestors = self._ancestors
+        reached = set()
+        stack = [handle]
+        visited = {handle}
+        while stack:
+            for parent in parents.get(stack.pop(), ()):
+                reached.add(parent)
+                if parent not in affected:
+                    # Unaffected ancestors are still up to date
+                    reached.update(ancestors.get(parent, ()))
+                elif parent not in visited:
+                    visited.add(parent)
+                    stack.append(parent)
+        return reached
+    
+    def is_a(self, child: int, ancestor: int) -> bool:
+        """Check whether ancestor is reachable from child"""
+        ancestors = self._ancestors.get(child)
+        return ancestors is not None and ancestor in ancestors
+    
+    def ancestors(self, handle: int) -> Iterable[int]:
+        """Get the handles reachable from a handle"""
+        return self._ancestors.get(handle, ())
+    
+    def descendants(self, handle: int) -> Iterable[int]:
+        """Get the handles that reach a handle"""
+        return self._descendants.get(handle, ())
+    
+    def clear(self):
+        """Remove every edge"""
+        self._parents.clear()
+        self._ancestors.clear()
+        self._descendants.clear()
@@ -0,0 +1,965 @@
+"""
+Columnar AtomSpace - a struct-of-arrays storage engine
+"""
+
+import zlib
+from array import array
+from contextlib import contextmanager
+from itertools import chain
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Union
+from weakref import WeakValueDictionary
+
+from cogpy.core.atom import Atom, Node, Link
+from cogpy.core.attention import AttentionValue, AttentionValueStore
+from cogpy.core.closure import walk_inheritance
+from cogpy.core.types import AtomType
+from cogpy.core.truthvalue import TruthValue, TruthValueStore, require_numpy
+
+
+# Type code 0 marks a removed atom; live atoms use 1 + enum position.
+_DEAD = 0
+_TYPES: List[Optional[AtomType]] = [None] + list(AtomType)
+_TYPE_CODES: Dict[AtomType, int] = {atom_type: code for code, atom_type in enumerate(_TYPES) if atom_type}
+_NODE_CODES = [code for atom_type, code in _TYPE_CODES.items() if AtomType.is_node(atom_type)]
+_LINK_CODES = [code for atom_type, code in _TYPE_CODES.items() if AtomType.is_link(atom_type)]
+
+# Number of incoming entries kept outside the CSR arrays before compact()
+# is run automatically. The threshold grows with the number of rows, so the
+# cost of rebuilding is amortized over the inserts that triggered it.
+_COMPACT_MIN = 4096
+
+
+class _HandleTable:
+    """
+    Open-addressing hash table from keys to atom handles.
+    
+    Keys are not stored. Each slot holds the key hash and the handle of
+    the atom it belongs to, and callers pass a `matches(handle)` callback
+    that compares the probe key with that atom's columns. This keeps the
+    table at 16 bytes per slot regardless of key size.
+    """
+    
+    __slots__ = ("_hashes", "_handles", "_mask", "_live", "_filled")
+    
+    _EMPTY = -1
+    _DELETED = -2
+    
+    def __init__(self, capacity: int = 8):
+        self._hashes = array("q", bytes(8 * capacity))
+        self._handles = array("q", [self._EMPTY]) * capacity
+        self._mask = capacity - 1
+        self._live = 0
+        self._filled = 0  # live + deleted slots
+    
+    def __len__(self) -> int:
+        return self._live
+    
+    def find(self, key_hash: int, matches: Callable[[int], bool]) -> int:
+        """Return the handle whose key matches, or -1"""
+        hashes = self._hashes
+        handles = self._handles
+        mask = self._mask
+        i = key_hash & mask
+        while True:
+            handle = handles[i]
+            if handle == self._EMPTY:
+                return -1
+            if handle >= 0 and hashes[i] == key_hash and matches(handle):
+                return handle
+            i = (i + 1) & mask
+    
+    def insert(self, key_hash: int, handle: int):
+        """Insert a handle; the key must not already be present"""
+        if (self._filled + 1) * 3 >= len(self._handles) * 2:
+            self._resize()
+        handles = self._handles
+        mask = self._mask
+        i = key_hash & mask
+        while handles[i] >= 0:
+            i = (i + 1) & mask
+        if handles[i] == self._EMPTY:
+            self._filled += 1
+        handles[i] = handle
+        self._hashes[i] = key_hash
+        self._live += 1
+    
+    def remove(self, key_hash: int, handle: int) -> bool:
+        """Remove a handle stored under the given key hash"""
+        handles = self._handles
+        mask = self._mask
+        i = key_hash & mask
+        while True:
+            current = handles[i]
+            if current == self._EMPTY:
+                return False
+            if current == handle:
+                handles[i] = self._DELETED
+                self._live -= 1
+                return True
+            i = (i + 1) & mask
+    
+    def _resize(self):
+        """Rehash live entries, growing the table if it is mostly live"""
+        capacity = len(self._handles)
+        if self._live * 3 >= capacity:
+            capacity *= 2
+        old_hashes, old_handles = self._hashes, self._handles
+        self.__init__(capacity)
+        handles = self._handles
+        hashes = self._hashes
+        mask = self._mask
+        for key_hash, handle in zip(old_hashes, old_handles):
+            if handle >= 0:
+                i = key_hash & mask
+                while handles[i] != self._EMPTY:
+                    i = (i + 1) & mask
+                handles[i] = handle
+                hashes[i] = key_hash
+        self._live = self._filled = sum(1 for handle in old_handles if handle >= 0)
+
+
+def _get_truth_value(atom) -> TruthValue:
+    return atom._space._truth_values.view(atom.id)
+
+
+def _set_truth_value(atom, truth_value: TruthValue):
+    atom._space._truth_values.set(atom.id, truth_value)
+
+
+class _ColumnarNode(Node):
+    """Node materialized from a ColumnarAtomSpace row"""
+    
+    __slots__ = ("_space", "__weakref__")
+    
+    truth_value = property(_get_truth_value, _set_truth_value)
+
+
+class _ColumnarLink(Link):
+    """Link materialized from a ColumnarAtomSpace row"""
+    
+    __slots__ = ("_space", "__weakref__")
+    
+    truth_value = property(_get_truth_value, _set_truth_value)
+
+
+class ColumnarAtomSpace:
+    """
+    An AtomSpace that stores atoms in parallel typed arrays.
+    
+    Each atom is a row identified by its handle. Rows hold a type code, an
+    offset into an interned string pool for node names, strength and
+    confidence, and CSR-style outgoing and incoming adjacency. Node and
+    Link objects are only created when a caller asks for an atom, and the
+    same object is returned for as long as the caller keeps it alive.
+    
+    Handles are row numbers local to this AtomSpace, so atoms from a
+    ColumnarAtomSpace cannot be mixed with atoms from any other AtomSpace.
+    Removed rows are tombstoned; handles are never reused.
+    """
+    
+    def __init__(self):
+        """Initialize an empty ColumnarAtomSpace"""
+        # Incremented whenever rows are added or removed, so derived
+        # structures (e.g. the spreading matrix) know when to rebuild
+        self._version = 0
+        self.clear()
+    
+    def clear(self):
+        """Remove all atoms from the AtomSpace"""
+        # Per-atom columns
+        self._types = bytearray()  # handle -> type code
+        self._name_ids = array("q")  # handle -> string id, -1 for links
+        self._truth_values = TruthValueStore()  # handle -> strength, confidence
+        self._attention = AttentionValueStore()  # handle -> STI, LTI
+        self._out_offsets = array("q", [0])  # handle -> start in _out_targets
+        self._out_targets = array("q")
+        
+        # Incoming adjacency: a CSR snapshot built by compact(), plus a
+        # linked list per target for links added since then
+        self._in_offsets = array("q", [0])
+        self._in_sources = array("q")
+        self._in_head = array("q")  # handle -> newest delta entry, -1 if none
+        self._in_next = array("q")  # delta entry -> older entry for the same target
+        self._in_delta = array("q")  # delta entry -> source link handle
+        
+        # Interned string pool
+        self._pool = bytearray()
+        self._pool_offsets = array("q", [0])  # string id -> start in _pool
+        self._strings = _HandleTable()  # name -> string id
+        
+        # Deduplication tables
+        self._node_table = _HandleTable()  # (type, string id) -> handle
+        self._link_table = _HandleTable()  # (type, outgoing handles) -> handle
+        
+        self._count = 0
+        self._type_counts = [0] * len(_TYPES)  # type code -> live atoms
+        self._version += 1
+        self._bulk_loading = False
+        # True while the columns are views of a mapped snapshot file
+        self._mapped = False
+        self._cache: "WeakValueDictionary[int, Atom]" = WeakValueDictionary()
+    
+    def add_node(
+        self,
+        atom_type: Union[AtomType, str],
+        name: str,
+        truth_value: Optional[TruthValue] = None,
+    ) -> Node:
+        """
+        Add a node to the AtomSpace.
+        
+        Args:
+            atom_type: Type of the node
+            name: Name of the node
+            truth_value: Optional truth value
+        
+        Returns:
+            The created or existing node
+        """
+        if isinstance(atom_type, str):
+            atom_type = AtomType.from_string(atom_type)
+        code = _TYPE_CODES[atom_type]
+        
+        # Check if node already exists
+        string_id = self._intern(name)
+        key_hash = hash((code, string_id))
+        handle = self._node_table.find(key_hash, self._node_matcher(code, string_id))
+        if handle < 0:
+            handle = self._append_row(code, string_id, (), truth_value)
+            self._node_table.insert(key_hash, handle)
+        elif truth_value:
+            self._truth_values.set(handle, truth_value)
+        
+        return self._materialize(handle)
+    
+    def add_link(
+        self,
+        atom_type: Union[AtomType, str],
+        outgoing: Sequence[Atom],
+        truth_value: Optional[TruthValue] = None,
+    ) -> Link:
+        """
+        Add a link to the AtomSpace.
+        
+        Args:
+            atom_type: Type of the link
+            outgoing: Atoms of this AtomSpace the link connects
+            truth_value: Optional truth value
+        
+        Returns:
+            The created or existing link
+        """
+        if isinstance(atom_type, str):
+            atom_type = AtomType.from_string(atom_type)
+        code = _TYPE_CODES[atom_type]
+        handles = tuple(self._handle_of(atom) for atom in outgoing)
+        if AtomType.is_unordered(atom_type):
+            handles = tuple(sorted(handles))
+        
+        # Check if link already exists
+        key_hash = hash((code, handles))
+        handle = self._link_table.find(key_hash, self._link_matcher(code, handles))
+        if handle >= 0:
+            if truth_value:
+                self._truth_values.set(handle, truth_value)
+            return self._materialize(handle)
+        
+        handle = self._append_row(code, -1, handles, truth_value)
+        self._link_table.insert(key_hash, handle)
+        
+        # Update incoming lists
+        head = self._in_head
+        for target in handles:
+            self._in_next.append(head[target])
+            head[target] = len(self._in_delta)
+            self._in_delta.append(handle)
+        if not self._bulk_loading and len(self._in_delta) > max(_COMPACT_MIN, len(self._types)):
+            self.compact()
+        
+        return self._materialize(handle)
+    
+    def add_nodes(self, nodes: Iterable[Sequence]) -> List[Node]:
+        """
+        Add many nodes at once.
+        
+        Args:
+            nodes: (atom_type, name) or (atom_type, name, truth_value)
+                tuples
+        
+        Returns:
+            The created or existing nodes, in input order
+        """
+        with self.bulk_load():
+            return [self.add_node(*spec) for spec in nodes]
+    
+    def add_links(self, links: Iterable[Sequence]) -> List[Link]:
+        """
+        Add many links at once.
+        
+        Args:
+            links: (atom_type, outgoing) or (atom_type, outgoing,
+                truth_value) tuples
+        
+        Returns:
+            The created or existing links, in input order
+        """
+        with self.bulk_load():
+            return [self.add_link(*spec) for spec in links]
+    
+    @contextmanager
+    def bulk_load(self):
+        """
+        Defer incoming compaction while loading many atoms.
+        
+        Inside the block, new incoming entries stay in the linked lists
+        and are folded into the CSR arrays once, when the block exits.
+        All queries remain valid throughout.
+        """
+        if self._bulk_loading:
+            yield self
+            return
+        
+        self._bulk_loading = True
+        try:
+            yield self
+        finally:
+            self._bulk_loading = False
+            if self._in_delta:
+                self.compact()
+    
+    def remove_atom(self, atom: Atom, recursive: bool = True) -> bool:
+        """
+        Remove an atom from the AtomSpace.
+        
+        Args:
+            atom: The atom to remove
+            recursive: Also remove every link that contains the atom,
+                directly or through other links. If False, an atom that
+                still has incoming links is not removed.
+        
+        Returns:
+            True if removed, False if not found or not removable
+        """
+        return self.remove_atoms((atom,), recursive) > 0
+    
+    def remove_atoms(self, atoms: Iterable[Atom], recursive: bool = True) -> int:
+        """
+        Remove many atoms at once.
+        
+        Args:
+            atoms: The atoms to remove
+            recursive: Also remove every link that contains one of the
+                atoms. If False, atoms with incoming links from outside
+                the batch are left in place.
+        
+        Returns:
+            The number of atoms removed, including dependent links
+        """
+        doomed = {atom.id for atom in atoms if self._owns(atom)}
+        
+        if recursive:
+            pending = list(doomed)
+            while pending:
+                for source in self._incoming_handles(pending.pop()):
+                    if source not in doomed:
+                        doomed.add(source)
+                        pending.append(source)
+        else:
+            changed = True
+            while changed:
+                changed = False
+                for handle in list(doomed):
+                    if any(source not in doomed for source in self._incoming_handles(handle)):
+                        doomed.discard(handle)
+                        changed = True
+        
+        for handle in doomed:
+            self._kill(handle)
+        return len(doomed)
+    
+    def save_snapshot(self, path: str):
+        """
+        Write the AtomSpace to a snapshot file; see open_snapshot.
+        
+        Args:
+            path: File to write, replaced atomically
+        """
+        from cogpy.core.snapshot import save_snapshot
+        save_snapshot(self, path)
+    
+    @classmethod
+    def open_snapshot(cls, path: str, mmap: bool = True) -> "ColumnarAtomSpace":
+        """
+        Open a snapshot written by save_snapshot.
+        
+        With mmap, the columns are views of the mapped file: opening costs
+        the same whatever the number of atoms, and queries read the pages
+        they touch. Changes to existing atoms stay in private memory and
+        are never written back. Adding the first new atom copies every
+        column into memory.
+        
+        Args:
+            path: Snapshot file
+            mmap: Map the file rather than read it into memory
+        
+        Returns:
+            A ColumnarAtomSpace with the atoms of the snapshot
+        """
+        from cogpy.core.snapshot import open_snapshot
+        return open_snapshot(path, mmap)
+    
+    def compact(self):
+        """
+        Fold recently added incoming entries into the CSR arrays.
+        
+        This also drops entries for removed links. It is run automatically
+        when enough links have been added since the last compaction.
+        """
+        types = self._types
+        size = len(types)
+        counts = array("q", bytes(8 * (size + 1)))
+        offsets = self._out_offsets
+        targets = self._out_targets
+        for handle in range(size):
+            if types[handle] != _DEAD:
+                for i in range(offsets[handle], offsets[handle + 1]):
+                    counts[targets[i] + 1] += 1
+        for handle in range(size):
+            counts[handle + 1] += counts[handle]
+        
+        sources = array("q", bytes(8 * counts[size]))
+        fill = array("q", counts)
+        for handle in range(size):
+            if types[handle] != _DEAD:
+                for i in range(offsets[handle], offsets[handle + 1]):
+                    target = targets[i]
+                    sources[fill[target]] = handle
+                    fill[target] += 1
+        
+        self._in_offsets = counts
+        self._in_sources = sources
+        self._in_head = array("q", [-1]) * size
+        self._in_next = array("q")
+        self._in_delta = array("q")
+    
+    def get_atom_by_id(self, atom_id: int) -> Optional[Atom]:
+        """Get an atom by its handle"""
+        if 0 <= atom_id < len(self._types) and self._types[atom_id] != _DEAD:
+            return self._materialize(atom_id)
+        return None
+    
+    def get_external_id(self, atom: Atom) -> Optional[str]:
+        """External IDs are not supported; always returns None"""
+        return None
+    
+    def get_atom_by_external_id(self, external_id: str) -> Optional[Atom]:
+        """External IDs are not supported; always returns None"""
+        return None
+    
+    def get_atoms_by_type(self, atom_type: Union[AtomType, str], subtypes: bool = False) -> List[Atom]:
+        """
+        Get all atoms of a specific type.
+        
+        Args:
+            atom_type: Type to filter by
+            subtypes: Also include atoms of every subtype, e.g. all node
+                types for AtomType.NODE
+        
+        Returns:
+            List of atoms of the specified type
+        """
+        return list(self.iter_by_type(atom_type, subtypes))
+    
+    def get_node_by_name(self, name: str, atom_type: Optional[Union[AtomType, str]] = None) -> Optional[Node]:
+        """
+        Get a node by name and optionally type.
+        
+        Args:
+            name: Name of the node
+            atom_type: Optional type filter
+        
+        Returns:
+            The node if found, None otherwise
+        """
+        string_id = self._find_string(name)
+        if string_id < 0:
+            return None
+        
+        if atom_type:
+            if isinstance(atom_type, str):
+                atom_type = AtomType.from_string(atom_type)
+            codes = [_TYPE_CODES[atom_type]]
+        else:
+            codes = _NODE_CODES
+        
+        for code in codes:
+            handle = self._node_table.find(hash((code, string_id)), self._node_matcher(code, string_id))
+            if handle >= 0:
+                return self._materialize(handle)
+        return None
+    
+    def get_link(self, atom_type: Union[AtomType, str], outgoing: Sequence[Atom]) -> Optional[Link]:
+        """
+        Get a link by type and outgoing set.
+        
+        Args:
+            atom_type: Type of the link
+            outgoing: Atoms the link connects
+        
+        Returns:
+            The link if found, None otherwise
+        """
+        if not all(self._owns(atom) for atom in outgoing):
+            return None
+        if isinstance(atom_type, str):
+            atom_type = AtomType.from_string(atom_type)
+        code = _TYPE_CODES[atom_type]
+        handles = tuple([atom.id for atom in outgoing])
+        if AtomType.is_unordered(atom_type):
+            handles = tuple(sorted(handles))
+        handle = self._link_table.find(hash((code, handles)), self._link_matcher(code, handles))
+        return self._materialize(handle) if handle >= 0 else None
+    
+    def is_a(self, atom: Atom, ancestor: Atom) -> bool:
+        """Check whether an atom transitively inherits from another"""
+        if atom.id == ancestor.id:
+            return True
+        return any(found.id == ancestor.id for found in walk_inheritance(self, atom, 0))
+    
+    def ancestors(self, atom: Atom) -> Set[Atom]:
+        """Get every atom an atom transitively inherits from"""
+        return set(walk_inheritance(self, atom, 0))
+    
+    def descendants(self, atom: Atom) -> Set[Atom]:
+        """Get every atom that transitively inherits from an atom"""
+        return set(walk_inheritance(self, atom, 1))
+    
+    def get_incoming(
+        self,
+        atom: Atom,
+        link_type: Optional[Union[AtomType, str]] = None,
+        position: Optional[int] = None,
+    ) -> List[Link]:
+        """
+        Get the links that point to this atom.
+        
+        The incoming arrays are not bucketed, so the filters are applied
+        to the atom's incoming entries one by one.
+        
+        Args:
+            atom: The target atom
+            link_type: Only return links of this type
+            position: Only return links that have the atom at this
+                position of their outgoing set
+        
+        Returns:
+            List of incoming links
+        """
+        return [self._materialize(handle) for handle in self._filter_incoming(atom, link_type, position)]
+    
+    def iter_incoming(
+        self,
+        atom: Atom,
+        link_type: Optional[Union[AtomType, str]] = None,
+        position: Optional[int] = None,
+    ) -> Iterator[Link]:
+        """
+        Iterate over the links that point to this atom.
+        
+        Takes the same filters as get_incoming. Link objects are created
+        as the iterator advances.
+        """
+        return map(self._materialize, self._filter_incoming(atom, link_type, position))
+    
+    def count_incoming(
+        self,
+        atom: Atom,
+        link_type: Optional[Union[AtomType, str]] = None,
+        position: Optional[int] = None,
+    ) -> int:
+        """Count the links that point to this atom without creating them"""
+        return len(self._filter_incoming(atom, link_type, position))
+    
+    def _filter_incoming(self, atom: Atom, link_type: Optional[Union[AtomType, str]],
+                         position: Optional[int]) -> List[int]:
+        """Get the handles of the incoming links that pass the filters"""
+        if not self._owns(atom):
+            return []
+        handles = self._incoming_handles(atom.id)
+        if link_type is not None:
+            if isinstance(link_type, str):
+                link_type = AtomType.from_string(link_type)
+            code = _TYPE_CODES[link_type]
+            handles = [handle for handle in handles if self._types[handle] == code]
+        if position is not None:
+            offsets = self._out_offsets
+            targets = self._out_targets
+            handles = [handle for handle in handles
+                       if position < offsets[handle + 1] - offsets[handle] and
+                       targets[offsets[handle] + position] == atom.id]
+        return handles
+    
+    def get_all_atoms(self) -> List[Atom]:
+        """Get all atoms in the AtomSpace"""
+        return list(self.iter_atoms())
+    
+    def get_all_nodes(self) -> List[Node]:
+        """Get all nodes in the AtomSpace"""
+        return list(self.iter_nodes())
+    
+    def get_all_links(self) -> List[Link]:
+        """Get all links in the AtomSpace"""
+        return list(self.iter_links())
+    
+    def iter_atoms(self) -> Iterator[Atom]:
+        """Iterate over all atoms in handle order, creating them lazily"""
+        types = self._types
+        for handle in range(len(types)):
+            if types[handle] != _DEAD:
+                yield self._materialize(handle)
+    
+    def iter_nodes(self) -> Iterator[Node]:
+        """Iterate over all nodes, creating them lazily"""
+        for code in _NODE_CODES:
+            yield from map(self._materialize, self._scan_type(code))
+    
+    def iter_links(self) -> Iterator[Link]:
+        """Iterate over all links, creating them lazily"""
+        for code in _LINK_CODES:
+            yield from map(self._materialize, self._scan_type(code))
+    
+    def iter_by_type(self, atom_type: Union[AtomType, str], subtypes: bool = False) -> Iterator[Atom]:
+        """Iterate over the atoms of a specific type, creating them lazily"""
+        if isinstance(atom_type, str):
+            atom_type = AtomType.from_string(atom_type)
+        if not subtypes:
+            return map(self._materialize, self._scan_type(_TYPE_CODES[atom_type]))
+        return map(self._materialize, chain.from_iterable(
+            self._scan_type(_TYPE_CODES[t]) for t in AtomType.get_subtypes(atom_type)))
+    
+    def count_atoms(self) -> int:
+        """Count all atoms"""
+        return self._count
+    
+    def count_nodes(self) -> int:
+        """Count all nodes"""
+        counts = self._type_counts
+        return sum(counts[code] for code in _NODE_CODES)
+    
+    def count_links(self) -> int:
+        """Count all links"""
+        return self._count - self.count_nodes()
+    
+    def count_by_type(self, atom_type: Union[AtomType, str], subtypes: bool = False) -> int:
+        """Count the atoms of a specific type"""
+        if isinstance(atom_type, str):
+            atom_type = AtomType.from_string(atom_type)
+        counts = self._type_counts
+        if not subtypes:
+            return counts[_TYPE_CODES[atom_type]]
+        return sum(counts[_TYPE_CODES[t]] for t in AtomType.get_subtypes(atom_type))
+    
+    def get_truth_values(
+        self,
+        atom_type: Optional[Union[AtomType, str]] = None,
+        subtypes: bool = False,
+        handles=None,
+    ):
+        """
+        Get the truth values of many atoms as NumPy arrays.
+        
+        Takes the same arguments as AtomSpace.get_truth_values. Matching
+        handles are found by a vectorized scan of the type column.
+        
+        Returns:
+            A (handles, strengths, confidences) tuple of NumPy arrays
+        """
+        np = require_numpy()
+        if handles is None:
+            types = np.frombuffer(self._types, dtype=np.uint8)
+            if atom_type is None:
+                handles = np.flatnonzero(types != _DEAD)
+            else:
+                if isinstance(atom_type, str):
+                    atom_type = AtomType.from_string(atom_type)
+                selected = AtomType.get_subtypes(atom_type) if subtypes else (atom_type,)
+                handles = np.flatnonzero(np.isin(types, [_TYPE_CODES[t] for t in selected]))
+        else:
+            handles = np.asarray(handles, dtype=np.int64)
+        strengths, confidences = self._truth_values.get_many(handles)
+        return handles, strengths, confidences
+    
+    def set_truth_values(self, handles, strengths, confidences):
+        """Set the truth values of many atoms at once; see AtomSpace.set_truth_values"""
+        self._truth_values.set_many(handles, strengths, confidences)
+    
+    def get_attention_value(self, atom: Atom) -> AttentionValue:
+        """Get a copy of the attention value of an atom"""
+        return self._attention.get(self._handle_of(atom))
+    
+    def set_attention_value(self, atom: Atom, attention_value: AttentionValue):
+        """Set the attention value of an atom"""
+        self._attention.set(self._handle_of(atom), attention_value)
+    
+    def stimulate(self, atom: Atom, amount: float):
+        """Add to the short-term importance of an atom"""
+        self._attention.stimulate(self._handle_of(atom), amount)
+    
+    def get_attention_values(self, handles=None):
+        """
+        Get the attention values of many atoms as NumPy arrays.
+        
+        Takes the same arguments as AtomSpace.get_attention_values.
+        
+        Returns:
+            A (handles, stis, ltis) tuple of NumPy arrays
+        """
+        np = require_numpy()
+        if handles is None:
+            handles = np.flatnonzero(np.frombuffer(self._types, dtype=np.uint8) != _DEAD)
+        else:
+            handles = np.asarray(handles, dtype=np.int64)
+        stis, ltis = self._attention.get_many(handles)
+        return handles, stis, ltis
+    
+    def set_attention_values(self, handles, stis=None, ltis=None):
+        """Set the attention values of many atoms at once; see AtomSpace.set_attention_values"""
+        self._attention.set_many(handles, stis, ltis)
+    
+    def get_attentional_focus(self, count: int) -> List[Atom]:
+        """Get up to count atoms, highest short-term importance first"""
+        np = require_numpy()
+        handles, stis, _ = self.get_attention_values()
+        if count < len(handles):
+            top = np.argpartition(-stis, count)[:count]
+            handles, stis = handles[top], stis[top]
+        order = np.argsort(-stis, kind="stable")
+        return [self._materialize(handle) for handle in handles[order].tolist()]
+    
+    def get_adjacency(self):
+        """
+        Get every link-to-outgoing-atom edge as NumPy arrays.
+        
+        Read straight from the outgoing CSR arrays.
+        
+        Returns:
+            A (links, targets) tuple of handle arrays
+        """
+        np = require_numpy()
+        offsets = np.frombuffer(self._out_offsets, dtype=np.int64)
+        sources = np.repeat(np.arange(len(self._types), dtype=np.int64), np.diff(offsets))
+        targets = np.frombuffer(self._out_targets, dtype=np.int64)
+        live = np.frombuffer(self._types, dtype=np.uint8)[sources] != _DEAD
+        return sources[live], targets[live]
+    
+    def __len__(self) -> int:
+        """Return the number of atoms in the AtomSpace"""
+        return self._count
+    
+    def __repr__(self) -> str:
+        return f"ColumnarAtomSpace(atoms={self._count})"
+    
+    def _append_row(self, code: int, string_id: int, outgoing: Sequence[int],
+                    truth_value: Optional[TruthValue]) -> int:
+        """Append a new atom row and return its handle"""
+        if self._mapped:
+            self._thaw()
+        handle = len(self._types)
+        self._types.append(code)
+        self._name_ids.append(string_id)
+        self._truth_values.set(handle, truth_value)
+        self._attention.set(handle)
+        self._out_targets.extend(outgoing)
+        self._out_offsets.append(len(self._out_targets))
+        self._in_head.append(-1)
+        self._version += 1
+        self._count += 1
+        self._type_counts[code] += 1
+        return handle
+    
+    def _kill(self, handle: int):
+        """Tombstone a row and drop it from the deduplication tables"""
+        code = self._types[handle]
+        string_id = self._name_ids[handle]
+        if string_id >= 0:
+            self._node_table.remove(hash((code, string_id)), handle)
+        else:
+            self._link_table.remove(hash((code, self._outgoing_handles(handle))), handle)
+        self._types[handle] = _DEAD
+        self._attention.set(handle)
+        self._version += 1
+        self._count -= 1
+        self._type_counts[code] -= 1
+        self._cache.pop(handle, None)
+    
+    def _owns(self, atom: Atom) -> bool:
+        """Check whether an atom is a live atom of this AtomSpace"""
+        return (isinstance(atom, (_ColumnarNode, _ColumnarLink)) and
+                atom._space is self and
+                atom.id < len(self._types) and
+                self._types[atom.id] != _DEAD)
+    
+    def _handle_of(self, atom: Atom) -> int:
+        """Get the handle of an outgoing atom, checking it belongs here"""
+        if not self._owns(atom):
+            raise ValueError(f"{atom!r} is not an atom of this ColumnarAtomSpace")
+        return atom.id
+    
+    def _outgoing_handles(self, handle: int) -> tuple:
+        """Get the outgoing handles of a row"""
+        return tuple(self._out_targets[self._out_offsets[handle]:self._out_offsets[handle + 1]])
+    
+    def _incoming_handles(self, handle: int) -> List[int]:
+        """Get the handles of live links pointing at a row"""
+        types = self._types
+        result = []
+        if handle + 1 < len(self._in_offsets):
+            for i in range(self._in_offsets[handle], self._in_offsets[handle + 1]):
+                source = self._in_sources[i]
+                if types[source] != _DEAD:
+                    result.append(source)
+        entry = self._in_head[handle] if self._in_delta else -1
+        while entry >= 0:
+            source = self._in_delta[entry]
+            if types[source] != _DEAD:
+                result.append(source)
+            entry = self._in_next[entry]
+        # A link holding the atom at several positions has several entries
+        return list(dict.fromkeys(result))
+    
+    def _scan_type(self, code: int) -> Iterator[int]:
+        """Iterate over the handles of all rows with a type code"""
+        types = self._types
+        needle = bytes((code,))
+        handle = types.find(needle)
+        while handle >= 0:
+            yield handle
+            handle = types.find(needle, handle + 1)
+    
+    def _node_matcher(self, code: int, string_id: int) -> Callable[[int], bool]:
+        types = self._types
+        name_ids = self._name_ids
+        return lambda handle: types[handle] == code and name_ids[handle] == string_id
+    
+    def _link_matcher(self, code: int, handles: tuple) -> Callable[[int], bool]:
+        types = self._types
+        return lambda handle: types[handle] == code and self._outgoing_handles(handle) == handles
+    
+    def _find_string(self, name: str) -> int:
+        """Get the id of an interned string, or -1"""
+        encoded = name.encode("utf-8")
+        pool = self._pool
+        offsets = self._pool_offsets
+        # A CRC rather than hash(), which changes from process to process,
+        # so that snapshots can store the string table as it is
+        return self._strings.find(
+            zlib.crc32(encoded),
+            lambda string_id: pool[offsets[string_id]:offsets[string_id + 1]] == encoded,
+        )
+    
+    def _intern(self, name: str) -> int:
+        """Get the id of a string, adding it to the pool if needed"""
+        string_id = self._find_string(name)
+        if string_id < 0:
+            if self._mapped:
+                self._thaw()
+            encoded = name.encode("utf-8")
+            string_id = len(self._pool_offsets) - 1
+            self._pool += encoded
+            self._pool_offsets.append(len(self._pool))
+            self._strings.insert(zlib.crc32(encoded), string_id)
+        return string_id
+    
+    def _name(self, string_id: int) -> str:
+        """Decode an interned string"""
+        offsets = self._pool_offsets
+        return str(self._pool[offsets[string_id]:offsets[string_id + 1]], "utf-8")
+    
+    def _thaw(self):
+        """Copy the columns of a mapped snapshot into arrays of their own"""
+        def copy(column):
+            copied = array(column.format)
+            copied.frombytes(column.cast("B"))
+            return copied
+        
+        self._types = bytearray(self._types)
+        self._pool = bytearray(self._pool)
+        for name in ("_name_ids", "_out_offsets", "_out_targets", "_in_offsets", "_in_sources", "_pool_offsets"):
+            setattr(self, name, copy(getattr(self, name)))
+        for table in (self._strings, self._node_table, self._link_table):
+            table._hashes = copy(table._hashes)
+            table._handles = copy(table._handles)
+        self._truth_values._strength = copy(self._truth_values._strength)
+        self._truth_values._confidence = copy(self._truth_values._confidence)
+        self._attention._sti = copy(self._attention._sti)
+        self._attention._lti = copy(self._attention._lti)
+        self._in_head = array("q", [-1]) * len(self._types)
+        self._mapped = False
+    
+    def _rebuild_tables(self):
+        """Rebuild the node and link deduplication tables from the columns"""
+        self._node_table = _HandleTable()
+        self._link_table = _HandleTable()
+        types = self._types
+        name_ids = self._name_ids
+        for handle in range(len(types)):
+            code = types[handle]
+            if code == _DEAD:
+                continue
+            string_id = name_ids[handle]
+            if string_id >= 0:
+                self._node_table.insert(hash((code, string_id)), handle)
+            else:
+                self._link_table.insert(hash((code, self._outgoing_handles(handle))), handle)
+    
+    def _materialize(self, handle: int) -> Atom:
+        """
+        Get the Node or Link object for a row.
+        
+        Links are built after their outgoing atoms, from an explicit stack
+        rather than by recursion, so link-of-link chains of any depth can
+        be materialized.
+        """
+        cache = self._cache
+        atom = cache.get(handle)
+        if atom is not None:
+            return atom
+        
+        # Atoms made so far, kept alive until the links above hold them
+        made: Dict[int, Atom] = {}
+        stack = [handle]
+        while stack:
+            top = stack[-1]
+            if top in made:
+                stack.pop()
+                continue
+            atom_type = _TYPES[self._types[top]]
+            string_id = self._name_ids[top]
+            if string_id >= 0:
+                atom = _ColumnarNode.__new__(_ColumnarNode)
+                atom.name = self._name(string_id)
+                atom._hash = hash((atom_type, atom.name))
+            else:
+                outgoing = []
+                missing = []
+                for target in self._outgoing_handles(top):
+                    child = made.get(target)
+                    if child is None:
+                        child = made[target] = cache.get(target)
+                        if child is None:
+                            del made[target]
+                            missing.append(target)
+                    outgoing.append(child)
+                if missing:
+                    # Visit the link again once its outgoing atoms exist
+                    stack.extend(missing)
+                    continue
+                atom = _ColumnarLink.__new__(_ColumnarLink)
+                atom.outgoing = tuple(outgoing)
+                atom._hash = hash((atom_type, atom.outgoing))
+            atom.id = top
+            atom.type = atom_type
+            atom._space = self
+            cache[top] = made[top] = atom
+            stack.pop()
+        return made[handle]
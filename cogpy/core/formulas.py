@@ -0,0 +1,136 @@
+"""
+Truth value formulas for probabilistic inference
+
+Every formula takes NumPy arrays (or scalars) of strengths and confidences
+and works elementwise, so one call computes the conclusions of many sets
+of premises. Results are clipped to [0, 1].
+"""
+
+from typing import Tuple
+
+from cogpy.core.truthvalue import require_numpy
+
+
+# Evidence count at which confidence reaches 0.5 (PLN's "personality"
+# parameter k)
+DEFAULT_K = 800.0
+
+# Confidences are capped below 1 when converted to evidence counts, so a
+# fully confident truth value has a large but finite count
+_MAX_CONFIDENCE = 1.0 - 1e-9
+
+# Strengths closer than this to 0 or 1 are treated as 0 or 1
+_EPSILON = 1e-9
+
+
+def confidence_to_count(confidence, k: float = DEFAULT_K):
+    """Convert confidences to evidence counts, n = k * c / (1 - c)"""
+    np = require_numpy()
+    confidence = np.clip(confidence, 0.0, _MAX_CONFIDENCE)
+    return k * confidence / (1.0 - confidence)
+
+
+def count_to_confidence(count, k: float = DEFAULT_K):
+    """Convert evidence counts to confidences, c = n / (n + k)"""
+    return count / (count + k)
+
+
+def deduction(s_ab, c_ab, s_bc, c_bc, s_b, s_c) -> Tuple:
+    """
+    Deduce A -> C from A -> B and B -> C.
+    
+    Uses the independence-based PLN deduction formula:
+    s_ac = s_ab * s_bc + (1 - s_ab) * (s_c - s_b * s_bc) / (1 - s_b).
+    When B is (almost) certain, as with a node's default truth value, the
+    second term is undefined and s_ac = s_ab * s_bc, the strength of the
+    path through B alone. The conclusion is as confident as the weaker
+    premise.
+    
+    Args:
+        s_ab, c_ab: Strength and confidence of A -> B
+        s_bc, c_bc: Strength and confidence of B -> C
+        s_b, s_c: Strengths of the terms B and C
+    
+    Returns:
+        The strengths and confidences of A -> C
+    """
+    np = require_numpy()
+    s_ab, s_bc, s_b, s_c = np.broadcast_arrays(*(np.asarray(x, dtype=np.float64) for x in (s_ab, s_bc, s_b, s_c)))
+    rest = 1.0 - s_b
+    through_b = s_ab * s_bc
+    with np.errstate(divide="ignore", invalid="ignore"):
+        strength = through_b + (1.0 - s_ab) * (s_c - s_b * s_bc) / rest
+    strength = np.where(rest < _EPSILON, through_b, strength)
+    return np.clip(strength, 0.0, 1.0), np.minimum(c_ab, c_bc)
+
+
+def inversion(s_ab, c_ab, s_a, s_b) -> Tuple:
+    """
+    Invert A -> B into B -> A with Bayes' rule, s_ba = s_ab * s_a / s_b.
+    
+    Args:
+        s_ab, c_ab: Strength and confidence of A -> B
+        s_a, s_b: Strengths of the terms A and B
+    
+    Returns:
+        The strengths and confidences of B -> A
+    """
+    np = require_numpy()
+    s_ab, s_a, s_b = np.broadcast_arrays(*(np.asarray(x, dtype=np.float64) for x in (s_ab, s_a, s_b)))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        strength = s_ab * s_a / s_b
+    strength = np.where(s_b < _EPSILON, 0.0, strength)
+    return np.clip(strength, 0.0, 1.0), np.broadcast_to(c_ab, strength.shape).copy()
+
+
+def revision(s1, c1, s2, c2, k: float = DEFAULT_K) -> Tuple:
+    """
+    Merge two independent truth values for the same statement.
+    
+    Strengths are averaged weighted by evidence count, and the counts add.
+    
+    Args:
+        s1, c1: Strength and confidence of the first truth value
+        s2, c2: Strength and confidence of the second truth value
+        k: Evidence count at which confidence reaches 0.5
+    
+    Returns:
+        The merged strengths and confidences
+    """
+    np = require_numpy()
+    n1 = confidence_to_count(c1, k)
+    n2 = confidence_to_count(c2, k)
+    total = n1 + n2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        strength = (s1 * n1 + s2 * n2) / total
+    # With no evidence on either side keep the plain average
+    strength = np.where(total > 0, strength, (np.asarray(s1) + s2) / 2.0)
+    return np.clip(strength, 0.0, 1.0), count_to_confidence(total, k)
+
+
+def revise_groups(groups, strengths, confidences, group_count: int, k: float = DEFAULT_K) -> Tuple:
+    """
+    Merge many truth values per statement in one pass.
+    
+    Generalizes revision to any number of truth values: within each group
+    strengths are averaged weighted by evidence count and counts add.
+    
+    Args:
+        groups: Array of group numbers in range(group_count), one per
+            truth value
+        strengths, confidences: Arrays of the truth values to merge
+        group_count: Number of groups
+        k: Evidence count at which confidence reaches 0.5
+    
+    Returns:
+        The merged strengths and confidences of each group
+    """
+    np = require_numpy()
+    counts = confidence_to_count(confidences, k)
+    total = np.bincount(groups, weights=counts, minlength=group_count)
+    weighted = np.bincount(groups, weights=np.asarray(strengths) * counts, minlength=group_count)
+    plain = np.bincount(groups, weights=strengths, minlength=group_count)
+    members = np.bincount(groups, minlength=group_count)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        strength = np.where(total > 0, weighted / total, plain / np.maximum(members, 1))
+    return np.clip(strength, 0.0, 1.0), count_to_confidence(total, k)
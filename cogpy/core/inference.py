@@ -0,0 +1,624 @@
+"""
+Rule-based inference over an AtomSpace
+"""
+
+import heapq
+import time
+from itertools import count
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple, Union
+
+from cogpy.core.atom import Atom, Link, Node
+from cogpy.core.formulas import DEFAULT_K, deduction, inversion, revise_groups, revision
+from cogpy.core.pattern import Bindings, is_variable
+from cogpy.core.types import AtomType
+from cogpy.core.truthvalue import TruthValue, require_numpy
+
+
+Premises = Tuple[Link, ...]
+# A conclusion is named by its link type and outgoing set
+Conclusion = Tuple[AtomType, Tuple[Atom, ...]]
+# A goal is a binary link with each end a handle, or None when unknown
+Goal = Tuple[AtomType, Optional[int], Optional[int]]
+# Proved links by (source handle, target handle), with strength and confidence
+Answers = Dict[Tuple[int, int], Tuple[float, float]]
+
+
+def _truth_values(atomspace, atoms: Sequence[Atom]):
+    """Get the strengths and confidences of atoms as arrays"""
+    _, strengths, confidences = atomspace.get_truth_values(handles=[atom.id for atom in atoms])
+    return strengths, confidences
+
+
+def _term_strengths(atomspace, handles: Sequence[int]):
+    """Get the strengths of atoms by handle as an array"""
+    return atomspace.get_truth_values(handles=handles)[1]
+
+
+def _is_binary(link: Link) -> bool:
+    """Check that a link relates two different atoms"""
+    outgoing = link.outgoing
+    return len(outgoing) == 2 and outgoing[0].id != outgoing[1].id
+
+
+class Rule:
+    """
+    Base class for inference rules.
+    
+    A rule finds the premise sets a batch of source links take part in and
+    names the conclusion of each. Its formula computes the truth values of many
+    conclusions at once from arrays of premise truth values. For backward
+    chaining, a rule also proves a goal from the answers to its subgoals.
+    """
+    
+    name = "rule"
+    
+    def __init__(self, link_type: Union[AtomType, str] = AtomType.INHERITANCE_LINK):
+        """
+        Initialize a rule.
+        
+        Args:
+            link_type: Type of the links the rule reasons about
+        """
+        if isinstance(link_type, str):
+            link_type = AtomType.from_string(link_type)
+        self.link_type = link_type
+    
+    def premises(self, atomspace, sources: Sequence[Link]) -> Iterable[Premises]:
+        """Yield every premise set that includes a source link, once each"""
+        raise NotImplementedError
+    
+    def conclusion(self, premises: Premises) -> Conclusion:
+        """Get the conclusion of a premise set"""
+        raise NotImplementedError
+    
+    def formula(self, atomspace, premise_sets: Sequence[Premises]):
+        """
+        Compute the truth values of the conclusions of many premise sets.
+        
+        Returns:
+            Arrays of strengths and confidences, one per premise set
+        """
+        raise NotImplementedError
+    
+    def backward(self, chainer: "BackwardChainer", goal: Goal, depth: int):
+        """
+        Prove a goal from subgoals, solved with chainer.prove(subgoal, depth).
+        
+        Returns:
+            The (source, target) handle pairs proved and arrays of their
+            strengths and confidences
+        """
+        raise NotImplementedError
+    
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.link_type.value})"
+
+
+class DeductionRule(Rule):
+    """A -> B, B -> C |- A -> C"""
+    
+    name = "deduction"
+    
+    def premises(self, atomspace, sources: Sequence[Link]) -> Iterable[Premises]:
+        link_type = self.link_type
+        batch = {source.id for source in sources}
+        for source in sources:
+            if source.type is not link_type or not _is_binary(source):
+                continue
+            a, b = source.outgoing
+            a_id, b_id = a.id, b.id
+            # The source as A -> B
+            for bc in atomspace.iter_incoming(b, link_type, 0):
+                outgoing = bc.outgoing
+                if len(outgoing) == 2 and outgoing[1].id != a_id and outgoing[1].id != b_id:
+                    yield (source, bc)
+            # The source as B -> C, unless A -> B is in the batch and has
+            # already paired with it
+            for ab in atomspace.iter_incoming(a, link_type, 1):
+                outgoing = ab.outgoing
+                if (ab.id not in batch and len(outgoing) == 2 and
+                        outgoing[0].id != b_id and outgoing[0].id != a_id):
+                    yield (ab, source)
+    
+    def conclusion(self, premises: Premises) -> Conclusion:
+        ab, bc = premises
+        return (self.link_type, (ab.outgoing[0], bc.outgoing[1]))
+    
+    def formula(self, atomspace, premise_sets: Sequence[Premises]):
+        s_ab, c_ab = _truth_values(atomspace, [ab for ab, _ in premise_sets])
+        s_bc, c_bc = _truth_values(atomspace, [bc for _, bc in premise_sets])
+        s_b, _ = _truth_values(atomspace, [ab.outgoing[1] for ab, _ in premise_sets])
+        s_c, _ = _truth_values(atomspace, [bc.outgoing[1] for _, bc in premise_sets])
+        return deduction(s_ab, c_ab, s_bc, c_bc, s_b, s_c)
+    
+    def backward(self, chainer: "BackwardChainer", goal: Goal, depth: int):
+        link_type, a, c = goal
+        pairs = []  # (a, b, c) handles
+        first, second = [], []
+        if a is not None or c is None:
+            # Work forwards from A: A -> B, then B -> C for each B found
+            for (a_id, b), ab in chainer.prove((link_type, a, None), depth).items():
+                if b == c:
+                    continue
+                for (_, c_id), bc in chainer.prove((link_type, b, c), depth).items():
+                    if c_id != a_id:
+                        pairs.append((a_id, b, c_id))
+                        first.append(ab)
+                        second.append(bc)
+        else:
+            # Work backwards from C: B -> C, then A -> B for each B found
+            for (b, c_id), bc in chainer.prove((link_type, None, c), depth).items():
+                for (a_id, _), ab in chainer.prove((link_type, None, b), depth).items():
+                    if a_id != c_id:
+                        pairs.append((a_id, b, c_id))
+                        first.append(ab)
+                        second.append(bc)
+        if not pairs:
+            return [], (), ()
+        
+        np = require_numpy()
+        s_ab, c_ab = np.array(first, dtype=np.float64).T
+        s_bc, c_bc = np.array(second, dtype=np.float64).T
+        atomspace = chainer.atomspace
+        s_b = _term_strengths(atomspace, [b for _, b, _ in pairs])
+        s_c = _term_strengths(atomspace, [c_id for _, _, c_id in pairs])
+        strengths, confidences = deduction(s_ab, c_ab, s_bc, c_bc, s_b, s_c)
+        return [(a_id, c_id) for a_id, _, c_id in pairs], strengths, confidences
+
+
+class InversionRule(Rule):
+    """A -> B |- B -> A"""
+    
+    name = "inversion"
+    
+    def premises(self, atomspace, sources: Sequence[Link]) -> Iterable[Premises]:
+        for source in sources:
+            if source.type is self.link_type and _is_binary(source):
+                yield (source,)
+    
+    def conclusion(self, premises: Premises) -> Conclusion:
+        a, b = premises[0].outgoing
+        return (self.link_type, (b, a))
+    
+    def formula(self, atomspace, premise_sets: Sequence[Premises]):
+        links = [premises[0] for premises in premise_sets]
+        s_ab, c_ab = _truth_values(atomspace, links)
+        s_a, _ = _truth_values(atomspace, [ab.outgoing[0] for ab in links])
+        s_b, _ = _truth_values(atomspace, [ab.outgoing[1] for ab in links])
+        return inversion(s_ab, c_ab, s_a, s_b)
+    
+    def backward(self, chainer: "BackwardChainer", goal: Goal, depth: int):
+        link_type, a, b = goal
+        # B -> A proves A -> B
+        answers = chainer.prove((link_type, b, a), depth)
+        if not answers:
+            return [], (), ()
+        
+        np = require_numpy()
+        keys = [(a_id, b_id) for b_id, a_id in answers]
+        s_ba, c_ba = np.array(list(answers.values()), dtype=np.float64).T
+        atomspace = chainer.atomspace
+        s_b = _term_strengths(atomspace, [b_id for _, b_id in keys])
+        s_a = _term_strengths(atomspace, [a_id for a_id, _ in keys])
+        strengths, confidences = inversion(s_ba, c_ba, s_b, s_a)
+        return keys, strengths, confidences
+
+
+# Rules by name
+_RULES: Dict[str, Rule] = {}
+
+
+def register_rule(rule: Rule, name: Optional[str] = None) -> Rule:
+    """
+    Register a rule so chainers can refer to it by name.
+    
+    Args:
+        rule: The rule
+        name: Name to register it under (default: rule.name)
+    
+    Returns:
+        The rule
+    """
+    _RULES[name or rule.name] = rule
+    return rule
+
+
+def get_rule(name: str) -> Rule:
+    """Get a registered rule by name"""
+    rule = _RULES.get(name)
+    if rule is None:
+        raise ValueError(f"Unknown rule: {name}")
+    return rule
+
+
+def get_rule_names() -> List[str]:
+    """Get the names of every registered rule"""
+    return list(_RULES)
+
+
+register_rule(DeductionRule())
+register_rule(InversionRule())
+
+
+class ForwardChainer:
+    """
+    Derives new links from the links of an AtomSpace.
+    
+    Source links wait on a priority agenda, highest strength * confidence
+    first. Each step pops a batch of sources, collects every premise set
+    the rules find around them, and evaluates each rule's formula once over
+    arrays of all the premise truth values. Conclusions derived more than
+    once are merged by revision, conclusions that already exist are revised
+    with the new evidence, and new conclusions join the agenda.
+    
+    A premise set fires at most once per rule, so chaining ends when no
+    new premise sets are left. Requires NumPy.
+    """
+    
+    def __init__(
+        self,
+        atomspace,
+        rules: Iterable[Union[Rule, str]] = ("deduction",),
+        sources: Optional[Iterable[Link]] = None,
+        batch_size: int = 1024,
+        k: float = DEFAULT_K,
+    ):
+        """
+        Initialize a forward chainer.
+        
+        Args:
+            atomspace: The AtomSpace to reason over
+            rules: Rules, or names of registered rules
+            sources: Links to start from; every link of the rules' link
+                types if None
+            batch_size: Number of sources fired per step
+            k: Evidence count at which confidence reaches 0.5, for revision
+        """
+        require_numpy()
+        self.atomspace = atomspace
+        self.rules = [get_rule(rule) if isinstance(rule, str) else rule for rule in rules]
+        self.batch_size = batch_size
+        self.k = k
+        self._agenda: List[Tuple[float, int, int]] = []  # (-priority, sequence, handle)
+        self._sequence = count()
+        self._fired: Dict[str, set] = {}  # rule name -> premise handles
+        # handle -> (strength, confidence) this chainer gave every link it
+        # derived or revised, for BackwardChainer's derived option
+        self.derived: Dict[int, Tuple[float, float]] = {}
+        
+        if sources is None:
+            link_types = dict.fromkeys(rule.link_type for rule in self.rules)
+            sources = [link for link_type in link_types for link in atomspace.iter_by_type(link_type)]
+        self.add_sources(sources)
+    
+    def add_sources(self, atoms: Iterable[Atom]):
+        """Put atoms on the agenda, prioritized by strength * confidence"""
+        atoms = list(atoms)
+        if not atoms:
+            return
+        strengths, confidences = _truth_values(self.atomspace, atoms)
+        agenda = self._agenda
+        sequence = self._sequence
+        entries = [(-priority, next(sequence), atom.id)
+                   for atom, priority in zip(atoms, (strengths * confidences).tolist())]
+        if len(entries) > len(agenda):
+            # Rebuilding the heap is cheaper than pushing one at a time
+            agenda.extend(entries)
+            heapq.heapify(agenda)
+        else:
+            for entry in entries:
+                heapq.heappush(agenda, entry)
+    
+    def __len__(self) -> int:
+        """Return the number of sources waiting on the agenda"""
+        return len(self._agenda)
+    
+    def step(self) -> List[Link]:
+        """
+        Fire the rules on the next batch of sources.
+        
+        Returns:
+            The new links derived
+        """
+        atomspace = self.atomspace
+        agenda = self._agenda
+        batch = {}
+        while agenda and len(batch) < self.batch_size:
+            handle = heapq.heappop(agenda)[2]
+            atom = atomspace.get_atom_by_id(handle)
+            # Sources may have been removed since they were queued
+            if atom is not None:
+                batch[handle] = atom
+        
+        sources = list(batch.values())
+        created = []
+        for rule in self.rules:
+            fired = self._fired.setdefault(rule.name, set())
+            premise_sets = []
+            for premises in rule.premises(atomspace, sources):
+                key = tuple([premise.id for premise in premises])
+                if key not in fired:
+                    fired.add(key)
+                    premise_sets.append(premises)
+            if premise_sets:
+                strengths, confidences = rule.formula(atomspace, premise_sets)
+                created.extend(self._conclude(rule, premise_sets, strengths, confidences))
+        
+        self.add_sources(created)
+        return created
+    
+    def run(self, max_steps: Optional[int] = None, max_conclusions: Optional[int] = None) -> List[Link]:
+        """
+        Step until the agenda is empty or a limit is reached.
+        
+        Args:
+            max_steps: Maximum number of steps
+            max_conclusions: Stop once this many new links are derived
+        
+        Returns:
+            The new links derived
+        """
+        created = []
+        steps = 0
+        while self._agenda and (max_steps is None or steps < max_steps):
+            created.extend(self.step())
+            steps += 1
+            if max_conclusions is not None and len(created) >= max_conclusions:
+                break
+        return created
+    
+    def _conclude(self, rule: Rule, premise_sets: Sequence[Premises], strengths, confidences) -> List[Link]:
+        """Add or revise the conclusions of fired premise sets"""
+        np = require_numpy()
+        atomspace = self.atomspace
+        
+        # Merge conclusions derived from several premise sets, keyed by
+        # handles so that grouping does not compare atoms
+        groups: Dict[tuple, int] = {}
+        conclusions: List[Conclusion] = []
+        group_of = []
+        for premises in premise_sets:
+            conclusion = rule.conclusion(premises)
+            key = (conclusion[0], tuple([atom.id for atom in conclusion[1]]))
+            group = groups.get(key)
+            if group is None:
+                group = groups[key] = len(conclusions)
+                conclusions.append(conclusion)
+            group_of.append(group)
+        strengths, confidences = revise_groups(
+            np.array(group_of, dtype=np.int64), strengths, confidences, len(conclusions), self.k)
+        
+        existing = [atomspace.get_link(link_type, outgoing) for link_type, outgoing in conclusions]
+        old = [i for i, link in enumerate(existing) if link is not None]
+        new = [i for i, link in enumerate(existing) if link is None]
+        if old:
+            handles = np.array([existing[i].id for i in old], dtype=np.int64)
+            _, old_strengths, old_confidences = atomspace.get_truth_values(handles=handles)
+            atomspace.set_truth_values(handles, *revision(
+                old_strengths, old_confidences, strengths[old], confidences[old], self.k))
+            self._record(handles)
+        if not new:
+            return []
+        created = atomspace.add_links([conclusions[i] for i in new])
+        handles = [link.id for link in created]
+        atomspace.set_truth_values(handles, strengths[new], confidences[new])
+        self._record(handles)
+        return created
+    
+    def _record(self, handles):
+        """Remember the truth values just given to links, as stored"""
+        handles, strengths, confidences = self.atomspace.get_truth_values(handles=handles)
+        self.derived.update(zip(handles.tolist(), zip(strengths.tolist(), confidences.tolist())))
+
+
+class BackwardChainer:
+    """
+    Answers queries by goal-directed proof search.
+    
+    A query is a binary link template such as InheritanceLink(cat, $X).
+    Links already in the AtomSpace answer a goal directly, and each rule
+    proves it from subgoals, e.g. deduction proves A -> C from A -> B and
+    B -> C. Every derivation of the same link is merged by revision, and
+    with the link if it is in the AtomSpace, unless the link still holds
+    the truth value a ForwardChainer gave it (see the derived option): that
+    value already includes the derivations, and is the answer as it stands.
+    
+    Subgoals are tabled: within a query each goal is solved once and its
+    answers are reused wherever it recurs, so shared subproofs are not
+    repeated. A goal met again while it is still being solved contributes
+    the answers found so far, which keeps cyclic proofs finite. Each query
+    has a depth budget (rule applications along any proof) and an optional
+    time budget; when time runs out, the goals still open are answered
+    from what has been found so far. Requires NumPy.
+    """
+    
+    def __init__(
+        self,
+        atomspace,
+        rules: Iterable[Union[Rule, str]] = ("deduction",),
+        max_depth: int = 3,
+        time_limit: Optional[float] = None,
+        k: float = DEFAULT_K,
+        derived: Optional[Mapping[int, Tuple[float, float]]] = None,
+    ):
+        """
+        Initialize a backward chainer.
+        
+        Args:
+            atomspace: The AtomSpace to reason over
+            rules: Rules, or names of registered rules
+            max_depth: Default maximum number of rule applications along
+                a proof
+            time_limit: Default time budget per query, in seconds
+            k: Evidence count at which confidence reaches 0.5, for revision
+            derived: Truth values by handle that forward chaining gave
+                links, e.g. ForwardChainer.derived; links that still hold
+                them are not revised with their derivations again
+        """
+        require_numpy()
+        self.atomspace = atomspace
+        self.rules = [get_rule(rule) if isinstance(rule, str) else rule for rule in rules]
+        self.derived = {} if derived is None else derived
+        self.max_depth = max_depth
+        self.time_limit = time_limit
+        self.k = k
+        # Whether the last query ran out of time
+        self.timed_out = False
+        self._table: Dict[Goal, Tuple[int, Answers]] = {}  # goal -> (depth budget, answers)
+        self._active = set()
+        self._deadline: Optional[float] = None
+    
+    def query(
+        self,
+        template: Link,
+        max_depth: Optional[int] = None,
+        time_limit: Optional[float] = None,
+    ) -> List[Tuple[Bindings, TruthValue]]:
+        """
+        Answer a query.
+        
+        Args:
+            template: A binary link whose ends are nodes or VariableNodes,
+                e.g. InheritanceLink(cat, $X)
+            max_depth: Maximum number of rule applications along a proof
+                (default: the chainer's max_depth)
+            time_limit: Time budget in seconds (default: the chainer's
+                time_limit; None for no limit)
+        
+        Returns:
+            (bindings, truth value) pairs, strongest strength * confidence
+            first; bindings map variable names to atoms
+        """
+        if (not isinstance(template, Link) or len(template.outgoing) != 2 or
+                not all(isinstance(atom, Node) for atom in template.outgoing)):
+            raise ValueError("Query must be a binary link between nodes or variables")
+        if max_depth is None:
+            max_depth = self.max_depth
+        if time_limit is None:
+            time_limit = self.time_limit
+        
+        ends = []
+        for atom in template.outgoing:
+            if is_variable(atom):
+                ends.append(None)
+                continue
+            found = self.atomspace.get_node_by_name(atom.name, atom.type)
+            if found is None:
+                return []
+            ends.append(found.id)
+        
+        self._table = {}
+        self._active = set()
+        self._deadline = None if time_limit is None else time.monotonic() + time_limit
+        self.timed_out = False
+        try:
+            answers = self.prove((template.type, ends[0], ends[1]), max_depth)
+        finally:
+            self._table = {}
+            self._active = set()
+        
+        first, second = template.outgoing
+        get_atom = self.atomspace.get_atom_by_id
+        results = []
+        for (a, b), (strength, confidence) in answers.items():
+            bindings = {}
+            if is_variable(first):
+                bindings[first.name] = get_atom(a)
+            if is_variable(second):
+                if second.name in bindings and a != b:
+                    continue
+                bindings[second.name] = get_atom(b)
+            results.append((bindings, TruthValue(strength, confidence)))
+        results.sort(key=lambda result: -result[1].strength * result[1].confidence)
+        return results
+    
+    def prove(self, goal: Goal, depth: int) -> Answers:
+        """
+        Solve a goal, reusing its tabled answers.
+        
+        Args:
+            goal: (link type, source handle or None, target handle or None)
+            depth: Number of rule applications still allowed
+        
+        Returns:
+            The links proved, by (source, target) handle pair, with their
+            strength and confidence
+        """
+        entry = self._table.get(goal)
+        if entry is not None and (entry[0] >= depth or goal in self._active):
+            return entry[1]
+        
+        answers, settled = self._direct(goal)
+        self._table[goal] = (depth, answers)
+        if depth <= 0 or self._out_of_time():
+            return answers
+        
+        np = require_numpy()
+        self._active.add(goal)
+        try:
+            keys = list(answers)
+            strengths = [answer[0] for answer in answers.values()]
+            confidences = [answer[1] for answer in answers.values()]
+            for rule in self.rules:
+                if rule.link_type is not goal[0]:
+                    continue
+                rule_keys, rule_strengths, rule_confidences = rule.backward(self, goal, depth - 1)
+                if settled:
+                    kept = [i for i, key in enumerate(rule_keys) if key not in settled]
+                    rule_keys = [rule_keys[i] for i in kept]
+                    rule_strengths = np.asarray(rule_strengths)[kept]
+                    rule_confidences = np.asarray(rule_confidences)[kept]
+                keys.extend(rule_keys)
+                strengths.extend(rule_strengths)
+                confidences.extend(rule_confidences)
+        finally:
+            self._active.discard(goal)
+        
+        if len(keys) > len(answers):
+            groups: Dict[Tuple[int, int], int] = {}
+            group_of = [groups.setdefault(key, len(groups)) for key in keys]
+            merged_strengths, merged_confidences = revise_groups(
+                np.array(group_of, dtype=np.int64), np.array(strengths, dtype=np.float64),
+                np.array(confidences, dtype=np.float64), len(groups), self.k)
+            answers = dict(zip(groups, zip(merged_strengths.tolist(), merged_confidences.tolist())))
+        self._table[goal] = (depth, answers)
+        return answers
+    
+    def _direct(self, goal: Goal) -> Tuple[Answers, Set[Tuple[int, int]]]:
+        """
+        Answer a goal from the links in the AtomSpace.
+        
+        Returns:
+            The answers, and those of them that still hold the truth value
+            forward chaining gave them
+        """
+        atomspace = self.atomspace
+        link_type, a, b = goal
+        if a is not None and b is not None:
+            link = atomspace.get_link(link_type, [atomspace.get_atom_by_id(a), atomspace.get_atom_by_id(b)])
+            links = [] if link is None else [link]
+        elif a is not None:
+            links = atomspace.iter_incoming(atomspace.get_atom_by_id(a), link_type, 0)
+        elif b is not None:
+            links = atomspace.iter_incoming(atomspace.get_atom_by_id(b), link_type, 1)
+        else:
+            links = atomspace.iter_by_type(link_type)
+        links = [link for link in links if _is_binary(link)]
+        if not links:
+            return {}, set()
+        _, strengths, confidences = atomspace.get_truth_values(handles=[link.id for link in links])
+        answers = {}
+        settled = set()
+        derived = self.derived
+        for link, truth_value in zip(links, zip(strengths.tolist(), confidences.tolist())):
+            key = (link.outgoing[0].id, link.outgoing[1].id)
+            answers[key] = truth_value
+            if derived and derived.get(link.id) == truth_value:
+                settled.add(key)
+        return answers, settled
+    
+    def _out_of_time(self) -> bool:
+        """Check the query's time budget"""
+        if self._deadline is not None and time.monotonic() > self._deadline:
+            self.timed_out = True
+        return self.timed_out
@@ -0,0 +1,338 @@
+"""
+Pattern matching over an AtomSpace
+"""
+
+from collections import OrderedDict
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from cogpy.core.atom import Atom, Node, Link
+from cogpy.core.types import AtomType
+from cogpy.core.truthvalue import require_numpy
+
+
+Bindings = Dict[str, Atom]
+# Steps from a clause down to an anchor: (link type, position) pairs, with
+# position None below unordered links
+Path = Tuple[Tuple[AtomType, Optional[int]], ...]
+
+
+def is_variable(atom: Atom) -> bool:
+    """Return True if the atom is a pattern variable"""
+    return atom.type is AtomType.VARIABLE_NODE
+
+
+def _shape(atom: Atom, constants: List[Node]):
+    """Get the shape key of a template, appending its constants in order"""
+    if isinstance(atom, Link):
+        return (atom.type, tuple([_shape(child, constants) for child in atom.outgoing]))
+    if is_variable(atom):
+        return atom.name
+    constants.append(atom)
+    return atom.type
+
+
+class _CompiledClause:
+    """The anchors and variables of one clause of a query shape"""
+    
+    __slots__ = ("type", "anchors", "variables")
+    
+    def __init__(self, atom_type: AtomType, anchors: Tuple[Tuple[Union[int, str], Path], ...],
+                 variables: FrozenSet[str]):
+        self.type = atom_type
+        # Each anchor is a constant (by index into the query's constants) or
+        # a variable (by name), with its path from the clause
+        self.anchors = anchors
+        self.variables = variables
+
+
+class PatternMatcher:
+    """
+    Finds the groundings of query templates in an AtomSpace.
+    
+    A template is a link whose outgoing set may contain VariableNodes,
+    e.g. InheritanceLink($X, animal). Templates do not need to be added to
+    the AtomSpace; their constants are looked up by value. Instead of
+    scanning every link of the template's type, matching starts from the
+    constant atom with the fewest incoming links of the right type and
+    position, and grows candidates upwards through the incoming index.
+    
+    A query with several clauses is a conjunction: variables shared between
+    clauses must be bound to the same atom, and variables bound by earlier
+    clauses become anchors for later ones. Clauses are evaluated cheapest
+    first, as estimated from the AtomSpace's live per-type and incoming
+    counts, whatever order they are written in.
+    
+    Compiled queries are cached by shape: the clause structure and variable
+    names, with constants abstracted to their type. Repeated queries of the
+    same shape, even with different constants, skip compilation.
+    
+    With importance_order, the candidates of each clause are tried highest
+    short-term importance first, so the first groundings produced involve
+    the atoms currently in focus.
+    """
+    
+    def __init__(self, atomspace, plan_cache_size: int = 256, importance_order: bool = False):
+        """
+        Initialize the matcher.
+        
+        Args:
+            atomspace: The AtomSpace (or ColumnarAtomSpace) to query
+            plan_cache_size: How many compiled query shapes to keep
+            importance_order: Try candidates highest STI first (requires
+                NumPy)
+        """
+        if importance_order:
+            require_numpy()
+        self.atomspace = atomspace
+        self.plan_cache_size = plan_cache_size
+        self.importance_order = importance_order
+        self._plans: "OrderedDict[tuple, Tuple[_CompiledClause, ...]]" = OrderedDict()
+    
+    def match(
+        self,
+        clauses: Union[Link, Sequence[Link]],
+        bindings: Optional[Bindings] = None,
+    ) -> Iterator[Bindings]:
+        """
+        Iterate over the groundings of a query.
+        
+        Args:
+            clauses: A template link, or a sequence of template links that
+                must all match
+            bindings: Variables that are already bound, by variable name
+        
+        Returns:
+            An iterator of dicts mapping variable names to atoms
+        """
+        if isinstance(clauses, Link):
+            clauses = [clauses]
+        bindings = dict(bindings or {})
+        clauses = list(clauses)
+        plan = self._plan(clauses, bindings)
+        if plan is None:
+            return iter(())
+        ordered, constants = plan
+        return self._match_clauses(ordered, 0, constants, bindings)
+    
+    def match_all(
+        self,
+        clauses: Union[Link, Sequence[Link]],
+        bindings: Optional[Bindings] = None,
+    ) -> List[Bindings]:
+        """
+        Get every grounding of a query.
+        
+        Takes the same arguments as match.
+        """
+        return list(self.match(clauses, bindings))
+    
+    def plan(
+        self,
+        clauses: Union[Link, Sequence[Link]],
+        bindings: Optional[Bindings] = None,
+    ) -> List[Link]:
+        """
+        Get the order in which a query's clauses would be evaluated.
+        
+        Takes the same arguments as match. A query with a constant missing
+        from the AtomSpace has no groundings and is returned as written.
+        """
+        if isinstance(clauses, Link):
+            clauses = [clauses]
+        clauses = list(clauses)
+        plan = self._plan(clauses, dict(bindings or {}))
+        if plan is None:
+            return clauses
+        return [template for template, _ in plan[0]]
+    
+    def clear_plan_cache(self):
+        """Drop every compiled query shape"""
+        self._plans.clear()
+    
+    def _plan(self, clauses: List[Link], bindings: Bindings):
+        """
+        Compile (or fetch) a query and order its clauses.
+        
+        Returns:
+            The (template, compiled clause) pairs in evaluation order and
+            the AtomSpace atoms of the query's constants, or None if a
+            constant is missing from the AtomSpace
+        """
+        constants: List[Node] = []
+        shape = tuple([_shape(clause, constants) for clause in clauses])
+        compiled = self._plans.get(shape)
+        if compiled is None:
+            counter = [0]
+            compiled = tuple([self._compile(clause, counter) for clause in clauses])
+            self._plans[shape] = compiled
+            if len(self._plans) > self.plan_cache_size:
+                self._plans.popitem(last=False)
+        else:
+            self._plans.move_to_end(shape)
+        
+        get_node = self.atomspace.get_node_by_name
+        resolved = [get_node(constant.name, constant.type) for constant in constants]
+        if any(atom is None for atom in resolved):
+            return None
+        
+        bound = set(bindings)
+        remaining = list(range(len(clauses)))
+        ordered = []
+        while remaining:
+            best = min(remaining, key=lambda i: self._estimate(compiled[i], resolved, bound))
+            remaining.remove(best)
+            ordered.append((clauses[best], compiled[best]))
+            bound |= compiled[best].variables
+        return ordered, resolved
+    
+    def _compile(self, clause: Link, counter: List[int]) -> _CompiledClause:
+        """Collect the anchors and variables of a clause"""
+        anchors = []
+        variables = set()
+        
+        def walk(template: Link, path: Path):
+            unordered = AtomType.is_unordered(template.type)
+            for position, child in enumerate(template.outgoing):
+                step = path + ((template.type, None if unordered else position),)
+                if isinstance(child, Link):
+                    walk(child, step)
+                elif is_variable(child):
+                    anchors.append((child.name, step))
+                    variables.add(child.name)
+                else:
+                    # Constants are numbered in the order _shape visits them
+                    anchors.append((counter[0], step))
+                    counter[0] += 1
+        
+        walk(clause, ())
+        return _CompiledClause(clause.type, tuple(anchors), frozenset(variables))
+    
+    def _estimate(self, clause: _CompiledClause, constants: List[Atom], bound: set) -> float:
+        """Estimate how many candidates a clause would produce"""
+        atomspace = self.atomspace
+        cost = None
+        for slot, path in clause.anchors:
+            link_type, position = path[-1]
+            if isinstance(slot, int):
+                count = atomspace.count_incoming(constants[slot], link_type, position)
+            elif slot in bound:
+                # The value is not known yet: use the average incoming count
+                count = atomspace.count_by_type(link_type) / max(1, len(atomspace))
+            else:
+                continue
+            if cost is None or count < cost:
+                cost = count
+        if cost is None:
+            return atomspace.count_by_type(clause.type)
+        return cost
+    
+    def _match_clauses(self, clauses: List[Tuple[Link, _CompiledClause]], index: int,
+                       constants: List[Atom], bindings: Bindings) -> Iterator[Bindings]:
+        """Ground clauses[index:] under the given bindings"""
+        if index == len(clauses):
+            yield bindings
+            return
+        
+        template, compiled = clauses[index]
+        candidates = self._candidates(compiled, constants, bindings)
+        if self.importance_order:
+            candidates = self._by_importance(candidates)
+        for candidate in candidates:
+            for extended in self._unify(template, candidate, bindings):
+                yield from self._match_clauses(clauses, index + 1, constants, extended)
+    
+    def _candidates(self, clause: _CompiledClause, constants: List[Atom], bindings: Bindings) -> Iterable[Atom]:
+        """Get the atoms that could ground a clause, from its rarest anchor"""
+        atomspace = self.atomspace
+        best = None
+        best_count = None
+        for slot, path in clause.anchors:
+            if isinstance(slot, int):
+                anchor = constants[slot]
+            else:
+                anchor = bindings.get(slot)
+                if anchor is None:
+                    continue
+            link_type, position = path[-1]
+            count = atomspace.count_incoming(anchor, link_type, position)
+            if best_count is None or count < best_count:
+                best, best_count = (anchor, path), count
+                if not count:
+                    return ()
+        
+        if best is None:
+            # No constants and no bound variables: scan the clause's type
+            return atomspace.iter_by_type(clause.type)
+        
+        anchor, path = best
+        link_type, position = path[-1]
+        if len(path) == 1:
+            return atomspace.iter_incoming(anchor, link_type, position)
+        
+        atoms = [anchor]
+        for link_type, position in reversed(path):
+            reached = {}
+            for atom in atoms:
+                for link in atomspace.iter_incoming(atom, link_type, position):
+                    reached[link.id] = link
+            atoms = list(reached.values())
+        return atoms
+    
+    def _by_importance(self, atoms: Iterable[Atom]) -> List[Atom]:
+        """Sort candidate atoms by decreasing short-term importance"""
+        atoms = list(atoms)
+        if len(atoms) < 2:
+            return atoms
+        np = require_numpy()
+        _, stis, _ = self.atomspace.get_attention_values(handles=[atom.id for atom in atoms])
+        return [atoms[i] for i in np.argsort(-stis, kind="stable").tolist()]
+    
+    def _unify(self, template: Atom, atom: Atom, bindings: Bindings) -> Iterator[Bindings]:
+        """Yield each extension of bindings under which template matches atom"""
+        if isinstance(template, Node):
+            if not is_variable(template):
+                if template == atom:
+                    yield bindings
+                return
+            bound = bindings.get(template.name)
+            if bound is None:
+                extended = dict(bindings)
+                extended[template.name] = atom
+                yield extended
+            elif bound == atom:
+                yield bindings
+            return
+        
+        if (not isinstance(atom, Link) or atom.type is not template.type or
+                len(atom.outgoing) != len(template.outgoing)):
+            return
+        if AtomType.is_unordered(template.type):
+            yield from self._unify_unordered(template.outgoing, atom.outgoing, bindings)
+        else:
+            yield from self._unify_ordered(template.outgoing, atom.outgoing, 0, bindings)
+    
+    def _unify_ordered(self, templates: Sequence[Atom], atoms: Sequence[Atom], index: int,
+                       bindings: Bindings) -> Iterator[Bindings]:
+        """Unify two outgoing sets position by position"""
+        if index == len(templates):
+            yield bindings
+            return
+        for extended in self._unify(templates[index], atoms[index], bindings):
+            yield from self._unify_ordered(templates, atoms, index + 1, extended)
+    
+    def _unify_unordered(self, templates: Sequence[Atom], atoms: Sequence[Atom],
+                         bindings: Bindings) -> Iterator[Bindings]:
+        """Unify two outgoing sets under every pairing of their members"""
+        if not templates:
+            yield bindings
+            return
+        first, rest = templates[0], templates[1:]
+        tried = set()
+        for i, atom in enumerate(atoms):
+            # Pairing with a repeated member would repeat the groundings
+            if atom.id in tried:
+                continue
+            tried.add(atom.id)
+            for extended in self._unify(first, atom, bindings):
+                yield from self._unify_unordered(rest, atoms[:i] + atoms[i + 1:], extended)
+
@@ -0,0 +1,229 @@
+"""
+Memory-mappable snapshot files of a ColumnarAtomSpace
+"""
+
+import mmap as _mmap
+import os
+from array import array
+from operator import attrgetter
+from struct import Struct
+from typing import Dict, List
+
+from cogpy.core.atom import Atom, Node
+from cogpy.core.columnar import ColumnarAtomSpace, _TYPES, _TYPE_CODES
+from cogpy.core.types import AtomType
+
+
+# Layout: a header, then at _ALIGNMENT the type column, then the other
+# sections each at a multiple of 8 bytes, in the order of _SECTIONS. The
+# type column comes first at an offset every platform can map on its own,
+# as scans of it need an mmap object rather than a memoryview.
+_MAGIC = b"COGPYMAP"
+FORMAT_VERSION = 1
+_ALIGNMENT = 1 << 16
+
+# magic, version, hash check, length of the type table
+_HEADER = Struct("<8sIqI")
+
+# Sections: (name, array type code)
+_SECTIONS = (
+    ("types", "B"),           # handle -> type code, 0 for removed atoms
+    ("name_ids", "q"),        # handle -> string id, -1 for links
+    ("out_offsets", "q"),     # CSR outgoing sets
+    ("out_targets", "q"),
+    ("in_offsets", "q"),      # CSR incoming sets
+    ("in_sources", "q"),
+    ("strength", "d"),        # handle -> truth value
+    ("confidence", "d"),
+    ("sti", "d"),             # handle -> attention value
+    ("lti", "d"),
+    ("pool_offsets", "q"),    # string id -> start in pool
+    ("pool", "B"),            # UTF-8 strings
+    ("string_hashes", "q"),   # string table
+    ("string_handles", "q"),
+    ("node_hashes", "q"),     # (type, string id) table
+    ("node_handles", "q"),
+    ("link_hashes", "q"),     # (type, outgoing handles) table
+    ("link_handles", "q"),
+    ("type_counts", "q"),     # type code -> live atoms
+)
+
+# After the type table: the length of each section, then the live atom
+# count and the live and filled slots of the three tables
+_SIZES = Struct("<" + "q" * (len(_SECTIONS) + 7))
+
+# The node and link tables hold hash() values of tuples of integers. These
+# are the same in every process, but not necessarily in every build of
+# Python, so the tables are rebuilt if this value differs.
+_HASH_CHECK = hash((1, (2, 3)))
+
+
+def save_snapshot(atomspace, path: str):
+    """
+    Write an AtomSpace to a snapshot file.
+    
+    A ColumnarAtomSpace is written column by column. Any other AtomSpace
+    is first copied into one, so its atoms get new handles in the order
+    of their old ones.
+    
+    Args:
+        atomspace: The AtomSpace to write
+        path: File to write, replaced atomically
+    """
+    if not isinstance(atomspace, ColumnarAtomSpace):
+        atomspace = _to_columnar(atomspace)
+    elif atomspace._in_delta:
+        atomspace.compact()
+    
+    tables = (atomspace._strings, atomspace._node_table, atomspace._link_table)
+    truth_values = atomspace._truth_values
+    attention = atomspace._attention
+    sections = [
+        atomspace._types,
+        atomspace._name_ids,
+        atomspace._out_offsets,
+        atomspace._out_targets,
+        atomspace._in_offsets,
+        atomspace._in_sources,
+        truth_values._strength,
+        truth_values._confidence,
+        attention._sti,
+        attention._lti,
+        atomspace._pool_offsets,
+        atomspace._pool,
+    ]
+    for table in tables:
+        sections += [table._hashes, table._handles]
+    sections.append(array("q", atomspace._type_counts))
+    
+    names = "\n".join(atom_type.value for atom_type in _TYPES[1:]).encode()
+    counts = [atomspace._count]
+    for table in tables:
+        counts += [table._live, table._filled]
+    header = (_HEADER.pack(_MAGIC, FORMAT_VERSION, _HASH_CHECK, len(names)) + names +
+              _SIZES.pack(*[len(section) for section in sections], *counts))
+    
+    with open(path + ".tmp", "wb") as snapshot:
+        snapshot.write(header)
+        offset = len(header)
+        for section in sections:
+            start = _ALIGNMENT if offset <= _ALIGNMENT else -(-offset // 8) * 8
+            snapshot.write(bytes(start - offset))
+            snapshot.write(section)
+            offset = start + memoryview(section).nbytes
+        snapshot.flush()
+        os.fsync(snapshot.fileno())
+    os.replace(path + ".tmp", path)
+
+
+def open_snapshot(path: str, mmap: bool = True) -> ColumnarAtomSpace:
+    """
+    Open a snapshot file as a ColumnarAtomSpace.
+    
+    Args:
+        path: Snapshot file written by save_snapshot
+        mmap: Map the file and serve queries from the mapped pages, rather
+            than read it into memory
+    
+    Returns:
+        A ColumnarAtomSpace with the atoms of the snapshot
+    """
+    with open(path, "rb") as snapshot:
+        if mmap:
+            data = _mmap.mmap(snapshot.fileno(), 0, access=_mmap.ACCESS_COPY)
+        else:
+            data = snapshot.read()
+        view = memoryview(data)
+        
+        magic, version, hash_check, names_size = _HEADER.unpack_from(view)
+        if magic != _MAGIC:
+            raise ValueError("Not a cogpy snapshot file")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported snapshot format version: {version}")
+        start = _HEADER.size
+        names = str(view[start:start + names_size], "utf-8").split("\n")
+        sizes = _SIZES.unpack_from(view, start + names_size)
+        
+        columns: Dict[str, memoryview] = {}
+        offset = start + names_size + _SIZES.size
+        for (name, code), size in zip(_SECTIONS, sizes):
+            offset = _ALIGNMENT if offset <= _ALIGNMENT else -(-offset // 8) * 8
+            end = offset + size * array(code).itemsize
+            if end > len(view):
+                raise ValueError(f"Snapshot {path} is truncated")
+            columns[name] = view[offset:end].cast(code)
+            offset = end
+        
+        rows = sizes[0]
+        if mmap:
+            # A mapping of the type column alone, which has find()
+            columns["types"] = _mmap.mmap(
+                snapshot.fileno(), rows, offset=_ALIGNMENT, access=_mmap.ACCESS_COPY) if rows else bytearray()
+    
+    atomspace = ColumnarAtomSpace()
+    atomspace._types = columns["types"]
+    for name in ("name_ids", "out_offsets", "out_targets", "in_offsets", "in_sources", "pool_offsets", "pool"):
+        setattr(atomspace, "_" + name, columns[name])
+    count, *slots = sizes[len(_SECTIONS):]
+    for i, (table, name) in enumerate([(atomspace._strings, "string"), (atomspace._node_table, "node"),
+                                       (atomspace._link_table, "link")]):
+        table._hashes = columns[name + "_hashes"]
+        table._handles = columns[name + "_handles"]
+        table._mask = len(table._handles) - 1
+        table._live, table._filled = slots[2 * i], slots[2 * i + 1]
+    truth_values = atomspace._truth_values
+    truth_values._strength = columns["strength"]
+    truth_values._confidence = columns["confidence"]
+    attention = atomspace._attention
+    attention._sti = columns["sti"]
+    attention._lti = columns["lti"]
+    atomspace._count = count
+    atomspace._type_counts = columns["type_counts"].tolist()
+    atomspace._mapped = True
+    
+    current = [atom_type.value for atom_type in _TYPES[1:]]
+    if names != current:
+        # Written with other atom types: renumber the type codes
+        atomspace._thaw()
+        _recode_types(atomspace, names)
+        atomspace._rebuild_tables()
+    elif hash_check != _HASH_CHECK:
+        atomspace._thaw()
+        atomspace._rebuild_tables()
+    elif not mmap:
+        atomspace._thaw()
+    return atomspace
+
+
+def _recode_types(atomspace: ColumnarAtomSpace, names: List[str]):
+    """Translate type codes written against another type table"""
+    translation = bytearray(range(256))
+    for code, name in enumerate(names, 1):
+        try:
+            translation[code] = _TYPE_CODES[AtomType.from_string(name)]
+        except ValueError:
+            raise ValueError(f"Snapshot holds an unknown atom type: {name}") from None
+    atomspace._types = atomspace._types.translate(translation)
+    type_counts = [0] * len(_TYPES)
+    for code, count in enumerate(atomspace._type_counts):
+        type_counts[translation[code]] += count
+    atomspace._type_counts = type_counts
+
+
+def _to_columnar(atomspace) -> ColumnarAtomSpace:
+    """Copy an AtomSpace into a ColumnarAtomSpace, in handle order"""
+    columnar = ColumnarAtomSpace()
+    copies: Dict[int, Atom] = {}
+    with columnar.bulk_load():
+        # Handles grow over time, so outgoing atoms come before their links
+        for atom in sorted(atomspace.iter_atoms(), key=attrgetter("id")):
+            if isinstance(atom, Node):
+                copy = columnar.add_node(atom.type, atom.name, atom.truth_value)
+            else:
+                copy = columnar.add_link(
+                    atom.type, [copies[target.id] for target in atom.outgoing], atom.truth_value)
+            copies[atom.id] = copy
+            attention_value = atomspace.get_attention_value(atom)
+            if attention_value.sti or attention_value.lti:
+                columnar.set_attention_value(copy, attention_value)
+    return columnar
@@ -2,7 +2,13 @@
 Truth value representation for atoms
 """
 
-from typing import Tuple
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed for the batch truth value APIs
+    np = None
 
 
 class TruthValue:
@@ -14,6 +20,8 @@ class TruthValue:
         confidence: The confidence in the truth value (0.0 to 1.0)
     """
     
+    __slots__ = ("strength", "confidence")
+    
     def __init__(self, strength: float = 1.0, confidence: float = 1.0):
         """
         Initialize a truth value.
@@ -22,8 +30,9 @@ class TruthValue:
             strength: Truth strength (default: 1.0)
             confidence: Confidence level (default: 1.0)
         """
-        self.strength = max(0.0, min(1.0, strength))
-        self.confidence = max(0.0, min(1.0, confidence))
+        # Chained comparisons skip the max/min calls in the common case
+        self.strength = strength if 0.0 <= strength <= 1.0 else max(0.0, min(1.0, strength))
+        self.confidence = confidence if 0.0 <= confidence <= 1.0 else max(0.0, min(1.0, confidence))
     
     def __repr__(self) -> str:
         return f"TruthValue(strength={self.strength:.3f}, confidence={self.confidence:.3f})"
@@ -46,3 +55,346 @@ class TruthValue:
     def get_mean(self) -> float:
         """Get the mean truth value weighted by confidence"""
         return self.strength * self.confidence
+
+
+def require_numpy():
+    """Return the numpy module, or raise ImportError if it is missing"""
+    if np is None:
+        raise ImportError("Batch truth value access requires NumPy")
+    return np
+
+
+def _clamp(value: float) -> float:
+    return value if 0.0 <= value <= 1.0 else max(0.0, min(1.0, value))
+
+
+class HandleRows:
+    """
+    Dense row numbers for the atoms of one AtomSpace.
+    
+    Handles come from a process-wide counter, so arrays indexed by handle
+    would span every atom any AtomSpace has made. Instead each handle is
+    given a row when it is first stored, reusing the rows of removed
+    atoms, so the arrays are as long as the most atoms held at once. The
+    truth value and attention stores of an AtomSpace share one HandleRows,
+    and the rows of an atom line up in both.
+    """
+    
+    __slots__ = ("_rows", "_handles", "_free", "_index")
+    
+    def __init__(self):
+        """Initialize an empty map"""
+        # Stores hold on to this dict, so it is only ever cleared in place
+        self._rows: Dict[int, int] = {}  # handle -> row
+        self.clear()
+    
+    def clear(self):
+        """Free every row"""
+        self._rows.clear()
+        self._handles = array("q")  # row -> handle, -1 if free
+        self._free: List[int] = []
+        # Lookup structure for find_many (see _build_index); None when
+        # out of date
+        self._index = None
+    
+    def add(self, handle: int) -> int:
+        """Get the row of a handle, giving it one if it has none"""
+        row = self._rows.get(handle)
+        if row is None:
+            if self._free:
+                row = self._free.pop()
+                self._handles[row] = handle
+            else:
+                row = len(self._handles)
+                self._handles.append(handle)
+            self._rows[handle] = row
+            self._index = None
+        return row
+    
+    def remove(self, handle: int):
+        """Free the row of a handle, if it has one"""
+        row = self._rows.pop(handle, None)
+        if row is not None:
+            self._handles[row] = -1
+            self._free.append(row)
+            self._index = None
+    
+    def find_many(self, handles) -> "np.ndarray":
+        """
+        Get the rows of many handles.
+        
+        Args:
+            handles: Array-like of handles
+        
+        Returns:
+            A NumPy array of rows, in the order of handles
+        
+        Raises:
+            ValueError: If a handle has no row
+        """
+        require_numpy()
+        handles = np.asarray(handles, dtype=np.int64)
+        if not handles.size:
+            return handles
+        if self._index is None:
+            self._index = self._build_index()
+        low, table, keys, rows = self._index
+        if table is not None:
+            # Look the handles up in a table spanning them
+            offsets = handles - low
+            if offsets.min() >= 0 and offsets.max() < len(table):
+                rows = table[offsets]
+                if rows.min() >= 0:
+                    return rows
+            raise ValueError("Handle not in this store")
+        positions = np.searchsorted(keys, handles)
+        if positions.max() >= len(keys) or not np.array_equal(keys[positions], handles):
+            raise ValueError("Handle not in this store")
+        return rows[positions]
+    
+    def _build_index(self):
+        """
+        Index the stored handles for find_many.
+        
+        The handles of one AtomSpace mostly form a run, so a table from
+        every handle between the lowest and the highest to its row (-1 if
+        none) is usually only a little longer than the rows themselves.
+        When the handles are too spread out for that, they are sorted and
+        searched instead.
+        
+        Returns:
+            (lowest handle, table, None, None), or (None, None, sorted
+            handles, their rows)
+        """
+        stored = np.array(self._handles, dtype=np.int64)
+        used = np.flatnonzero(stored >= 0)
+        stored = stored[used]
+        if not len(stored):
+            return None, None, stored, used
+        low = int(stored.min())
+        span = int(stored.max()) - low + 1
+        if span <= 4 * len(stored) + 1024:
+            table = np.full(span, -1, dtype=np.int64)
+            table[stored - low] = used
+            return low, table, None, None
+        order = np.argsort(stored)
+        return None, None, stored[order], used[order]
+    
+    def __contains__(self, handle: int) -> bool:
+        return handle in self._rows
+    
+    def __len__(self) -> int:
+        """Return the number of rows, used or free"""
+        return len(self._handles)
+
+
+class TruthValueView(TruthValue):
+    """
+    A TruthValue that reads and writes one row of a TruthValueStore.
+    
+    Atoms in an AtomSpace return views from their truth_value attribute, so
+    changing the strength or confidence of a view changes the atom. Once
+    the atom leaves the store (it is removed, or evicted from a
+    BoundedAtomSpace), the view reads and writes the copy of its truth
+    value the atom kept.
+    """
+    
+    __slots__ = ("_store", "_handle", "_atom")
+    
+    def __init__(self, store: "TruthValueStore", handle: int, atom=None):
+        """
+        Initialize a view.
+        
+        Args:
+            store: The store holding the truth value
+            handle: Handle of the atom whose truth value is viewed
+            atom: The atom itself, to fall back to once it leaves the store
+        """
+        self._store = store
+        self._handle = handle
+        self._atom = atom
+    
+    @property
+    def strength(self) -> float:
+        store = self._store
+        rows = store._rows
+        if rows is None:
+            return store._strength[self._handle]
+        row = rows.get(self._handle)
+        return store._strength[row] if row is not None else self._detached().strength
+    
+    @strength.setter
+    def strength(self, value: float):
+        store = self._store
+        rows = store._rows
+        row = self._handle if rows is None else rows.get(self._handle)
+        if row is None:
+            self._detached().strength = _clamp(value)
+            return
+        store._strength[row] = _clamp(value)
+        if store._journal is not None:
+            store._journal.truth_value_changed(self._handle)
+    
+    @property
+    def confidence(self) -> float:
+        store = self._store
+        rows = store._rows
+        if rows is None:
+            return store._confidence[self._handle]
+        row = rows.get(self._handle)
+        return store._confidence[row] if row is not None else self._detached().confidence
+    
+    @confidence.setter
+    def confidence(self, value: float):
+        store = self._store
+        rows = store._rows
+        row = self._handle if rows is None else rows.get(self._handle)
+        if row is None:
+            self._detached().confidence = _clamp(value)
+            return
+        store._confidence[row] = _clamp(value)
+        if store._journal is not None:
+            store._journal.truth_value_changed(self._handle)
+    
+    def _detached(self) -> TruthValue:
+        """
+        Get the truth value the atom kept when it left the store.
+        
+        Raises:
+            KeyError: If the view has no atom, or the atom kept none
+        """
+        atom = self._atom
+        truth_value = None if atom is None else atom._tv
+        if truth_value is None or truth_value.__class__ is TruthValueStore:
+            raise KeyError(f"Handle {self._handle} is not in the store; its atom was removed")
+        return truth_value
+
+
+class TruthValueStore:
+    """
+    Strengths and confidences of many atoms in two contiguous float arrays.
+    
+    Given a HandleRows, the store keeps each atom in the row it assigns,
+    so the arrays stay dense however the handles are spread. Without one,
+    handles are used as rows directly, which suits a ColumnarAtomSpace
+    whose handles are already row numbers; rows that belong to no atom
+    then hold the default truth value.
+    
+    The batch methods take and return NumPy arrays, and work on the arrays
+    in place without a Python call per atom.
+    """
+    
+    __slots__ = ("_strength", "_confidence", "_map", "_rows", "_journal")
+    
+    def __init__(self, rows: Optional[HandleRows] = None):
+        """
+        Initialize an empty store.
+        
+        Args:
+            rows: Map from handles to rows, possibly shared with another
+                store; if None, handles are rows
+        """
+        self._map = rows
+        self._rows = rows._rows if rows is not None else None
+        # Told of every changed row, if set (see cogpy.storage.WriteAheadLog)
+        self._journal = None
+        self.clear()
+    
+    def clear(self):
+        """Drop every row"""
+        self._strength = array("d")
+        self._confidence = array("d")
+        if self._map is not None:
+            self._map.clear()
+    
+    def set(self, handle: int, truth_value: Optional[TruthValue] = None):
+        """
+        Store the truth value of one atom, adding its row if needed.
+        
+        Args:
+            handle: Handle of the atom
+            truth_value: The truth value, or None for the default
+        """
+        rows = self._rows
+        if rows is None:
+            row = handle
+        else:
+            row = rows.get(handle)
+            if row is None:
+                row = self._map.add(handle)
+        strength, confidence = (truth_value.strength, truth_value.confidence) if truth_value else (1.0, 1.0)
+        size = len(self._strength)
+        if row == size:
+            # New rows usually come last
+            self._strength.append(strength)
+            self._confidence.append(confidence)
+        else:
+            if row > size:
+                self._grow(row + 1)
+            self._strength[row] = strength
+            self._confidence[row] = confidence
+        if self._journal is not None:
+            self._journal.truth_value_changed(handle)
+    
+    def get(self, handle: int) -> TruthValue:
+        """Get a copy of the truth value of one atom"""
+        rows = self._rows
+        row = handle if rows is None else rows[handle]
+        return TruthValue(self._strength[row], self._confidence[row])
+    
+    def view(self, handle: int, atom=None) -> TruthValueView:
+        """Get a view of the truth value of one atom, which may be given"""
+        return TruthValueView(self, handle, atom)
+    
+    def get_many(self, handles) -> Tuple["np.ndarray", "np.ndarray"]:
+        """
+        Get the truth values of many atoms.
+        
+        Args:
+            handles: Array-like of handles
+            
+        Returns:
+            NumPy arrays of the strengths and the confidences, in the
+            order of handles
+        """
+        rows = self._find_many(handles)
+        return (np.frombuffer(self._strength, dtype=np.float64)[rows],
+                np.frombuffer(self._confidence, dtype=np.float64)[rows])
+    
+    def set_many(self, handles, strengths, confidences):
+        """
+        Set the truth values of many atoms at once.
+        
+        Values are clamped to [0, 1]. Scalars apply to every handle.
+        
+        Args:
+            handles: Array-like of handles
+            strengths: Array-like of strengths, or a scalar
+            confidences: Array-like of confidences, or a scalar
+        """
+        rows = self._find_many(handles)
+        np.frombuffer(self._strength, dtype=np.float64)[rows] = np.clip(strengths, 0.0, 1.0)
+        np.frombuffer(self._confidence, dtype=np.float64)[rows] = np.clip(confidences, 0.0, 1.0)
+        if self._journal is not None:
+            self._journal.truth_values_changed(np.asarray(handles, dtype=np.int64))
+    
+    def _find_many(self, handles) -> "np.ndarray":
+        """Convert handles to row numbers, checking they are stored"""
+        require_numpy()
+        if self._map is not None:
+            rows = self._map.find_many(handles)
+        else:
+            rows = np.asarray(handles, dtype=np.int64)
+        if rows.size and (rows.min() < 0 or rows.max() >= len(self._strength)):
+            raise ValueError("Handle not in this store")
+        return rows
+    
+    def _grow(self, size: int):
+        """Pad the arrays with default rows up to size"""
+        padding = array("d", [1.0]) * (size - len(self._strength))
+        self._strength.extend(padding)
+        self._confidence.extend(padding)
+    
+    def __len__(self) -> int:
+        """Return the number of rows"""
+        return len(self._strength)
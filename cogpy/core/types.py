@@ -3,7 +3,7 @@ Atom type system for the hypergraph
 """
 
 from enum import Enum
-from typing import Set, Optional
+from typing import Dict, Optional, Tuple
 
 
 class AtomType(Enum):
@@ -15,6 +15,7 @@ class AtomType(Enum):
     ATOM = "Atom"
     NODE = "Node"
     LINK = "Link"
+    UNORDERED_LINK = "UnorderedLink"
     
     # Node types
     CONCEPT_NODE = "ConceptNode"
@@ -36,42 +37,88 @@ class AtomType(Enum):
     OR_LINK = "OrLink"
     NOT_LINK = "NotLink"
     
+    # Members are singletons compared by identity, so the identity hash is
+    # consistent with equality and avoids Enum's Python-level __hash__ on
+    # every index key built from a type
+    __hash__ = object.__hash__
+    
     @classmethod
     def is_node(cls, atom_type: "AtomType") -> bool:
         """Check if atom type is a node type"""
-        node_types = {
-            cls.NODE,
-            cls.CONCEPT_NODE,
-            cls.PREDICATE_NODE,
-            cls.VARIABLE_NODE,
-            cls.NUMBER_NODE,
-            cls.SCHEMA_NODE,
-        }
-        return atom_type in node_types
+        return bool(_SUBTYPE_MASKS[cls.NODE] & _TYPE_BITS[atom_type])
     
     @classmethod
     def is_link(cls, atom_type: "AtomType") -> bool:
         """Check if atom type is a link type"""
-        link_types = {
-            cls.LINK,
-            cls.INHERITANCE_LINK,
-            cls.SIMILARITY_LINK,
-            cls.IMPLICATION_LINK,
-            cls.EVALUATION_LINK,
-            cls.EXECUTION_LINK,
-            cls.LIST_LINK,
-            cls.SET_LINK,
-            cls.MEMBER_LINK,
-            cls.AND_LINK,
-            cls.OR_LINK,
-            cls.NOT_LINK,
-        }
-        return atom_type in link_types
+        return bool(_SUBTYPE_MASKS[cls.LINK] & _TYPE_BITS[atom_type])
+    
+    @classmethod
+    def is_unordered(cls, atom_type: "AtomType") -> bool:
+        """Check if atom type is a link type whose outgoing set is unordered"""
+        return bool(_SUBTYPE_MASKS[cls.UNORDERED_LINK] & _TYPE_BITS[atom_type])
+    
+    @classmethod
+    def is_a(cls, atom_type: "AtomType", parent: "AtomType") -> bool:
+        """Check if atom type is parent or a (transitive) subtype of it"""
+        return bool(_SUBTYPE_MASKS[parent] & _TYPE_BITS[atom_type])
+    
+    @classmethod
+    def get_parent(cls, atom_type: "AtomType") -> Optional["AtomType"]:
+        """Get the direct parent type, or None for ATOM"""
+        return _PARENTS[atom_type]
+    
+    @classmethod
+    def get_subtypes(cls, atom_type: "AtomType") -> Tuple["AtomType", ...]:
+        """Get the type and all of its (transitive) subtypes"""
+        return _SUBTYPES[atom_type]
     
     @classmethod
     def from_string(cls, type_str: str) -> "AtomType":
         """Convert string to AtomType"""
-        for atom_type in cls:
-            if atom_type.value == type_str:
-                return atom_type
-        raise ValueError(f"Unknown atom type: {type_str}")
+        atom_type = _TYPES_BY_NAME.get(type_str)
+        if atom_type is None:
+            raise ValueError(f"Unknown atom type: {type_str}")
+        return atom_type
+
+
+# Direct parent of every atom type
+_PARENTS: Dict[AtomType, Optional[AtomType]] = {
+    AtomType.ATOM: None,
+    AtomType.NODE: AtomType.ATOM,
+    AtomType.LINK: AtomType.ATOM,
+    AtomType.UNORDERED_LINK: AtomType.LINK,
+    
+    AtomType.CONCEPT_NODE: AtomType.NODE,
+    AtomType.PREDICATE_NODE: AtomType.NODE,
+    AtomType.VARIABLE_NODE: AtomType.NODE,
+    AtomType.NUMBER_NODE: AtomType.NODE,
+    AtomType.SCHEMA_NODE: AtomType.NODE,
+    
+    AtomType.INHERITANCE_LINK: AtomType.LINK,
+    AtomType.SIMILARITY_LINK: AtomType.UNORDERED_LINK,
+    AtomType.IMPLICATION_LINK: AtomType.LINK,
+    AtomType.EVALUATION_LINK: AtomType.LINK,
+    AtomType.EXECUTION_LINK: AtomType.LINK,
+    AtomType.LIST_LINK: AtomType.LINK,
+    AtomType.SET_LINK: AtomType.UNORDERED_LINK,
+    AtomType.MEMBER_LINK: AtomType.LINK,
+    AtomType.AND_LINK: AtomType.UNORDERED_LINK,
+    AtomType.OR_LINK: AtomType.UNORDERED_LINK,
+    AtomType.NOT_LINK: AtomType.LINK,
+}
+
+# Lookup tables precomputed from the hierarchy, so type checks done on
+# every add_node/add_link are a dict lookup and a bitwise and
+_TYPES_BY_NAME: Dict[str, AtomType] = {atom_type.value: atom_type for atom_type in AtomType}
+_TYPE_BITS: Dict[AtomType, int] = {atom_type: 1 << i for i, atom_type in enumerate(AtomType)}
+_SUBTYPE_MASKS: Dict[AtomType, int] = {atom_type: 0 for atom_type in AtomType}
+for _atom_type in AtomType:
+    _ancestor = _atom_type
+    while _ancestor is not None:
+        _SUBTYPE_MASKS[_ancestor] |= _TYPE_BITS[_atom_type]
+        _ancestor = _PARENTS[_ancestor]
+_SUBTYPES: Dict[AtomType, Tuple[AtomType, ...]] = {
+    parent: tuple(atom_type for atom_type in AtomType if _SUBTYPE_MASKS[parent] & _TYPE_BITS[atom_type])
+    for parent in AtomType
+}
+del _atom_type, _ancestor
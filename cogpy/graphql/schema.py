@@ -23,6 +23,29 @@ def set_atomspace(atomspace: AtomSpace):
     _atomspace = atomspace
 
 
+def to_external_id(atom: Atom) -> str:
+    """
+    Get the ID exposed to GraphQL clients for an atom.
+    
+    Uses the AtomSpace's stable external ID when it keeps one, and the
+    integer handle rendered as a string otherwise.
+    """
+    external_id = get_atomspace().get_external_id(atom)
+    return external_id if external_id is not None else str(atom.id)
+
+
+def find_atom(atom_id: str) -> Optional[Atom]:
+    """Look up an atom by an ID produced by to_external_id"""
+    atomspace = get_atomspace()
+    atom = atomspace.get_atom_by_external_id(atom_id)
+    if atom is not None:
+        return atom
+    try:
+        return atomspace.get_atom_by_id(int(atom_id))
+    except ValueError:
+        return None
+
+
 class TruthValueType(graphene.ObjectType):
     """GraphQL type for TruthValue"""
     strength = graphene.Float()
@@ -44,7 +67,7 @@ class NodeType(graphene.ObjectType):
     name = graphene.String()
     
     def resolve_id(self, info):
-        return self.id
+        return to_external_id(self)
     
     def resolve_type(self, info):
         return self.type.value if hasattr(self.type, 'value') else str(self.type)
@@ -65,7 +88,7 @@ class LinkType(graphene.ObjectType):
     arity = graphene.Int()
     
     def resolve_id(self, info):
-        return self.id
+        return to_external_id(self)
     
     def resolve_type(self, info):
         return self.type.value if hasattr(self.type, 'value') else str(self.type)
@@ -131,8 +154,7 @@ class Query(graphene.ObjectType):
     
     def resolve_atom_by_id(self, info, id):
         """Resolve atom by ID"""
-        atomspace = get_atomspace()
-        return atomspace.get_atom_by_id(id)
+        return find_atom(id)
     
     def resolve_atoms_by_type(self, info, atom_type):
         """Resolve atoms by type"""
@@ -147,7 +169,7 @@ class Query(graphene.ObjectType):
     def resolve_incoming(self, info, atom_id):
         """Resolve incoming links for an atom"""
         atomspace = get_atomspace()
-        atom = atomspace.get_atom_by_id(atom_id)
+        atom = find_atom(atom_id)
         if atom:
             return atomspace.get_incoming(atom)
         return []
@@ -190,7 +212,7 @@ class AddLinkMutation(graphene.Mutation):
         # Get outgoing atoms
         outgoing = []
         for atom_id in outgoing_ids:
-            atom = atomspace.get_atom_by_id(atom_id)
+            atom = find_atom(atom_id)
             if atom:
                 outgoing.append(atom)
         
@@ -211,7 +233,7 @@ class RemoveAtomMutation(graphene.Mutation):
     
     def mutate(self, info, atom_id):
         atomspace = get_atomspace()
-        atom = atomspace.get_atom_by_id(atom_id)
+        atom = find_atom(atom_id)
         if atom:
             success = atomspace.remove_atom(atom)
             return RemoveAtomMutation(success=success)
@@ -0,0 +1,15 @@
+"""
+Import and export of AtomSpaces in text formats
+"""
+
+from cogpy.io.atomese import iter_atomese, read_atomese, write_atomese
+from cogpy.io.ndjson import iter_ndjson, read_ndjson, write_ndjson
+
+__all__ = [
+    "read_atomese",
+    "write_atomese",
+    "iter_atomese",
+    "read_ndjson",
+    "write_ndjson",
+    "iter_ndjson",
+]
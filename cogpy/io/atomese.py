@@ -0,0 +1,229 @@
+"""
+Streaming Atomese (Scheme S-expression) reader and writer
+"""
+
+import re
+from typing import Dict, Iterator, List, Optional, TextIO, Union
+
+from cogpy.core.atom import Atom, Node
+from cogpy.core.types import AtomType
+from cogpy.core.truthvalue import TruthValue
+
+
+# Characters read at a time
+CHUNK_SIZE = 1 << 20
+
+# One token per match. Nodes, with their optional truth value, are matched
+# whole, as they are most of the tokens of a typical file. A link opening
+# only matches once the next parenthesis is in view, so a node cut off at
+# the end of a chunk cannot be taken for a link. Anything else matches the
+# last alternative, which is either an error or a token cut off at the end
+# of a chunk.
+_TOKENS = re.compile(r"""
+    (\(\s*([A-Za-z]\w*)\s+"([^"\\]*(?:\\.[^"\\]*)*)"\s*(?:\(\s*stv\s+([^\s()]+)\s+([^\s()]+)\s*\)\s*)?\))
+  | (\(\s*stv\s+([^\s()]+)\s+([^\s()]+)\s*\))
+  | \(\s*([A-Za-z]\w*)(?=\s*[()])
+  | (\))
+  | ;[^\n]*\n
+  | (\S)
+""", re.VERBOSE)
+# match.lastindex of each kind of token: the group enclosing the others
+_NODE, _TRUTH_VALUE, _LINK, _CLOSE, _OTHER = 1, 6, 9, 10, 11
+
+_ESCAPE = re.compile(r"\\(.)", re.DOTALL)
+
+_DEFAULT = (1.0, 1.0)
+
+
+def read_atomese(atomspace, source: Union[str, TextIO], chunk_size: int = CHUNK_SIZE) -> int:
+    """
+    Add the atoms of an Atomese file to an AtomSpace.
+    
+    Reads expressions such as
+    `(InheritanceLink (stv 0.9 0.8) (ConceptNode "cat") (ConceptNode "animal"))`
+    chunk by chunk, so memory use is bounded by chunk_size and the nesting
+    depth rather than the file size. Atoms are added inside one
+    bulk_load() block. Truth values may follow a node's name or a link's
+    type. A line comment starts with ";".
+    
+    Args:
+        atomspace: AtomSpace to add the atoms to
+        source: Path or text file to read
+        chunk_size: Characters read at a time; also the longest token
+    
+    Returns:
+        The number of top-level expressions read
+    
+    Raises:
+        ValueError: If the input is not valid Atomese
+    """
+    if isinstance(source, str):
+        with open(source, encoding="utf-8") as file:
+            return read_atomese(atomspace, file, chunk_size)
+    
+    add_node = atomspace.add_node
+    add_link = atomspace.add_link
+    node_types: Dict[str, AtomType] = {}
+    link_types: Dict[str, AtomType] = {}
+    # Open links: [type, truth value, outgoing atoms]
+    stack: List[list] = []
+    count = 0
+    consumed = 0
+    rest = ""
+    with atomspace.bulk_load():
+        while True:
+            chunk = source.read(chunk_size)
+            end = not chunk
+            # The newline ends a comment on the last line
+            text = rest + chunk if chunk else rest + "\n"
+            rest = ""
+            for match in _TOKENS.finditer(text):
+                kind = match.lastindex
+                if kind == _NODE:
+                    type_name, name, strength, confidence = match.group(2, 3, 4, 5)
+                    atom_type = node_types.get(type_name)
+                    if atom_type is None:
+                        atom_type = node_types[type_name] = _atom_type(type_name, node=True)
+                    if "\\" in name:
+                        name = _ESCAPE.sub(r"\1", name)
+                    truth_value = None
+                    if strength is not None:
+                        truth_value = TruthValue(float(strength), float(confidence))
+                    atom = add_node(atom_type, name, truth_value)
+                    if stack:
+                        stack[-1][2].append(atom)
+                    else:
+                        count += 1
+                elif kind == _CLOSE:
+                    if not stack:
+                        raise ValueError(f"Unbalanced ')' at character {consumed + match.start()}")
+                    atom_type, truth_value, outgoing = stack.pop()
+                    atom = add_link(atom_type, outgoing, truth_value)
+                    if stack:
+                        stack[-1][2].append(atom)
+                    else:
+                        count += 1
+                elif kind == _LINK:
+                    type_name = match.group(_LINK)
+                    atom_type = link_types.get(type_name)
+                    if atom_type is None:
+                        atom_type = link_types[type_name] = _atom_type(type_name, node=False)
+                    stack.append([atom_type, None, []])
+                elif kind == _TRUTH_VALUE:
+                    if not stack:
+                        raise ValueError(f"Truth value outside a link at character {consumed + match.start()}")
+                    stack[-1][1] = TruthValue(float(match.group(7)), float(match.group(8)))
+                elif kind == _OTHER:
+                    start = match.start()
+                    if end or len(text) - start > chunk_size:
+                        raise ValueError(f"Invalid Atomese at character {consumed + start}: "
+                                         f"{text[start:start + 40]!r}")
+                    # Probably a token cut off by the end of the chunk
+                    rest = text[start:]
+                    break
+            consumed += len(text) - len(rest)
+            if end:
+                break
+    if stack:
+        raise ValueError("Unexpected end of input inside a link")
+    return count
+
+
+def iter_atomese(atomspace) -> Iterator[str]:
+    """
+    Write the atoms of an AtomSpace as Atomese, one expression per line.
+    
+    Every node comes before every link, and links come in the order they
+    were added, so the atoms of each expression come before any later
+    expression that contains them. An atom gets a line of its own if no
+    link contains it or its truth value is not the default; the others
+    appear only inside the links that contain them. Lines are produced as
+    the AtomSpace is iterated, without collecting its atoms.
+    
+    Args:
+        atomspace: AtomSpace to write
+    
+    Yields:
+        Lines of Atomese, each ending in a newline
+    """
+    count_incoming = atomspace.count_incoming
+    for atoms in (atomspace.iter_nodes(), atomspace.iter_links()):
+        for atom in atoms:
+            truth_value = atom.truth_value
+            strength, confidence = truth_value.strength, truth_value.confidence
+            if (strength, confidence) != _DEFAULT:
+                yield _expression(atom, f"(stv {strength!r} {confidence!r})") + "\n"
+            elif not count_incoming(atom):
+                yield _expression(atom) + "\n"
+
+
+def write_atomese(atomspace, destination: Union[str, TextIO], batch_size: int = 10000) -> int:
+    """
+    Write the atoms of an AtomSpace to an Atomese file; see iter_atomese.
+    
+    Args:
+        atomspace: AtomSpace to write
+        destination: Path or text file to write to
+        batch_size: Lines written at a time
+    
+    Returns:
+        The number of expressions written
+    """
+    if isinstance(destination, str):
+        with open(destination, "w", encoding="utf-8") as file:
+            return write_atomese(atomspace, file, batch_size)
+    
+    count = 0
+    lines = []
+    for line in iter_atomese(atomspace):
+        lines.append(line)
+        if len(lines) >= batch_size:
+            destination.write("".join(lines))
+            count += len(lines)
+            lines.clear()
+    destination.write("".join(lines))
+    return count + len(lines)
+
+
+def _atom_type(name: str, node: bool) -> AtomType:
+    """Look up a node or link type by name"""
+    try:
+        atom_type = AtomType.from_string(name)
+    except ValueError:
+        raise ValueError(f"Unknown atom type in Atomese input: {name}") from None
+    if not (AtomType.is_node(atom_type) if node else AtomType.is_link(atom_type)):
+        raise ValueError(f"{name} cannot be used as a {'node' if node else 'link'}")
+    return atom_type
+
+
+def _quote(name: str) -> str:
+    """Quote a node name as a Scheme string"""
+    if "\\" in name or '"' in name:
+        name = name.replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{name}"'
+
+
+def _expression(atom: Atom, truth_value: Optional[str] = None) -> str:
+    """Write an atom and, nested inside it, its outgoing atoms"""
+    if isinstance(atom, Node):
+        if truth_value:
+            return f"({atom.type.value} {_quote(atom.name)} {truth_value})"
+        return f"({atom.type.value} {_quote(atom.name)})"
+    
+    # Explicit stack rather than recursion, for deeply nested links
+    parts = [f"({atom.type.value}"]
+    if truth_value:
+        parts.append(" " + truth_value)
+    stack: list = [")"]
+    stack.extend(reversed(atom.outgoing))
+    while stack:
+        item = stack.pop()
+        if item.__class__ is str:
+            parts.append(item)
+        elif isinstance(item, Node):
+            parts.append(f" ({item.type.value} {_quote(item.name)})")
+        else:
+            parts.append(f" ({item.type.value}")
+            stack.append(")")
+            stack.extend(reversed(item.outgoing))
+    return "".join(parts)
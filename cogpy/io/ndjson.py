@@ -0,0 +1,163 @@
+"""
+Streaming newline-delimited JSON import and export
+"""
+
+import json
+from typing import Dict, Iterable, Iterator, List, TextIO, Union
+
+from cogpy.core.atom import Atom, Node
+from cogpy.core.types import AtomType
+from cogpy.core.truthvalue import TruthValue
+
+
+# Links read before one of their outgoing atoms that are held at once
+MAX_PENDING = 10000
+
+
+def iter_ndjson(atomspace) -> Iterator[str]:
+    """
+    Write the atoms of an AtomSpace as JSON, one object per line.
+    
+    Nodes are written as
+    `{"id": 1, "type": "ConceptNode", "name": "cat", "tv": [1.0, 1.0]}`
+    and links as
+    `{"id": 3, "type": "InheritanceLink", "outgoing": [1, 2], "tv": [0.9, 0.8]}`,
+    with outgoing atoms referred to by their handles. Atoms are produced
+    straight from the AtomSpace's iter_atoms(), so memory use does not
+    grow with the AtomSpace; it must not be modified meanwhile.
+    
+    Args:
+        atomspace: AtomSpace to write
+    
+    Yields:
+        Lines of JSON, each ending in a newline
+    """
+    dumps = json.dumps
+    for atom in atomspace.iter_atoms():
+        truth_value = atom.truth_value
+        if isinstance(atom, Node):
+            yield (f'{{"id": {atom.id}, "type": "{atom.type.value}", "name": {dumps(atom.name)}, '
+                   f'"tv": [{truth_value.strength!r}, {truth_value.confidence!r}]}}\n')
+        else:
+            outgoing = ", ".join([str(target.id) for target in atom.outgoing])
+            yield (f'{{"id": {atom.id}, "type": "{atom.type.value}", "outgoing": [{outgoing}], '
+                   f'"tv": [{truth_value.strength!r}, {truth_value.confidence!r}]}}\n')
+
+
+def write_ndjson(atomspace, destination: Union[str, TextIO], batch_size: int = 10000) -> int:
+    """
+    Write the atoms of an AtomSpace to an NDJSON file; see iter_ndjson.
+    
+    Args:
+        atomspace: AtomSpace to write
+        destination: Path or text file to write to
+        batch_size: Lines written at a time
+    
+    Returns:
+        The number of atoms written
+    """
+    if isinstance(destination, str):
+        with open(destination, "w", encoding="utf-8") as file:
+            return write_ndjson(atomspace, file, batch_size)
+    
+    count = 0
+    lines = []
+    for line in iter_ndjson(atomspace):
+        lines.append(line)
+        if len(lines) >= batch_size:
+            destination.write("".join(lines))
+            count += len(lines)
+            lines.clear()
+    destination.write("".join(lines))
+    return count + len(lines)
+
+
+def read_ndjson(atomspace, source: Union[str, Iterable[str]], max_pending: int = MAX_PENDING) -> int:
+    """
+    Add the atoms of an NDJSON stream written by iter_ndjson.
+    
+    Lines are read one at a time, from a file or from any iterable of
+    lines such as iter_ndjson() of another AtomSpace. A link may come
+    before an atom it contains: it is held in a pending buffer until that
+    atom has been read, so besides a map from input ids to atoms only
+    those links are kept, never the whole input. Atoms are added inside
+    one bulk_load() block and get new handles; the handles in the input
+    only link its lines together.
+    
+    Args:
+        atomspace: AtomSpace to add the atoms to
+        source: Path, text file or iterable of lines
+        max_pending: Most links held waiting for an outgoing atom
+    
+    Returns:
+        The number of atoms read
+    
+    Raises:
+        ValueError: If a line is malformed, more than max_pending links
+            wait at once, or a link refers to an atom never read
+    """
+    if isinstance(source, str):
+        with open(source, encoding="utf-8") as file:
+            return read_ndjson(atomspace, file, max_pending)
+    
+    add_node = atomspace.add_node
+    add_link = atomspace.add_link
+    loads = json.loads
+    from_string = AtomType.from_string
+    # Input id -> atom added for it
+    atoms: Dict[int, Atom] = {}
+    # Input id of a missing atom -> links waiting for it
+    waiting: Dict[int, List[dict]] = {}
+    pending = 0
+    count = 0
+    
+    def add(record: dict) -> Atom:
+        """Add the atom of a record whose outgoing atoms have all been read"""
+        atom_type = from_string(record["type"])
+        truth_value = record.get("tv")
+        if truth_value is not None:
+            truth_value = TruthValue(*truth_value)
+        if "name" in record:
+            return add_node(atom_type, record["name"], truth_value)
+        return add_link(atom_type, [atoms[target] for target in record["outgoing"]], truth_value)
+    
+    def first_missing(record: dict):
+        """Get the input id of an outgoing atom not read yet, or None"""
+        return next((target for target in record.get("outgoing", ()) if target not in atoms), None)
+    
+    with atomspace.bulk_load():
+        for number, line in enumerate(source, 1):
+            if not line.strip():
+                continue
+            try:
+                record = loads(line)
+                missing = first_missing(record)
+                if missing is None:
+                    atoms[record["id"]] = add(record)
+                else:
+                    from_string(record["type"])
+            except (AttributeError, KeyError, TypeError, ValueError) as error:
+                raise ValueError(f"Invalid NDJSON atom on line {number}: {error}") from None
+            if missing is not None:
+                waiting.setdefault(missing, []).append(record)
+                pending += 1
+                if pending > max_pending:
+                    raise ValueError(f"More than {max_pending} links wait for atoms not read yet")
+                continue
+            count += 1
+            
+            # Links waiting for the new atom, and for those links in turn
+            ready = [record["id"]]
+            while ready:
+                for record in waiting.pop(ready.pop(), ()):
+                    missing = first_missing(record)
+                    if missing is None:
+                        pending -= 1
+                        atoms[record["id"]] = add(record)
+                        ready.append(record["id"])
+                        count += 1
+                    else:
+                        waiting.setdefault(missing, []).append(record)
+    if waiting:
+        raise ValueError(f"Links refer to atoms missing from the input: {sorted(waiting)[:10]}")
+    return count
@@ -13,6 +13,10 @@ setup(
         "graphene>=3.0",
         "flask>=2.3.2",
     ],
+    extras_require={
+        # Batch truth value access (AtomSpace.get_truth_values/set_truth_values)
+        "numpy": ["numpy>=1.20"],
+    },
     python_requires=">=3.8",
     classifiers=[
         "Development Status :: 3 - Alpha",
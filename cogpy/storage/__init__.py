@@ -0,0 +1,11 @@
+"""
+Storage module for persisting AtomSpaces
+"""
+
+from cogpy.storage.sqlite import SQLiteStorage
+from cogpy.storage.wal import WriteAheadLog
+
+__all__ = [
+    "SQLiteStorage",
+    "WriteAheadLog",
+]
@@ -0,0 +1,565 @@
+"""
+SQLite storage backend for AtomSpaces
+"""
+
+import gc
+import sqlite3
+import threading
+from array import array
+from itertools import islice
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from cogpy.core.atom import Atom, Link
+from cogpy.core.types import AtomType
+from cogpy.core.truthvalue import TruthValue
+
+
+# Version of the table layout, kept in the database's user_version
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS atoms (
+        id INTEGER PRIMARY KEY,
+        type TEXT NOT NULL,
+        name TEXT,
+        outgoing_key BLOB
+    );
+    CREATE UNIQUE INDEX IF NOT EXISTS atoms_by_name ON atoms (type, name) WHERE name IS NOT NULL;
+    CREATE UNIQUE INDEX IF NOT EXISTS atoms_by_outgoing ON atoms (type, outgoing_key) WHERE name IS NULL;
+    CREATE TABLE IF NOT EXISTS outgoing (
+        link INTEGER NOT NULL,
+        position INTEGER NOT NULL,
+        target INTEGER NOT NULL,
+        PRIMARY KEY (link, position)
+    ) WITHOUT ROWID;
+    CREATE INDEX IF NOT EXISTS outgoing_by_target ON outgoing (target, link);
+    CREATE TABLE IF NOT EXISTS truth_values (
+        atom INTEGER PRIMARY KEY,
+        strength REAL NOT NULL,
+        confidence REAL NOT NULL
+    );
+"""
+
+_INSERT_ATOM = "INSERT INTO atoms VALUES (?, ?, ?, ?)"
+_INSERT_EDGE = "INSERT INTO outgoing VALUES (?, ?, ?)"
+_UPSERT_TRUTH_VALUE = "INSERT OR REPLACE INTO truth_values VALUES (?, ?, ?)"
+
+# Queued operations: (_INSERT, atom row, edge rows) and (_DELETE, ID)
+_INSERT = 0
+_DELETE = 1
+
+
+def _outgoing_key(atom_type: AtomType, targets: Sequence[int]) -> bytes:
+    """Encode the outgoing set of a link for deduplication"""
+    if AtomType.is_unordered(atom_type):
+        targets = sorted(targets)
+    return array("q", targets).tobytes()
+
+
+class SQLiteStorage:
+    """
+    Persists the atoms of an AtomSpace in a SQLite database.
+    
+    The database has one table of atoms (with unique indexes on node type
+    and name and on link type and outgoing set), one of outgoing edges
+    (indexed by target, for incoming sets) and one of truth values. Atoms
+    are identified by database IDs of their own, since handles only last
+    as long as the process; the storage maps between the two for the atoms
+    it has stored or fetched.
+    
+    Writes are write-behind: store_atom and remove_atom only queue rows,
+    and a background thread writes the queue in one transaction every
+    flush_interval seconds, or sooner once batch_size rows are waiting.
+    Repeated truth value updates of one atom between flushes are written
+    once. Reads flush the queue first, so they see every earlier write.
+    
+    Example:
+        storage = SQLiteStorage(atomspace, "graph.db")
+        storage.load_atomspace()
+        ...
+        storage.store_atom(link)
+        storage.close()
+    """
+    
+    def __init__(
+        self,
+        atomspace,
+        path: str,
+        flush_interval: Optional[float] = 1.0,
+        batch_size: int = 10000,
+    ):
+        """
+        Open (or create) a database.
+        
+        Args:
+            atomspace: The AtomSpace (or ColumnarAtomSpace) to store
+            path: Database file (not ":memory:", since writes and reads
+                use separate connections)
+            flush_interval: Seconds between background writes, or None to
+                write only on flush() and when batch_size rows are waiting
+            batch_size: Number of queued rows that triggers a write
+        """
+        self.atomspace = atomspace
+        self.path = path
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        
+        # Writes go through one connection and reads through another, so
+        # that the background writer never holds up lookups
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        version = self._db.execute("PRAGMA user_version").fetchone()[0]
+        if version not in (0, SCHEMA_VERSION):
+            self._db.close()
+            raise ValueError(f"Unsupported storage schema version: {version}")
+        self._db.execute("PRAGMA journal_mode = WAL")
+        self._db.execute("PRAGMA synchronous = NORMAL")
+        with self._db:
+            self._db.executescript(_SCHEMA)
+            self._db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self._reader = sqlite3.connect(path, check_same_thread=False)
+        last_id = self._reader.execute("SELECT MAX(id) FROM atoms").fetchone()[0]
+        self._next_id = (last_id or 0) + 1
+        
+        # handle -> database ID
+        self._ids: Dict[int, int] = {}
+        
+        # The write queue: operations in order, and the latest truth value
+        # of each atom by database ID
+        self._queue: List[Tuple] = []
+        self._truth_values: Dict[int, Tuple[float, float]] = {}
+        # (type, name or outgoing key) -> database ID of the atoms queued
+        # for insertion, and of those being written, which lookups in the
+        # database cannot see yet
+        self._queued: Dict[Tuple[str, Union[str, bytes]], int] = {}
+        self._writing: Dict[Tuple[str, Union[str, bytes]], int] = {}
+        self._deletes_queued = False
+        self._queue_lock = threading.Lock()
+        # Held while writing; queued batches are written in order because
+        # the queue is swapped out under it
+        self._db_lock = threading.Lock()
+        self._read_lock = threading.Lock()
+        
+        self._error: Optional[BaseException] = None
+        self._closed = False
+        self._wake = threading.Event()
+        self._writer = None
+        if flush_interval is not None:
+            self._writer = threading.Thread(target=self._write_behind, name="SQLiteStorage writer", daemon=True)
+            self._writer.start()
+    
+    def store_atom(self, atom: Atom):
+        """
+        Queue an atom, its truth value and its outgoing atoms for writing.
+        
+        Storing an atom that is already stored updates its truth value.
+        
+        Args:
+            atom: An atom of the AtomSpace
+        """
+        self.store_atoms((atom,))
+    
+    def store_atoms(self, atoms: Iterable[Atom]):
+        """
+        Queue many atoms for writing, like store_atom.
+        
+        The cyclic garbage collector is paused meanwhile, as in
+        AtomSpace.bulk_load().
+        
+        Args:
+            atoms: Atoms of the AtomSpace
+        """
+        self._check_open()
+        atoms = iter(atoms)
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            while True:
+                # The queue lock is taken once per batch, so the writer can
+                # swap the queue out in between
+                batch = list(islice(atoms, self.batch_size))
+                if not batch:
+                    return
+                with self._queue_lock:
+                    for atom in batch:
+                        db_id = self._db_id(atom, create=True)
+                        truth_value = atom.truth_value
+                        self._truth_values[db_id] = (truth_value.strength, truth_value.confidence)
+                    queued = len(self._queue) + len(self._truth_values)
+                if queued >= self.batch_size:
+                    if self._writer is not None:
+                        self._wake.set()
+                    else:
+                        self.flush()
+        finally:
+            if gc_enabled:
+                gc.enable()
+    
+    def store_atomspace(self):
+        """Queue every atom of the AtomSpace for writing"""
+        self.store_atoms(self.atomspace.iter_atoms())
+    
+    def remove_atom(self, atom: Atom, recursive: bool = True) -> bool:
+        """
+        Remove an atom from the AtomSpace and from the database.
+        
+        Args:
+            atom: The atom to remove
+            recursive: Also remove every link that contains the atom, in
+                memory and in the database. If False, an atom with
+                incoming links in either is not removed.
+        
+        Returns:
+            True if the atom was removed from either
+        """
+        self._check_open()
+        atomspace = self.atomspace
+        db_id = self._find(atom)
+        if not recursive and (atomspace.count_incoming(atom) or (db_id is not None and self._stored_incoming(db_id))):
+            return False
+        
+        # Forget the handles of the links removed along with the atom
+        doomed = [atom]
+        seen = {atom.id}
+        for doomed_atom in doomed:
+            for link in atomspace.get_incoming(doomed_atom):
+                if link.id not in seen:
+                    seen.add(link.id)
+                    doomed.append(link)
+        with self._queue_lock:
+            for handle in seen:
+                stale = self._ids.pop(handle, None)
+                if stale is not None:
+                    self._truth_values.pop(stale, None)
+            if db_id is not None:
+                self._queue.append((_DELETE, db_id))
+                self._deletes_queued = True
+        removed = atomspace.remove_atom(atom, recursive)
+        return removed or db_id is not None
+    
+    def fetch_atom(self, atom: Atom) -> Optional[Atom]:
+        """
+        Load an atom and its stored truth value into the AtomSpace.
+        
+        Args:
+            atom: The atom to fetch; it need not be in the AtomSpace (a
+                Node or Link built for the purpose will do)
+        
+        Returns:
+            The atom in the AtomSpace, or None if it is not stored
+        """
+        self.flush()
+        db_id = self._find(atom)
+        if db_id is None:
+            return None
+        return self._load([db_id])[db_id]
+    
+    def fetch_incoming(self, atom: Atom, link_type: Optional[Union[AtomType, str]] = None) -> List[Link]:
+        """
+        Load the stored links that contain an atom into the AtomSpace.
+        
+        Args:
+            atom: The atom
+            link_type: Only load links of this type
+        
+        Returns:
+            The loaded links
+        """
+        self.flush()
+        db_id = self._find(atom)
+        if db_id is None:
+            return []
+        if isinstance(link_type, str):
+            link_type = AtomType.from_string(link_type)
+        with self._read_lock:
+            if link_type is None:
+                rows = self._reader.execute("SELECT DISTINCT link FROM outgoing WHERE target = ?", (db_id,))
+            else:
+                rows = self._reader.execute(
+                    "SELECT DISTINCT o.link FROM outgoing o JOIN atoms a ON a.id = o.link "
+                    "WHERE o.target = ? AND a.type = ?", (db_id, link_type.value))
+            links = [row[0] for row in rows]
+        loaded = self._load(links)
+        return [loaded[link] for link in links]
+    
+    def load_atomspace(self) -> int:
+        """
+        Load every stored atom into the AtomSpace.
+        
+        Atoms are read in database ID order, which puts every link after
+        its outgoing atoms, and added with add_nodes/add_links inside one
+        bulk_load() block, batch_size atoms at a time.
+        
+        Returns:
+            The number of atoms loaded
+        """
+        self.flush()
+        atomspace = self.atomspace
+        loaded: Dict[int, Atom] = {}
+        batch_ids: List[int] = []
+        batch: List[Tuple] = []
+        batch_is_links = False
+        
+        def add_batch():
+            added = atomspace.add_links(batch) if batch_is_links else atomspace.add_nodes(batch)
+            for db_id, added_atom in zip(batch_ids, added):
+                loaded[db_id] = added_atom
+            batch_ids.clear()
+            batch.clear()
+        
+        with self._read_lock, atomspace.bulk_load():
+            rows = self._reader.execute(
+                "SELECT a.id, a.type, a.name, t.strength, t.confidence FROM atoms a "
+                "LEFT JOIN truth_values t ON t.atom = a.id ORDER BY a.id")
+            edges = self._reader.execute("SELECT link, target FROM outgoing ORDER BY link, position")
+            edge = edges.fetchone()
+            types: Dict[str, AtomType] = {}
+            for db_id, type_name, name, strength, confidence in rows:
+                atom_type = types.get(type_name)
+                if atom_type is None:
+                    atom_type = types[type_name] = AtomType.from_string(type_name)
+                truth_value = TruthValue(strength, confidence) if strength is not None else TruthValue()
+                is_link = name is None
+                if is_link != batch_is_links or len(batch) >= self.batch_size:
+                    if batch:
+                        add_batch()
+                    batch_is_links = is_link
+                if is_link:
+                    targets = []
+                    while edge is not None and edge[0] == db_id:
+                        targets.append(edge[1])
+                        edge = edges.fetchone()
+                    if batch and any(target not in loaded for target in targets):
+                        # The link contains a link of the current batch
+                        add_batch()
+                    batch.append((atom_type, [loaded[target] for target in targets], truth_value))
+                else:
+                    batch.append((atom_type, name, truth_value))
+                batch_ids.append(db_id)
+            if batch:
+                add_batch()
+        
+        with self._queue_lock:
+            for db_id, atom in loaded.items():
+                self._ids[atom.id] = db_id
+        return len(loaded)
+    
+    def flush(self):
+        """Write every queued row now"""
+        if self._error is not None:
+            raise RuntimeError("Background write failed") from self._error
+        with self._db_lock:
+            with self._queue_lock:
+                queue, self._queue = self._queue, []
+                truth_values, self._truth_values = self._truth_values, {}
+                self._writing, self._queued = self._queued, {}
+                self._deletes_queued = False
+            try:
+                if queue or truth_values:
+                    self._write(queue, truth_values)
+            finally:
+                with self._queue_lock:
+                    self._writing = {}
+    
+    def close(self):
+        """Write every queued row and close the database"""
+        if self._closed:
+            return
+        self._closed = True
+        if self._writer is not None:
+            self._wake.set()
+            self._writer.join()
+        try:
+            self.flush()
+        finally:
+            self._db.close()
+            self._reader.close()
+    
+    def _check_open(self):
+        """Raise if the storage has been closed"""
+        if self._closed:
+            raise ValueError("Storage is closed")
+    
+    def _write_behind(self):
+        """Background thread: flush every flush_interval seconds"""
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as error:
+                # Reported by the next flush() in the owning thread
+                if self._error is None:
+                    self._error = error
+                return
+    
+    def _write(self, queue: List[Tuple], truth_values: Dict[int, Tuple[float, float]]):
+        """Write a swapped-out queue in one transaction"""
+        db = self._db
+        with db:
+            # Truth values go first so that queued deletes also remove them
+            if truth_values:
+                db.executemany(_UPSERT_TRUTH_VALUE, [
+                    (db_id, strength, confidence) for db_id, (strength, confidence) in truth_values.items()])
+            # Consecutive operations of one kind are written together
+            start = 0
+            while start < len(queue):
+                kind = queue[start][0]
+                end = start
+                while end < len(queue) and queue[end][0] == kind:
+                    end += 1
+                if kind == _INSERT:
+                    db.executemany(_INSERT_ATOM, [operation[1] for operation in queue[start:end]])
+                    db.executemany(_INSERT_EDGE, [row for operation in queue[start:end] for row in operation[2]])
+                else:
+                    self._delete([operation[1] for operation in queue[start:end]])
+                start = end
+    
+    def _delete(self, db_ids: List[int]):
+        """Delete atoms and every stored link that contains them"""
+        db = self._db
+        db.execute("CREATE TEMP TABLE IF NOT EXISTS doomed (id INTEGER PRIMARY KEY)")
+        db.execute("DELETE FROM doomed")
+        db.executemany("INSERT OR IGNORE INTO doomed VALUES (?)", [(db_id,) for db_id in db_ids])
+        db.execute("""
+            INSERT OR IGNORE INTO doomed
+            WITH RECURSIVE closure(id) AS (
+                SELECT id FROM doomed
+                UNION
+                SELECT o.link FROM outgoing o JOIN closure c ON o.target = c.id
+            )
+            SELECT id FROM closure
+        """)
+        db.execute("DELETE FROM atoms WHERE id IN (SELECT id FROM doomed)")
+        db.execute("DELETE FROM outgoing WHERE link IN (SELECT id FROM doomed)")
+        db.execute("DELETE FROM truth_values WHERE atom IN (SELECT id FROM doomed)")
+    
+    def _db_id(self, atom: Atom, create: bool) -> Optional[int]:
+        """
+        Get the database ID of an atom, with the queue lock held.
+        
+        If create, atoms that are not stored yet (the atom and any of its
+        outgoing atoms) are given new IDs and queued for writing, and the
+        handle map is updated. Otherwise the handle map is left as is.
+        Link-of-link chains are walked without recursion.
+        """
+        ids = self._ids
+        db_id = ids.get(atom.id)
+        if db_id is not None:
+            return db_id
+        # New IDs go straight into the handle map when creating
+        found = ids if create else {}
+        stack = [atom]
+        while stack:
+            top = stack.pop()
+            if top.id in found or top.id in ids:
+                continue
+            targets = key = None
+            if isinstance(top, Link):
+                outgoing = top.outgoing
+                targets = [ids.get(target.id) or found.get(target.id) for target in outgoing]
+                if None in targets:
+                    # Visit the link again once its outgoing atoms have IDs
+                    stack.append(top)
+                    stack.extend([target for target, target_id in zip(outgoing, targets) if target_id is None])
+                    continue
+                key = _outgoing_key(top.type, targets)
+            db_id = self._lookup(top, key)
+            if db_id is None:
+                if not create:
+                    return None
+                db_id = self._next_id
+                self._next_id += 1
+                self._queued[(top.type.value, top.name if key is None else key)] = db_id
+                if targets is None:
+                    self._queue.append((_INSERT, (db_id, top.type.value, top.name, None), ()))
+                else:
+                    self._queue.append((_INSERT, (db_id, top.type.value, None, key),
+                                        [(db_id, position, target) for position, target in enumerate(targets)]))
+                truth_value = top.truth_value
+                self._truth_values[db_id] = (truth_value.strength, truth_value.confidence)
+            found[top.id] = db_id
+        return found[atom.id]
+    
+    def _lookup(self, atom: Atom, key: Optional[bytes]) -> Optional[int]:
+        """
+        Find a stored or queued atom by type and name or outgoing key, with
+        the queue lock held.
+        """
+        if self._deletes_queued:
+            # The rows of removed atoms must be gone before looking atoms up
+            self._queue_lock.release()
+            try:
+                self.flush()
+            finally:
+                self._queue_lock.acquire()
+        queued = (atom.type.value, atom.name if key is None else key)
+        db_id = self._queued.get(queued) or self._writing.get(queued)
+        if db_id is not None:
+            return db_id
+        with self._read_lock:
+            if key is None:
+                row = self._reader.execute(
+                    "SELECT id FROM atoms WHERE type = ? AND name = ?", (atom.type.value, atom.name)).fetchone()
+            else:
+                row = self._reader.execute(
+                    "SELECT id FROM atoms WHERE type = ? AND outgoing_key = ? AND name IS NULL",
+                    (atom.type.value, key)).fetchone()
+        return row[0] if row else None
+    
+    def _find(self, atom: Atom) -> Optional[int]:
+        """Get the database ID of an atom without storing anything"""
+        with self._queue_lock:
+            return self._db_id(atom, create=False)
+    
+    def _stored_incoming(self, db_id: int) -> bool:
+        """Check whether a stored link contains the atom"""
+        self.flush()
+        with self._read_lock:
+            return self._reader.execute("SELECT 1 FROM outgoing WHERE target = ? LIMIT 1", (db_id,)).fetchone() is not None
+    
+    def _load(self, db_ids: Sequence[int]) -> Dict[int, Atom]:
+        """Load stored atoms, and the atoms they contain, into the AtomSpace"""
+        atomspace = self.atomspace
+        loaded: Dict[int, Atom] = {}
+        rows: Dict[int, Tuple] = {}
+        edges: Dict[int, List[int]] = {}
+        wanted = set(db_ids)
+        with self._read_lock:
+            while wanted:
+                batch = list(wanted)
+                wanted = set()
+                for start in range(0, len(batch), 500):
+                    chunk = batch[start:start + 500]
+                    marks = ",".join("?" * len(chunk))
+                    for row in self._reader.execute(
+                            "SELECT a.id, a.type, a.name, t.strength, t.confidence FROM atoms a "
+                            f"LEFT JOIN truth_values t ON t.atom = a.id WHERE a.id IN ({marks})", chunk):
+                        rows[row[0]] = row
+                    for link, target in self._reader.execute(
+                            f"SELECT link, target FROM outgoing WHERE link IN ({marks}) ORDER BY link, position", chunk):
+                        edges.setdefault(link, []).append(target)
+                        if target not in rows:
+                            wanted.add(target)
+        
+        # Links always have higher IDs than their outgoing atoms
+        for db_id in sorted(rows):
+            _, type_name, name, strength, confidence = rows[db_id]
+            truth_value = TruthValue(strength, confidence) if strength is not None else TruthValue()
+            if name is not None:
+                atom = atomspace.add_node(type_name, name, truth_value)
+            else:
+                atom = atomspace.add_link(type_name, [loaded[target] for target in edges.get(db_id, ())], truth_value)
+            loaded[db_id] = atom
+        with self._queue_lock:
+            for db_id, atom in loaded.items():
+                self._ids[atom.id] = db_id
+        return loaded
+    
+    def __len__(self) -> int:
+        """Return the number of stored atoms"""
+        self.flush()
+        with self._read_lock:
+            return self._reader.execute("SELECT COUNT(*) FROM atoms").fetchone()[0]
+    
+    def __repr__(self) -> str:
+        return f"SQLiteStorage(path={self.path!r})"
@@ -0,0 +1,562 @@
+"""
+Write-ahead log and snapshots for crash recovery of an AtomSpace
+"""
+
+import os
+import threading
+import time
+import zlib
+from array import array
+from operator import itemgetter
+from struct import Struct
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from cogpy.core.atom import Atom, Node
+from cogpy.core.atomspace import AtomSpace
+from cogpy.core.types import AtomType
+from cogpy.core.truthvalue import TruthValue
+
+
+# Every file starts with a magic string, a format version and the table of
+# type names that the type codes in its records index
+_MAGIC = b"COGPYWAL"
+_SNAPSHOT_MAGIC = b"COGPYSNP"
+FORMAT_VERSION = 1
+
+# Files are sequences of frames, each a (length, CRC-32) header followed by
+# that many bytes of records. A frame is written with one write() call, so
+# after a crash the log is read up to its first torn or corrupt frame.
+_FRAME = Struct("<II")
+
+# Records: an opcode byte then its fields. Atoms are referred to by log IDs,
+# which are assigned in order of creation and, unlike handles, stay valid
+# across restarts.
+_NODE = 1         # type, strength, confidence, name length; name
+_LINK = 2         # type, strength, confidence, arity; outgoing log IDs
+_TRUTH_VALUE = 3  # log ID, strength, confidence
+_REMOVE = 4       # log ID
+_CLEAR = 5
+_END = 6          # last record of a complete snapshot; next log ID
+
+_ATOM = Struct("<BHddI")
+_SNAPSHOT_ATOM = Struct("<BqHddI")
+_ID_TV = Struct("<Bqdd")
+_ID = Struct("<Bq")
+
+_TYPES = list(AtomType)
+_TYPE_CODES = {atom_type: code for code, atom_type in enumerate(_TYPES)}
+
+# Buffered records that wake the commit thread early
+_COMMIT_BYTES = 1 << 20
+
+# Link record layouts by arity
+_LINK_RECORDS: Dict[int, Struct] = {}
+
+
+def _link_record(arity: int) -> Struct:
+    """Get the layout of a link record, header and outgoing log IDs"""
+    layout = _LINK_RECORDS.get(arity)
+    if layout is None:
+        layout = _LINK_RECORDS[arity] = Struct(_ATOM.format + "q" * arity)
+    return layout
+
+
+def _header(magic: bytes) -> bytes:
+    """Encode a file header"""
+    names = "\n".join(atom_type.value for atom_type in _TYPES).encode()
+    return magic + _FRAME.pack(FORMAT_VERSION, len(names)) + names
+
+
+def _read_header(data: memoryview, magic: bytes) -> Tuple[List[AtomType], int]:
+    """Decode a file header into its type table and the offset after it"""
+    if bytes(data[:8]) != magic:
+        raise ValueError("Not a cogpy log or snapshot file")
+    version, size = _FRAME.unpack_from(data, 8)
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported log format version: {version}")
+    start = 8 + _FRAME.size
+    names = bytes(data[start:start + size]).decode().split("\n")
+    return [AtomType.from_string(name) for name in names], start + size
+
+
+def _frame(records: bytes) -> bytes:
+    """Wrap records in a frame"""
+    return _FRAME.pack(len(records), zlib.crc32(records)) + records
+
+
+def _read_frames(data: memoryview, offset: int) -> Iterator[memoryview]:
+    """Yield the records of each intact frame, stopping at a torn one"""
+    end = len(data)
+    while offset + _FRAME.size <= end:
+        size, checksum = _FRAME.unpack_from(data, offset)
+        start = offset + _FRAME.size
+        records = data[start:start + size]
+        if len(records) < size or zlib.crc32(records) != checksum:
+            return
+        yield records
+        offset = start + size
+
+
+class WriteAheadLog:
+    """
+    Makes an AtomSpace durable with a write-ahead log and snapshots.
+    
+    Once attached, every atom added or removed, every truth value change
+    and every clear() is appended as a compact binary record to a log
+    segment in directory. Records are buffered in memory and a background
+    thread writes and fsyncs the buffer every commit_interval seconds
+    (group commit), so a crash loses at most the last interval of changes;
+    commit() makes every change so far durable at once.
+    
+    Every snapshot_interval seconds the log is checkpointed: the next
+    change starts a new segment, and the AtomSpace as of that point is
+    written to a snapshot by a background thread. Capturing that point
+    copies the AtomSpace's tables, not its atoms, so it is cheap; atoms
+    never change their identity, so the snapshot can be written while the
+    AtomSpace carries on. Once the snapshot is on disk, the older
+    segments and snapshots are deleted.
+    
+    Opening a directory that holds a log recovers it: the latest snapshot
+    is loaded and the segments written after it are replayed, inside one
+    bulk_load() block.
+    
+    Example:
+        atomspace = AtomSpace()
+        log = WriteAheadLog(atomspace, "state/")   # Recovers state/
+        atomspace.add_node("ConceptNode", "cat")   # Logged
+        log.close()
+    """
+    
+    def __init__(
+        self,
+        atomspace: AtomSpace,
+        directory: str,
+        commit_interval: float = 0.01,
+        snapshot_interval: Optional[float] = 300.0,
+    ):
+        """
+        Open a log, recovering the state it holds into the AtomSpace.
+        
+        Args:
+            atomspace: An AtomSpace; it must be empty if directory already
+                holds a log. ColumnarAtomSpace, BoundedAtomSpace and frames
+                are not supported.
+            directory: Directory of the log segments and snapshots,
+                created if needed
+            commit_interval: Seconds between group commits
+            snapshot_interval: Seconds between checkpoints, or None to
+                checkpoint only when checkpoint() is called
+        """
+        from cogpy.core.bounded import BoundedAtomSpace
+        if not isinstance(atomspace, AtomSpace) or isinstance(atomspace, BoundedAtomSpace):
+            raise TypeError("WriteAheadLog requires an AtomSpace")
+        if atomspace.parent is not None:
+            raise TypeError("WriteAheadLog cannot log a frame; attach it to the parent")
+        if atomspace._journal is not None:
+            raise ValueError("The AtomSpace already has a log attached")
+        self.atomspace = atomspace
+        self.directory = directory
+        self.commit_interval = commit_interval
+        self.snapshot_interval = snapshot_interval
+        os.makedirs(directory, exist_ok=True)
+        
+        # handle -> log ID of every logged atom
+        self._ids: Dict[int, int] = {}
+        self._next_id = 0
+        
+        snapshots, segments = self._scan()
+        if snapshots or segments:
+            if len(atomspace):
+                raise ValueError("Recovering a log requires an empty AtomSpace")
+            self.recovered = self._recover(snapshots, segments)
+            generation = max(snapshots + segments) + 1
+        else:
+            self.recovered = 0
+            generation = 0
+        
+        # Records not yet written, and the open segment
+        self._buffer = bytearray()
+        self._buffer_lock = threading.Lock()
+        self._file_lock = threading.Lock()
+        self._generation = generation
+        self._segment = self._open_segment(generation)
+        
+        self._error: Optional[BaseException] = None
+        self._closed = False
+        self._checkpoint_due = False
+        self._last_checkpoint = time.monotonic()
+        self._snapshotter: Optional[threading.Thread] = None
+        self._wake = threading.Event()
+        self._committer = threading.Thread(target=self._commit_loop, name="WriteAheadLog committer", daemon=True)
+        self._committer.start()
+        
+        atomspace._flush_pending()
+        atomspace._journal = self
+        atomspace._truth_values._journal = self
+        if len(atomspace) and not self.recovered:
+            # Atoms added before the log was attached go in the first
+            # snapshot, in handle order so that links follow their
+            # outgoing atoms
+            for atom in sorted(atomspace.iter_atoms(), key=lambda atom: atom.id):
+                self._ids[atom.id] = self._next_id
+                self._next_id += 1
+            self.checkpoint(wait=True)
+    
+    def commit(self):
+        """Write and fsync every buffered record now"""
+        if self._error is not None:
+            raise RuntimeError("Background log write failed") from self._error
+        with self._file_lock:
+            self._write_buffer()
+    
+    def checkpoint(self, wait: bool = False) -> bool:
+        """
+        Start a new segment and snapshot the AtomSpace in the background.
+        
+        Must be called from the thread that changes the AtomSpace.
+        
+        Args:
+            wait: Wait for the snapshot to be written
+        
+        Returns:
+            False if the previous snapshot is still being written and no
+            checkpoint was taken
+        """
+        self._checkpoint_due = False
+        self._last_checkpoint = time.monotonic()
+        if self._snapshotter is not None and self._snapshotter.is_alive():
+            if not wait:
+                return False
+            self._snapshotter.join()
+        
+        # Every change so far goes in the old segment and in the snapshot
+        atomspace = self.atomspace
+        with self._file_lock:
+            self._write_buffer()
+            self._segment.close()
+            self._generation += 1
+            self._segment = self._open_segment(self._generation)
+        truth_values = atomspace._truth_values
+        image = (
+            dict(self._ids),
+            dict(atomspace._nodes),
+            dict(atomspace._links),
+            truth_values._strength[:],
+            truth_values._confidence[:],
+            dict(truth_values._rows),
+            self._next_id,
+        )
+        self._snapshotter = threading.Thread(
+            target=self._write_snapshot, args=(self._generation, image), name="WriteAheadLog snapshotter", daemon=True)
+        self._snapshotter.start()
+        if wait:
+            self._snapshotter.join()
+            if self._error is not None:
+                raise RuntimeError("Snapshot write failed") from self._error
+        return True
+    
+    def close(self):
+        """Commit every buffered record, detach from the AtomSpace and close"""
+        if self._closed:
+            return
+        self._closed = True
+        atomspace = self.atomspace
+        atomspace._journal = None
+        atomspace._truth_values._journal = None
+        self._wake.set()
+        self._committer.join()
+        if self._snapshotter is not None:
+            self._snapshotter.join()
+        try:
+            self.commit()
+        finally:
+            self._segment.close()
+    
+    def atom_added(self, atom: Atom):
+        """Log a new atom (called by the AtomSpace)"""
+        if self._checkpoint_due:
+            self.checkpoint()
+        ids = self._ids
+        store = self.atomspace._truth_values
+        row = store._rows[atom.id]
+        strength = store._strength[row]
+        confidence = store._confidence[row]
+        code = _TYPE_CODES[atom.type]
+        if isinstance(atom, Node):
+            name = atom.name.encode()
+            record = _ATOM.pack(_NODE, code, strength, confidence, len(name)) + name
+        else:
+            outgoing = atom.outgoing
+            record = _link_record(len(outgoing)).pack(
+                _LINK, code, strength, confidence, len(outgoing), *[ids[target.id] for target in outgoing])
+        ids[atom.id] = self._next_id
+        self._next_id += 1
+        self._append(record)
+    
+    def atoms_removed(self, doomed: Dict[int, Atom]):
+        """Log removed atoms (called by the AtomSpace)"""
+        if self._checkpoint_due:
+            self.checkpoint()
+        ids = self._ids
+        records = b"".join([_ID.pack(_REMOVE, ids.pop(handle)) for handle in doomed if handle in ids])
+        self._append(records)
+    
+    def truth_value_changed(self, handle: int):
+        """Log the truth value of one atom (called by its TruthValueStore)"""
+        if self._checkpoint_due:
+            self.checkpoint()
+        log_id = self._ids.get(handle)
+        if log_id is not None:
+            store = self.atomspace._truth_values
+            row = store._rows[handle]
+            self._append(_ID_TV.pack(_TRUTH_VALUE, log_id, store._strength[row], store._confidence[row]))
+    
+    def truth_values_changed(self, handles):
+        """Log the truth values of many atoms (called by their TruthValueStore)"""
+        if self._checkpoint_due:
+            self.checkpoint()
+        ids = self._ids
+        store = self.atomspace._truth_values
+        rows = store._rows
+        strength = store._strength
+        confidence = store._confidence
+        records = []
+        for handle in handles.tolist():
+            log_id = ids.get(handle)
+            if log_id is not None:
+                row = rows[handle]
+                records.append(_ID_TV.pack(_TRUTH_VALUE, log_id, strength[row], confidence[row]))
+        self._append(b"".join(records))
+    
+    def cleared(self):
+        """Log that every atom was removed (called by the AtomSpace)"""
+        if self._checkpoint_due:
+            self.checkpoint()
+        self._ids.clear()
+        self._append(bytes([_CLEAR]))
+    
+    def _append(self, records: bytes):
+        """Buffer records for the next group commit"""
+        with self._buffer_lock:
+            self._buffer += records
+            size = len(self._buffer)
+        if size >= _COMMIT_BYTES:
+            self._wake.set()
+    
+    def _write_buffer(self):
+        """Write and fsync the buffered records, with the file lock held"""
+        with self._buffer_lock:
+            records = bytes(self._buffer)
+            self._buffer.clear()
+        if records:
+            self._segment.write(_frame(records))
+            self._segment.flush()
+            os.fsync(self._segment.fileno())
+    
+    def _commit_loop(self):
+        """Background thread: commit every commit_interval seconds"""
+        while not self._closed:
+            self._wake.wait(self.commit_interval)
+            self._wake.clear()
+            try:
+                self.commit()
+            except Exception as error:
+                # Reported by the next commit() in the owning thread
+                if self._error is None:
+                    self._error = error
+                return
+            if self.snapshot_interval is not None and \
+                    time.monotonic() - self._last_checkpoint >= self.snapshot_interval:
+                # Taken by the next change, in the thread making it
+                self._checkpoint_due = True
+    
+    def _path(self, kind: str, generation: int) -> str:
+        """Get the path of a segment ("wal") or snapshot ("snapshot")"""
+        return os.path.join(self.directory, f"{kind}-{generation:010d}.bin")
+    
+    def _open_segment(self, generation: int):
+        """Create a segment file"""
+        segment = open(self._path("wal", generation), "ab")
+        if segment.tell() == 0:
+            segment.write(_header(_MAGIC))
+            segment.flush()
+            os.fsync(segment.fileno())
+        return segment
+    
+    def _scan(self) -> Tuple[List[int], List[int]]:
+        """List the generations of the snapshots and segments in the directory"""
+        snapshots = []
+        segments = []
+        for name in os.listdir(self.directory):
+            kind, _, rest = name.partition("-")
+            generation, _, extension = rest.partition(".")
+            if not generation.isdigit():
+                continue
+            if extension == "tmp":
+                # A snapshot that was never finished
+                os.remove(os.path.join(self.directory, name))
+            elif kind == "snapshot" and extension == "bin":
+                snapshots.append(int(generation))
+            elif kind == "wal" and extension == "bin":
+                segments.append(int(generation))
+        return sorted(snapshots), sorted(segments)
+    
+    def _write_snapshot(self, generation: int, image: Tuple):
+        """Background thread: write a snapshot, then drop what it replaces"""
+        try:
+            ids, nodes, links, strength, confidence, rows, next_id = image
+            path = self._path("snapshot", generation)
+            with open(path + ".tmp", "wb") as snapshot:
+                snapshot.write(_header(_SNAPSHOT_MAGIC))
+                records = []
+                size = 0
+                # Log IDs follow creation order, so links follow their
+                # outgoing atoms
+                for handle, log_id in sorted(ids.items(), key=itemgetter(1)):
+                    row = rows[handle]
+                    atom = nodes.get(handle)
+                    if atom is not None:
+                        name = atom.name.encode()
+                        record = _SNAPSHOT_ATOM.pack(
+                            _NODE, log_id, _TYPE_CODES[atom.type], strength[row], confidence[row], len(name)) + name
+                    else:
+                        atom = links[handle]
+                        outgoing = array("q", [ids[target.id] for target in atom.outgoing])
+                        record = _SNAPSHOT_ATOM.pack(
+                            _LINK, log_id, _TYPE_CODES[atom.type], strength[row], confidence[row],
+                            len(outgoing)) + outgoing.tobytes()
+                    records.append(record)
+                    size += len(record)
+                    if size >= _COMMIT_BYTES:
+                        snapshot.write(_frame(b"".join(records)))
+                        records.clear()
+                        size = 0
+                records.append(_ID.pack(_END, next_id))
+                snapshot.write(_frame(b"".join(records)))
+                snapshot.flush()
+                os.fsync(snapshot.fileno())
+            os.replace(path + ".tmp", path)
+            self._sync_directory()
+            
+            snapshots, segments = self._scan()
+            for old in snapshots:
+                if old < generation:
+                    os.remove(self._path("snapshot", old))
+            for old in segments:
+                if old < generation:
+                    os.remove(self._path("wal", old))
+        except Exception as error:
+            if self._error is None:
+                self._error = error
+    
+    def _sync_directory(self):
+        """Make renames in the directory durable, where the OS allows it"""
+        if hasattr(os, "O_DIRECTORY"):
+            descriptor = os.open(self.directory, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(descriptor)
+            finally:
+                os.close(descriptor)
+    
+    def _recover(self, snapshots: List[int], segments: List[int]) -> int:
+        """Load the latest snapshot and replay the segments after it"""
+        atomspace = self.atomspace
+        # log ID -> atom
+        atoms: Dict[int, Atom] = {}
+        start = 0
+        with atomspace.bulk_load():
+            if snapshots:
+                start = snapshots[-1]
+                self._load_snapshot(self._path("snapshot", start), atoms)
+            for generation in segments:
+                if generation >= start:
+                    self._replay(self._path("wal", generation), atoms)
+        self._ids = {atom.id: log_id for log_id, atom in atoms.items()}
+        return len(atoms)
+    
+    def _load_snapshot(self, path: str, atoms: Dict[int, Atom]):
+        """Add the atoms of a snapshot"""
+        atomspace = self.atomspace
+        with open(path, "rb") as snapshot:
+            data = memoryview(snapshot.read())
+        types, offset = _read_header(data, _SNAPSHOT_MAGIC)
+        unpack_atom = _SNAPSHOT_ATOM.unpack_from
+        atom_size = _SNAPSHOT_ATOM.size
+        complete = False
+        for records in _read_frames(data, offset):
+            position = 0
+            end = len(records)
+            while position < end:
+                opcode = records[position]
+                if opcode == _END:
+                    self._next_id = _ID.unpack_from(records, position)[1]
+                    complete = True
+                    break
+                _, log_id, code, strength, confidence, size = unpack_atom(records, position)
+                position += atom_size
+                if opcode == _NODE:
+                    name = str(records[position:position + size], "utf-8")
+                    position += size
+                    atoms[log_id] = atomspace.add_node(types[code], name, TruthValue(strength, confidence))
+                else:
+                    outgoing = array("q")
+                    outgoing.frombytes(records[position:position + 8 * size])
+                    position += 8 * size
+                    atoms[log_id] = atomspace.add_link(
+                        types[code], [atoms[target] for target in outgoing], TruthValue(strength, confidence))
+        if not complete:
+            raise ValueError(f"Snapshot {path} is incomplete")
+    
+    def _replay(self, path: str, atoms: Dict[int, Atom]):
+        """Apply the records of a segment, up to its first torn frame"""
+        atomspace = self.atomspace
+        with open(path, "rb") as segment:
+            data = memoryview(segment.read())
+        if len(data) < len(_header(_MAGIC)):
+            # Created just before a crash
+            return
+        types, offset = _read_header(data, _MAGIC)
+        unpack_atom = _ATOM.unpack_from
+        atom_size = _ATOM.size
+        for records in _read_frames(data, offset):
+            position = 0
+            end = len(records)
+            removed = []
+            while position < end:
+                opcode = records[position]
+                if removed and opcode != _REMOVE:
+                    atomspace.remove_atoms(removed)
+                    removed = []
+                if opcode == _NODE or opcode == _LINK:
+                    _, code, strength, confidence, size = unpack_atom(records, position)
+                    position += atom_size
+                    if opcode == _NODE:
+                        name = str(records[position:position + size], "utf-8")
+                        position += size
+                        atom = atomspace.add_node(types[code], name, TruthValue(strength, confidence))
+                    else:
+                        outgoing = array("q")
+                        outgoing.frombytes(records[position:position + 8 * size])
+                        position += 8 * size
+                        atom = atomspace.add_link(
+                            types[code], [atoms[target] for target in outgoing], TruthValue(strength, confidence))
+                    atoms[self._next_id] = atom
+                    self._next_id += 1
+                elif opcode == _TRUTH_VALUE:
+                    _, log_id, strength, confidence = _ID_TV.unpack_from(records, position)
+                    position += _ID_TV.size
+                    atoms[log_id].truth_value = TruthValue(strength, confidence)
+                elif opcode == _REMOVE:
+                    removed.append(atoms.pop(_ID.unpack_from(records, position)[1]))
+                    position += _ID.size
+                elif opcode == _CLEAR:
+                    atomspace.clear()
+                    atoms.clear()
+                    position += 1
+                else:
+                    raise ValueError(f"Corrupt log record in {path}")
+            if removed:
+                atomspace.remove_atoms(removed)
+    
+    def __repr__(self) -> str:
+        return f"WriteAheadLog(directory={self.directory!r})"
@@ -0,0 +1,22 @@
+"""
+AtomSpace backends that test suites run against
+"""
+
+from cogpy.core.atomspace import AtomSpace
+from cogpy.core.columnar import ColumnarAtomSpace
+
+
+class AtomSpaceBackend:
+    """Mixin for test cases that run against an AtomSpace"""
+    
+    def make_atomspace(self):
+        """Create the AtomSpace under test"""
+        return AtomSpace()
+
+
+class ColumnarBackend:
+    """Mixin for test cases that run against a ColumnarAtomSpace"""
+    
+    def make_atomspace(self):
+        """Create the AtomSpace under test"""
+        return ColumnarAtomSpace()
@@ -38,6 +38,13 @@ class TestNode(unittest.TestCase):
         
         self.assertEqual(node1, node2)
         self.assertNotEqual(node1, node3)
+    
+    def test_node_is_slotted(self):
+        """Test nodes have no per-instance __dict__"""
+        node = Node(AtomType.CONCEPT_NODE, "cat")
+        self.assertFalse(hasattr(node, "__dict__"))
+        with self.assertRaises(AttributeError):
+            node.color = "grey"
 
 
 class TestLink(unittest.TestCase):
@@ -82,6 +89,42 @@ class TestLink(unittest.TestCase):
         
         self.assertEqual(link1, link2)
         self.assertNotEqual(link1, link3)
+    
+    def test_link_outgoing_is_tuple(self):
+        """Test outgoing is stored as an immutable tuple"""
+        node1 = Node(AtomType.CONCEPT_NODE, "cat")
+        node2 = Node(AtomType.CONCEPT_NODE, "animal")
+        outgoing = [node1, node2]
+        link = Link(AtomType.INHERITANCE_LINK, outgoing)
+        outgoing.append(node1)
+        
+        self.assertEqual(link.outgoing, (node1, node2))
+        self.assertEqual(Link(AtomType.LIST_LINK, []).outgoing, ())
+    
+    def test_unordered_link_equality(self):
+        """Test unordered links ignore outgoing order"""
+        node1 = Node(AtomType.CONCEPT_NODE, "cat")
+        node2 = Node(AtomType.CONCEPT_NODE, "dog")
+        
+        forward = Link(AtomType.SIMILARITY_LINK, [node1, node2])
+        backward = Link(AtomType.SIMILARITY_LINK, [node2, node1])
+        self.assertEqual(forward, backward)
+        self.assertEqual(hash(forward), hash(backward))
+        self.assertEqual(backward.outgoing, (node1, node2))
+        
+        ordered = Link(AtomType.LIST_LINK, [node2, node1])
+        self.assertEqual(ordered.outgoing, (node2, node1))
+        self.assertNotEqual(ordered, Link(AtomType.LIST_LINK, [node1, node2]))
+    
+    def test_link_hash(self):
+        """Test equal links hash equally"""
+        node1 = Node(AtomType.CONCEPT_NODE, "cat")
+        node2 = Node(AtomType.CONCEPT_NODE, "animal")
+        
+        link1 = Link(AtomType.INHERITANCE_LINK, [node1, node2])
+        link2 = Link(AtomType.INHERITANCE_LINK, [node1, node2])
+        self.assertEqual(hash(link1), hash(link2))
+        self.assertEqual(len({link1, link2}), 1)
 
 
 if __name__ == '__main__':
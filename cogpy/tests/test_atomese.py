@@ -0,0 +1,107 @@
+"""
+Tests for the Atomese reader and writer
+"""
+
+import io
+import os
+import tempfile
+import unittest
+from cogpy.core.types import AtomType
+from cogpy.core.truthvalue import TruthValue
+from cogpy.io.atomese import iter_atomese, read_atomese, write_atomese
+from cogpy.tests.backends import AtomSpaceBackend, ColumnarBackend
+
+
+SAMPLE = '''; Knowledge about cats
+(InheritanceLink (stv 0.9 0.8)
+    (ConceptNode "cat")
+    (ConceptNode "animal"))
+(ConceptNode "animal" (stv 0.5 0.25))  ; trailing comment
+(EvaluationLink
+    (PredicateNode "says")
+    (ListLink (ConceptNode "cat") (ConceptNode "\\"meow\\" \\\\ purr")))
+(ListLink)'''
+
+
+class TestAtomese(AtomSpaceBackend, unittest.TestCase):
+    """Test reading and writing Atomese"""
+    
+    def read(self, text, **kwargs):
+        """Read Atomese text into a new AtomSpace"""
+        atomspace = self.make_atomspace()
+        read_atomese(atomspace, io.StringIO(text), **kwargs)
+        return atomspace
+    
+    def assertSameAtoms(self, first, second):
+        """Assert two AtomSpaces hold the same atoms and truth values"""
+        def atoms(atomspace):
+            return sorted((repr(atom), atom.truth_value.to_tuple()) for atom in atomspace.get_all_atoms())
+        self.assertEqual(atoms(first), atoms(second))
+    
+    def test_read(self):
+        """Test atoms, truth values, comments and escapes are read"""
+        atomspace = self.make_atomspace()
+        self.assertEqual(read_atomese(atomspace, io.StringIO(SAMPLE)), 4)
+        self.assertEqual(len(atomspace), 8)
+        cat = atomspace.get_node_by_name("cat")
+        animal = atomspace.get_node_by_name("animal")
+        self.assertEqual(animal.truth_value, TruthValue(0.5, 0.25))
+        self.assertEqual(atomspace.get_link(AtomType.INHERITANCE_LINK, [cat, animal]).truth_value,
+                         TruthValue(0.9, 0.8))
+        self.assertIsNotNone(atomspace.get_node_by_name('"meow" \\ purr'))
+        self.assertEqual(len(atomspace.get_atoms_by_type(AtomType.LIST_LINK)), 2)
+    
+    def test_chunk_boundaries(self):
+        """Test tokens cut off at the end of a chunk are read whole"""
+        expected = self.read(SAMPLE)
+        for chunk_size in range(40, len(SAMPLE) + 1):
+            self.assertSameAtoms(self.read(SAMPLE, chunk_size=chunk_size), expected)
+    
+    def test_round_trip(self):
+        """Test written Atomese reads back as the same atoms"""
+        atomspace = self.read(SAMPLE)
+        output = io.StringIO()
+        self.assertEqual(write_atomese(atomspace, output), 4)
+        self.assertSameAtoms(self.read(output.getvalue()), atomspace)
+    
+    def test_write_order(self):
+        """Test only roots and atoms with truth values get their own line"""
+        lines = list(iter_atomese(self.read(SAMPLE)))
+        self.assertEqual(lines[0], '(ConceptNode "animal" (stv 0.5 0.25))\n')
+        self.assertEqual(lines[1], '(InheritanceLink (stv 0.9 0.8) (ConceptNode "cat") (ConceptNode "animal"))\n')
+        self.assertFalse(any(line.startswith('(ConceptNode "cat"') for line in lines))
+        self.assertIn("(ListLink)\n", lines)
+    
+    def test_deep_nesting(self):
+        """Test deeply nested links are written and read without recursion"""
+        atomspace = self.make_atomspace()
+        atom = atomspace.add_node("ConceptNode", "x")
+        for _ in range(3000):
+            atom = atomspace.add_link("ListLink", [atom])
+        output = io.StringIO()
+        self.assertEqual(write_atomese(atomspace, output), 1)
+        self.assertEqual(len(self.read(output.getvalue())), 3001)
+    
+    def test_files(self):
+        """Test paths can be given instead of file objects"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "atoms.scm")
+            write_atomese(self.read(SAMPLE), path)
+            atomspace = self.make_atomspace()
+            self.assertEqual(read_atomese(atomspace, path), 4)
+            self.assertEqual(len(atomspace), 8)
+    
+    def test_invalid(self):
+        """Test malformed input is refused"""
+        for text in ['(ConceptNode cat)', '(UnknownNode "x")', '(ListLink "x")', '(InheritanceLink',
+                     ')', '(ConceptNode "x") junk', '(stv 1 1)', '(ConceptNode "unterminated)']:
+            with self.subTest(text=text), self.assertRaises(ValueError):
+                self.read(text)
+
+
+class TestColumnarAtomese(ColumnarBackend, TestAtomese):
+    """Run the Atomese tests against ColumnarAtomSpace"""
+
+
+if __name__ == '__main__':
+    unittest.main()
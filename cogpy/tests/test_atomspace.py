@@ -6,15 +6,16 @@ import unittest
 from cogpy.core.atomspace import AtomSpace
 from cogpy.core.atom import Node, Link
 from cogpy.core.types import AtomType
-from cogpy.core.truthvalue import TruthValue
+from cogpy.core.truthvalue import TruthValue, np
+from cogpy.tests.backends import AtomSpaceBackend
 
 
-class TestAtomSpace(unittest.TestCase):
+class TestAtomSpace(AtomSpaceBackend, unittest.TestCase):
     """Test AtomSpace class"""
     
     def setUp(self):
         """Set up test fixtures"""
-        self.atomspace = AtomSpace()
+        self.atomspace = self.make_atomspace()
     
     def test_create_atomspace(self):
         """Test creating an AtomSpace"""
@@ -43,6 +44,71 @@ class TestAtomSpace(unittest.TestCase):
         self.assertEqual(link.type, AtomType.INHERITANCE_LINK)
         self.assertEqual(len(self.atomspace), 3)  # 2 nodes + 1 link
     
+    def test_add_duplicate_link(self):
+        """Test adding duplicate links returns same link"""
+        cat = self.atomspace.add_node("ConceptNode", "cat")
+        animal = self.atomspace.add_node("ConceptNode", "animal")
+        link1 = self.atomspace.add_link("InheritanceLink", [cat, animal])
+        link2 = self.atomspace.add_link("InheritanceLink", [cat, animal])
+        reverse = self.atomspace.add_link("InheritanceLink", [animal, cat])
+        
+        self.assertIs(link1, link2)
+        self.assertIsNot(link1, reverse)
+        self.assertEqual(len(self.atomspace), 4)
+    
+    def test_add_unordered_link(self):
+        """Test unordered links are deduplicated regardless of order"""
+        cat = self.atomspace.add_node("ConceptNode", "cat")
+        dog = self.atomspace.add_node("ConceptNode", "dog")
+        forward = self.atomspace.add_link("SimilarityLink", [cat, dog])
+        backward = self.atomspace.add_link("SimilarityLink", [dog, cat])
+        batched = self.atomspace.add_links([("SimilarityLink", [dog, cat])])
+        
+        self.assertIs(forward, backward)
+        self.assertIs(batched[0], forward)
+        self.assertEqual(len(self.atomspace), 3)
+        self.assertEqual(self.atomspace.get_incoming(dog), [forward])
+        
+        self.atomspace.remove_atom(backward)
+        self.assertEqual(len(self.atomspace), 2)
+        self.assertEqual(self.atomspace.get_incoming(cat), [])
+    
+    def test_readd_removed_link(self):
+        """Test a removed link is no longer deduplicated against"""
+        cat = self.atomspace.add_node("ConceptNode", "cat")
+        animal = self.atomspace.add_node("ConceptNode", "animal")
+        link = self.atomspace.add_link("InheritanceLink", [cat, animal])
+        self.atomspace.remove_atom(link)
+        
+        readded = self.atomspace.add_link("InheritanceLink", [cat, animal])
+        self.assertIsNot(readded, link)
+        self.assertEqual(len(self.atomspace), 3)
+    
+    def test_integer_handles(self):
+        """Test atoms get unique, increasing integer handles"""
+        cat = self.atomspace.add_node("ConceptNode", "cat")
+        animal = self.atomspace.add_node("ConceptNode", "animal")
+        link = self.atomspace.add_link("InheritanceLink", [cat, animal])
+        
+        self.assertIsInstance(cat.id, int)
+        self.assertLess(cat.id, animal.id)
+        self.assertLess(animal.id, link.id)
+        self.assertIs(self.atomspace.get_atom_by_id(link.id), link)
+    
+    def test_external_ids(self):
+        """Test the optional external ID mapping"""
+        self.assertIsNone(self.atomspace.get_external_id(
+            self.atomspace.add_node("ConceptNode", "cat")))
+        
+        atomspace = AtomSpace(external_ids=True)
+        cat = atomspace.add_node("ConceptNode", "cat")
+        external_id = atomspace.get_external_id(cat)
+        self.assertIsInstance(external_id, str)
+        self.assertIs(atomspace.get_atom_by_external_id(external_id), cat)
+        
+        atomspace.remove_atom(cat)
+        self.assertIsNone(atomspace.get_atom_by_external_id(external_id))
+    
     def test_get_atoms_by_type(self):
         """Test getting atoms by type"""
         self.atomspace.add_node("ConceptNode", "cat")
@@ -55,6 +121,17 @@ class TestAtomSpace(unittest.TestCase):
         predicates = self.atomspace.get_atoms_by_type("PredicateNode")
         self.assertEqual(len(predicates), 1)
     
+    def test_get_atoms_by_type_with_subtypes(self):
+        """Test getting atoms by type including subtypes"""
+        cat = self.atomspace.add_node("ConceptNode", "cat")
+        runs = self.atomspace.add_node("PredicateNode", "runs")
+        link = self.atomspace.add_link("EvaluationLink", [runs, cat])
+        
+        self.assertEqual(self.atomspace.get_atoms_by_type("Node"), [])
+        self.assertEqual(set(self.atomspace.get_atoms_by_type("Node", subtypes=True)), {cat, runs})
+        self.assertEqual(self.atomspace.get_atoms_by_type(AtomType.LINK, subtypes=True), [link])
+        self.assertEqual(self.atomspace.count_by_type("Atom", subtypes=True), 3)
+    
     def test_get_node_by_name(self):
         """Test getting node by name"""
         self.atomspace.add_node("ConceptNode", "cat")
@@ -66,6 +143,28 @@ class TestAtomSpace(unittest.TestCase):
         not_found = self.atomspace.get_node_by_name("dog")
         self.assertIsNone(not_found)
     
+    def test_same_name_different_types(self):
+        """Test nodes sharing a name but not a type are distinct"""
+        concept = self.atomspace.add_node("ConceptNode", "runs")
+        predicate = self.atomspace.add_node("PredicateNode", "runs")
+        
+        self.assertIsNot(concept, predicate)
+        self.assertEqual(len(self.atomspace), 2)
+        self.assertIs(self.atomspace.get_node_by_name("runs", "ConceptNode"), concept)
+        self.assertIs(self.atomspace.get_node_by_name("runs", "PredicateNode"), predicate)
+        self.assertIsNone(self.atomspace.get_node_by_name("runs", "SchemaNode"))
+    
+    def test_readd_removed_node(self):
+        """Test a removed node can be looked up and added again"""
+        node = self.atomspace.add_node("ConceptNode", "cat")
+        self.atomspace.remove_atom(node)
+        self.assertIsNone(self.atomspace.get_node_by_name("cat", "ConceptNode"))
+        
+        readded = self.atomspace.add_node("ConceptNode", "cat")
+        self.assertIsNot(readded, node)
+        self.assertIs(self.atomspace.get_node_by_name("cat", "ConceptNode"), readded)
+        self.assertEqual(len(self.atomspace), 1)
+    
     def test_get_incoming(self):
         """Test getting incoming links"""
         cat = self.atomspace.add_node("ConceptNode", "cat")
@@ -78,6 +177,45 @@ class TestAtomSpace(unittest.TestCase):
         incoming = self.atomspace.get_incoming(animal)
         self.assertEqual(len(incoming), 2)
     
+    def test_get_incoming_by_type(self):
+        """Test filtering incoming links by link type"""
+        cat = self.atomspace.add_node("ConceptNode", "cat")
+        dog = self.atomspace.add_node("ConceptNode", "dog")
+        animal = self.atomspace.add_node("ConceptNode", "animal")
+        
+        inheritance = self.atomspace.add_link("InheritanceLink", [cat, animal])
+        self.atomspace.add_link("SimilarityLink", [cat, dog])
+        
+        self.assertEqual(self.atomspace.get_incoming(cat, link_type="InheritanceLink"), [inheritance])
+        self.assertEqual(len(self.atomspace.get_incoming(cat, link_type=AtomType.SIMILARITY_LINK)), 1)
+        self.assertEqual(self.atomspace.get_incoming(cat, link_type="MemberLink"), [])
+    
+    def test_get_incoming_by_position(self):
+        """Test filtering incoming links by outgoing position"""
+        cat = self.atomspace.add_node("ConceptNode", "cat")
+        mammal = self.atomspace.add_node("ConceptNode", "mammal")
+        animal = self.atomspace.add_node("ConceptNode", "animal")
+        
+        cat_mammal = self.atomspace.add_link("InheritanceLink", [cat, mammal])
+        mammal_animal = self.atomspace.add_link("InheritanceLink", [mammal, animal])
+        
+        self.assertEqual(self.atomspace.get_incoming(mammal, position=0), [mammal_animal])
+        self.assertEqual(
+            self.atomspace.get_incoming(mammal, link_type="InheritanceLink", position=1),
+            [cat_mammal])
+        self.assertEqual(self.atomspace.get_incoming(mammal, position=2), [])
+    
+    def test_get_incoming_repeated_target(self):
+        """Test a link holding an atom twice is returned once"""
+        cat = self.atomspace.add_node("ConceptNode", "cat")
+        link = self.atomspace.add_link("ListLink", [cat, cat])
+        
+        self.assertEqual(self.atomspace.get_incoming(cat), [link])
+        self.assertEqual(self.atomspace.get_incoming(cat, position=1), [link])
+        
+        self.atomspace.remove_atom(link)
+        self.assertEqual(self.atomspace.get_incoming(cat), [])
+    
     def test_remove_atom(self):
         """Test removing an atom"""
         node = self.atomspace.add_node("ConceptNode", "cat")
@@ -98,6 +236,52 @@ class TestAtomSpace(unittest.TestCase):
         self.atomspace.remove_atom(animal)
         self.assertEqual(len(self.atomspace), 1)  # Only cat remains
     
+    def test_remove_link_removes_links_containing_it(self):
+        """Test that removing a link also removes links that contain it"""
+        cat = self.atomspace.add_node("ConceptNode", "cat")
+        animal = self.atomspace.add_node("ConceptNode", "animal")
+        link = self.atomspace.add_link("InheritanceLink", [cat, animal])
+        self.atomspace.add_link("NotLink", [link])
+        
+        self.atomspace.remove_atom(link)
+        self.assertEqual(len(self.atomspace), 2)
+        self.assertEqual(self.atomspace.get_incoming(cat), [])
+    
+    def test_remove_deep_chain(self):
+        """Test removal cascades through link chains deeper than the recursion limit"""
+        node = self.atomspace.add_node("ConceptNode", "base")
+        atom = node
+        for _ in range(3000):
+            atom = self.atomspace.add_link("ListLink", [atom])
+        
+        self.assertTrue(self.atomspace.remove_atom(node))
+        self.assertEqual(len(self.atomspace), 0)
+    
+    def test_remove_non_recursive(self):
+        """Test non-recursive removal keeps atoms that have incoming links"""
+        cat = self.atomspace.add_node("ConceptNode", "cat")
+        animal = self.atomspace.add_node("ConceptNode", "animal")
+        link = self.atomspace.add_link("InheritanceLink", [cat, animal])
+        
+        self.assertFalse(self.atomspace.remove_atom(animal, recursive=False))
+        self.assertEqual(len(self.atomspace), 3)
+        
+        self.assertEqual(self.atomspace.remove_atoms([link, animal], recursive=False), 2)
+        self.assertEqual(self.atomspace.get_all_atoms(), [cat])
+    
+    def test_remove_atoms(self):
+        """Test removing many atoms and their dependents at once"""
+        hub = self.atomspace.add_node("ConceptNode", "hub")
+        spokes = [self.atomspace.add_node("ConceptNode", f"spoke-{i}") for i in range(10)]
+        for spoke in spokes:
+            self.atomspace.add_link("InheritanceLink", [spoke, hub])
+        
+        removed = self.atomspace.remove_atoms([hub, spokes[0], spokes[0]])
+        self.assertEqual(removed, 12)
+        self.assertEqual(len(self.atomspace), 9)
+        self.assertEqual(self.atomspace.count_links(), 0)
+        self.assertEqual(self.atomspace.remove_atoms([hub]), 0)
+    
     def test_clear(self):
         """Test clearing the AtomSpace"""
         self.atomspace.add_node("ConceptNode", "cat")
@@ -126,6 +310,162 @@ class TestAtomSpace(unittest.TestCase):
         
         links = self.atomspace.get_all_links()
         self.assertEqual(len(links), 2)
+    
+    
+    def test_iterators(self):
+        """Test iterator variants match the list getters"""
+        cat = self.atomspace.add_node("ConceptNode", "cat")
+        animal = self.atomspace.add_node("ConceptNode", "animal")
+        runs = self.atomspace.add_node("PredicateNode", "runs")
+        link = self.atomspace.add_link("InheritanceLink", [cat, animal])
+        
+        self.assertEqual(set(self.atomspace.iter_atoms()), {cat, animal, runs, link})
+        self.assertEqual(set(self.atomspace.iter_nodes()), {cat, animal, runs})
+        self.assertEqual(list(self.atomspace.iter_links()), [link])
+        self.assertEqual(set(self.atomspace.iter_by_type("ConceptNode")), {cat, animal})
+        self.assertEqual(list(self.atomspace.iter_incoming(animal)), [link])
+        self.assertEqual(list(self.atomspace.iter_incoming(animal, position=0)), [])
+    
+    def test_counts(self):
+        """Test count methods"""
+        cat = self.atomspace.add_node("ConceptNode", "cat")
+        animal = self.atomspace.add_node("ConceptNode", "animal")
+        self.atomspace.add_node("PredicateNode", "runs")
+        self.atomspace.add_link("InheritanceLink", [cat, animal])
+        self.atomspace.add_link("ListLink", [animal, animal])
+        
+        self.assertEqual(self.atomspace.count_atoms(), 5)
+        self.assertEqual(self.atomspace.count_nodes(), 3)
+        self.assertEqual(self.atomspace.count_links(), 2)
+        self.assertEqual(self.atomspace.count_by_type("ConceptNode"), 2)
+        self.assertEqual(self.atomspace.count_by_type(AtomType.SET_LINK), 0)
+        self.assertEqual(self.atomspace.count_incoming(animal), 2)
+        self.assertEqual(self.atomspace.count_incoming(animal, link_type="ListLink"), 1)
+        self.assertEqual(self.atomspace.count_incoming(animal, position=1), 2)
+        self.assertEqual(self.atomspace.count_incoming(cat, link_type="InheritanceLink", position=0), 1)
+        
+        self.atomspace.remove_atom(cat)
+        self.assertEqual(self.atomspace.count_nodes(), 2)
+        self.assertEqual(self.atomspace.count_by_type("ConceptNode"), 1)
+        self.assertEqual(self.atomspace.count_by_type("InheritanceLink"), 0)
+    
+    
+    def test_add_nodes(self):
+        """Test adding nodes in a batch"""
+        existing = self.atomspace.add_node("ConceptNode", "cat")
+        nodes = self.atomspace.add_nodes([
+            ("ConceptNode", "cat"),
+            ("ConceptNode", "dog", TruthValue(0.5, 0.5)),
+            (AtomType.PREDICATE_NODE, "runs"),
+            ("ConceptNode", "dog"),
+        ])
+        
+        self.assertIs(nodes[0], existing)
+        self.assertIs(nodes[1], nodes[3])
+        self.assertEqual(nodes[1].truth_value, TruthValue(0.5, 0.5))
+        self.assertEqual(len(self.atomspace), 3)
+        self.assertEqual(self.atomspace.count_by_type("ConceptNode"), 2)
+        self.assertIs(self.atomspace.get_node_by_name("runs"), nodes[2])
+    
+    def test_add_links(self):
+        """Test adding links in a batch"""
+        cat, dog, animal = self.atomspace.add_nodes([
+            ("ConceptNode", "cat"), ("ConceptNode", "dog"), ("ConceptNode", "animal")])
+        links = self.atomspace.add_links([
+            ("InheritanceLink", [cat, animal]),
+            ("InheritanceLink", [dog, animal]),
+            ("InheritanceLink", [cat, animal]),
+        ])
+        
+        self.assertIs(links[0], links[2])
+        self.assertEqual(len(self.atomspace), 5)
+        self.assertEqual(set(self.atomspace.get_incoming(animal)), set(links))
+    
+    def test_bulk_load(self):
+        """Test indexes are complete after a bulk_load block"""
+        with self.atomspace.bulk_load():
+            cat = self.atomspace.add_node("ConceptNode", "cat")
+            animal = self.atomspace.add_node("ConceptNode", "animal")
+            link = self.atomspace.add_link("InheritanceLink", [cat, animal])
+            self.assertIs(self.atomspace.add_node("ConceptNode", "cat"), cat)
+            self.assertIs(self.atomspace.add_link("InheritanceLink", [cat, animal]), link)
+            
+            dog = self.atomspace.add_node("ConceptNode", "dog")
+            self.atomspace.remove_atom(dog)
+        
+        self.assertEqual(len(self.atomspace), 3)
+        self.assertEqual(self.atomspace.get_incoming(animal), [link])
+        self.assertEqual(self.atomspace.get_atoms_by_type("InheritanceLink"), [link])
+        self.assertIsNone(self.atomspace.get_node_by_name("dog"))
+    
+    
+    def test_truth_value_is_a_view(self):
+        """Test changing an atom's truth value in place is stored"""
+        cat = self.atomspace.add_node("ConceptNode", "cat", TruthValue(0.5, 0.5))
+        cat.truth_value.strength = 0.25
+        cat.truth_value.confidence = 2.0
+        again = self.atomspace.get_node_by_name("cat")
+        self.assertEqual(again.truth_value, TruthValue(0.25, 1.0))
+        
+        self.atomspace.add_node("ConceptNode", "cat", TruthValue(0.75, 0.5))
+        self.assertEqual(cat.truth_value, TruthValue(0.75, 0.5))
+    
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_get_truth_values(self):
+        """Test reading truth values as arrays"""
+        cat = self.atomspace.add_node("ConceptNode", "cat", TruthValue(0.5, 0.25))
+        dog = self.atomspace.add_node("ConceptNode", "dog")
+        self.atomspace.add_node("PredicateNode", "runs", TruthValue(0.1, 0.1))
+        
+        handles, strengths, confidences = self.atomspace.get_truth_values("ConceptNode")
+        by_handle = dict(zip(handles.tolist(), zip(strengths.tolist(), confidences.tolist())))
+        self.assertEqual(by_handle, {cat.id: (0.5, 0.25), dog.id: (1.0, 1.0)})
+        
+        handles, strengths, _ = self.atomspace.get_truth_values(handles=[dog.id, cat.id])
+        self.assertEqual(strengths.tolist(), [1.0, 0.5])
+        self.assertEqual(len(self.atomspace.get_truth_values()[0]), 3)
+        self.assertEqual(len(self.atomspace.get_truth_values("Node", subtypes=True)[0]), 3)
+    
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_set_truth_values(self):
+        """Test writing truth values from arrays"""
+        cat = self.atomspace.add_node("ConceptNode", "cat")
+        dog = self.atomspace.add_node("ConceptNode", "dog")
+        link = self.atomspace.add_link("InheritanceLink", [cat, dog])
+        
+        handles, strengths, confidences = self.atomspace.get_truth_values()
+        self.atomspace.set_truth_values(handles, strengths * 0.5, 1.5)
+        self.assertEqual(link.truth_value, TruthValue(0.5, 1.0))
+        
+        self.atomspace.set_truth_values(np.array([cat.id]), np.array([-1.0]), np.array([0.2]))
+        self.assertEqual(cat.truth_value, TruthValue(0.0, 0.2))
+        self.assertEqual(dog.truth_value, TruthValue(0.5, 1.0))
+    
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_set_truth_values_unknown_handle(self):
+        """Test handles outside the AtomSpace are rejected"""
+        self.atomspace.add_node("ConceptNode", "cat")
+        with self.assertRaises(ValueError):
+            self.atomspace.set_truth_values([10 ** 9], [0.5], [0.5])
+    
+    def test_removed_atom_keeps_truth_value(self):
+        """Test atoms keep their truth value when removed"""
+        cat = self.atomspace.add_node("ConceptNode", "cat", TruthValue(0.5, 0.5))
+        self.atomspace.remove_atom(cat)
+        self.assertEqual(cat.truth_value, TruthValue(0.5, 0.5))
+    
+    
+    def test_get_link(self):
+        """Test looking up a link by type and outgoing set"""
+        cat = self.atomspace.add_node("ConceptNode", "cat")
+        dog = self.atomspace.add_node("ConceptNode", "dog")
+        link = self.atomspace.add_link("InheritanceLink", [cat, dog])
+        similarity = self.atomspace.add_link("SimilarityLink", [cat, dog])
+        
+        self.assertEqual(self.atomspace.get_link("InheritanceLink", [cat, dog]), link)
+        self.assertIsNone(self.atomspace.get_link("InheritanceLink", [dog, cat]))
+        self.assertEqual(self.atomspace.get_link(AtomType.SIMILARITY_LINK, [dog, cat]), similarity)
+        self.assertIsNone(self.atomspace.get_link("ListLink", [cat, dog]))
 
 
 if __name__ == '__main__':
@@ -0,0 +1,255 @@
+"""
+Tests for attention values and importance spreading
+"""
+
+import unittest
+from cogpy.core.atom import Node, Link
+from cogpy.core.atomspace import AtomSpace
+from cogpy.core.attention import AttentionValue, AttentionValueStore, ImportanceSpreader
+from cogpy.core.pattern import PatternMatcher
+from cogpy.core.types import AtomType
+from cogpy.core.truthvalue import HandleRows, TruthValueStore, np
+from cogpy.tests.backends import AtomSpaceBackend, ColumnarBackend
+
+
+class TestAttentionValueStore(unittest.TestCase):
+    """Test AttentionValueStore class"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.store = AttentionValueStore(HandleRows())
+    
+    def test_set_and_get(self):
+        """Test handles are given dense rows that default to zero"""
+        self.store.set(100, AttentionValue(5.0, 1.0))
+        self.store.set(103)
+        self.assertEqual(self.store.get(100), AttentionValue(5.0, 1.0))
+        self.assertEqual(self.store.get(103), AttentionValue())
+        self.assertEqual(len(self.store), 2)
+    
+    def test_rows_by_handle(self):
+        """Test handles are rows without a HandleRows"""
+        store = AttentionValueStore()
+        store.set(3, AttentionValue(5.0, 1.0))
+        self.assertEqual(store.get(1), AttentionValue())
+        self.assertEqual(len(store), 4)
+    
+    def test_shared_rows(self):
+        """Test stores sharing a HandleRows keep an atom in the same row"""
+        rows = HandleRows()
+        truth_values = TruthValueStore(rows)
+        attention = AttentionValueStore(rows)
+        truth_values.set(100)
+        truth_values.set(200)
+        attention.set(200, AttentionValue(5.0, 1.0))
+        self.assertEqual(attention.get(200), AttentionValue(5.0, 1.0))
+        rows.remove(100)
+        attention.set(300)
+        self.assertEqual(len(attention), 2)
+        self.assertEqual(rows._rows[300], 0)
+    
+    def test_rows_track_live_atoms(self):
+        """Test an AtomSpace's rows follow its live atoms"""
+        atomspace = AtomSpace()
+        cat = atomspace.add_node("ConceptNode", "cat")
+        for _ in range(100):
+            atomspace.stimulate(atomspace.add_link("ListLink", [cat]), 1.0)
+            atomspace.remove_atom(atomspace.get_atoms_by_type("ListLink")[0])
+        dog = atomspace.add_node("ConceptNode", "dog")
+        self.assertEqual(len(atomspace._attention), 2)
+        self.assertEqual(atomspace.get_attention_value(dog), AttentionValue())
+    
+    def test_lower_handle(self):
+        """Test storing a handle below the first one"""
+        self.store.set(100, AttentionValue(1.0, 2.0))
+        self.store.set(98, AttentionValue(3.0, 4.0))
+        self.assertEqual(self.store.get(100), AttentionValue(1.0, 2.0))
+        self.assertEqual(self.store.get(98), AttentionValue(3.0, 4.0))
+    
+    def test_stimulate(self):
+        """Test stimulation adds to STI only"""
+        self.store.set(5, AttentionValue(1.0, 1.0))
+        self.store.stimulate(5, 2.5)
+        self.store.stimulate(5, -0.5)
+        self.assertEqual(self.store.get(5), AttentionValue(3.0, 1.0))
+    
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_get_and_set_many(self):
+        """Test batch access, leaving a column unchanged when None"""
+        for handle in range(10, 15):
+            self.store.set(handle, AttentionValue(1.0, 2.0))
+        self.store.set_many([11, 13], sti=[5.0, -5.0])
+        sti, lti = self.store.get_many([13, 11, 10])
+        self.assertEqual(sti.tolist(), [-5.0, 5.0, 1.0])
+        self.assertEqual(lti.tolist(), [2.0, 2.0, 2.0])
+        with self.assertRaises(ValueError):
+            self.store.get_many([20])
+
+
+class TestAtomSpaceAttention(AtomSpaceBackend, unittest.TestCase):
+    """Test the attention methods of AtomSpace"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.atomspace = self.make_atomspace()
+        self.cat = self.atomspace.add_node("ConceptNode", "cat")
+        self.dog = self.atomspace.add_node("ConceptNode", "dog")
+        self.animal = self.atomspace.add_node("ConceptNode", "animal")
+        self.cat_animal = self.atomspace.add_link("InheritanceLink", [self.cat, self.animal])
+        self.dog_animal = self.atomspace.add_link("InheritanceLink", [self.dog, self.animal])
+    
+    def test_default(self):
+        """Test new atoms have zero importance"""
+        self.assertEqual(self.atomspace.get_attention_value(self.cat), AttentionValue())
+    
+    def test_set_and_stimulate(self):
+        """Test setting and stimulating one atom"""
+        self.atomspace.set_attention_value(self.cat, AttentionValue(2.0, 1.0))
+        self.atomspace.stimulate(self.cat, 3.0)
+        self.assertEqual(self.atomspace.get_attention_value(self.cat), AttentionValue(5.0, 1.0))
+        self.assertEqual(self.atomspace.get_attention_value(self.dog).sti, 0.0)
+    
+    def test_foreign_atom(self):
+        """Test atoms of another AtomSpace are rejected"""
+        other = self.make_atomspace().add_node("ConceptNode", "cat")
+        with self.assertRaises(ValueError):
+            self.atomspace.stimulate(other, 1.0)
+    
+    def test_removed_atom_is_reset(self):
+        """Test an atom removed and added again has no importance"""
+        self.atomspace.stimulate(self.dog_animal, 4.0)
+        self.atomspace.remove_atom(self.dog_animal)
+        dog_animal = self.atomspace.add_link("InheritanceLink", [self.dog, self.animal])
+        self.assertEqual(self.atomspace.get_attention_value(dog_animal), AttentionValue())
+    
+    
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_get_and_set_attention_values(self):
+        """Test batch access over every atom"""
+        handles, stis, ltis = self.atomspace.get_attention_values()
+        self.assertEqual(sorted(handles.tolist()), sorted(atom.id for atom in self.atomspace.get_all_atoms()))
+        self.assertFalse(stis.any() or ltis.any())
+        self.atomspace.set_attention_values(handles, stis=1.0)
+        self.assertEqual(self.atomspace.get_attention_value(self.animal), AttentionValue(1.0, 0.0))
+    
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_attentional_focus(self):
+        """Test the focus is the highest-STI atoms, highest first"""
+        self.atomspace.stimulate(self.dog, 1.0)
+        self.atomspace.stimulate(self.cat_animal, 3.0)
+        self.atomspace.stimulate(self.animal, 2.0)
+        self.assertEqual(self.atomspace.get_attentional_focus(2), [self.cat_animal, self.animal])
+        self.assertEqual(len(self.atomspace.get_attentional_focus(100)), 5)
+    
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_adjacency(self):
+        """Test every link-to-outgoing edge is listed once per position"""
+        links, targets = self.atomspace.get_adjacency()
+        edges = sorted(zip(links.tolist(), targets.tolist()))
+        expected = sorted((link.id, atom.id) for link in (self.cat_animal, self.dog_animal) for atom in link.outgoing)
+        self.assertEqual(edges, expected)
+        self.atomspace.remove_atom(self.dog_animal)
+        self.assertEqual(len(self.atomspace.get_adjacency()[0]), 2)
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestImportanceSpreader(AtomSpaceBackend, unittest.TestCase):
+    """Test cases for ImportanceSpreader"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.atomspace = self.make_atomspace()
+        self.cat = self.atomspace.add_node("ConceptNode", "cat")
+        self.animal = self.atomspace.add_node("ConceptNode", "animal")
+        self.loner = self.atomspace.add_node("ConceptNode", "loner")
+        self.link = self.atomspace.add_link("InheritanceLink", [self.cat, self.animal])
+    
+    def sti(self, atom):
+        """Get the STI of an atom"""
+        return self.atomspace.get_attention_value(atom).sti
+    
+    def test_spread_one_step(self):
+        """Test a fraction of STI flows to each neighbour"""
+        self.atomspace.stimulate(self.cat, 10.0)
+        ImportanceSpreader(self.atomspace, fraction=0.5).spread()
+        self.assertAlmostEqual(self.sti(self.cat), 5.0)
+        self.assertAlmostEqual(self.sti(self.link), 5.0)
+        self.assertAlmostEqual(self.sti(self.animal), 0.0)
+    
+    def test_spread_reaches_further(self):
+        """Test importance moves on through links over several steps"""
+        self.atomspace.stimulate(self.cat, 10.0)
+        ImportanceSpreader(self.atomspace, fraction=0.5).spread(steps=2)
+        # The link gives half of its 5 to cat and animal, 1.25 each
+        self.assertAlmostEqual(self.sti(self.animal), 1.25)
+        self.assertAlmostEqual(self.sti(self.cat), 2.5 + 1.25)
+    
+    def test_total_is_conserved(self):
+        """Test spreading without decay conserves total STI"""
+        self.atomspace.stimulate(self.cat, 10.0)
+        self.atomspace.stimulate(self.loner, 3.0)
+        ImportanceSpreader(self.atomspace).spread(steps=5)
+        _, stis, _ = self.atomspace.get_attention_values()
+        self.assertAlmostEqual(stis.sum(), 13.0)
+        # Isolated atoms keep their importance
+        self.assertAlmostEqual(self.sti(self.loner), 3.0)
+    
+    def test_decay_and_lti(self):
+        """Test decay removes STI and LTI follows STI"""
+        self.atomspace.stimulate(self.loner, 10.0)
+        ImportanceSpreader(self.atomspace, decay=0.5, lti_rate=0.5).spread()
+        self.assertEqual(self.atomspace.get_attention_value(self.loner), AttentionValue(5.0, 2.5))
+    
+    def test_negative_sti_does_not_spread(self):
+        """Test only positive importance is given away"""
+        self.atomspace.stimulate(self.cat, -4.0)
+        ImportanceSpreader(self.atomspace).spread()
+        self.assertEqual(self.sti(self.cat), -4.0)
+        self.assertEqual(self.sti(self.link), 0.0)
+    
+    def test_rebuilds_after_changes(self):
+        """Test atoms added after the first step take part in spreading"""
+        spreader = ImportanceSpreader(self.atomspace, fraction=0.5)
+        spreader.spread()
+        link = self.atomspace.add_link("InheritanceLink", [self.loner, self.animal])
+        self.atomspace.stimulate(self.loner, 4.0)
+        spreader.spread()
+        self.assertAlmostEqual(self.sti(link), 2.0)
+        self.atomspace.remove_atom(link)
+        spreader.spread()
+        self.assertAlmostEqual(self.sti(self.loner), 2.0)
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestImportanceOrder(AtomSpaceBackend, unittest.TestCase):
+    """Test PatternMatcher's importance ordering"""
+    
+    def test_candidates_by_importance(self):
+        """Test groundings come highest STI first"""
+        atomspace = self.make_atomspace()
+        animal = atomspace.add_node("ConceptNode", "animal")
+        links = [atomspace.add_link("InheritanceLink", [atomspace.add_node("ConceptNode", f"a{i}"), animal])
+                 for i in range(5)]
+        for i, link in enumerate(links):
+            atomspace.stimulate(link, [2.0, 5.0, 1.0, 4.0, 3.0][i])
+        template = Link(AtomType.INHERITANCE_LINK, [Node(AtomType.VARIABLE_NODE, "$X"), animal])
+        names = [g["$X"].name for g in PatternMatcher(atomspace, importance_order=True).match(template)]
+        self.assertEqual(names, ["a1", "a3", "a4", "a0", "a2"])
+
+
+class TestColumnarAttention(ColumnarBackend, TestAtomSpaceAttention):
+    """Run the attention tests against ColumnarAtomSpace"""
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestColumnarImportanceSpreader(ColumnarBackend, TestImportanceSpreader):
+    """Run the ImportanceSpreader tests against ColumnarAtomSpace"""
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestColumnarImportanceOrder(ColumnarBackend, TestImportanceOrder):
+    """Run the importance ordering tests against ColumnarAtomSpace"""
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,251 @@
+"""
+Tests for BoundedAtomSpace and SpillStore
+"""
+
+import time
+import unittest
+from cogpy.core.atom import Link
+from cogpy.core.attention import AttentionValue
+from cogpy.core.bounded import BoundedAtomSpace, SpillStore
+from cogpy.core.types import AtomType
+from cogpy.core.truthvalue import TruthValue, np
+from cogpy.tests import test_atomspace
+
+
+class TestSpillStore(unittest.TestCase):
+    """Test SpillStore class"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.store = SpillStore()
+        self.store.put([
+            (1, AtomType.CONCEPT_NODE, "cat", (), 0.9, 0.5, 2.0, 1.0, "cat-id"),
+            (2, AtomType.PREDICATE_NODE, "cat", (), 1.0, 0.0, 0.0, 0.0, None),
+            (3, AtomType.INHERITANCE_LINK, None, (1, 2), 0.8, 0.7, 0.0, 0.0, None),
+        ])
+    
+    def tearDown(self):
+        """Close the store"""
+        self.store.close()
+    
+    def test_get(self):
+        """Test records come back by handle, skipping unknown handles"""
+        records = self.store.get([3, 1, 99])
+        self.assertEqual(sorted(records), [1, 3])
+        self.assertEqual(records[3], (3, AtomType.INHERITANCE_LINK, None, (1, 2), 0.8, 0.7, 0.0, 0.0, None))
+        self.assertEqual(records[1][6:], (2.0, 1.0, "cat-id"))
+        self.assertEqual(len(self.store), 3)
+    
+    def test_find(self):
+        """Test looking atoms up by name and by outgoing set"""
+        self.assertEqual(self.store.find_node("cat", AtomType.PREDICATE_NODE), 2)
+        self.assertEqual(self.store.find_node("cat"), 1)
+        self.assertIsNone(self.store.find_node("dog"))
+        self.assertEqual(self.store.find_link(AtomType.INHERITANCE_LINK, (1, 2)), 3)
+        self.assertIsNone(self.store.find_link(AtomType.INHERITANCE_LINK, (2, 1)))
+        self.assertEqual(self.store.find_external_id("cat-id"), 1)
+        self.assertIsNone(self.store.find_external_id("dog-id"))
+    
+    def test_incoming_and_delete(self):
+        """Test the incoming table follows deletions"""
+        self.assertEqual(self.store.incoming(2), [3])
+        self.store.delete([3])
+        self.assertEqual(self.store.incoming(2), [])
+        self.assertEqual(len(self.store), 2)
+
+
+class TestBoundedAtomSpace(unittest.TestCase):
+    """Test eviction and fault-in"""
+    
+    def make_atomspace(self, max_atoms=4, **kwargs):
+        """Create the AtomSpace under test"""
+        atomspace = BoundedAtomSpace(max_atoms, **kwargs)
+        self.addCleanup(atomspace.close)
+        return atomspace
+    
+    def fill(self, atomspace, count):
+        """Add count concept nodes"""
+        return [atomspace.add_node("ConceptNode", f"c{i}") for i in range(count)]
+    
+    def test_invalid_arguments(self):
+        """Test the cap and policy are checked"""
+        with self.assertRaises(ValueError):
+            BoundedAtomSpace(0)
+        with self.assertRaises(ValueError):
+            BoundedAtomSpace(10, policy="fifo")
+    
+    def test_cap(self):
+        """Test resident atoms stay within the cap"""
+        atomspace = self.make_atomspace(max_atoms=16)
+        self.fill(atomspace, 100)
+        self.assertLessEqual(len(atomspace), 16)
+        self.assertEqual(len(atomspace) + atomspace.count_evicted(), 100)
+    
+    def test_fault_in_by_id(self):
+        """Test an evicted atom comes back with its handle and truth value"""
+        atomspace = self.make_atomspace()
+        first = atomspace.add_node("ConceptNode", "first", TruthValue(0.3, 0.6))
+        handle = first.id
+        self.fill(atomspace, 10)
+        self.assertIsNone(super(BoundedAtomSpace, atomspace).get_atom_by_id(handle))
+        atom = atomspace.get_atom_by_id(handle)
+        self.assertEqual((atom.id, atom.name), (handle, "first"))
+        self.assertEqual(atom.truth_value, TruthValue(0.3, 0.6))
+        self.assertIsNone(atomspace.get_atom_by_id(-1))
+    
+    def test_fault_in_by_name(self):
+        """Test get_node_by_name finds evicted nodes"""
+        atomspace = self.make_atomspace()
+        handle = atomspace.add_node("PredicateNode", "likes").id
+        self.fill(atomspace, 10)
+        self.assertEqual(atomspace.get_node_by_name("likes").id, handle)
+        self.assertEqual(atomspace.get_node_by_name("likes", "PredicateNode").id, handle)
+        self.assertIsNone(atomspace.get_node_by_name("likes", "ConceptNode"))
+    
+    def test_fault_in_incoming(self):
+        """Test get_incoming brings back evicted links"""
+        atomspace = self.make_atomspace(max_atoms=8)
+        animal = atomspace.add_node("ConceptNode", "animal")
+        links = [atomspace.add_link("InheritanceLink", [atomspace.add_node("ConceptNode", f"a{i}"), animal])
+                 for i in range(10)]
+        self.fill(atomspace, 20)
+        self.assertGreater(atomspace.count_evicted(), 0)
+        animal = atomspace.get_node_by_name("animal")
+        incoming = atomspace.get_incoming(animal, "InheritanceLink", position=1)
+        self.assertEqual(sorted(link.id for link in incoming), [link.id for link in links])
+        self.assertEqual(atomspace.count_incoming(animal), 10)
+        # Every resident link's outgoing atoms are resident
+        for link in atomspace.get_all_links():
+            for atom in link.outgoing:
+                self.assertIs(atomspace.get_atom_by_id(atom.id), atom)
+    
+    def test_dedup_across_eviction(self):
+        """Test adding an evicted atom again returns the same handle"""
+        atomspace = self.make_atomspace()
+        cat = atomspace.add_node("ConceptNode", "cat")
+        animal = atomspace.add_node("ConceptNode", "animal")
+        link = atomspace.add_link("InheritanceLink", [cat, animal], TruthValue(0.9, 0.8))
+        self.fill(atomspace, 10)
+        self.assertEqual(atomspace.add_node("ConceptNode", "cat").id, cat.id)
+        # The stale objects still name the evicted atoms
+        again = atomspace.add_link("InheritanceLink", [cat, animal])
+        self.assertEqual(again.id, link.id)
+        self.assertEqual(again.truth_value, TruthValue(0.9, 0.8))
+        self.assertEqual(atomspace.get_link("InheritanceLink", [cat, animal]).id, link.id)
+    
+    def test_remove_evicted(self):
+        """Test removing an evicted atom also removes its evicted links"""
+        atomspace = self.make_atomspace()
+        cat = atomspace.add_node("ConceptNode", "cat")
+        link = atomspace.add_link("InheritanceLink", [cat, atomspace.add_node("ConceptNode", "animal")])
+        self.fill(atomspace, 10)
+        self.assertEqual(atomspace.remove_atoms([cat]), 2)
+        self.assertIsNone(atomspace.get_atom_by_id(cat.id))
+        self.assertIsNone(atomspace.get_atom_by_id(link.id))
+        self.assertIsNone(atomspace.get_node_by_name("cat"))
+    
+    def test_lru(self):
+        """Test recently used atoms stay resident"""
+        atomspace = self.make_atomspace(max_atoms=8)
+        nodes = self.fill(atomspace, 8)
+        for _ in range(20):
+            atomspace.get_atom_by_id(nodes[0].id)
+            atomspace.add_node("ConceptNode", f"extra-{_}")
+        self.assertIn(nodes[0].id, {atom.id for atom in atomspace.get_all_atoms()})
+    
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_importance_policy(self):
+        """Test atoms with high STI stay resident"""
+        atomspace = self.make_atomspace(max_atoms=8, policy="importance")
+        nodes = self.fill(atomspace, 8)
+        atomspace.stimulate(nodes[0], 5.0)
+        self.fill(atomspace, 8)
+        atomspace.add_nodes(("ConceptNode", f"more-{i}") for i in range(20))
+        self.assertIn(nodes[0].id, {atom.id for atom in atomspace.get_all_atoms()})
+        self.assertEqual(atomspace.get_attention_value(nodes[0]), AttentionValue(5.0, 0.0))
+    
+    def test_long_chain(self):
+        """Test eviction stays cheap when most atoms are held by links"""
+        atomspace = self.make_atomspace(max_atoms=100)
+        start = time.perf_counter()
+        previous = atomspace.add_node("ConceptNode", "root")
+        for _ in range(3000):
+            previous = atomspace.add_link("ListLink", [previous])
+        self.assertLess(time.perf_counter() - start, 5.0)
+        # The whole chain faults back in from its head
+        atom = atomspace.get_atom_by_id(previous.id)
+        while isinstance(atom, Link):
+            atom = atom.outgoing[0]
+        self.assertEqual(atom.name, "root")
+    
+    def test_external_ids_and_ancestors(self):
+        """Test external IDs and the ancestor index survive eviction"""
+        atomspace = self.make_atomspace(external_ids=True, ancestor_index=True)
+        cat = atomspace.add_node("ConceptNode", "cat")
+        mammal = atomspace.add_node("ConceptNode", "mammal")
+        animal = atomspace.add_node("ConceptNode", "animal")
+        atomspace.add_link("InheritanceLink", [cat, mammal])
+        atomspace.add_link("InheritanceLink", [mammal, animal])
+        external_id = atomspace.get_external_id(cat)
+        self.fill(atomspace, 10)
+        self.assertEqual(atomspace.get_atom_by_external_id(external_id).id, cat.id)
+        self.assertTrue(atomspace.is_a(cat, animal))
+        self.fill(atomspace, 10)
+        self.assertEqual({atom.name for atom in atomspace.ancestors(cat)}, {"mammal", "animal"})
+        self.assertEqual({atom.name for atom in atomspace.descendants(animal)}, {"cat", "mammal"})
+        self.assertFalse(atomspace.is_a(animal, cat))
+        self.fill(atomspace, 10)
+        self.assertEqual(atomspace.get_external_id(cat), external_id)
+    
+    def test_eviction_releases_memory(self):
+        """Test evicted atoms leave no rows, external IDs or closure edges behind"""
+        atomspace = self.make_atomspace(max_atoms=16, external_ids=True, ancestor_index=True)
+        animal = atomspace.add_node("ConceptNode", "animal")
+        for i in range(200):
+            atomspace.add_link("InheritanceLink", [atomspace.add_node("ConceptNode", f"a{i}"), animal])
+        resident = len(atomspace)
+        self.assertLessEqual(len(atomspace._handle_rows), 2 * 16)
+        self.assertEqual(len(atomspace._handle_rows._rows), resident)
+        self.assertEqual(len(atomspace._handle_to_external), resident)
+        self.assertEqual(len(atomspace._external_ids), resident)
+        self.assertLessEqual(len(atomspace._ancestor_index._parents), resident)
+        self.assertEqual(atomspace.count_incoming(animal), 200)
+    
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_values_survive_eviction(self):
+        """Test attention values go to disk and batch methods fault atoms in"""
+        atomspace = self.make_atomspace()
+        cat = atomspace.add_node("ConceptNode", "cat", TruthValue(0.3, 0.6))
+        atomspace.set_attention_value(cat, AttentionValue(4.0, 2.0))
+        self.fill(atomspace, 10)
+        self.assertEqual(atomspace.get_attention_value(atomspace.get_atom_by_id(cat.id)), AttentionValue(4.0, 2.0))
+        self.fill(atomspace, 10)
+        handles, stis, ltis = atomspace.get_attention_values([cat.id])
+        self.assertEqual((stis.tolist(), ltis.tolist()), ([4.0], [2.0]))
+        self.fill(atomspace, 10)
+        atomspace.set_truth_values([cat.id], 0.7, 0.2)
+        self.fill(atomspace, 10)
+        handles, strengths, confidences = atomspace.get_truth_values(handles=[cat.id])
+        self.assertAlmostEqual(strengths[0], 0.7)
+        self.assertAlmostEqual(confidences[0], 0.2)
+    
+    def test_clear(self):
+        """Test clear drops evicted atoms too"""
+        atomspace = self.make_atomspace()
+        handle = self.fill(atomspace, 10)[0].id
+        atomspace.clear()
+        self.assertEqual((len(atomspace), atomspace.count_evicted()), (0, 0))
+        self.assertIsNone(atomspace.get_atom_by_id(handle))
+
+
+class TestBoundedAtomSpaceUncapped(test_atomspace.TestAtomSpace):
+    """Run the AtomSpace tests against a BoundedAtomSpace that never evicts"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.atomspace = BoundedAtomSpace(10 ** 6)
+        self.addCleanup(self.atomspace.close)
+
+
+if __name__ == '__main__':
+    unittest.main()
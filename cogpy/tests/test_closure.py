@@ -0,0 +1,168 @@
+"""
+Tests for the inheritance closure
+"""
+
+import random
+import unittest
+from cogpy.core.atomspace import AtomSpace
+from cogpy.core.closure import AncestorIndex
+from cogpy.tests.backends import AtomSpaceBackend, ColumnarBackend
+
+
+class TestAncestorIndex(unittest.TestCase):
+    """Test cases for AncestorIndex"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.index = AncestorIndex()
+    
+    def test_chain(self):
+        """Test reachability along a chain"""
+        self.index.add_edge(1, 2)
+        self.index.add_edge(2, 3)
+        self.assertTrue(self.index.is_a(1, 3))
+        self.assertFalse(self.index.is_a(3, 1))
+        self.assertEqual(set(self.index.ancestors(1)), {2, 3})
+        self.assertEqual(set(self.index.descendants(3)), {1, 2})
+    
+    def test_remove_edge(self):
+        """Test removing an edge drops what it made reachable"""
+        self.index.add_edge(1, 2)
+        self.index.add_edge(2, 3)
+        self.index.remove_edge(2, 3)
+        self.assertFalse(self.index.is_a(1, 3))
+        self.assertEqual(set(self.index.ancestors(1)), {2})
+        self.assertEqual(set(self.index.descendants(3)), set())
+    
+    def test_remove_with_other_path(self):
+        """Test an ancestor reachable another way survives removal"""
+        self.index.add_edge(1, 2)
+        self.index.add_edge(2, 4)
+        self.index.add_edge(1, 3)
+        self.index.add_edge(3, 4)
+        self.index.remove_edge(2, 4)
+        self.assertTrue(self.index.is_a(1, 4))
+        self.assertFalse(self.index.is_a(2, 4))
+    
+    def test_parallel_edges(self):
+        """Test an edge added twice must be removed twice"""
+        self.index.add_edge(1, 2)
+        self.index.add_edge(1, 2)
+        self.index.remove_edge(1, 2)
+        self.assertTrue(self.index.is_a(1, 2))
+        self.index.remove_edge(1, 2)
+        self.assertFalse(self.index.is_a(1, 2))
+    
+    def test_cycle(self):
+        """Test cycles make their members their own ancestors"""
+        self.index.add_edge(1, 2)
+        self.index.add_edge(2, 1)
+        self.assertTrue(self.index.is_a(1, 1))
+        self.index.remove_edge(2, 1)
+        self.assertFalse(self.index.is_a(1, 1))
+        self.assertFalse(self.index.is_a(2, 1))
+        self.assertTrue(self.index.is_a(1, 2))
+    
+    def test_matches_recomputation(self):
+        """Test random edits against reachability computed from scratch"""
+        rng = random.Random(7)
+        edges = []
+        for _ in range(300):
+            if edges and rng.random() < 0.4:
+                edge = edges.pop(rng.randrange(len(edges)))
+                self.index.remove_edge(*edge)
+            else:
+                edge = (rng.randrange(20), rng.randrange(20))
+                edges.append(edge)
+                self.index.add_edge(*edge)
+        
+        parents = {}
+        for child, parent in edges:
+            parents.setdefault(child, set()).add(parent)
+        for handle in range(20):
+            reached = set()
+            stack = [handle]
+            while stack:
+                for parent in parents.get(stack.pop(), ()):
+                    if parent not in reached:
+                        reached.add(parent)
+                        stack.append(parent)
+            self.assertEqual(set(self.index.ancestors(handle)), reached)
+            for ancestor in reached:
+                self.assertIn(handle, self.index.descendants(ancestor))
+
+
+class TestAtomSpaceClosure(unittest.TestCase):
+    """Test is_a and ancestors on an AtomSpace with the ancestor index"""
+    
+    def make_atomspace(self):
+        """Create the AtomSpace under test"""
+        return AtomSpace(ancestor_index=True)
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.atomspace = self.make_atomspace()
+        self.cat = self.atomspace.add_node("ConceptNode", "cat")
+        self.mammal = self.atomspace.add_node("ConceptNode", "mammal")
+        self.animal = self.atomspace.add_node("ConceptNode", "animal")
+        self.pets = self.atomspace.add_node("ConceptNode", "pets")
+        self.atomspace.add_link("InheritanceLink", [self.cat, self.mammal])
+        self.link = self.atomspace.add_link("InheritanceLink", [self.mammal, self.animal])
+        self.atomspace.add_link("MemberLink", [self.cat, self.pets])
+    
+    def test_is_a(self):
+        """Test transitive inheritance through both link types"""
+        self.assertTrue(self.atomspace.is_a(self.cat, self.animal))
+        self.assertTrue(self.atomspace.is_a(self.cat, self.pets))
+        self.assertTrue(self.atomspace.is_a(self.cat, self.cat))
+        self.assertFalse(self.atomspace.is_a(self.animal, self.cat))
+        self.assertFalse(self.atomspace.is_a(self.mammal, self.pets))
+    
+    def test_ancestors(self):
+        """Test ancestors and descendants"""
+        self.assertEqual(self.atomspace.ancestors(self.cat), {self.mammal, self.animal, self.pets})
+        self.assertEqual(self.atomspace.descendants(self.animal), {self.cat, self.mammal})
+        self.assertEqual(self.atomspace.ancestors(self.animal), set())
+    
+    def test_other_links_ignored(self):
+        """Test links of other types do not inherit"""
+        dog = self.atomspace.add_node("ConceptNode", "dog")
+        self.atomspace.add_link("SimilarityLink", [dog, self.cat])
+        self.atomspace.add_link("ListLink", [dog, self.animal])
+        self.assertFalse(self.atomspace.is_a(dog, self.animal))
+    
+    def test_remove_link(self):
+        """Test removing a link updates inheritance"""
+        self.atomspace.remove_atom(self.link)
+        self.assertFalse(self.atomspace.is_a(self.cat, self.animal))
+        self.assertTrue(self.atomspace.is_a(self.cat, self.mammal))
+    
+    def test_remove_node(self):
+        """Test removing a node removes the inheritance through it"""
+        self.atomspace.remove_atom(self.mammal)
+        self.assertFalse(self.atomspace.is_a(self.cat, self.animal))
+        self.assertEqual(self.atomspace.ancestors(self.cat), {self.pets})
+    
+    def test_bulk_load(self):
+        """Test links added in bulk are indexed when the block exits"""
+        with self.atomspace.bulk_load():
+            kitten = self.atomspace.add_node("ConceptNode", "kitten")
+            self.atomspace.add_link("InheritanceLink", [kitten, self.cat])
+        self.assertTrue(self.atomspace.is_a(kitten, self.animal))
+    
+    def test_clear(self):
+        """Test clearing the AtomSpace clears inheritance"""
+        self.atomspace.clear()
+        self.assertEqual(self.atomspace.ancestors(self.cat), set())
+
+
+class TestAtomSpaceClosureWalk(AtomSpaceBackend, TestAtomSpaceClosure):
+    """Test is_a and ancestors on an AtomSpace without the ancestor index"""
+
+
+class TestColumnarClosure(ColumnarBackend, TestAtomSpaceClosure):
+    """Test is_a and ancestors on a ColumnarAtomSpace"""
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+"""
+Tests for ColumnarAtomSpace
+"""
+
+import unittest
+from cogpy.core.atomspace import AtomSpace
+from cogpy.core.columnar import ColumnarAtomSpace
+from cogpy.core.types import AtomType
+from cogpy.core.truthvalue import TruthValue
+from cogpy.tests import test_atomspace
+from cogpy.tests.backends import ColumnarBackend
+
+
+class TestColumnarAtomSpace(ColumnarBackend, test_atomspace.TestAtomSpace):
+    """Run the AtomSpace test suite against ColumnarAtomSpace"""
+
+
+class TestColumnarStorage(unittest.TestCase):
+    """Test ColumnarAtomSpace storage details"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.atomspace = ColumnarAtomSpace()
+    
+    def test_handles_are_rows(self):
+        """Test handles are dense row numbers"""
+        cat = self.atomspace.add_node("ConceptNode", "cat")
+        animal = self.atomspace.add_node("ConceptNode", "animal")
+        link = self.atomspace.add_link("InheritanceLink", [cat, animal])
+        self.assertEqual([cat.id, animal.id, link.id], [0, 1, 2])
+    
+    def test_materialized_atoms_are_reused(self):
+        """Test the same object is returned while it is referenced"""
+        cat = self.atomspace.add_node("ConceptNode", "cat")
+        self.assertIs(self.atomspace.get_atom_by_id(cat.id), cat)
+        self.assertIs(self.atomspace.get_node_by_name("cat"), cat)
+    
+    def test_names_are_interned(self):
+        """Test names shared across node types are stored once"""
+        self.atomspace.add_node("ConceptNode", "runs")
+        self.atomspace.add_node("PredicateNode", "runs")
+        self.assertEqual(bytes(self.atomspace._pool), b"runs")
+    
+    def test_truth_value_writes_through(self):
+        """Test setting a truth value updates the columns"""
+        cat = self.atomspace.add_node("ConceptNode", "cat", TruthValue(0.5, 0.5))
+        cat.truth_value = TruthValue(0.8, 0.9)
+        del cat
+        
+        cat = self.atomspace.get_node_by_name("cat", "ConceptNode")
+        self.assertEqual(cat.truth_value, TruthValue(0.8, 0.9))
+    
+    def test_foreign_outgoing_rejected(self):
+        """Test links cannot point at atoms of another AtomSpace"""
+        cat = self.atomspace.add_node("ConceptNode", "cat")
+        animal = AtomSpace().add_node("ConceptNode", "animal")
+        with self.assertRaises(ValueError):
+            self.atomspace.add_link("InheritanceLink", [cat, animal])
+    
+    def test_incoming_survives_compaction(self):
+        """Test incoming sets are the same before and after compact()"""
+        hub = self.atomspace.add_node("ConceptNode", "hub")
+        spokes = [self.atomspace.add_node("ConceptNode", f"spoke-{i}") for i in range(100)]
+        links = [self.atomspace.add_link("InheritanceLink", [spoke, hub]) for spoke in spokes]
+        self.atomspace.remove_atom(links[0])
+        
+        before = {link.id for link in self.atomspace.get_incoming(hub)}
+        self.atomspace.compact()
+        after = {link.id for link in self.atomspace.get_incoming(hub)}
+        self.assertEqual(before, after)
+        self.assertEqual(len(after), 99)
+        
+        # Links added after compaction are found alongside the CSR entries
+        extra = self.atomspace.add_node("ConceptNode", "extra")
+        self.atomspace.add_link("InheritanceLink", [extra, hub])
+        self.assertEqual(len(self.atomspace.get_incoming(hub)), 100)
+    
+    def test_materialize_deep_link_chain(self):
+        """Test links nested deeper than the recursion limit are materialized"""
+        atom = self.atomspace.add_node("ConceptNode", "base")
+        for _ in range(5000):
+            atom = self.atomspace.add_link("ListLink", [atom])
+        handle = atom.id
+        # Only the weak cache refers to the atoms now, so they are rebuilt
+        del atom
+        
+        atom = self.atomspace.get_atom_by_id(handle)
+        depth = 0
+        while atom.type is AtomType.LIST_LINK:
+            atom = atom.outgoing[0]
+            depth += 1
+        self.assertEqual(depth, 5000)
+        self.assertEqual(atom.name, "base")
+    
+    def test_remove_deep_link_chain(self):
+        """Test removal of a node cascades through nested links"""
+        node = self.atomspace.add_node("ConceptNode", "base")
+        atom = node
+        for _ in range(5000):
+            atom = self.atomspace.add_link("ListLink", [atom])
+        del atom
+        
+        self.atomspace.remove_atom(node)
+        self.assertEqual(len(self.atomspace), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
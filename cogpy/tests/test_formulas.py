@@ -0,0 +1,80 @@
+"""
+Tests for the truth value formulas
+"""
+
+import unittest
+from cogpy.core.truthvalue import np
+
+if np is not None:
+    from cogpy.core.formulas import (
+        confidence_to_count, count_to_confidence, deduction, inversion, revise_groups, revision)
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestFormulas(unittest.TestCase):
+    """Test the vectorized truth value formulas"""
+    
+    def test_deduction(self):
+        """Test the deduction strength and confidence"""
+        strength, confidence = deduction(0.8, 0.9, 0.5, 0.6, 0.2, 0.3)
+        expected = 0.8 * 0.5 + 0.2 * (0.3 - 0.2 * 0.5) / 0.8
+        self.assertAlmostEqual(float(strength), expected)
+        self.assertAlmostEqual(float(confidence), 0.6)
+    
+    def test_deduction_certain_b(self):
+        """Test a certain B leaves only the path through B"""
+        for s_c in [0.3, 1.0]:
+            strength, _ = deduction(0.2, 0.9, 0.3, 0.9, 1.0, s_c)
+            self.assertAlmostEqual(float(strength), 0.2 * 0.3)
+    
+    def test_deduction_certain_c(self):
+        """Test a certain C follows the PLN formula"""
+        strength, _ = deduction(0.2, 0.9, 0.3, 0.9, 0.2, 1.0)
+        self.assertAlmostEqual(float(strength), 0.2 * 0.3 + 0.8 * (1.0 - 0.2 * 0.3) / 0.8)
+        self.assertAlmostEqual(float(strength), 1.0)
+    
+    def test_deduction_arrays(self):
+        """Test deduction applies elementwise"""
+        strength, confidence = deduction(
+            np.array([1.0, 0.0]), np.array([0.9, 0.5]),
+            np.array([0.7, 0.7]), np.array([0.8, 0.8]),
+            0.5, np.array([0.4, 0.9]))
+        self.assertEqual(strength.shape, (2,))
+        self.assertAlmostEqual(strength[0], 0.7)
+        self.assertAlmostEqual(strength[1], 1.0)
+        self.assertEqual(confidence.tolist(), [0.8, 0.5])
+    
+    def test_inversion(self):
+        """Test inversion with Bayes' rule"""
+        strength, confidence = inversion(np.array([0.5, 0.5]), 0.7, np.array([0.2, 0.2]), np.array([0.4, 0.0]))
+        self.assertAlmostEqual(strength[0], 0.25)
+        self.assertEqual(strength[1], 0.0)
+        self.assertEqual(confidence.tolist(), [0.7, 0.7])
+    
+    def test_counts(self):
+        """Test confidences and evidence counts convert both ways"""
+        self.assertAlmostEqual(float(confidence_to_count(0.5, k=10)), 10.0)
+        self.assertAlmostEqual(float(count_to_confidence(confidence_to_count(0.3))), 0.3)
+        self.assertTrue(np.isfinite(confidence_to_count(1.0)))
+    
+    def test_revision(self):
+        """Test revision weights strengths by evidence"""
+        strength, confidence = revision(0.2, 0.5, 0.8, 0.5, k=10)
+        self.assertAlmostEqual(float(strength), 0.5)
+        self.assertAlmostEqual(float(confidence), 20 / 30)
+        strength, _ = revision(0.2, 0.9, 0.8, 0.1)
+        self.assertLess(float(strength), 0.3)
+    
+    def test_revise_groups(self):
+        """Test grouped revision matches pairwise revision"""
+        strengths, confidences = revise_groups(
+            np.array([0, 1, 0]), np.array([0.2, 0.6, 0.8]), np.array([0.5, 0.4, 0.5]), 2, k=10)
+        expected = revision(0.2, 0.5, 0.8, 0.5, k=10)
+        self.assertAlmostEqual(strengths[0], float(expected[0]))
+        self.assertAlmostEqual(confidences[0], float(expected[1]))
+        self.assertAlmostEqual(strengths[1], 0.6)
+        self.assertAlmostEqual(confidences[1], 0.4)
+
+
+if __name__ == '__main__':
+    unittest.main()
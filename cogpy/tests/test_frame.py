@@ -0,0 +1,248 @@
+"""
+Tests for copy-on-write AtomSpace frames
+"""
+
+import unittest
+from cogpy.core.atomspace import AtomSpace
+from cogpy.core.attention import AttentionValue
+from cogpy.core.columnar import ColumnarAtomSpace
+from cogpy.core.inference import ForwardChainer
+from cogpy.core.types import AtomType
+from cogpy.core.truthvalue import TruthValue, np
+from cogpy.tests import test_atomspace
+
+
+class TestFrameAtomSpace(test_atomspace.TestAtomSpace):
+    """Run the AtomSpace test suite against a frame over an empty parent"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.atomspace = AtomSpace(parent=AtomSpace())
+
+
+class TestFrame(unittest.TestCase):
+    """Test frames over a shared parent"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.base = AtomSpace()
+        self.cat = self.base.add_node("ConceptNode", "cat")
+        self.dog = self.base.add_node("ConceptNode", "dog")
+        self.animal = self.base.add_node("ConceptNode", "animal")
+        self.cat_animal = self.base.add_link("InheritanceLink", [self.cat, self.animal], TruthValue(0.9, 0.8))
+        self.dog_animal = self.base.add_link("InheritanceLink", [self.dog, self.animal], TruthValue(0.7, 0.6))
+        self.frame = AtomSpace(parent=self.base)
+    
+    def assertUnchanged(self):
+        """Assert the parent still holds exactly its original atoms"""
+        self.assertEqual(len(self.base), 5)
+        self.assertEqual(self.cat_animal.truth_value, TruthValue(0.9, 0.8))
+        self.assertEqual(set(self.base.get_incoming(self.animal)), {self.cat_animal, self.dog_animal})
+    
+    def test_reads_fall_through(self):
+        """Test a new frame sees the parent's atoms as they are"""
+        frame = self.frame
+        self.assertIs(frame.parent, self.base)
+        self.assertEqual(len(frame), 5)
+        self.assertEqual((frame.count_nodes(), frame.count_links()), (3, 2))
+        self.assertIs(frame.get_node_by_name("cat"), self.cat)
+        self.assertIs(frame.get_atom_by_id(self.cat_animal.id), self.cat_animal)
+        self.assertIs(frame.get_link("InheritanceLink", [self.cat, self.animal]), self.cat_animal)
+        self.assertEqual(set(frame.get_incoming(self.animal)), {self.cat_animal, self.dog_animal})
+        self.assertEqual(frame.count_incoming(self.animal, "InheritanceLink", 1), 2)
+        self.assertEqual(frame.count_by_type(AtomType.NODE, subtypes=True), 3)
+        self.assertTrue(frame.is_a(self.cat, self.animal))
+    
+    def test_writes_stay_in_frame(self):
+        """Test atoms added to a frame are merged into its queries only"""
+        frame = self.frame
+        bird = frame.add_node("ConceptNode", "bird")
+        bird_animal = frame.add_link("InheritanceLink", [bird, self.animal])
+        self.assertEqual(len(frame), 7)
+        self.assertEqual(set(frame.get_incoming(self.animal)), {self.cat_animal, self.dog_animal, bird_animal})
+        self.assertEqual(frame.count_incoming(self.animal), 3)
+        self.assertEqual(len(frame.get_atoms_by_type("InheritanceLink")), 3)
+        self.assertEqual(frame.count_by_type("ConceptNode"), 4)
+        self.assertEqual(len(frame.get_all_atoms()), 7)
+        self.assertIs(frame.add_node("ConceptNode", "bird"), bird)
+        self.assertIsNone(self.base.get_node_by_name("bird"))
+        self.assertUnchanged()
+    
+    def test_truth_value_copy_on_write(self):
+        """Test writing a truth value copies the parent's atom into the frame"""
+        frame = self.frame
+        copy = frame.add_link("InheritanceLink", [self.cat, self.animal], TruthValue(0.2, 0.3))
+        self.assertIsNot(copy, self.cat_animal)
+        self.assertEqual(copy, self.cat_animal)
+        self.assertEqual(copy.id, self.cat_animal.id)
+        self.assertEqual(copy.truth_value, TruthValue(0.2, 0.3))
+        self.assertIs(frame.get_atom_by_id(copy.id), copy)
+        self.assertIs(frame.get_link("InheritanceLink", [self.cat, self.animal]), copy)
+        self.assertEqual(frame.get_incoming(self.animal).count(copy), 1)
+        self.assertIn(copy, frame.get_atoms_by_type("InheritanceLink"))
+        self.assertEqual(len(frame), 5)
+        self.assertEqual(frame.count_links(), 2)
+        self.assertUnchanged()
+    
+    def test_remove(self):
+        """Test atoms removed from a frame stay in the parent"""
+        frame = self.frame
+        self.assertEqual(frame.remove_atoms([self.animal]), 3)
+        self.assertEqual(len(frame), 2)
+        self.assertIsNone(frame.get_node_by_name("animal"))
+        self.assertIsNone(frame.get_atom_by_id(self.cat_animal.id))
+        self.assertEqual(frame.get_incoming(self.cat), [])
+        self.assertEqual(frame.count_by_type("InheritanceLink"), 0)
+        self.assertUnchanged()
+        
+        animal = frame.add_node("ConceptNode", "animal")
+        self.assertNotEqual(animal.id, self.animal.id)
+        self.assertEqual(len(frame), 3)
+    
+    def test_remove_copy(self):
+        """Test removing an atom copied into a frame hides the original too"""
+        frame = self.frame
+        frame.add_node("ConceptNode", "cat", TruthValue(0.5, 0.5))
+        frame.remove_atom(self.cat)
+        self.assertIsNone(frame.get_node_by_name("cat"))
+        self.assertEqual(len(frame), 3)
+        self.assertEqual(self.cat.truth_value, TruthValue())
+        self.assertUnchanged()
+    
+    def test_clear(self):
+        """Test clearing a frame hides every atom of the parent"""
+        self.frame.add_node("ConceptNode", "bird")
+        self.frame.clear()
+        self.assertEqual(len(self.frame), 0)
+        self.assertEqual(self.frame.get_all_atoms(), [])
+        self.assertIsNone(self.frame.get_node_by_name("cat"))
+        self.assertUnchanged()
+    
+    def test_sibling_frames(self):
+        """Test frames over one parent do not see each other's changes"""
+        other = AtomSpace(parent=self.base)
+        self.frame.add_link("InheritanceLink", [self.cat, self.animal], TruthValue(0.1, 0.1))
+        other.add_link("InheritanceLink", [self.cat, self.animal], TruthValue(0.3, 0.3))
+        other.remove_atom(self.dog)
+        get = lambda space: space.get_link("InheritanceLink", [self.cat, self.animal]).truth_value
+        self.assertEqual(get(self.frame), TruthValue(0.1, 0.1))
+        self.assertEqual(get(other), TruthValue(0.3, 0.3))
+        self.assertEqual((len(self.frame), len(other)), (5, 3))
+        self.assertUnchanged()
+    
+    def test_nested_frames(self):
+        """Test a frame over a frame reads through both"""
+        bird = self.frame.add_node("ConceptNode", "bird")
+        inner = AtomSpace(parent=self.frame)
+        self.assertIs(inner.get_node_by_name("bird"), bird)
+        inner.remove_atom(self.dog)
+        inner.add_link("InheritanceLink", [bird, self.animal])
+        self.assertEqual(len(inner), 5)
+        self.assertEqual(len(self.frame), 6)
+        self.assertEqual(inner.count_incoming(self.animal), 2)
+        
+        inner.collapse()
+        self.assertEqual(len(self.frame), 5)
+        self.assertIsNone(self.frame.get_node_by_name("dog"))
+        self.assertUnchanged()
+    
+    def test_collapse(self):
+        """Test collapsing a frame applies its changes to the parent"""
+        frame = self.frame
+        bird = frame.add_node("ConceptNode", "bird")
+        bird_animal = frame.add_link("InheritanceLink", [bird, self.animal], TruthValue(0.6, 0.5))
+        frame.add_link("InheritanceLink", [self.cat, self.animal], TruthValue(0.2, 0.3))
+        frame.remove_atom(self.dog)
+        
+        self.assertIs(frame.collapse(), self.base)
+        self.assertEqual(len(self.base), 5)
+        self.assertIs(self.base.get_node_by_name("bird"), bird)
+        self.assertIs(self.base.get_atom_by_id(bird_animal.id), bird_animal)
+        self.assertEqual(bird_animal.truth_value, TruthValue(0.6, 0.5))
+        self.assertEqual(self.cat_animal.truth_value, TruthValue(0.2, 0.3))
+        self.assertIsNone(self.base.get_node_by_name("dog"))
+        self.assertEqual(set(self.base.get_incoming(self.animal)), {self.cat_animal, bird_animal})
+        
+        # The emptied frame reads through to the updated parent
+        self.assertEqual(len(frame), 5)
+        self.assertIs(frame.get_node_by_name("bird"), bird)
+    
+    def test_collapse_link_to_copy(self):
+        """Test a link added over a copied atom holds the parent's atom after collapse"""
+        cat = self.frame.add_node("ConceptNode", "cat", TruthValue(0.4, 0.4))
+        link = self.frame.add_link("ListLink", [cat, self.dog])
+        self.frame.collapse()
+        self.assertIs(link.outgoing[0], self.cat)
+        self.assertEqual(self.cat.truth_value, TruthValue(0.4, 0.4))
+        self.assertEqual(self.base.get_incoming(self.cat, "ListLink"), [link])
+    
+    def test_attention(self):
+        """Test attention written in a frame stays there until collapse"""
+        self.base.set_attention_value(self.cat, AttentionValue(5.0, 1.0))
+        self.frame.stimulate(self.cat, 2.0)
+        self.assertEqual(self.frame.get_attention_value(self.cat), AttentionValue(7.0, 1.0))
+        self.assertEqual(self.base.get_attention_value(self.cat), AttentionValue(5.0, 1.0))
+        self.frame.collapse()
+        self.assertEqual(self.base.get_attention_value(self.cat), AttentionValue(7.0, 1.0))
+    
+    def test_external_ids(self):
+        """Test frames share the parent's external IDs and keep their own"""
+        base = AtomSpace(external_ids=True)
+        cat = base.add_node("ConceptNode", "cat")
+        frame = AtomSpace(parent=base)
+        external_id = base.get_external_id(cat)
+        self.assertEqual(frame.get_external_id(cat), external_id)
+        self.assertIs(frame.get_atom_by_external_id(external_id), cat)
+        bird = frame.add_node("ConceptNode", "bird")
+        bird_id = frame.get_external_id(bird)
+        self.assertIsNotNone(bird_id)
+        self.assertIsNone(base.get_atom_by_external_id(bird_id))
+        frame.collapse()
+        self.assertIs(base.get_atom_by_external_id(bird_id), bird)
+    
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_truth_value_arrays(self):
+        """Test batch truth values read both layers and write to the frame"""
+        frame = self.frame
+        bird = frame.add_node("ConceptNode", "bird", TruthValue(0.5, 0.5))
+        handles = [self.cat_animal.id, bird.id, self.dog_animal.id]
+        _, strengths, confidences = frame.get_truth_values(handles=handles)
+        self.assertEqual(strengths.tolist(), [0.9, 0.5, 0.7])
+        
+        frame.set_truth_values(handles, 0.25, 0.75)
+        self.assertEqual(frame.get_atom_by_id(self.dog_animal.id).truth_value, TruthValue(0.25, 0.75))
+        _, strengths, _ = frame.get_truth_values("InheritanceLink")
+        self.assertEqual(strengths.tolist(), [0.25, 0.25])
+        self.assertUnchanged()
+        self.assertEqual(self.dog_animal.truth_value, TruthValue(0.7, 0.6))
+    
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_inference_in_frame(self):
+        """Test a forward chainer run in a frame leaves the parent alone"""
+        mammal = self.base.add_node("ConceptNode", "mammal")
+        self.base.add_link("InheritanceLink", [mammal, self.animal], TruthValue(0.9, 0.8))
+        self.base.add_link("InheritanceLink", [self.cat, mammal], TruthValue(0.9, 0.8))
+        being = self.base.add_node("ConceptNode", "being")
+        self.base.add_link("InheritanceLink", [self.animal, being], TruthValue(0.9, 0.8))
+        frame = AtomSpace(parent=self.base)
+        created = ForwardChainer(frame).run()
+        self.assertTrue(created)
+        self.assertEqual(len(frame), len(self.base) + len(created))
+        self.assertIsNone(self.base.get_link("InheritanceLink", [self.cat, being]))
+        self.assertEqual(self.cat_animal.truth_value, TruthValue(0.9, 0.8))
+        self.assertGreater(frame.get_atom_by_id(self.cat_animal.id).truth_value.confidence, 0.8)
+    
+    def test_invalid(self):
+        """Test unsupported frames and collapsing a non-frame are refused"""
+        with self.assertRaises(TypeError):
+            AtomSpace(parent=ColumnarAtomSpace())
+        with self.assertRaises(ValueError):
+            AtomSpace(parent=self.base, ancestor_index=True)
+        with self.assertRaises(ValueError):
+            self.base.collapse()
+        with self.assertRaises(ValueError):
+            self.frame.get_attention_value(AtomSpace().add_node("ConceptNode", "cat"))
+
+
+if __name__ == '__main__':
+    unittest.main()
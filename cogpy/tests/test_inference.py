@@ -0,0 +1,291 @@
+"""
+Tests for rule-based inference
+"""
+
+import unittest
+from cogpy.core.atom import Node, Link
+from cogpy.core.inference import (
+    BackwardChainer, DeductionRule, ForwardChainer, InversionRule, get_rule, get_rule_names, register_rule)
+from cogpy.core.types import AtomType
+from cogpy.core.truthvalue import TruthValue, np
+from cogpy.tests.backends import AtomSpaceBackend, ColumnarBackend
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestForwardChainer(AtomSpaceBackend, unittest.TestCase):
+    """Test cases for ForwardChainer"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.atomspace = self.make_atomspace()
+        self.terms = {
+            name: self.atomspace.add_node("ConceptNode", name, TruthValue(0.1, 0.9))
+            for name in ["cat", "mammal", "animal", "being"]}
+        self.chain = [
+            self.atomspace.add_link("InheritanceLink", [self.terms[a], self.terms[b]], TruthValue(0.9, 0.8))
+            for a, b in [("cat", "mammal"), ("mammal", "animal"), ("animal", "being")]]
+    
+    def inherits(self, child, parent):
+        """Get the InheritanceLink between two terms, if any"""
+        return self.atomspace.get_link("InheritanceLink", [self.terms[child], self.terms[parent]])
+    
+    def test_deduction_chain(self):
+        """Test every transitive link is derived"""
+        created = ForwardChainer(self.atomspace).run()
+        self.assertEqual(len(created), 3)
+        for child, parent in [("cat", "animal"), ("mammal", "being"), ("cat", "being")]:
+            self.assertIsNotNone(self.inherits(child, parent))
+        self.assertIsNone(self.inherits("animal", "cat"))
+    
+    def test_deduction_truth_value(self):
+        """Test conclusions get the deduction formula's truth value"""
+        ForwardChainer(self.atomspace).run()
+        truth_value = self.inherits("cat", "animal").truth_value
+        expected = 0.9 * 0.9 + 0.1 * (0.1 - 0.1 * 0.9) / 0.9
+        self.assertAlmostEqual(truth_value.strength, expected)
+        self.assertAlmostEqual(truth_value.confidence, 0.8)
+    
+    def test_default_term_truth_values(self):
+        """Test terms with the default truth value do not decide the conclusion"""
+        atomspace = self.make_atomspace()
+        cat, mammal, animal = [atomspace.add_node("ConceptNode", name) for name in ["cat", "mammal", "animal"]]
+        atomspace.add_link("InheritanceLink", [cat, mammal], TruthValue(0.2, 0.9))
+        atomspace.add_link("InheritanceLink", [mammal, animal], TruthValue(0.3, 0.9))
+        ForwardChainer(atomspace).run()
+        truth_value = atomspace.get_link("InheritanceLink", [cat, animal]).truth_value
+        self.assertAlmostEqual(truth_value.strength, 0.2 * 0.3)
+        self.assertAlmostEqual(truth_value.confidence, 0.9)
+    
+    def test_existing_conclusion_is_revised(self):
+        """Test a conclusion that already exists gains confidence"""
+        existing = self.atomspace.add_link(
+            "InheritanceLink", [self.terms["cat"], self.terms["animal"]], TruthValue(0.5, 0.5))
+        ForwardChainer(self.atomspace, sources=[self.chain[0]]).run(max_steps=1)
+        self.assertGreater(existing.truth_value.confidence, 0.5)
+        self.assertGreater(existing.truth_value.strength, 0.5)
+    
+    def test_premises_fire_once(self):
+        """Test running again derives nothing new"""
+        chainer = ForwardChainer(self.atomspace)
+        chainer.run()
+        confidence = self.inherits("cat", "being").truth_value.confidence
+        chainer.add_sources(self.atomspace.get_atoms_by_type("InheritanceLink"))
+        self.assertEqual(chainer.run(), [])
+        self.assertEqual(self.inherits("cat", "being").truth_value.confidence, confidence)
+    
+    def test_agenda_priority(self):
+        """Test the strongest sources are fired first"""
+        weak = self.atomspace.add_node("ConceptNode", "weak")
+        weak_link = self.atomspace.add_link("InheritanceLink", [weak, self.terms["cat"]], TruthValue(0.1, 0.1))
+        chainer = ForwardChainer(self.atomspace, batch_size=1)
+        for _ in self.chain:
+            chainer.step()
+        waiting = [handle for _, _, handle in chainer._agenda]
+        self.assertIn(weak_link.id, waiting)
+        self.assertFalse(any(link.id in waiting for link in self.chain))
+    
+    def test_max_conclusions(self):
+        """Test run stops once enough links are derived"""
+        created = ForwardChainer(self.atomspace, batch_size=1).run(max_conclusions=1)
+        self.assertGreaterEqual(len(created), 1)
+        self.assertLess(len(created), 3)
+    
+    def test_inversion(self):
+        """Test the inversion rule"""
+        chainer = ForwardChainer(self.atomspace, rules=["inversion"], sources=[self.chain[0]])
+        created = chainer.run(max_steps=1)
+        self.assertEqual(created, [self.inherits("mammal", "cat")])
+        self.assertAlmostEqual(created[0].truth_value.strength, 0.9)
+    
+    def test_rule_registry(self):
+        """Test rules are looked up by name"""
+        self.assertIn("deduction", get_rule_names())
+        self.assertIsInstance(get_rule("deduction"), DeductionRule)
+        self.assertIsInstance(get_rule("inversion"), InversionRule)
+        with self.assertRaises(ValueError):
+            get_rule("abduction")
+    
+    def test_custom_rule(self):
+        """Test registering a rule of another link type"""
+        class SymmetryRule(InversionRule):
+            name = "test-symmetry"
+            
+            def formula(self, atomspace, premise_sets):
+                _, strengths, confidences = atomspace.get_truth_values(
+                    handles=[premises[0].id for premises in premise_sets])
+                return strengths, confidences
+        
+        rule = register_rule(SymmetryRule("ImplicationLink"))
+        self.assertIs(get_rule("test-symmetry"), rule)
+        dog = self.atomspace.add_node("ConceptNode", "dog")
+        self.atomspace.add_link("ImplicationLink", [dog, self.terms["cat"]])
+        created = ForwardChainer(self.atomspace, rules=["test-symmetry"]).run()
+        self.assertEqual(len(created), 1)
+        self.assertEqual(created[0].outgoing, (self.terms["cat"], dog))
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestColumnarForwardChainer(ColumnarBackend, TestForwardChainer):
+    """Run the ForwardChainer tests against ColumnarAtomSpace"""
+
+
+class CountingDeductionRule(DeductionRule):
+    """A deduction rule that records the goals it is asked to prove"""
+    
+    def __init__(self):
+        super().__init__()
+        self.goals = []
+    
+    def backward(self, chainer, goal, depth):
+        self.goals.append(goal)
+        return super().backward(chainer, goal, depth)
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestBackwardChainer(AtomSpaceBackend, unittest.TestCase):
+    """Test cases for BackwardChainer"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.atomspace = self.make_atomspace()
+        self.terms = {
+            name: self.atomspace.add_node("ConceptNode", name, TruthValue(0.1, 0.9))
+            for name in ["cat", "mammal", "animal", "being"]}
+        for a, b in [("cat", "mammal"), ("mammal", "animal"), ("animal", "being")]:
+            self.atomspace.add_link("InheritanceLink", [self.terms[a], self.terms[b]], TruthValue(0.9, 0.8))
+        self.X = Node(AtomType.VARIABLE_NODE, "$X")
+    
+    def template(self, first, second):
+        """Build an InheritanceLink template from names and variables"""
+        ends = [end if isinstance(end, Node) else Node(AtomType.CONCEPT_NODE, end) for end in (first, second)]
+        return Link(AtomType.INHERITANCE_LINK, ends)
+    
+    def answers(self, results):
+        """Map each answer's $X name to its truth value"""
+        return {bindings["$X"].name: truth_value for bindings, truth_value in results}
+    
+    def test_query_parents(self):
+        """Test InheritanceLink(cat, $X) finds direct and derived parents"""
+        answers = self.answers(BackwardChainer(self.atomspace).query(self.template("cat", self.X)))
+        self.assertEqual(set(answers), {"mammal", "animal", "being"})
+        self.assertAlmostEqual(answers["mammal"].strength, 0.9)
+        expected = 0.9 * 0.9 + 0.1 * (0.1 - 0.1 * 0.9) / 0.9
+        self.assertAlmostEqual(answers["animal"].strength, expected)
+        self.assertAlmostEqual(answers["animal"].confidence, 0.8)
+    
+    def test_query_children(self):
+        """Test InheritanceLink($X, being) works backwards from the parent"""
+        answers = self.answers(BackwardChainer(self.atomspace).query(self.template(self.X, "being")))
+        self.assertEqual(set(answers), {"animal", "mammal", "cat"})
+    
+    def test_query_is_read_only(self):
+        """Test derived answers are not added to the AtomSpace"""
+        size = len(self.atomspace)
+        BackwardChainer(self.atomspace).query(self.template("cat", self.X))
+        self.assertEqual(len(self.atomspace), size)
+    
+    def test_query_ground(self):
+        """Test a query without variables"""
+        chainer = BackwardChainer(self.atomspace)
+        results = chainer.query(self.template("cat", "being"))
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0][0], {})
+        self.assertEqual(chainer.query(self.template("being", "cat")), [])
+    
+    def test_answers_sorted(self):
+        """Test answers come strongest first"""
+        results = BackwardChainer(self.atomspace).query(self.template("cat", self.X))
+        self.assertEqual([bindings["$X"].name for bindings, _ in results], ["mammal", "animal", "being"])
+    
+    def test_existing_link_is_revised(self):
+        """Test derived evidence is merged with an existing link"""
+        self.atomspace.add_link("InheritanceLink", [self.terms["cat"], self.terms["animal"]], TruthValue(0.5, 0.5))
+        answers = self.answers(BackwardChainer(self.atomspace).query(self.template("cat", self.X)))
+        self.assertGreater(answers["animal"].confidence, 0.8)
+        self.assertGreater(answers["animal"].strength, 0.5)
+    
+    def test_after_forward_chaining(self):
+        """Test links a ForwardChainer derived are not revised with the same derivations"""
+        forward = ForwardChainer(self.atomspace)
+        forward.run()
+        stored = self.atomspace.get_link("InheritanceLink", [self.terms["cat"], self.terms["animal"]])
+        chainer = BackwardChainer(self.atomspace, derived=forward.derived)
+        answers = self.answers(chainer.query(self.template("cat", self.X)))
+        self.assertAlmostEqual(answers["animal"].strength, stored.truth_value.strength)
+        self.assertAlmostEqual(answers["animal"].confidence, stored.truth_value.confidence)
+        
+        # New evidence makes the link revisable again
+        stored.truth_value = TruthValue(0.5, 0.5)
+        answers = self.answers(chainer.query(self.template("cat", self.X)))
+        self.assertGreater(answers["animal"].confidence, 0.5)
+    
+    def test_default_term_truth_values(self):
+        """Test terms with the default truth value do not decide the answer"""
+        atomspace = self.make_atomspace()
+        cat, mammal, animal = [atomspace.add_node("ConceptNode", name) for name in ["cat", "mammal", "animal"]]
+        atomspace.add_link("InheritanceLink", [cat, mammal], TruthValue(0.2, 0.9))
+        atomspace.add_link("InheritanceLink", [mammal, animal], TruthValue(0.3, 0.9))
+        results = BackwardChainer(atomspace).query(Link(AtomType.INHERITANCE_LINK, [cat, animal]))
+        self.assertAlmostEqual(results[0][1].strength, 0.2 * 0.3)
+    
+    def test_depth_budget(self):
+        """Test max_depth limits the number of rule applications"""
+        chainer = BackwardChainer(self.atomspace)
+        self.assertEqual(set(self.answers(chainer.query(self.template("cat", self.X), max_depth=0))), {"mammal"})
+        self.assertEqual(set(self.answers(chainer.query(self.template("cat", self.X), max_depth=1))),
+                         {"mammal", "animal"})
+        self.assertEqual(set(self.answers(chainer.query(self.template("cat", self.X), max_depth=2))),
+                         {"mammal", "animal", "being"})
+        self.assertEqual(chainer.query(self.template("cat", "being"), max_depth=0), [])
+    
+    def test_time_budget(self):
+        """Test an exhausted time budget answers from the AtomSpace alone"""
+        chainer = BackwardChainer(self.atomspace, time_limit=0.0)
+        answers = self.answers(chainer.query(self.template("cat", self.X)))
+        self.assertTrue(chainer.timed_out)
+        self.assertEqual(set(answers), {"mammal"})
+        chainer.query(self.template("cat", self.X), time_limit=10.0)
+        self.assertFalse(chainer.timed_out)
+    
+    def test_subgoals_are_tabled(self):
+        """Test a subgoal shared by several proofs is solved once"""
+        for name in ["dog", "wolf"]:
+            self.terms[name] = self.atomspace.add_node("ConceptNode", name, TruthValue(0.1, 0.9))
+            self.atomspace.add_link("InheritanceLink", [self.terms[name], self.terms["mammal"]], TruthValue(0.9, 0.8))
+        rule = CountingDeductionRule()
+        BackwardChainer(self.atomspace, rules=[rule]).query(self.template(self.X, "being"))
+        self.assertEqual(len(rule.goals), len(set(rule.goals)))
+        mammal = ("InheritanceLink", None, self.terms["mammal"].id)
+        self.assertIn(mammal, [(goal[0].value, goal[1], goal[2]) for goal in rule.goals])
+    
+    def test_cycles_terminate(self):
+        """Test proofs through cyclic inheritance terminate"""
+        self.atomspace.add_link("InheritanceLink", [self.terms["being"], self.terms["cat"]], TruthValue(0.5, 0.5))
+        chainer = BackwardChainer(self.atomspace, rules=["deduction", "inversion"], max_depth=6)
+        answers = self.answers(chainer.query(self.template("cat", self.X)))
+        self.assertIn("being", answers)
+        self.assertNotIn("cat", answers)
+    
+    def test_inversion(self):
+        """Test the inversion rule answers queries backwards"""
+        chainer = BackwardChainer(self.atomspace, rules=["inversion"], max_depth=1)
+        answers = self.answers(chainer.query(self.template("mammal", self.X)))
+        self.assertAlmostEqual(answers["cat"].strength, 0.9)
+    
+    def test_missing_constant(self):
+        """Test a query naming an unknown atom has no answers"""
+        self.assertEqual(BackwardChainer(self.atomspace).query(self.template("unicorn", self.X)), [])
+    
+    def test_invalid_query(self):
+        """Test queries must be binary links between nodes"""
+        with self.assertRaises(ValueError):
+            BackwardChainer(self.atomspace).query(Link(AtomType.LIST_LINK, [self.X]))
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestColumnarBackwardChainer(ColumnarBackend, TestBackwardChainer):
+    """Run the BackwardChainer tests against ColumnarAtomSpace"""
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+"""
+Tests for NDJSON import and export
+"""
+
+import io
+import json
+import os
+import tempfile
+import unittest
+from cogpy.core.types import AtomType
+from cogpy.core.truthvalue import TruthValue
+from cogpy.io.ndjson import iter_ndjson, read_ndjson, write_ndjson
+from cogpy.tests.backends import AtomSpaceBackend, ColumnarBackend
+
+
+class TestNDJSON(AtomSpaceBackend, unittest.TestCase):
+    """Test reading and writing NDJSON"""
+    
+    def setUp(self):
+        self.atomspace = self.make_atomspace()
+        cat = self.atomspace.add_node(AtomType.CONCEPT_NODE, 'the "cat"\né')
+        animal = self.atomspace.add_node(AtomType.CONCEPT_NODE, "animal", TruthValue(0.5, 0.25))
+        pair = self.atomspace.add_link(AtomType.LIST_LINK, [cat, animal])
+        self.atomspace.add_link(AtomType.INHERITANCE_LINK, [cat, animal], TruthValue(0.9, 0.8))
+        self.atomspace.add_link(AtomType.EVALUATION_LINK,
+                                [self.atomspace.add_node(AtomType.PREDICATE_NODE, "likes"), pair])
+        self.atomspace.add_link(AtomType.LIST_LINK, [])
+    
+    def assertSameAtoms(self, first, second):
+        """Assert two AtomSpaces hold the same atoms and truth values"""
+        def atoms(atomspace):
+            return sorted((repr(atom), atom.truth_value.to_tuple()) for atom in atomspace.get_all_atoms())
+        self.assertEqual(atoms(first), atoms(second))
+    
+    def test_format(self):
+        """Test each line is a JSON object referring to outgoing atoms by handle"""
+        records = [json.loads(line) for line in iter_ndjson(self.atomspace)]
+        self.assertEqual(len(records), len(self.atomspace))
+        by_id = {record["id"]: record for record in records}
+        link = self.atomspace.get_atoms_by_type(AtomType.INHERITANCE_LINK)[0]
+        self.assertEqual(by_id[link.id], {"id": link.id, "type": "InheritanceLink",
+                                          "outgoing": [atom.id for atom in link.outgoing], "tv": [0.9, 0.8]})
+        self.assertEqual(by_id[link.outgoing[0].id]["name"], 'the "cat"\né')
+    
+    def test_round_trip(self):
+        """Test written NDJSON reads back as the same atoms"""
+        output = io.StringIO()
+        self.assertEqual(write_ndjson(self.atomspace, output, batch_size=2), len(self.atomspace))
+        copy = self.make_atomspace()
+        self.assertEqual(read_ndjson(copy, io.StringIO(output.getvalue())), len(self.atomspace))
+        self.assertSameAtoms(copy, self.atomspace)
+    
+    def test_pipe(self):
+        """Test one AtomSpace's lines can be read straight into another"""
+        copy = self.make_atomspace()
+        read_ndjson(copy, iter_ndjson(self.atomspace))
+        self.assertSameAtoms(copy, self.atomspace)
+    
+    def test_forward_references(self):
+        """Test links that come before their outgoing atoms wait for them"""
+        lines = list(reversed(list(iter_ndjson(self.atomspace))))
+        copy = self.make_atomspace()
+        self.assertEqual(read_ndjson(copy, lines), len(self.atomspace))
+        self.assertSameAtoms(copy, self.atomspace)
+    
+    def test_pending_limit(self):
+        """Test too many waiting links are refused"""
+        lines = list(reversed(list(iter_ndjson(self.atomspace))))
+        with self.assertRaises(ValueError):
+            read_ndjson(self.make_atomspace(), lines, max_pending=1)
+    
+    def test_missing_reference(self):
+        """Test a link to an atom never read is refused"""
+        lines = ['{"id": 0, "type": "ConceptNode", "name": "cat"}',
+                 '{"id": 1, "type": "ListLink", "outgoing": [0, 7]}']
+        with self.assertRaises(ValueError):
+            read_ndjson(self.make_atomspace(), lines)
+    
+    def test_invalid(self):
+        """Test malformed lines are refused"""
+        for line in ['{"id": 0, "type": "ConceptNode"', '{"id": 0, "name": "cat"}',
+                     '{"id": 0, "type": "UnknownNode", "name": "cat"}', '[1, 2]',
+                     '{"id": 0, "type": "ConceptNode", "name": "cat", "tv": [1, 1, 1]}']:
+            with self.subTest(line=line), self.assertRaises(ValueError):
+                read_ndjson(self.make_atomspace(), [line])
+    
+    def test_files(self):
+        """Test paths can be given instead of file objects"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "atoms.ndjson")
+            write_ndjson(self.atomspace, path)
+            copy = self.make_atomspace()
+            self.assertEqual(read_ndjson(copy, path), len(self.atomspace))
+            self.assertSameAtoms(copy, self.atomspace)
+
+
+class TestColumnarNDJSON(ColumnarBackend, TestNDJSON):
+    """Run the NDJSON tests against ColumnarAtomSpace"""
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,168 @@
+"""
+Tests for PatternMatcher
+"""
+
+import unittest
+from cogpy.core.atom import Node, Link
+from cogpy.core.atomspace import AtomSpace
+from cogpy.core.columnar import ColumnarAtomSpace
+from cogpy.core.pattern import PatternMatcher
+from cogpy.core.types import AtomType
+
+
+X = Node(AtomType.VARIABLE_NODE, "$X")
+Y = Node(AtomType.VARIABLE_NODE, "$Y")
+
+
+class TestPatternMatcher(unittest.TestCase):
+    """Test cases for PatternMatcher"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.atomspace = AtomSpace()
+        self.matcher = PatternMatcher(self.atomspace)
+        self.cat = self.atomspace.add_node("ConceptNode", "cat")
+        self.dog = self.atomspace.add_node("ConceptNode", "dog")
+        self.rock = self.atomspace.add_node("ConceptNode", "rock")
+        self.animal = self.atomspace.add_node("ConceptNode", "animal")
+        self.mammal = self.atomspace.add_node("ConceptNode", "mammal")
+        for child, parent in [(self.cat, self.mammal), (self.dog, self.mammal),
+                              (self.mammal, self.animal), (self.cat, self.animal)]:
+            self.atomspace.add_link("InheritanceLink", [child, parent])
+    
+    def names(self, groundings, variable="$X"):
+        """Get the sorted names bound to a variable"""
+        return sorted(grounding[variable].name for grounding in groundings)
+    
+    def test_single_clause(self):
+        """Test grounding a variable against a constant"""
+        animal = Node(AtomType.CONCEPT_NODE, "animal")
+        groundings = self.matcher.match_all(Link(AtomType.INHERITANCE_LINK, [X, animal]))
+        self.assertEqual(self.names(groundings), ["cat", "mammal"])
+    
+    def test_variable_position(self):
+        """Test the constant anchors the position it appears at"""
+        groundings = self.matcher.match_all(Link(AtomType.INHERITANCE_LINK, [self.cat, X]))
+        self.assertEqual(self.names(groundings), ["animal", "mammal"])
+    
+    def test_conjunction(self):
+        """Test variables shared between clauses"""
+        groundings = self.matcher.match_all([
+            Link(AtomType.INHERITANCE_LINK, [X, Y]),
+            Link(AtomType.INHERITANCE_LINK, [Y, self.animal]),
+        ])
+        self.assertEqual(len(groundings), 2)
+        for grounding in groundings:
+            self.assertEqual(grounding["$Y"], self.mammal)
+        self.assertEqual(self.names(groundings), ["cat", "dog"])
+    
+    def test_repeated_variable(self):
+        """Test a variable used twice must bind the same atom"""
+        self.atomspace.add_link("SimilarityLink", [self.cat, self.cat])
+        self.atomspace.add_link("SimilarityLink", [self.cat, self.dog])
+        groundings = self.matcher.match_all(Link(AtomType.SIMILARITY_LINK, [X, X]))
+        self.assertEqual(self.names(groundings), ["cat"])
+    
+    def test_unordered_link(self):
+        """Test unordered templates match in any order"""
+        self.atomspace.add_link("SimilarityLink", [self.cat, self.dog])
+        groundings = self.matcher.match_all(Link(AtomType.SIMILARITY_LINK, [X, self.dog]))
+        self.assertEqual(self.names(groundings), ["cat"])
+        groundings = self.matcher.match_all(Link(AtomType.SIMILARITY_LINK, [self.cat, X]))
+        self.assertEqual(self.names(groundings), ["dog"])
+    
+    def test_nested_template(self):
+        """Test constants below nested links anchor the match"""
+        likes = self.atomspace.add_node("PredicateNode", "likes")
+        fish = self.atomspace.add_node("ConceptNode", "fish")
+        self.atomspace.add_link("EvaluationLink", [
+            likes, self.atomspace.add_link("ListLink", [self.cat, fish])])
+        self.atomspace.add_link("EvaluationLink", [
+            likes, self.atomspace.add_link("ListLink", [self.dog, self.rock])])
+        template = Link(AtomType.EVALUATION_LINK, [
+            likes, Link(AtomType.LIST_LINK, [X, fish])])
+        self.assertEqual(self.names(self.matcher.match_all(template)), ["cat"])
+    
+    def test_initial_bindings(self):
+        """Test variables can be bound before matching"""
+        groundings = self.matcher.match_all(
+            Link(AtomType.INHERITANCE_LINK, [X, Y]), {"$X": self.dog})
+        self.assertEqual(self.names(groundings, "$Y"), ["mammal"])
+    
+    def test_no_constants(self):
+        """Test a template of only variables scans its type"""
+        groundings = self.matcher.match_all(Link(AtomType.INHERITANCE_LINK, [X, Y]))
+        self.assertEqual(len(groundings), 4)
+    
+    def test_missing_constant(self):
+        """Test a constant absent from the AtomSpace matches nothing"""
+        unicorn = Node(AtomType.CONCEPT_NODE, "unicorn")
+        self.assertEqual(self.matcher.match_all(Link(AtomType.INHERITANCE_LINK, [X, unicorn])), [])
+    
+    def test_no_match(self):
+        """Test a conjunction with no common grounding"""
+        groundings = self.matcher.match_all([
+            Link(AtomType.INHERITANCE_LINK, [X, self.mammal]),
+            Link(AtomType.INHERITANCE_LINK, [self.rock, X]),
+        ])
+        self.assertEqual(groundings, [])
+    
+    def test_match_is_lazy(self):
+        """Test match returns an iterator"""
+        groundings = self.matcher.match(Link(AtomType.INHERITANCE_LINK, [X, self.animal]))
+        self.assertIn(next(groundings)["$X"].name, ["cat", "mammal"])
+    
+    def test_clause_order(self):
+        """Test the most selective clause is evaluated first"""
+        loose = Link(AtomType.INHERITANCE_LINK, [X, Y])
+        anchored = Link(AtomType.INHERITANCE_LINK, [Y, self.animal])
+        self.assertEqual(self.matcher.plan([loose, anchored]), [anchored, loose])
+        self.assertEqual(self.matcher.plan([anchored, loose]), [anchored, loose])
+        self.assertEqual(
+            self.names(self.matcher.match_all([loose, anchored])),
+            self.names(self.matcher.match_all([anchored, loose])))
+    
+    def test_clause_order_uses_counts(self):
+        """Test clause order follows the incoming counts of constants"""
+        for i in range(5):
+            self.atomspace.add_link("InheritanceLink", [
+                self.atomspace.add_node("ConceptNode", f"bird-{i}"), self.animal])
+        by_animal = Link(AtomType.INHERITANCE_LINK, [X, self.animal])
+        by_mammal = Link(AtomType.INHERITANCE_LINK, [X, self.mammal])
+        self.assertEqual(self.matcher.plan([by_animal, by_mammal]), [by_mammal, by_animal])
+        self.assertEqual(self.names(self.matcher.match_all([by_animal, by_mammal])), ["cat"])
+    
+    def test_plan_cache(self):
+        """Test queries of the same shape share a compiled plan"""
+        self.matcher.match_all(Link(AtomType.INHERITANCE_LINK, [X, self.animal]))
+        groundings = self.matcher.match_all(Link(AtomType.INHERITANCE_LINK, [X, self.mammal]))
+        self.assertEqual(len(self.matcher._plans), 1)
+        self.assertEqual(self.names(groundings), ["cat", "dog"])
+        
+        self.matcher.match_all(Link(AtomType.INHERITANCE_LINK, [self.cat, X]))
+        self.assertEqual(len(self.matcher._plans), 2)
+        self.matcher.clear_plan_cache()
+        self.assertEqual(len(self.matcher._plans), 0)
+    
+    def test_plan_cache_size(self):
+        """Test the least recently used plans are dropped"""
+        matcher = PatternMatcher(self.atomspace, plan_cache_size=1)
+        matcher.match_all(Link(AtomType.INHERITANCE_LINK, [X, self.animal]))
+        matcher.match_all(Link(AtomType.INHERITANCE_LINK, [self.cat, X]))
+        self.assertEqual(len(matcher._plans), 1)
+        self.assertEqual(self.names(matcher.match_all(Link(AtomType.INHERITANCE_LINK, [X, self.animal]))),
+                         ["cat", "mammal"])
+    
+    def test_columnar_atomspace(self):
+        """Test matching over a ColumnarAtomSpace"""
+        atomspace = ColumnarAtomSpace()
+        cat = atomspace.add_node("ConceptNode", "cat")
+        animal = atomspace.add_node("ConceptNode", "animal")
+        atomspace.add_link("InheritanceLink", [cat, animal])
+        groundings = PatternMatcher(atomspace).match_all(
+            Link(AtomType.INHERITANCE_LINK, [X, Node(AtomType.CONCEPT_NODE, "animal")]))
+        self.assertEqual(self.names(groundings), ["cat"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+"""
+Tests for memory-mapped AtomSpace snapshots
+"""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+from cogpy.core import snapshot
+from cogpy.core.atomspace import AtomSpace
+from cogpy.core.attention import AttentionValue
+from cogpy.core.columnar import ColumnarAtomSpace
+from cogpy.core.types import AtomType
+from cogpy.core.truthvalue import TruthValue
+from cogpy.tests import test_atomspace
+from cogpy.tests.backends import AtomSpaceBackend, ColumnarBackend
+
+
+class TestSnapshot(AtomSpaceBackend, unittest.TestCase):
+    """Test saving and opening snapshots"""
+    
+    mmap = True
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "atoms.snapshot")
+        atomspace = self.make_atomspace()
+        cat = atomspace.add_node("ConceptNode", "cat")
+        dog = atomspace.add_node("ConceptNode", "dog")
+        animal = atomspace.add_node("ConceptNode", "animal", TruthValue(0.5, 0.5))
+        atomspace.add_link("InheritanceLink", [cat, animal], TruthValue(0.9, 0.8))
+        atomspace.add_link("InheritanceLink", [dog, animal])
+        atomspace.add_link("SimilarityLink", [dog, cat])
+        atomspace.remove_atom(atomspace.add_node("ConceptNode", "removed"))
+        atomspace.set_attention_value(cat, AttentionValue(5.0, 1.0))
+        atomspace.save_snapshot(self.path)
+        self.atomspace = self.open()
+    
+    def open(self):
+        """Open the test snapshot"""
+        return AtomSpace.open_snapshot(self.path, mmap=self.mmap)
+    
+    def test_queries(self):
+        """Test atoms, incoming sets and values are read back"""
+        atomspace = self.atomspace
+        self.assertIsInstance(atomspace, ColumnarAtomSpace)
+        self.assertEqual(len(atomspace), 6)
+        self.assertEqual(atomspace.count_nodes(), 3)
+        self.assertEqual(atomspace.count_by_type(AtomType.LINK, subtypes=True), 3)
+        animal = atomspace.get_node_by_name("animal", "ConceptNode")
+        self.assertEqual(animal.truth_value, TruthValue(0.5, 0.5))
+        self.assertEqual(sorted(link.outgoing[0].name for link in atomspace.get_incoming(animal)), ["cat", "dog"])
+        cat = atomspace.get_node_by_name("cat")
+        self.assertEqual(atomspace.get_attention_value(cat), AttentionValue(5.0, 1.0))
+        link = atomspace.get_link("InheritanceLink", [cat, animal])
+        self.assertEqual(link.truth_value, TruthValue(0.9, 0.8))
+        # Unordered links are found with their outgoing set in any order
+        self.assertIsNotNone(atomspace.get_link("SimilarityLink", [cat, atomspace.get_node_by_name("dog")]))
+        self.assertIsNone(atomspace.get_node_by_name("removed"))
+        self.assertEqual(atomspace._mapped, self.mmap)
+    
+    def test_changes_are_private(self):
+        """Test changes to an opened snapshot never reach the file"""
+        atomspace = self.atomspace
+        atomspace.get_node_by_name("cat").truth_value = TruthValue(0.1, 0.2)
+        atomspace.remove_atom(atomspace.get_node_by_name("animal"))
+        self.assertEqual(len(atomspace), 3)
+        reopened = self.open()
+        self.assertEqual(len(reopened), 6)
+        self.assertEqual(reopened.get_node_by_name("cat").truth_value, TruthValue(1.0, 1.0))
+    
+    def test_add_after_open(self):
+        """Test atoms can be added to an opened snapshot"""
+        atomspace = self.atomspace
+        cat = atomspace.get_node_by_name("cat")
+        self.assertIs(atomspace.add_node("ConceptNode", "cat"), cat)
+        self.assertEqual(atomspace._mapped, self.mmap)
+        bird = atomspace.add_node("ConceptNode", "bird")
+        link = atomspace.add_link("InheritanceLink", [bird, atomspace.get_node_by_name("animal")])
+        self.assertFalse(atomspace._mapped)
+        self.assertEqual(len(atomspace), 8)
+        self.assertEqual(len(atomspace.get_incoming(atomspace.get_node_by_name("animal"))), 3)
+        self.assertEqual(atomspace.get_incoming(bird), [link])
+        self.assertEqual(atomspace.get_attention_value(cat), AttentionValue(5.0, 1.0))
+    
+    def test_resave(self):
+        """Test an opened snapshot can be saved again"""
+        self.atomspace.remove_atom(self.atomspace.get_node_by_name("dog"))
+        self.atomspace.save_snapshot(self.path)
+        atomspace = self.open()
+        self.assertEqual(len(atomspace), 3)
+        self.assertEqual(len(atomspace.get_incoming(atomspace.get_node_by_name("animal"))), 1)
+    
+    def test_other_hash_function(self):
+        """Test tables are rebuilt if they were hashed differently"""
+        with mock.patch.object(snapshot, "_HASH_CHECK", snapshot._HASH_CHECK + 1):
+            atomspace = self.open()
+        self.assertFalse(atomspace._mapped)
+        cat = atomspace.get_node_by_name("cat")
+        self.assertIsNotNone(atomspace.get_link("InheritanceLink", [cat, atomspace.get_node_by_name("animal")]))
+    
+    def test_invalid_files(self):
+        """Test unknown types, other files and truncated files are refused"""
+        with open(self.path, "rb") as file:
+            data = file.read()
+        for corrupt in (data.replace(b"ConceptNode", b"ConceptNodX"), b"NOTASNAP" + data[8:], data[:-8]):
+            with open(self.path, "wb") as file:
+                file.write(corrupt)
+            with self.assertRaises(ValueError):
+                self.open()
+
+
+class TestSnapshotFromColumnar(ColumnarBackend, TestSnapshot):
+    """Run the snapshot tests on snapshots of a ColumnarAtomSpace"""
+
+
+class TestSnapshotRead(TestSnapshot):
+    """Run the snapshot tests reading files rather than mapping them"""
+    
+    mmap = False
+
+
+class TestEmptySnapshot(test_atomspace.TestAtomSpace):
+    """Run the AtomSpace test suite against an opened empty snapshot"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, "empty.snapshot")
+        ColumnarAtomSpace().save_snapshot(path)
+        self.atomspace = ColumnarAtomSpace.open_snapshot(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,189 @@
+"""
+Tests for SQLiteStorage
+"""
+
+import os
+import sqlite3
+import tempfile
+import time
+import unittest
+from cogpy.core.atom import Node, Link
+from cogpy.core.types import AtomType
+from cogpy.core.truthvalue import TruthValue
+from cogpy.storage.sqlite import SQLiteStorage
+from cogpy.tests.backends import AtomSpaceBackend, ColumnarBackend
+
+
+class TestSQLiteStorage(AtomSpaceBackend, unittest.TestCase):
+    """Test storing, fetching and loading atoms"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "atoms.db")
+        self.atomspace = self.make_atomspace()
+        self.storage = self.open(self.atomspace)
+        self.cat = self.atomspace.add_node("ConceptNode", "cat")
+        self.animal = self.atomspace.add_node("ConceptNode", "animal", TruthValue(0.5, 0.5))
+        self.link = self.atomspace.add_link("InheritanceLink", [self.cat, self.animal], TruthValue(0.9, 0.8))
+    
+    def open(self, atomspace, **kwargs):
+        """Open the test database for an AtomSpace"""
+        kwargs.setdefault("flush_interval", None)
+        storage = SQLiteStorage(atomspace, self.path, **kwargs)
+        self.addCleanup(storage.close)
+        return storage
+    
+    def reopen(self):
+        """Close the storage and open the database for a new AtomSpace"""
+        self.storage.close()
+        atomspace = self.make_atomspace()
+        return atomspace, self.open(atomspace)
+    
+    def test_store_stores_outgoing(self):
+        """Test storing a link also stores its outgoing atoms"""
+        self.storage.store_atom(self.link)
+        self.assertEqual(len(self.storage), 3)
+        self.storage.store_atom(self.cat)
+        self.assertEqual(len(self.storage), 3)
+    
+    def test_load_atomspace(self):
+        """Test every stored atom and truth value survives a restart"""
+        self.atomspace.add_link("ListLink", [])
+        self.storage.store_atomspace()
+        atomspace, storage = self.reopen()
+        self.assertEqual(storage.load_atomspace(), 4)
+        self.assertEqual(len(atomspace), 4)
+        link = atomspace.get_atoms_by_type(AtomType.INHERITANCE_LINK)[0]
+        self.assertEqual([atom.name for atom in link.outgoing], ["cat", "animal"])
+        self.assertEqual(link.truth_value, TruthValue(0.9, 0.8))
+        self.assertEqual(atomspace.get_node_by_name("animal").truth_value, TruthValue(0.5, 0.5))
+        self.assertEqual(len(atomspace.get_atoms_by_type(AtomType.LIST_LINK)[0].outgoing), 0)
+    
+    def test_truth_value_update(self):
+        """Test storing again writes the latest truth value"""
+        self.storage.store_atom(self.link)
+        self.link.truth_value = TruthValue(0.1, 0.2)
+        self.storage.store_atom(self.link)
+        self.storage.flush()
+        self.link.truth_value = TruthValue(0.3, 0.4)
+        self.storage.store_atom(self.link)
+        atomspace, storage = self.reopen()
+        storage.load_atomspace()
+        self.assertEqual(atomspace.get_all_links()[0].truth_value, TruthValue(0.3, 0.4))
+    
+    def test_fetch_atom(self):
+        """Test fetching a stored atom by a template of it"""
+        self.storage.store_atom(self.link)
+        atomspace, storage = self.reopen()
+        template = Link(AtomType.INHERITANCE_LINK,
+                        [Node(AtomType.CONCEPT_NODE, "cat"), Node(AtomType.CONCEPT_NODE, "animal")])
+        link = storage.fetch_atom(template)
+        self.assertIs(atomspace.get_atom_by_id(link.id), link)
+        self.assertEqual(link.truth_value, TruthValue(0.9, 0.8))
+        self.assertEqual(len(atomspace), 3)
+        self.assertIsNone(storage.fetch_atom(Node(AtomType.CONCEPT_NODE, "dog")))
+    
+    def test_fetch_after_store(self):
+        """Test atoms stored by the same storage can be fetched by template"""
+        self.storage.store_atom(self.link)
+        self.storage.flush()
+        node = self.storage.fetch_atom(Node(AtomType.CONCEPT_NODE, "cat"))
+        self.assertIs(node, self.cat)
+        self.atomspace.clear()
+        node = self.storage.fetch_atom(Node(AtomType.CONCEPT_NODE, "cat"))
+        self.assertIsNotNone(node)
+        self.assertIs(self.atomspace.get_node_by_name("cat"), node)
+    
+    def test_store_recreated_atom(self):
+        """Test storing an atom removed from memory and added again adds no rows"""
+        self.storage.store_atom(self.link)
+        self.atomspace.clear()
+        # Once before the first write and once after it
+        for _ in range(2):
+            cat = self.atomspace.add_node("ConceptNode", "cat")
+            animal = self.atomspace.add_node("ConceptNode", "animal")
+            self.storage.store_atom(self.atomspace.add_link("InheritanceLink", [cat, animal]))
+            self.assertEqual(len(self.storage), 3)
+            self.atomspace.clear()
+    
+    def test_fetch_incoming(self):
+        """Test fetching the stored links that contain an atom"""
+        dog = self.atomspace.add_node("ConceptNode", "dog")
+        self.storage.store_atoms([self.link, self.atomspace.add_link("InheritanceLink", [dog, self.animal]),
+                                  self.atomspace.add_link("SimilarityLink", [dog, self.cat])])
+        atomspace, storage = self.reopen()
+        animal = atomspace.add_node("ConceptNode", "animal")
+        links = storage.fetch_incoming(animal)
+        self.assertEqual(sorted(link.outgoing[0].name for link in links), ["cat", "dog"])
+        self.assertEqual(len(atomspace.get_incoming(animal)), 2)
+        cat = atomspace.get_node_by_name("cat")
+        self.assertEqual(len(storage.fetch_incoming(cat, "SimilarityLink")), 1)
+    
+    def test_dedup_after_restart(self):
+        """Test storing atoms already in the database adds no rows"""
+        self.storage.store_atomspace()
+        atomspace, storage = self.reopen()
+        cat = atomspace.add_node("ConceptNode", "cat")
+        animal = atomspace.add_node("ConceptNode", "animal")
+        storage.store_atom(atomspace.add_link("InheritanceLink", [cat, animal]))
+        storage.store_atom(atomspace.add_link("InheritanceLink", [animal, cat]))
+        self.assertEqual(len(storage), 4)
+    
+    def test_remove_atom(self):
+        """Test removal reaches links stored but not in memory"""
+        dog = self.atomspace.add_node("ConceptNode", "dog")
+        self.storage.store_atoms([self.link, self.atomspace.add_link("ListLink", [dog, self.animal])])
+        atomspace, storage = self.reopen()
+        animal = storage.fetch_atom(Node(AtomType.CONCEPT_NODE, "animal"))
+        self.assertFalse(storage.remove_atom(animal, recursive=False))
+        self.assertTrue(storage.remove_atom(animal))
+        self.assertEqual(len(storage), 2)
+        self.assertIsNone(atomspace.get_node_by_name("animal"))
+        # Storing the atom again gives it a new row
+        storage.store_atom(atomspace.add_node("ConceptNode", "animal"))
+        self.assertEqual(len(storage), 3)
+    
+    def test_write_behind(self):
+        """Test the background thread writes the queue without a flush"""
+        storage = self.open(self.make_atomspace(), flush_interval=0.01)
+        storage.store_atom(storage.atomspace.add_node("ConceptNode", "cat"))
+        reader = sqlite3.connect(self.path)
+        self.addCleanup(reader.close)
+        deadline = time.monotonic() + 5.0
+        while reader.execute("SELECT COUNT(*) FROM atoms").fetchone()[0] == 0:
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.01)
+    
+    def test_deep_chain(self):
+        """Test link-of-link chains are stored and loaded without recursion"""
+        atom = self.cat
+        for _ in range(3000):
+            atom = self.atomspace.add_link("ListLink", [atom])
+        self.storage.store_atom(atom)
+        atomspace, storage = self.reopen()
+        self.assertEqual(storage.load_atomspace(), 3001)
+    
+    def test_closed(self):
+        """Test a closed storage refuses writes"""
+        self.storage.close()
+        with self.assertRaises(ValueError):
+            self.storage.store_atom(self.cat)
+    
+    def test_schema_version(self):
+        """Test databases of an unknown layout are refused"""
+        self.storage.close()
+        db = sqlite3.connect(self.path)
+        db.execute("PRAGMA user_version = 99")
+        db.close()
+        with self.assertRaises(ValueError):
+            SQLiteStorage(self.atomspace, self.path)
+
+
+class TestColumnarSQLiteStorage(ColumnarBackend, TestSQLiteStorage):
+    """Run the SQLiteStorage tests against ColumnarAtomSpace"""
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,7 +3,8 @@ Tests for TruthValue
 """
 
 import unittest
-from cogpy.core.truthvalue import TruthValue
+from cogpy.core.atomspace import AtomSpace
+from cogpy.core.truthvalue import HandleRows, TruthValue, TruthValueStore, np
 
 
 class TestTruthValue(unittest.TestCase):
@@ -57,5 +58,111 @@ class TestTruthValue(unittest.TestCase):
         self.assertNotEqual(tv1, tv3)
 
 
+class TestTruthValueStore(unittest.TestCase):
+    """Test TruthValueStore class"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.store = TruthValueStore(HandleRows())
+    
+    def test_set_and_get(self):
+        """Test handles are given dense rows"""
+        self.store.set(100, TruthValue(0.5, 0.25))
+        self.store.set(103)
+        self.assertEqual(self.store.get(100), TruthValue(0.5, 0.25))
+        self.assertEqual(self.store.get(103), TruthValue())
+        self.assertEqual(len(self.store), 2)
+    
+    def test_rows_by_handle(self):
+        """Test handles are rows without a HandleRows"""
+        store = TruthValueStore()
+        store.set(3, TruthValue(0.5, 0.25))
+        self.assertEqual(store.get(3), TruthValue(0.5, 0.25))
+        self.assertEqual(store.get(1), TruthValue())
+        self.assertEqual(len(store), 4)
+    
+    def test_removed_rows_are_reused(self):
+        """Test a freed row goes to the next new handle"""
+        rows = self.store._map
+        self.store.set(100, TruthValue(0.5, 0.5))
+        self.store.set(200)
+        rows.remove(100)
+        self.assertNotIn(100, rows)
+        self.store.set(300, TruthValue(0.25, 0.25))
+        self.assertEqual(len(self.store), 2)
+        self.assertEqual(self.store.get(300), TruthValue(0.25, 0.25))
+        self.assertEqual(self.store.get(200), TruthValue())
+    
+    def test_rows_track_live_atoms(self):
+        """Test an AtomSpace's rows follow its live atoms, not the handles made"""
+        other = AtomSpace()
+        for i in range(1000):
+            other.add_node("ConceptNode", str(i))
+        atomspace = AtomSpace()
+        cat = atomspace.add_node("ConceptNode", "cat")
+        for i in range(1000):
+            atomspace.remove_atom(atomspace.add_link("ListLink", [cat]))
+        atomspace.add_node("ConceptNode", "dog")
+        self.assertEqual(len(atomspace._truth_values), 2)
+        self.assertEqual(cat.truth_value, TruthValue())
+    
+    def test_lower_handle(self):
+        """Test storing a handle below the first one"""
+        self.store.set(100, TruthValue(0.5, 0.5))
+        self.store.set(98, TruthValue(0.25, 0.25))
+        self.assertEqual(self.store.get(100), TruthValue(0.5, 0.5))
+        self.assertEqual(self.store.get(98), TruthValue(0.25, 0.25))
+    
+    def test_view(self):
+        """Test views read and write the store"""
+        self.store.set(7, TruthValue(0.5, 0.5))
+        view = self.store.view(7)
+        view.strength = 1.5
+        self.assertEqual(self.store.get(7), TruthValue(1.0, 0.5))
+        self.store.set(7, TruthValue(0.2, 0.3))
+        self.assertEqual(view, TruthValue(0.2, 0.3))
+        self.assertEqual(view.to_tuple(), (0.2, 0.3))
+        self.store._map.remove(7)
+        with self.assertRaisesRegex(KeyError, "removed"):
+            view.strength
+    
+    def test_view_outlives_atom(self):
+        """Test a view taken before its atom is removed keeps the atom's last values"""
+        atomspace = AtomSpace()
+        cat = atomspace.add_node("ConceptNode", "cat", TruthValue(0.3, 0.6))
+        view = cat.truth_value
+        atomspace.remove_atom(cat)
+        # The freed row goes to another atom
+        atomspace.add_node("ConceptNode", "dog", TruthValue(0.9, 0.9))
+        self.assertEqual(view.to_tuple(), (0.3, 0.6))
+        view.strength = 0.5
+        self.assertEqual(cat.truth_value, TruthValue(0.5, 0.6))
+        self.assertEqual(atomspace.get_node_by_name("dog").truth_value, TruthValue(0.9, 0.9))
+    
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_set_many(self):
+        """Test batch writes clamp and broadcast"""
+        for handle in range(10, 15):
+            self.store.set(handle)
+        self.store.set_many([11, 13], np.array([0.5, 2.0]), 0.5)
+        strengths, confidences = self.store.get_many([10, 11, 13])
+        self.assertEqual(strengths.tolist(), [1.0, 0.5, 1.0])
+        self.assertEqual(confidences.tolist(), [1.0, 0.5, 0.5])
+        self.store._map.remove(11)
+        for handles in ([11], [9], [99]):
+            with self.assertRaises(ValueError):
+                self.store.get_many(handles)
+    
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_get_many_spread_handles(self):
+        """Test batch reads of handles too far apart for a lookup table"""
+        for handle in (5, 10 ** 9, 10 ** 12):
+            self.store.set(handle, TruthValue(handle % 7 / 7, 0.5))
+        strengths, _ = self.store.get_many([10 ** 12, 5])
+        self.assertEqual(strengths.tolist(), [10 ** 12 % 7 / 7, 5 / 7])
+        with self.assertRaises(ValueError):
+            self.store.get_many([6])
+
+
 if __name__ == '__main__':
     unittest.main()
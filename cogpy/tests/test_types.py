@@ -32,6 +32,36 @@ class TestAtomType(unittest.TestCase):
         self.assertTrue(AtomType.is_link(AtomType.INHERITANCE_LINK))
         self.assertFalse(AtomType.is_link(AtomType.NODE))
         self.assertFalse(AtomType.is_link(AtomType.CONCEPT_NODE))
+        self.assertFalse(AtomType.is_link(AtomType.ATOM))
+    
+    def test_is_a(self):
+        """Test transitive subtype checks"""
+        self.assertTrue(AtomType.is_a(AtomType.CONCEPT_NODE, AtomType.CONCEPT_NODE))
+        self.assertTrue(AtomType.is_a(AtomType.CONCEPT_NODE, AtomType.NODE))
+        self.assertTrue(AtomType.is_a(AtomType.INHERITANCE_LINK, AtomType.ATOM))
+        self.assertFalse(AtomType.is_a(AtomType.NODE, AtomType.CONCEPT_NODE))
+        self.assertFalse(AtomType.is_a(AtomType.INHERITANCE_LINK, AtomType.NODE))
+    
+    def test_is_unordered(self):
+        """Test unordered link classification"""
+        self.assertTrue(AtomType.is_unordered(AtomType.SET_LINK))
+        self.assertTrue(AtomType.is_unordered(AtomType.SIMILARITY_LINK))
+        self.assertTrue(AtomType.is_unordered(AtomType.AND_LINK))
+        self.assertTrue(AtomType.is_unordered(AtomType.OR_LINK))
+        self.assertFalse(AtomType.is_unordered(AtomType.LIST_LINK))
+        self.assertFalse(AtomType.is_unordered(AtomType.INHERITANCE_LINK))
+        self.assertTrue(AtomType.is_link(AtomType.UNORDERED_LINK))
+    
+    def test_hierarchy(self):
+        """Test parents and subtype closures"""
+        self.assertEqual(AtomType.get_parent(AtomType.CONCEPT_NODE), AtomType.NODE)
+        self.assertEqual(AtomType.get_parent(AtomType.NODE), AtomType.ATOM)
+        self.assertIsNone(AtomType.get_parent(AtomType.ATOM))
+        
+        self.assertEqual(len(AtomType.get_subtypes(AtomType.ATOM)), len(AtomType))
+        self.assertIn(AtomType.SET_LINK, AtomType.get_subtypes(AtomType.LINK))
+        self.assertNotIn(AtomType.CONCEPT_NODE, AtomType.get_subtypes(AtomType.LINK))
+        self.assertEqual(AtomType.get_subtypes(AtomType.NOT_LINK), (AtomType.NOT_LINK,))
 
 
 if __name__ == '__main__':
@@ -0,0 +1,178 @@
+"""
+Tests for WriteAheadLog
+"""
+
+import os
+import tempfile
+import unittest
+from cogpy.core.atomspace import AtomSpace
+from cogpy.core.bounded import BoundedAtomSpace
+from cogpy.core.columnar import ColumnarAtomSpace
+from cogpy.core.types import AtomType
+from cogpy.core.truthvalue import TruthValue, np
+from cogpy.storage.wal import WriteAheadLog
+
+
+class TestWriteAheadLog(unittest.TestCase):
+    """Test logging changes and recovering them"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.atomspace = AtomSpace()
+        self.log = self.open(self.atomspace)
+        self.cat = self.atomspace.add_node("ConceptNode", "cat")
+        self.animal = self.atomspace.add_node("ConceptNode", "animal", TruthValue(0.5, 0.5))
+        self.link = self.atomspace.add_link("InheritanceLink", [self.cat, self.animal], TruthValue(0.9, 0.8))
+    
+    def open(self, atomspace):
+        """Open the test log for an AtomSpace"""
+        log = WriteAheadLog(atomspace, self.directory, commit_interval=60.0, snapshot_interval=None)
+        self.addCleanup(log.close)
+        return log
+    
+    def crash(self, log):
+        """Stop a log as a crash would, losing its uncommitted records"""
+        log.atomspace._journal = None
+        log.atomspace._truth_values._journal = None
+        log._buffer.clear()
+        log._closed = True
+        log._wake.set()
+        log._committer.join()
+        if log._snapshotter is not None:
+            log._snapshotter.join()
+        log._segment.close()
+    
+    def recover(self):
+        """Commit and crash the log, then recover it into a new AtomSpace"""
+        self.log.commit()
+        self.crash(self.log)
+        atomspace = AtomSpace()
+        return atomspace, self.open(atomspace)
+    
+    def recover_from(self, log):
+        """Recover a log other than the one made in setUp"""
+        self.log = log
+        return self.recover()
+    
+    def files(self, kind):
+        """List the files of one kind in the log directory"""
+        return sorted(name for name in os.listdir(self.directory) if name.startswith(kind))
+    
+    def test_recover(self):
+        """Test committed atoms and truth values survive a crash"""
+        self.atomspace.add_link("ListLink", [])
+        atomspace, log = self.recover()
+        self.assertEqual(log.recovered, 4)
+        self.assertEqual(len(atomspace), 4)
+        link = atomspace.get_atoms_by_type(AtomType.INHERITANCE_LINK)[0]
+        self.assertEqual([atom.name for atom in link.outgoing], ["cat", "animal"])
+        self.assertEqual(link.truth_value, TruthValue(0.9, 0.8))
+        self.assertEqual(atomspace.get_node_by_name("animal").truth_value, TruthValue(0.5, 0.5))
+    
+    def test_uncommitted_lost(self):
+        """Test a crash loses only the changes since the last commit"""
+        self.log.commit()
+        self.atomspace.add_node("ConceptNode", "dog")
+        self.crash(self.log)
+        atomspace = AtomSpace()
+        self.assertEqual(self.open(atomspace).recovered, 3)
+        self.assertIsNone(atomspace.get_node_by_name("dog"))
+    
+    def test_truth_value_changes(self):
+        """Test each way of changing a truth value is logged"""
+        self.cat.truth_value = TruthValue(0.1, 0.2)
+        self.animal.truth_value.strength = 0.3
+        atomspace, _ = self.recover()
+        self.assertEqual(atomspace.get_node_by_name("cat").truth_value, TruthValue(0.1, 0.2))
+        self.assertEqual(atomspace.get_node_by_name("animal").truth_value, TruthValue(0.3, 0.5))
+    
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_set_truth_values(self):
+        """Test truth values set in bulk are logged"""
+        self.atomspace.set_truth_values([self.link.id, self.cat.id], [0.4, 0.7], 0.6)
+        atomspace, _ = self.recover()
+        self.assertEqual(atomspace.get_all_links()[0].truth_value, TruthValue(0.4, 0.6))
+        self.assertEqual(atomspace.get_node_by_name("cat").truth_value, TruthValue(0.7, 0.6))
+    
+    def test_remove_and_clear(self):
+        """Test removals, including recursive ones, and clear() are replayed"""
+        self.atomspace.remove_atom(self.animal)
+        atomspace, log = self.recover()
+        self.assertEqual([atom.name for atom in atomspace.get_all_atoms()], ["cat"])
+        
+        atomspace.clear()
+        atomspace.add_node("ConceptNode", "dog")
+        atomspace, _ = self.recover_from(log)
+        self.assertEqual([atom.name for atom in atomspace.get_all_atoms()], ["dog"])
+    
+    def test_snapshot_and_tail(self):
+        """Test recovery loads the snapshot and replays the log after it"""
+        self.assertTrue(self.log.checkpoint(wait=True))
+        self.assertEqual(len(self.files("snapshot")), 1)
+        self.assertEqual(len(self.files("wal")), 1)
+        dog = self.atomspace.add_node("ConceptNode", "dog")
+        self.atomspace.add_link("InheritanceLink", [dog, self.animal])
+        self.cat.truth_value = TruthValue(0.2, 0.3)
+        atomspace, log = self.recover()
+        self.assertEqual(log.recovered, 5)
+        self.assertEqual(len(atomspace.get_incoming(atomspace.get_node_by_name("animal"))), 2)
+        self.assertEqual(atomspace.get_node_by_name("cat").truth_value, TruthValue(0.2, 0.3))
+        # Log IDs carry on from the snapshot
+        atomspace.add_node("ConceptNode", "bird")
+        atomspace, _ = self.recover_from(log)
+        self.assertEqual(len(atomspace), 6)
+    
+    def test_torn_tail(self):
+        """Test a partly written last frame is ignored"""
+        self.log.commit()
+        self.atomspace.add_node("ConceptNode", "dog")
+        self.log.commit()
+        self.crash(self.log)
+        path = os.path.join(self.directory, self.files("wal")[-1])
+        os.truncate(path, os.path.getsize(path) - 3)
+        atomspace = AtomSpace()
+        self.assertEqual(self.open(atomspace).recovered, 3)
+    
+    def test_attach_populated(self):
+        """Test atoms added before the log was attached are snapshotted"""
+        self.log.close()
+        atomspace = AtomSpace()
+        cat = atomspace.add_node("ConceptNode", "cat")
+        atomspace.add_link("ListLink", [cat, atomspace.add_node("ConceptNode", "dog")])
+        with tempfile.TemporaryDirectory() as directory:
+            log = WriteAheadLog(atomspace, directory, snapshot_interval=None)
+            self.crash(log)
+            recovered = AtomSpace()
+            log = WriteAheadLog(recovered, directory, snapshot_interval=None)
+            log.close()
+            self.assertEqual(len(recovered), 3)
+    
+    def test_background_checkpoint(self):
+        """Test a due checkpoint is taken by the next change"""
+        self.log._checkpoint_due = True
+        self.atomspace.add_node("ConceptNode", "dog")
+        self.log._snapshotter.join()
+        self.assertEqual(len(self.files("snapshot")), 1)
+        atomspace, log = self.recover()
+        self.assertEqual(log.recovered, 4)
+    
+    def test_refused(self):
+        """Test unsupported and non-empty AtomSpaces are refused"""
+        with self.assertRaises(TypeError):
+            WriteAheadLog(ColumnarAtomSpace(), self.directory)
+        with self.assertRaises(TypeError):
+            WriteAheadLog(BoundedAtomSpace(10), self.directory)
+        with self.assertRaises(ValueError):
+            WriteAheadLog(self.atomspace, self.directory)
+        self.log.commit()
+        atomspace = AtomSpace()
+        atomspace.add_node("ConceptNode", "dog")
+        with self.assertRaises(ValueError):
+            WriteAheadLog(atomspace, self.directory)
+
+
+if __name__ == '__main__':
+    unittest.main()